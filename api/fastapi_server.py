@@ -17,6 +17,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Quer
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse, Response
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
 import logging
 from typing import Optional, Dict, Any
@@ -35,6 +36,7 @@ from api.models import *
 from api.websocket_manager import ConnectionManager
 from api.utils.logging_handler import get_websocket_handler, setup_logging
 from api.camera_manager import get_camera_manager
+from lib.kinematics import batch_ik, kinematics_core
 
 import numpy as np
 import psutil
@@ -71,6 +73,10 @@ manager = ConnectionManager()
 robot_status_task: Optional[asyncio.Task] = None
 system_status_task: Optional[asyncio.Task] = None
 command_results: Dict[str, CommandAcknowledgment] = {}
+ik_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Batch IK: waypoints per process-pool task
+IK_BATCH_CHUNK_SIZE = 250
 
 # Connect WebSocket handler to manager
 websocket_handler = get_websocket_handler()
@@ -168,6 +174,9 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    if ik_process_pool:
+        ik_process_pool.shutdown(wait=False, cancel_futures=True)
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -276,6 +285,11 @@ async def log_api_requests(request, call_next):
 
 def parse_robot_status() -> RobotStatus:
     """Get current robot status from robot_api"""
+    # Commander unreachable: skip the queries entirely instead of letting each
+    # one short-circuit (the liveness probe re-enables them automatically)
+    if not robot_client.is_commander_alive():
+        return RobotStatus(is_stopped=None, estop_active=None)
+
     try:
         # Get all status data
         pose_data = robot_client.get_robot_pose()
@@ -596,7 +610,8 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "websocket_clients": manager.get_connection_count()
+        "websocket_clients": manager.get_connection_count(),
+        "commander": robot_client.get_commander_liveness()
     }
 
 
@@ -700,7 +715,12 @@ async def restart_pm2_process(process_name: str):
 # Status Endpoints
 @app.post("/api/robot/move/joints", response_model=CommandResponse)
 async def move_joints(request: MoveJointsRequest):
-    """Move robot joints to specified angles"""
+    """
+    Move robot joints to specified angles.
+
+    Speed-based moves follow a jerk-limited S-curve; with `retarget: true`
+    a running speed-based move is steered to the new angles without stopping.
+    """
     # Note: Commanded target logging now happens in commander when command starts executing
     return execute_robot_command(
         robot_client.move_robot_joints,
@@ -708,7 +728,9 @@ async def move_joints(request: MoveJointsRequest):
         duration=request.duration,
         speed_percentage=request.speed_percentage,
         wait_for_ack=request.wait_for_ack,
-        timeout=request.timeout
+        timeout=request.timeout,
+        accel_percentage=request.accel_percentage,
+        retarget=request.retarget
     )
 
 
@@ -741,6 +763,10 @@ async def execute_trajectory_endpoint(request: ExecuteTrajectoryRequest):
     ```
 
     **Example**: Drawing a straight line at constant speed in 3D space
+
+    **Time-optimal retiming**: with `retime: true` only the path geometry is
+    kept and the commander plays it back as fast as the joint velocity and
+    acceleration limits allow (TOPP-RA), starting and ending at rest
     """
     # Note: Commanded target logging now happens in commander when command starts executing
     return execute_robot_command(
@@ -748,10 +774,183 @@ async def execute_trajectory_endpoint(request: ExecuteTrajectoryRequest):
         request.trajectory,
         duration=request.duration,
         wait_for_ack=request.wait_for_ack,
+        timeout=request.timeout,
+        retime=request.retime
+    )
+
+
+@app.post("/api/robot/execute/spline", response_model=CommandResponse)
+async def execute_spline_endpoint(request: ExecuteSplineRequest):
+    """
+    Execute a piecewise-polynomial joint trajectory at 100Hz.
+
+    **Motion Type**: Pre-computed joint-space trajectory (compact form)
+
+    **How it works**:
+    - The trajectory is sent as spline knots and per-joint cubic or quintic
+      coefficients (scipy PPoly layout, degrees) instead of one waypoint per
+      10ms cycle
+    - The commander evaluates the spline in chunks during playback, with
+      the same collision check and joint speed limits as
+      /api/robot/execute/trajectory
+
+    **Advantages**:
+    - Payload and commander memory 20-100x smaller for long paths
+    - Same motion as sampling the spline at 100Hz
+    """
+    return execute_robot_command(
+        robot_client.execute_spline_trajectory,
+        request.breaks,
+        request.coefficients,
+        wait_for_ack=request.wait_for_ack,
         timeout=request.timeout
     )
 
 
+# Kinematics Endpoints
+def get_ik_process_pool() -> ProcessPoolExecutor:
+    """Process pool for batch IK (created on first use, size from api.ik_workers)"""
+    global ik_process_pool
+    if ik_process_pool is None:
+        workers = config.get('api', {}).get('ik_workers') or max(1, (os.cpu_count() or 2) - 1)
+        ik_process_pool = ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"Started IK process pool with {workers} workers")
+    return ik_process_pool
+
+
+@app.post("/api/ik/batch", response_model=BatchIKResponse)
+async def solve_ik_batch(request: BatchIKRequest):
+    """
+    Solve inverse kinematics for a list of Cartesian waypoints.
+
+    **How it works**:
+    - Closed-form IK for all waypoints, numerical IK as fallback
+    - With `use_previous_as_seed`, each waypoint takes the solution closest
+      to the previous one (no configuration flips along the path)
+    - Long paths are split into chunks solved in parallel worker processes;
+      the event loop is never blocked
+
+    **Response**: `joint_trajectory` (degrees) when every waypoint succeeded,
+    plus `waypoint_status` with the outcome of each waypoint and `warnings`
+    about large joint jumps, configuration changes, near-singular zones
+    and collisions. Near-singular zones are slowed down automatically when
+    the trajectory is executed (only where joint speed limits require it).
+
+    **Workflow**:
+    ```
+    1. Generate Cartesian waypoints → /api/ik/batch → Get joint trajectory
+    2. Execute joint trajectory → /api/robot/execute/trajectory
+    ```
+    """
+    start_time = time.time()
+    T = kinematics_core.pose_to_matrix(request.waypoints)
+    seed = np.deg2rad(request.seed_joints) if request.seed_joints is not None else None
+    warm_start = request.use_previous_as_seed
+
+    chunks = batch_ik.plan_chunk_seeds(T, IK_BATCH_CHUNK_SIZE, seed, warm_start)
+
+    loop = asyncio.get_running_loop()
+    pool = get_ik_process_pool()
+    try:
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, batch_ik.solve_chunk, T[start:stop], chunk_seed, warm_start)
+            for start, stop, chunk_seed in chunks
+        ])
+    except Exception as e:
+        logger.error(f"Batch IK failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch IK error: {str(e)}")
+
+    Q = np.vstack([q for q, _ in results])
+    waypoint_status = []
+    for (start, _, _), (_, status) in zip(chunks, results):
+        for entry in status:
+            waypoint_status.append(IKWaypointStatus(**{**entry, 'index': entry['index'] + start}))
+
+    failed = [entry for entry in waypoint_status if not entry.success]
+    warnings = batch_ik.path_warnings(Q, seed if warm_start else None)
+
+    return BatchIKResponse(
+        success=not failed,
+        joint_trajectory=np.rad2deg(Q).tolist() if not failed else None,
+        failed_at=failed[0].index if failed else None,
+        error=f"Waypoint {failed[0].index}: {failed[0].error}" if failed else None,
+        warnings=warnings,
+        waypoint_status=waypoint_status,
+        total_waypoints=len(request.waypoints),
+        planning_time_s=time.time() - start_time
+    )
+
+
+@app.post("/api/fk", response_model=FKResponse)
+async def forward_kinematics(request: FKRequest):
+    """
+    Compute the TCP pose for one joint configuration.
+
+    Uses the same DH model as the commander. `tool_offset` moves the TCP
+    from the J6 flange; `include_variations` adds the bare flange pose and
+    the ZYX Euler representation for comparison with other tools.
+    """
+    try:
+        q = np.deg2rad(request.joints)
+        T = kinematics_core.fkine_tcp(q, request.tool_offset)
+        quaternion = kinematics_core.matrix_to_quaternion(T[:, :3, :3])[0]
+
+        variations = None
+        if request.include_variations:
+            variations = [FKVariation(
+                label="TCP (ZYX Euler)",
+                pose=np.concatenate([T[0, :3, 3] * 1000.0,
+                                     kinematics_core.matrix_to_rpy(T[:, :3, :3], order='zyx')[0]]).tolist(),
+                quaternion=quaternion.tolist(),
+                euler_order='zyx'
+            )]
+            if request.tool_offset is not None:
+                T_flange = kinematics_core.fkine_batch(q)
+                variations.append(FKVariation(
+                    label="J6 flange (no tool offset)",
+                    pose=kinematics_core.matrix_to_pose(T_flange)[0].tolist(),
+                    quaternion=kinematics_core.matrix_to_quaternion(T_flange[:, :3, :3])[0].tolist(),
+                    euler_order='xyz'
+                ))
+
+        return FKResponse(
+            success=True,
+            pose=kinematics_core.matrix_to_pose(T)[0].tolist(),
+            quaternion=quaternion.tolist(),
+            variations=variations
+        )
+    except Exception as e:
+        logger.error(f"FK failed: {e}")
+        return FKResponse(success=False, error=str(e))
+
+
+@app.post("/api/fk/batch", response_model=FKBatchResponse)
+async def forward_kinematics_batch(request: FKBatchRequest):
+    """
+    Compute TCP poses for many joint configurations in one vectorized pass.
+
+    Use this to map recorded joint trajectories (e.g. `position_in` /
+    `position_out` of a motion recording) to Cartesian paths.
+    """
+    start_time = time.time()
+    try:
+        T = kinematics_core.fkine_tcp(np.deg2rad(request.joints), request.tool_offset)
+        quaternions = None
+        if request.include_quaternions:
+            quaternions = kinematics_core.matrix_to_quaternion(T[:, :3, :3]).tolist()
+
+        return FKBatchResponse(
+            success=True,
+            poses=kinematics_core.matrix_to_pose(T).tolist(),
+            quaternions=quaternions,
+            count=len(request.joints),
+            compute_time_s=time.time() - start_time
+        )
+    except Exception as e:
+        logger.error(f"Batch FK failed: {e}")
+        return FKBatchResponse(success=False, count=len(request.joints), error=str(e))
+
+
 # Jog Endpoints
 @app.post("/api/robot/gripper/electric", response_model=CommandResponse)
 async def control_electric_gripper(request: ElectricGripperRequest):
@@ -800,6 +999,16 @@ async def stop_robot():
     )
 
 
+@app.post("/api/robot/halt", response_model=CommandResponse)
+async def halt_robot():
+    """Smooth stop: brake the running move to rest (jerk-limited) and clear the queue"""
+    return execute_robot_command(
+        robot_client.halt_robot_movement,
+        wait_for_ack=True,
+        timeout=2.0
+    )
+
+
 @app.post("/api/robot/clear-estop", response_model=CommandResponse)
 async def clear_estop():
     """Clear software E-stop flag to re-enable robot motion"""
@@ -22,6 +22,16 @@ class MoveJointsRequest(BaseModel):
     )
     duration: Optional[float] = Field(None, description="Duration in seconds", gt=0)
     speed_percentage: Optional[int] = Field(None, description="Speed as percentage (1-100)", ge=1, le=100)
+    accel_percentage: Optional[int] = Field(
+        None,
+        description="Acceleration/jerk as percentage (1-100, default 50) for speed-based moves",
+        ge=1,
+        le=100
+    )
+    retarget: bool = Field(
+        False,
+        description="Steer the running speed-based move to these angles without stopping"
+    )
     wait_for_ack: bool = Field(False, description="Wait for command acknowledgment")
     timeout: float = Field(2.0, description="Acknowledgment timeout in seconds", gt=0)
     
@@ -231,6 +241,10 @@ class ExecuteTrajectoryRequest(BaseModel):
         description="Expected duration in seconds (for validation)",
         gt=0
     )
+    retime: bool = Field(
+        False,
+        description="Replace the trajectory timing with the time-optimal one under joint velocity/acceleration limits"
+    )
     wait_for_ack: bool = Field(False, description="Wait for command acknowledgment")
     timeout: float = Field(30.0, description="Acknowledgment timeout in seconds", gt=0)
 
@@ -242,6 +256,32 @@ class ExecuteTrajectoryRequest(BaseModel):
         return v
 
 
+class ExecuteSplineRequest(BaseModel):
+    """Request to execute a piecewise-polynomial joint trajectory"""
+    breaks: List[float] = Field(
+        ...,
+        description="Increasing breakpoint times in seconds (K+1 values)",
+        min_items=2
+    )
+    coefficients: List[List[List[float]]] = Field(
+        ...,
+        description="Coefficients [power][piece][joint] in degrees, highest power first, "
+                    "in powers of (t - breaks[piece]); 4 powers (cubic) or 6 (quintic)"
+    )
+    wait_for_ack: bool = Field(False, description="Wait for command acknowledgment")
+    timeout: float = Field(30.0, description="Acknowledgment timeout in seconds", gt=0)
+
+    @validator('coefficients')
+    def validate_coefficients(cls, v, values):
+        if len(v) not in (4, 6):
+            raise ValueError(f"Expected 4 (cubic) or 6 (quintic) coefficient rows, got {len(v)}")
+        pieces = len(values.get('breaks', [])) - 1
+        for power in v:
+            if len(power) != pieces or any(len(joints) != 6 for joints in power):
+                raise ValueError(f"Every coefficient row must have {pieces} pieces of 6 joint values")
+        return v
+
+
 # ============================================================================
 # Response Models - Data returned from the robot
 # ============================================================================
@@ -331,6 +371,14 @@ class IKResponse(BaseModel):
     residual: Optional[float] = Field(None, description="Solution residual/error")
 
 
+class IKWaypointStatus(BaseModel):
+    """IK outcome for a single waypoint of a batch"""
+    index: int = Field(..., description="Waypoint index")
+    success: bool = Field(..., description="IK solution found for this waypoint")
+    method: Optional[str] = Field(None, description="Solver used: 'analytic' or 'numerical'")
+    error: Optional[str] = Field(None, description="Error message if this waypoint failed")
+
+
 class BatchIKResponse(BaseModel):
     """Response from batch inverse kinematics solver"""
     success: bool = Field(..., description="All IK solutions found successfully")
@@ -347,6 +395,10 @@ class BatchIKResponse(BaseModel):
         default_factory=list,
         description="Warnings about velocity/acceleration limits or other issues"
     )
+    waypoint_status: List[IKWaypointStatus] = Field(
+        default_factory=list,
+        description="Per-waypoint IK status, in waypoint order"
+    )
     total_waypoints: int = Field(..., description="Total number of waypoints processed")
     planning_time_s: Optional[float] = Field(None, description="Time spent planning in seconds")
 
@@ -359,6 +411,36 @@ class FKRequest(BaseModel):
         min_items=6,
         max_items=6
     )
+    tool_offset: Optional[List[float]] = Field(
+        None,
+        description="TCP offset from the J6 flange [x, y, z, rx, ry, rz] (mm and degrees), null = flange",
+        min_items=6,
+        max_items=6
+    )
+    include_variations: bool = Field(False, description="Also return flange pose and ZYX Euler variations")
+
+
+class FKBatchRequest(BaseModel):
+    """Request to compute forward kinematics for many joint configurations"""
+    joints: List[List[float]] = Field(
+        ...,
+        description="Joint configurations [[J1-J6], [J1-J6], ...] in degrees",
+        min_items=1
+    )
+    tool_offset: Optional[List[float]] = Field(
+        None,
+        description="TCP offset from the J6 flange [x, y, z, rx, ry, rz] (mm and degrees), null = flange",
+        min_items=6,
+        max_items=6
+    )
+    include_quaternions: bool = Field(True, description="Also return orientations as quaternions")
+
+    @validator('joints')
+    def validate_joints(cls, v):
+        for i, joints in enumerate(v):
+            if len(joints) != 6:
+                raise ValueError(f"Configuration {i} must have 6 joint values, got {len(joints)}")
+        return v
 
 
 class FKVariation(BaseModel):
@@ -379,6 +461,22 @@ class FKResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if calculation failed")
 
 
+class FKBatchResponse(BaseModel):
+    """Response from batch forward kinematics"""
+    success: bool = Field(..., description="FK calculation succeeded")
+    poses: Optional[List[List[float]]] = Field(
+        None,
+        description="TCP poses [[x, y, z, rx, ry, rz], ...] (mm and degrees)"
+    )
+    quaternions: Optional[List[List[float]]] = Field(
+        None,
+        description="TCP orientations [[w, x, y, z], ...]"
+    )
+    count: int = Field(..., description="Number of configurations processed")
+    error: Optional[str] = Field(None, description="Error message if calculation failed")
+    compute_time_s: Optional[float] = Field(None, description="Computation time in seconds")
+
+
 class CommandAcknowledgment(BaseModel):
     """Command acknowledgment with tracking"""
     command_id: str = Field(..., description="Command tracking ID")
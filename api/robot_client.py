@@ -1,1783 +1,2493 @@
-"""
-Zero-Overhead Robot API with Optional Acknowledgments
-======================================================
-This version guarantees ZERO resource overhead when tracking is not used.
-The tracking system is only initialized when explicitly requested.
-"""
-
-import socket
-import os
-from typing import List, Optional, Literal, Dict, Tuple, Union
-import time
-import threading
-import queue
-import uuid
-from collections import deque
-from datetime import datetime, timedelta
-import logging
-
-# Set up logger for this module
-logger = logging.getLogger(__name__)
-
-# Global configuration - can be overridden by environment variables
-# COMMANDER_HOST: IP/hostname where commander is listening (default: 127.0.0.1)
-# COMMANDER_PORT: UDP port for commander commands (default: 5001)
-SERVER_IP = os.environ.get("COMMANDER_HOST", "127.0.0.1")
-SERVER_PORT = int(os.environ.get("COMMANDER_PORT", "5001"))
-
-# Global tracker - starts as None (no resources)
-_command_tracker = None
-_tracker_lock = threading.Lock()
-
-# ============================================================================
-# J2 BACKLASH COMPENSATION
-# ============================================================================
-
-# Load J2 backlash offset from config at startup (requires API restart to change)
-def _load_j2_backlash_offset() -> float:
-    """Load J2 backlash offset from config.yaml, default to 6.0 degrees."""
-    try:
-        from utils.config_loader import get_config
-        config = get_config()
-        return float(config.get('robot', {}).get('j2_backlash_offset', 6.0))
-    except Exception as e:
-        logger.warning(f"Failed to load J2 backlash offset from config: {e}, using default 6.0")
-        return 6.0
-
-J2_BACKLASH_OFFSET = _load_j2_backlash_offset()
-
-def _get_j2_backlash_offset(j2_deg: float) -> float:
-    """
-    Calculate backlash offset for J2 based on angle.
-    Returns offset in degrees (negative value).
-    """
-    if -100 <= j2_deg <= -3:
-        if j2_deg >= -90:
-            # Full offset in the main working range
-            return -J2_BACKLASH_OFFSET
-        else:
-            # Linear taper: full offset at -90°, 0° at -100°
-            t = (j2_deg + 100) / 10.0  # 0 at -100, 1 at -90
-            return -J2_BACKLASH_OFFSET * t
-    return 0.0
-
-
-def apply_j2_backlash(joint_angles: List[float]) -> List[float]:
-    """
-    Apply backlash compensation to J2 (for outgoing commands).
-    -6 deg offset from -3° to -90°, tapering to 0 at -100°.
-
-    Returns a new list with compensated angles (does not modify input).
-    """
-    result = list(joint_angles)  # Copy to avoid modifying input
-    result[1] += _get_j2_backlash_offset(result[1])
-    return result
-
-
-def reverse_j2_backlash(joint_angles: List[float]) -> List[float]:
-    """
-    Reverse backlash compensation from J2 (for incoming feedback).
-    The robot reports the compensated position, we need to show the original.
-
-    If we commanded X and robot went to X-offset, robot reports X-offset.
-    We need to return X, so we add offset back.
-
-    Returns a new list with original angles (does not modify input).
-    """
-    result = list(joint_angles)  # Copy to avoid modifying input
-    j2_deg = result[1]
-    offset = J2_BACKLASH_OFFSET
-
-    # The compensated range is -(100+offset) to -(3+offset) (original -100 to -3 minus up to offset)
-    # We need to figure out the original angle and its offset
-    lower_bound = -100 - offset  # e.g., -106 for offset=6
-    upper_bound = -3 - offset    # e.g., -9 for offset=6
-    taper_threshold = -90 - offset  # e.g., -96 for offset=6
-
-    if lower_bound <= j2_deg <= upper_bound:
-        if j2_deg >= taper_threshold:
-            # Was in full offset zone (-3 to -90 -> -(3+offset) to -(90+offset))
-            result[1] += offset
-        else:
-            # Was in taper zone (-90 to -100 -> -(90+offset) to -(100+offset))
-            # Compensated = original + offset_applied, where offset_applied = -offset * (original + 100) / 10
-            # So: compensated = original - offset * (original + 100) / 10
-            # compensated = original * (1 - offset/10) - 10*offset
-            # original = (compensated + 10*offset) / (1 - offset/10)
-            divisor = 1 - offset / 10.0
-            result[1] = (j2_deg + 10 * offset) / divisor
-
-    return result
-
-# ============================================================================
-# ORIGINAL SEND FUNCTION - ZERO OVERHEAD
-# ============================================================================
-
-def send_robot_command(command_string: str):
-    """
-    Original send function - NO TRACKING, NO OVERHEAD.
-    This is what gets called for all backward-compatible operations.
-    
-    Resource usage:
-    - No threads
-    - No extra sockets
-    - No memory allocation
-    - Exactly the same as your original implementation
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.sendto(command_string.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-        return f"Successfully sent command: '{command_string[:50]}...'"
-    except Exception as e:
-        return f"Error sending command: {e}"
-
-# ============================================================================
-# TRACKING SYSTEM - ONLY LOADED WHEN NEEDED
-# ============================================================================
-
-class LazyCommandTracker:
-    """
-    Command tracker with lazy initialization.
-    Resources are ONLY allocated when tracking is actually used.
-    """
-    
-    def __init__(self, listen_port=5002, history_size=100):
-        self.listen_port = listen_port
-        self.history_size = history_size
-        self.command_history = {}
-        self.lock = threading.Lock()
-        
-        # Lazy initialization flags
-        self._initialized = False
-        self._thread = None
-        self._socket = None
-        self._running = False
-    
-    def _lazy_init(self):
-        """
-        Initialize resources only when first tracking is requested.
-        This is called ONLY when someone uses tracking features.
-        """
-        if self._initialized:
-            return True
-            
-        try:
-            logger.info("[Tracker] First tracking request - initializing resources...")
-            
-            # Create socket
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._socket.bind(('', self.listen_port))
-            self._socket.settimeout(0.1)
-            
-            # Start thread
-            self._running = True
-            self._thread = threading.Thread(target=self._listen_loop, daemon=True)
-            self._thread.start()
-            
-            self._initialized = True
-            logger.info(f"[Tracker] Initialized on port {self.listen_port}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"[Tracker] Failed to initialize: {e}")
-            self._cleanup()
-            return False
-    
-    def _cleanup(self):
-        """Clean up resources"""
-        self._running = False
-        if self._thread:
-            self._thread.join(timeout=0.5)
-            self._thread = None
-        if self._socket:
-            self._socket.close()
-            self._socket = None
-        self._initialized = False
-    
-    def _listen_loop(self):
-        """Listener thread - only runs if tracking is used"""
-        while self._running:
-            try:
-                data, addr = self._socket.recvfrom(2048)
-                message = data.decode('utf-8')
-                
-                parts = message.split('|', 3)
-                if parts[0] == 'ACK' and len(parts) >= 3:
-                    cmd_id = parts[1]
-                    status = parts[2]
-                    details = parts[3] if len(parts) > 3 else ""
-                    
-                    with self.lock:
-                        if cmd_id in self.command_history:
-                            self.command_history[cmd_id].update({
-                                'status': status,
-                                'details': details,
-                                'ack_time': datetime.now(),
-                                'completed': status in ['COMPLETED', 'FAILED', 'INVALID', 'CANCELLED']
-                            })
-                    
-                    # Clean old entries (only if we have many)
-                    if len(self.command_history) > self.history_size:
-                        self._cleanup_old_entries()
-                        
-            except socket.timeout:
-                continue
-            except Exception:
-                if self._running:
-                    pass  # Silently continue
-    
-    def _cleanup_old_entries(self):
-        """Remove old entries to prevent memory growth"""
-        with self.lock:
-            now = datetime.now()
-            expired = [cmd_id for cmd_id, info in self.command_history.items()
-                      if now - info['sent_time'] > timedelta(seconds=30)]
-            for cmd_id in expired:
-                del self.command_history[cmd_id]
-    
-    def track_command(self, command: str) -> Tuple[str, str]:
-        """
-        Track a command - initializes tracker if needed.
-        Returns (modified_command, cmd_id)
-        """
-        # Initialize on first use
-        if not self._initialized:
-            if not self._lazy_init():
-                # Initialization failed - fall back to non-tracking
-                return command, None
-        
-        # Generate ID and modify command
-        cmd_id = str(uuid.uuid4())[:8]
-        tracked_command = f"{cmd_id}|{command}"
-        
-        # Register in history
-        with self.lock:
-            self.command_history[cmd_id] = {
-                'command': command,
-                'sent_time': datetime.now(),
-                'status': 'SENT',
-                'details': '',
-                'completed': False
-            }
-        
-        return tracked_command, cmd_id
-    
-    def get_status(self, cmd_id: str) -> Optional[Dict]:
-        """Get status if tracker is initialized"""
-        if not self._initialized:
-            return None
-        with self.lock:
-            return self.command_history.get(cmd_id, None)
-    
-    def wait_for_completion(self, cmd_id: str, timeout: float = 5.0) -> Dict:
-        """Wait for completion if tracker is initialized"""
-        if not self._initialized:
-            return {'status': 'NO_TRACKING', 'details': 'Tracker not initialized', 'completed': True}
-            
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status = self.get_status(cmd_id)
-            if status and status['completed']:
-                return status
-            time.sleep(0.01)
-        
-        return self.get_status(cmd_id) or {
-            'status': 'TIMEOUT',
-            'details': 'No acknowledgment received',
-            'completed': True
-        }
-    
-    def is_active(self) -> bool:
-        """Check if tracker is initialized and running"""
-        return self._initialized and self._running
-
-# ============================================================================
-# LAZY TRACKER ACCESS
-# ============================================================================
-
-def _get_tracker_if_needed() -> Optional[LazyCommandTracker]:
-    """
-    Get tracker ONLY if tracking is requested.
-    This ensures zero overhead for non-tracking operations.
-    """
-    global _command_tracker, _tracker_lock
-    
-    # Fast path - tracker already exists
-    if _command_tracker is not None:
-        return _command_tracker
-    
-    # Slow path - create tracker (only happens once)
-    with _tracker_lock:
-        if _command_tracker is None:
-            _command_tracker = LazyCommandTracker()
-        return _command_tracker
-
-# ============================================================================
-# ENHANCED SEND WITH OPTIONAL TRACKING
-# ============================================================================
-
-def send_robot_command_tracked(command_string: str) -> Tuple[str, Optional[str]]:
-    """
-    Send with tracking - initializes tracker on first use.
-    
-    Resource impact:
-    - First call: Starts tracker thread
-    - Subsequent calls: Minimal overhead (UUID generation)
-    """
-    tracker = _get_tracker_if_needed()
-    if tracker:
-        tracked_cmd, cmd_id = tracker.track_command(command_string)
-        if cmd_id:
-            # Send tracked command
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                    sock.sendto(tracked_cmd.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-                return f"Command sent with tracking (ID: {cmd_id})", cmd_id
-            except Exception as e:
-                return f"Error: {e}", None
-    
-    # Fall back to non-tracked
-    return send_robot_command(command_string), None
-
-def send_and_wait(
-    command_string: str, 
-    timeout: float = 2.0, 
-    non_blocking: bool = False
-    ) -> Union[Dict, str, None]:
-    """
-    Send and wait for acknowledgment OR return a command_id immediately.
-    First use initializes tracker.
-    """
-    result, cmd_id = send_robot_command_tracked(command_string)
-    
-    if cmd_id:
-        # If non_blocking is True, return the ID right away
-        if non_blocking:
-            return cmd_id
-            
-        # Otherwise, proceed with the original blocking logic
-        tracker = _get_tracker_if_needed()
-        if tracker:
-            status_dict = tracker.wait_for_completion(cmd_id, timeout)
-            # Add the command_id to the returned dictionary
-            status_dict['command_id'] = cmd_id
-            return status_dict
-    
-    # Handle cases where a command_id could not be generated
-    if non_blocking:
-        return None
-    else:
-        return {'status': 'NO_TRACKING', 'details': result, 'completed': True, 'command_id': None}
-
-# ============================================================================
-# BACKWARD COMPATIBLE MOVEMENT FUNCTIONS - ZERO OVERHEAD BY DEFAULT
-# ============================================================================
-
-def move_robot_joints(
-    joint_angles: List[float],
-    duration: Optional[float] = None,
-    speed_percentage: Optional[int] = None,
-    wait_for_ack: bool = False,  # Default: No tracking, no overhead
-    timeout: float = 2.0,
-    non_blocking: bool = False
-):
-    """
-    Move robot joints.
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    # Validation
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either a duration or a speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-
-    # Apply J2 backlash compensation
-    compensated_angles = apply_j2_backlash(joint_angles)
-
-    # Build command
-    angles_str = "|".join(map(str, compensated_angles))
-    duration_str = str(duration) if duration is not None else "None"
-    speed_str = str(speed_percentage) if speed_percentage is not None else "None"
-    command = f"MOVEJOINT|{angles_str}|{duration_str}|{speed_str}"
-    
-    # Send with or without tracking
-    if wait_for_ack:
-        # User explicitly requested tracking - initialize if needed
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        # Default path - NO TRACKING, NO OVERHEAD
-        return send_robot_command(command)
-
-def move_robot_pose(
-    pose: List[float],
-    duration: Optional[float] = None,
-    speed_percentage: Optional[int] = None,
-    wait_for_ack: bool = False,  # Default: No tracking
-    timeout: float = 2.,
-    non_blocking: bool = False
-):
-    """
-    Move to pose - zero overhead by default.
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either a duration or a speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    pose_str = "|".join(map(str, pose))
-    duration_str = str(duration) if duration is not None else "None"
-    speed_str = str(speed_percentage) if speed_percentage is not None else "None"
-    command = f"MOVEPOSE|{pose_str}|{duration_str}|{speed_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-
-def execute_trajectory(
-    trajectory: List[List[float]],
-    duration: Optional[float] = None,
-    wait_for_ack: bool = False,
-    timeout: float = 30.0,  # Longer default timeout for trajectories
-    non_blocking: bool = False
-):
-    """
-    Execute a pre-computed joint trajectory at 100Hz.
-
-    This is designed for Cartesian straight-line motion where:
-    1. Frontend generates Cartesian waypoints
-    2. Backend batch IK solves all waypoints ONCE
-    3. This executes the joint trajectory at 100Hz
-
-    Parameters
-    ----------
-    trajectory : List[List[float]]
-        Pre-computed joint trajectory, each waypoint is [J1-J6] in degrees
-    duration : float, optional
-        Expected duration in seconds (for validation)
-    wait_for_ack : bool
-        Wait for command acknowledgment (default: False for zero overhead)
-    timeout : float
-        Timeout for acknowledgment in seconds (default: 30s for long trajectories)
-    non_blocking : bool
-        If True with wait_for_ack, returns immediately with command_id
-
-    Returns
-    -------
-    dict or str
-        Command response with status, or command ID if wait_for_ack=True
-
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    import json
-
-    # Validation
-    if not trajectory or len(trajectory) == 0:
-        error = "Error: Trajectory is empty"
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-
-    # Validate each waypoint has 6 joints
-    for i, waypoint in enumerate(trajectory):
-        if len(waypoint) != 6:
-            error = f"Error: Waypoint {i} has {len(waypoint)} joints (expected 6)"
-            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-
-    # Apply J2 backlash compensation to each waypoint
-    compensated_trajectory = [apply_j2_backlash(waypoint) for waypoint in trajectory]
-
-    # Build command - encode trajectory as JSON
-    trajectory_json = json.dumps(compensated_trajectory)
-    duration_str = str(duration) if duration is not None else "None"
-    command = f"EXECUTETRAJECTORY|{trajectory_json}|{duration_str}"
-
-    # Debug logging
-    parts_count = command.count('|') + 1
-    logger.info(f"[DEBUG] Building EXECUTETRAJECTORY command: duration={duration}, parts={parts_count}")
-    if parts_count != 3:
-        logger.error(f"[DEBUG] Command has wrong number of parts! Command preview: {command[:200]}...")
-
-    # Send with or without tracking
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-
-def jog_robot_joint(
-    joint_index: int,
-    speed_percentage: int,
-    duration: Optional[float] = None,
-    distance_deg: Optional[float] = None,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-):
-    """
-    Jogs a single robot joint for a specified time or distance.
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    if duration is None and distance_deg is None:
-        error = "Error: You must provide either a duration or a distance_deg."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    if duration is not None:
-        try:
-            duration = float(duration)
-        except (ValueError, TypeError):
-            error = "Error: Duration must be a valid number."
-            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    duration_str = str(duration) if duration is not None else "None"
-    distance_str = str(distance_deg) if distance_deg is not None else "None"
-    command = f"JOG|{joint_index}|{speed_percentage}|{duration_str}|{distance_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def jog_multiple_joints(
-    joints: List[int], 
-    speeds: List[float], 
-    duration: float,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-) -> str:
-    """
-    Jogs multiple robot joints simultaneously for a specified duration.
-
-    Args:
-        joints: List of joint indices (0-5 for positive, 6-11 for negative)
-        speeds: List of corresponding speeds (1-100%)
-        duration: Duration of the jog in seconds
-        wait_for_ack: Enable command tracking (default False)
-        timeout: Timeout for acknowledgment
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    if len(joints) != len(speeds):
-        error = "Error: The number of joints must match the number of speeds."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    joints_str = ",".join(map(str, joints))
-    speeds_str = ",".join(map(str, speeds))
-    command = f"MULTIJOG|{joints_str}|{speeds_str}|{duration}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def jog_cartesian(
-    frame: Literal['TRF', 'WRF'],
-    axis: Literal['X+', 'X-', 'Y+', 'Y-', 'Z+', 'Z-', 'RX+', 'RX-', 'RY+', 'RY-', 'RZ+', 'RZ-'],
-    speed_percentage: int,
-    duration: float,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-):
-    """
-    Jogs the robot's end-effector continuously in Cartesian space.
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    if duration is not None:
-        try:
-            duration = float(duration)
-        except (ValueError, TypeError):
-            error = "Error: Duration must be a valid number."
-            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    command = f"CARTJOG|{frame}|{axis}|{speed_percentage}|{duration}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def move_robot_cartesian(
-    pose: List[float],
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-) -> str:
-    """
-    Moves the robot's end-effector to a specific Cartesian pose in a straight line.
-    
-    Args:
-        pose: Target pose as [x, y, z, r, p, y] (mm and degrees)
-        duration: Total time for the movement in seconds
-        speed_percentage: Movement speed as a percentage (1-100)
-        wait_for_ack: Enable command tracking (default False)
-        timeout: Timeout for acknowledgment
-        
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    # Validate timing arguments
-    if (duration is None and speed_percentage is None):
-        error = "Error: You must provide either 'duration' or 'speed_percentage'."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    if (duration is not None and speed_percentage is not None):
-        error = "Error: Please provide either 'duration' or 'speed_percentage', not both."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    # Prepare command arguments
-    duration_arg = 'NONE'
-    speed_arg = 'NONE'
-    
-    if duration is not None:
-        try:
-            if float(duration) <= 0:
-                error = "Error: Duration must be a positive number."
-                return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-            duration_arg = str(duration)
-        except (ValueError, TypeError):
-            error = "Error: Duration must be a valid number."
-            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    if speed_percentage is not None:
-        try:
-            speed_val = float(speed_percentage)
-            if not (0 < speed_val <= 100):
-                error = "Error: Speed percentage must be between 1 and 100."
-                return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-            speed_arg = str(speed_val)
-        except (ValueError, TypeError):
-            error = "Error: Speed percentage must be a valid number."
-            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    # Construct command
-    pose_str = "|".join(map(str, pose))
-    command = f"MOVECART|{pose_str}|{duration_arg}|{speed_arg}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def set_io(
-    output: Literal[1, 2],
-    state: bool,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-):
-    """
-    Set a digital output pin state.
-
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    state_int = 1 if state else 0
-    command = f"SET_IO|{output}|{state_int}"
-
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def control_electric_gripper(
-    action: Literal['move', 'calibrate'],
-    position: Optional[int] = 255,
-    speed: Optional[int] = 150,
-    current: Optional[int] = 500,
-    wait_for_ack: bool = False,
-    timeout: float = 2.0,
-    non_blocking: bool = False
-):
-    """
-    Controls the electric gripper.
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead, no tracking
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    action_str = "move" if action == 'move' else 'calibrate'
-    command = f"ELECTRICGRIPPER|{action_str}|{position}|{speed}|{current}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-    
-# ============================================================================
-# SMOOTH MOTION COMMANDS - WITH START POSITION AND DUAL TIMING SUPPORT
-# ============================================================================
-
-def smooth_circle(
-    center: List[float],
-    radius: float,
-    plane: Literal['XY', 'XZ', 'YZ'] = 'XY',
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    clockwise: bool = False,
-    wait_for_ack: bool = False,
-    timeout: float = 10.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a smooth circular motion.
-    
-    Args:
-        center: [x, y, z] center point in mm
-        radius: Circle radius in mm
-        plane: Plane of the circle ('XY', 'XZ', or 'YZ')
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose (mm and degrees).
-                   If None, starts from current position.
-        duration: Time to complete the circle in seconds
-        speed_percentage: Speed as percentage (1-100)
-        clockwise: Direction of motion
-        wait_for_ack: Enable command tracking (default False)
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-    
-    Resource usage:
-    - wait_for_ack=False (default): ZERO overhead
-    - wait_for_ack=True: Initializes tracker on first use
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either duration or speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    center_str = ",".join(map(str, center))
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    clockwise_str = "1" if clockwise else "0"
-    
-    # Format timing
-    if duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    command = f"SMOOTH_CIRCLE|{center_str}|{radius}|{plane}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def smooth_arc_center(
-    end_pose: List[float],
-    center: List[float],
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    clockwise: bool = False,
-    wait_for_ack: bool = False,
-    timeout: float = 10.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a smooth arc motion defined by center point.
-    
-    Args:
-        end_pose: [x, y, z, rx, ry, rz] end pose (mm and degrees)
-        center: [x, y, z] arc center point in mm
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
-                   If None, starts from current position.
-                   If specified, adds smooth transition from current position.
-        duration: Time to complete the arc in seconds
-        speed_percentage: Speed as percentage (1-100)
-        clockwise: Direction of motion
-        wait_for_ack: Enable command tracking
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either duration or speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    end_str = ",".join(map(str, end_pose))
-    center_str = ",".join(map(str, center))
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    clockwise_str = "1" if clockwise else "0"
-    
-    # Format timing
-    if duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    command = f"SMOOTH_ARC_CENTER|{end_str}|{center_str}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def smooth_arc_parametric(
-    end_pose: List[float],
-    radius: float,
-    arc_angle: float,
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    clockwise: bool = False,
-    wait_for_ack: bool = False,
-    timeout: float = 10.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a smooth arc motion defined by radius and angle.
-    
-    Args:
-        end_pose: [x, y, z, rx, ry, rz] end pose (mm and degrees)
-        radius: Arc radius in mm
-        arc_angle: Arc angle in degrees
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
-                   If None, starts from current position.
-        duration: Time to complete the arc in seconds
-        speed_percentage: Speed as percentage (1-100)
-        clockwise: Direction of motion
-        wait_for_ack: Enable command tracking
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either duration or speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    end_str = ",".join(map(str, end_pose))
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    clockwise_str = "1" if clockwise else "0"
-    
-    # Format timing
-    if duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    command = f"SMOOTH_ARC_PARAM|{end_str}|{radius}|{arc_angle}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def smooth_spline(
-    waypoints: List[List[float]],
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    wait_for_ack: bool = False,
-    timeout: float = 10.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a smooth spline motion through waypoints.
-    
-    Args:
-        waypoints: List of [x, y, z, rx, ry, rz] poses (mm and degrees)
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
-                   If None, starts from current position.
-                   If specified and different from first waypoint, adds transition.
-        duration: Total time for the motion in seconds
-        speed_percentage: Speed as percentage (1-100)
-        wait_for_ack: Enable command tracking
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either duration or speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    num_waypoints = len(waypoints)
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    
-    # Format timing
-    if duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    # Format waypoints - flatten each waypoint's 6 values
-    waypoint_strs = []
-    for wp in waypoints:
-        waypoint_strs.extend(map(str, wp))
-    
-    # Build command
-    command_parts = [f"SMOOTH_SPLINE", str(num_waypoints), frame, start_str, timing_str]
-    command_parts.extend(waypoint_strs)
-    command = "|".join(command_parts)
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def smooth_helix(
-    center: List[float],
-    radius: float,
-    pitch: float,
-    height: float,
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    clockwise: bool = False,
-    wait_for_ack: bool = False,
-    timeout: float = 10.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a smooth helical motion.
-    
-    Args:
-        center: [x, y, z] helix center point in mm
-        radius: Helix radius in mm
-        pitch: Vertical distance per revolution in mm
-        height: Total height of helix in mm
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
-                   If None, starts from current position on helix perimeter.
-        duration: Time to complete the helix in seconds
-        speed_percentage: Speed as percentage (1-100)
-        clockwise: Direction of motion
-        wait_for_ack: Enable command tracking
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-    """
-    if duration is None and speed_percentage is None:
-        error = "Error: You must provide either duration or speed_percentage."
-        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
-    
-    center_str = ",".join(map(str, center))
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    clockwise_str = "1" if clockwise else "0"
-    
-    # Format timing
-    if duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    command = f"SMOOTH_HELIX|{center_str}|{radius}|{pitch}|{height}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def smooth_blend(
-    segments: List[Dict],
-    blend_time: float = 0.5,
-    frame: Literal['WRF', 'TRF'] = 'WRF',
-    start_pose: Optional[List[float]] = None,
-    duration: Optional[float] = None,
-    speed_percentage: Optional[float] = None,
-    wait_for_ack: bool = False,
-    timeout: float = 15.0,
-    non_blocking: bool = False
-):
-    """
-    Execute a blended motion through multiple segments.
-    
-    Args:
-        segments: List of segment dictionaries, each containing:
-            - 'type': 'LINE', 'CIRCLE', 'ARC', or 'SPLINE'
-            - Additional parameters based on type
-        blend_time: Time to blend between segments in seconds
-        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
-        start_pose: Optional [x, y, z, rx, ry, rz] start pose for first segment.
-                   If None, starts from current position.
-        duration: Total time for entire motion (scales all segments proportionally)
-        speed_percentage: Speed as percentage (1-100) for entire motion
-        wait_for_ack: Enable command tracking
-        timeout: Timeout for acknowledgment
-        non_blocking: Return immediately with command ID
-        
-    Example:
-        segments = [
-            {'type': 'LINE', 'end': [x,y,z,rx,ry,rz], 'duration': 2.0},
-            {'type': 'CIRCLE', 'center': [x,y,z], 'radius': 50, 'plane': 'XY', 
-             'duration': 3.0, 'clockwise': False},
-            {'type': 'ARC', 'end': [x,y,z,rx,ry,rz], 'center': [x,y,z], 
-             'duration': 2.0, 'clockwise': True}
-        ]
-    """
-    num_segments = len(segments)
-    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
-    
-    # Format timing
-    if duration is None and speed_percentage is None:
-        # Use individual segment durations
-        timing_str = "DEFAULT"
-    elif duration is not None:
-        timing_str = f"DURATION|{duration}"
-    else:
-        timing_str = f"SPEED|{speed_percentage}"
-    
-    # Format segments
-    segment_strs = []
-    for seg in segments:
-        seg_type = seg['type']
-        
-        if seg_type == 'LINE':
-            end_str = ",".join(map(str, seg['end']))
-            seg_str = f"LINE|{end_str}|{seg.get('duration', 2.0)}"
-            
-        elif seg_type == 'CIRCLE':
-            center_str = ",".join(map(str, seg['center']))
-            clockwise_str = "1" if seg.get('clockwise', False) else "0"
-            seg_str = f"CIRCLE|{center_str}|{seg['radius']}|{seg['plane']}|{seg.get('duration', 3.0)}|{clockwise_str}"
-            
-        elif seg_type == 'ARC':
-            end_str = ",".join(map(str, seg['end']))
-            center_str = ",".join(map(str, seg['center']))
-            clockwise_str = "1" if seg.get('clockwise', False) else "0"
-            seg_str = f"ARC|{end_str}|{center_str}|{seg.get('duration', 2.0)}|{clockwise_str}"
-            
-        elif seg_type == 'SPLINE':
-            waypoints_str = ";".join([",".join(map(str, wp)) for wp in seg['waypoints']])
-            seg_str = f"SPLINE|{len(seg['waypoints'])}|{waypoints_str}|{seg.get('duration', 3.0)}"
-            
-        else:
-            continue
-            
-        segment_strs.append(seg_str)
-    
-    # Build command with || separators between segments
-    command = f"SMOOTH_BLEND|{num_segments}|{blend_time}|{frame}|{start_str}|{timing_str}|" + "||".join(segment_strs)
-    
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-# ============================================================================
-# CONVENIENCE FUNCTIONS FOR SMOOTH MOTION CHAINS
-# ============================================================================
-
-def chain_smooth_motions(
-    motions: List[Dict],
-    ensure_continuity: bool = True,
-    frame: Literal['WRF', 'TRF'] = 'WRF',  # ADD THIS
-    wait_for_ack: bool = True,
-    timeout: float = 30.0
-):
-    """
-    Chain multiple smooth motions together with automatic continuity.
-    
-    Args:
-        motions: List of motion dictionaries, each with 'type' and parameters
-        ensure_continuity: If True, automatically sets start_pose of each motion
-                          to end of previous motion for perfect continuity
-        frame: Reference frame for all motions ('WRF' or 'TRF')  # ADD THIS
-        wait_for_ack: Enable command tracking
-        timeout: Timeout per motion
-        
-    Example:
-        chain_smooth_motions([
-            {'type': 'circle', 'center': [200, 0, 200], 'radius': 50, 'duration': 5},
-            {'type': 'arc', 'end_pose': [250, 50, 200, 0, 0, 90], 'center': [225, 25, 200], 'duration': 3},
-            {'type': 'helix', 'center': [250, 50, 150], 'radius': 30, 'pitch': 20, 'height': 100, 'duration': 8}
-        ], frame='TRF')  # Can now specify frame
-    """
-    results = []
-    last_end_pose = None
-    
-    for i, motion in enumerate(motions):
-        motion_type = motion.get('type', '').lower()
-        
-        # Add frame to motion parameters
-        motion['frame'] = frame
-        
-        # Add start_pose from previous motion if ensuring continuity
-        if ensure_continuity and last_end_pose and i > 0:
-            motion['start_pose'] = last_end_pose
-        
-        # Execute the appropriate motion (add frame parameter to each call)
-        if motion_type == 'circle':
-            result = smooth_circle(**{k: v for k, v in motion.items() if k != 'type'}, 
-                                  wait_for_ack=wait_for_ack, timeout=timeout)
-            last_end_pose = None  # Circles return to start
-            
-        elif motion_type == 'arc' or motion_type == 'arc_center':
-            result = smooth_arc_center(**{k: v for k, v in motion.items() if k != 'type'},
-                                      wait_for_ack=wait_for_ack, timeout=timeout)
-            last_end_pose = motion.get('end_pose')
-            
-        elif motion_type == 'arc_param' or motion_type == 'arc_parametric':
-            result = smooth_arc_parametric(**{k: v for k, v in motion.items() if k != 'type'},
-                                          wait_for_ack=wait_for_ack, timeout=timeout)
-            last_end_pose = motion.get('end_pose')
-            
-        elif motion_type == 'spline':
-            result = smooth_spline(**{k: v for k, v in motion.items() if k != 'type'},
-                                  wait_for_ack=wait_for_ack, timeout=timeout)
-            waypoints = motion.get('waypoints', [])
-            last_end_pose = waypoints[-1] if waypoints else None
-            
-        elif motion_type == 'helix':
-            result = smooth_helix(**{k: v for k, v in motion.items() if k != 'type'},
-                                 wait_for_ack=wait_for_ack, timeout=timeout)
-            last_end_pose = None
-            
-        else:
-            result = {'status': 'INVALID', 'details': f'Unknown motion type: {motion_type}'}
-        
-        results.append(result)
-        
-        # Check for failures if tracking
-        if wait_for_ack and isinstance(result, dict) and result.get('status') == 'FAILED':
-            logger.error(f"Motion {i+1} failed: {result.get('details')}")
-            break
-    
-    return results
-
-# ============================================================================
-# BASIC FUNCTIONS
-# ============================================================================
-
-def delay_robot(duration: float, wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
-    """Delay - optional tracking"""
-    command = f"DELAY|{duration}"
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def home_robot(wait_for_ack: bool = False, timeout: float = 30.0, non_blocking: bool = False):
-    """Home robot - optional tracking (longer timeout for homing)"""
-    command = "HOME"
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def stop_robot_movement(wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
-    """Stop robot - optional tracking"""
-    command = "STOP"
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-# ============================================================================
-# GET FUNCTIONS - ZERO OVERHEAD, IMMEDIATE RESPONSE
-# ============================================================================
-
-def get_robot_pose():
-    """
-    Get the robot's current end-effector pose.
-    Returns [x, y, z, roll, pitch, yaw] or None if it fails.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_POSE"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(2048)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'POSE' and len(parts) == 2:
-                pose_values = [float(v) for v in parts[1].split(',')]
-                if len(pose_values) == 16:
-                    # Convert 4x4 matrix to [x,y,z,r,p,y]
-                    import numpy as np
-                    from spatialmath import SE3
-                    
-                    pose_matrix = np.array(pose_values).reshape((4, 4))
-                    T = SE3(pose_matrix, check=False)
-                    xyz_mm = T.t * 1000  # Convert to mm
-                    rpy_deg = T.rpy(unit='deg', order='xyz')
-                    
-                    # Convert numpy float64 to regular Python floats
-                    return [float(x) for x in xyz_mm] + [float(r) for r in rpy_deg]
-            
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for pose response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting robot pose: {e}")
-        return None
-
-def get_robot_joint_angles():
-    """
-    Get the robot's current joint angles in degrees.
-    Returns list of 6 angles or None if it fails.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_ANGLES"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'ANGLES' and len(parts) == 2:
-                angles = [float(v) for v in parts[1].split(',')]
-                # Reverse J2 backlash compensation for display
-                return reverse_j2_backlash(angles)
-
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for angles response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting robot angles: {e}")
-        return None
-
-def get_robot_io(verbose = False):
-    """
-    Get the robot's current digital I/O status.
-    Returns [IN1, IN2, OUT1, OUT2, ESTOP] or None if it fails.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_IO"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'IO' and len(parts) == 2:
-                io_values = [int(v) for v in parts[1].split(',')]
-
-                if verbose:
-                    logger.info("--- I/O Status ---")
-                    logger.info(f"  IN1:   {io_values[0]} | {'ON' if io_values[0] else 'OFF'}")
-                    logger.info(f"  IN2:   {io_values[1]} | {'ON' if io_values[1] else 'OFF'}")
-                    logger.info(f"  OUT1:  {io_values[2]} | {'ON' if io_values[2] else 'OFF'}")
-                    logger.info(f"  OUT2:  {io_values[3]} | {'ON' if io_values[3] else 'OFF'}")
-                    # More intuitive E-stop display
-                    if io_values[4] == 0:
-                        logger.info(f"  ESTOP: {io_values[4]} | PRESSED (Emergency Stop Active!)")
-                    else:
-                        logger.info(f"  ESTOP: {io_values[4]} | OK (Normal Operation)")
-                    logger.info("--------------------------")
-
-                return io_values
-            
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for I/O response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting robot I/O: {e}")
-        return None
-
-def get_electric_gripper_status(verbose = False):
-    """
-    Get the electric gripper's current status.
-    Returns [ID, Position, Speed, Current, StatusByte, ObjectDetected] or None.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_GRIPPER"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'GRIPPER' and len(parts) == 2:
-                gripper_values = [int(v) for v in parts[1].split(',')]
-                
-                # Decode the status byte
-                status_byte = gripper_values[4] if len(gripper_values) > 4 else 0
-                is_active = (status_byte & 0b00000001) != 0
-                is_moving = (status_byte & 0b00000010) != 0
-                is_calibrated = (status_byte & 0b10000000) != 0
-                
-                # Interpret object detection
-                object_detection = gripper_values[5] if len(gripper_values) > 5 else 0
-                if object_detection == 1:
-                    detection_text = "Yes (closing)"
-                elif object_detection == 2:
-                    detection_text = "Yes (opening)"
-                else:
-                    detection_text = "No"
-
-
-                if verbose:
-                    # Print formatted status
-                    logger.info("--- Electric Gripper Status ---")
-                    logger.info(f"  Device ID:         {gripper_values[0]}")
-                    logger.info(f"  Current Position:  {gripper_values[1]}")
-                    logger.info(f"  Current Speed:     {gripper_values[2]}")
-                    logger.info(f"  Current Current:   {gripper_values[3]}")
-                    logger.info(f"  Object Detected:   {detection_text}")
-                    logger.info(f"  Status Byte:       {bin(status_byte)}")
-                    logger.info(f"    - Calibrated:    {is_calibrated}")
-                    logger.info(f"    - Active:        {is_active}")
-                    logger.info(f"    - Moving:        {is_moving}")
-                    logger.info("-------------------------------")
-                
-                return gripper_values
-            
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for gripper response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting gripper status: {e}")
-        return None
-
-def get_robot_joint_speeds():
-    """
-    Get the robot's current joint speeds in steps/sec.
-    Returns list of 6 speed values or None if it fails.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_SPEEDS"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'SPEEDS' and len(parts) == 2:
-                speeds = [float(v) for v in parts[1].split(',')]
-                return speeds
-            
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for speeds response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting robot speeds: {e}")
-        return None
-
-def get_robot_pose_matrix():
-    """
-    Get the robot's current pose as a 4x4 transformation matrix.
-    Returns 4x4 numpy array or None if it fails.
-    
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-            
-            request_message = "GET_POSE"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-            
-            data, _ = client_socket.recvfrom(2048)
-            response_str = data.decode('utf-8')
-            
-            parts = response_str.split('|')
-            if parts[0] == 'POSE' and len(parts) == 2:
-                pose_values = [float(v) for v in parts[1].split(',')]
-                if len(pose_values) == 16:
-                    import numpy as np
-                    return np.array(pose_values).reshape((4, 4))
-            
-            return None
-            
-    except socket.timeout:
-        logger.error("Timeout waiting for pose response")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting robot pose matrix: {e}")
-        return None
-
-def is_robot_stopped(threshold_speed: float = 2.0) -> bool:
-    """
-    Check if the robot has stopped moving.
-    
-    Args:
-        threshold_speed: Speed threshold in steps/sec
-        
-    Returns:
-        True if all joints below threshold, False otherwise
-        
-    Resource usage: ZERO overhead - simple request/response
-    """
-    speeds = get_robot_joint_speeds()
-    if not speeds:
-        return False
-    
-    max_speed = max(abs(s) for s in speeds)
-    return max_speed < threshold_speed
-
-def is_estop_pressed() -> bool:
-    """
-    Check if the physical E-stop button is currently pressed.
-
-    Returns:
-        True if E-stop button is pressed, False otherwise
-
-    Resource usage: ZERO overhead - simple request/response
-    """
-    io_status = get_robot_io()
-    if io_status and len(io_status) >= 5:
-        return io_status[4] == 0  # E-stop is at index 4, 0 means pressed
-    return False
-
-def get_software_estop_status() -> bool:
-    """
-    Get the software E-stop flag status (the flag that blocks motion).
-    This is different from the physical button - the software flag remains
-    active until explicitly cleared, even after the physical button is released.
-
-    Returns:
-        True if software E-stop is active (blocking motion), False otherwise
-
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-
-            request_message = "GET_ESTOP_STATUS"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-
-            parts = response_str.split('|')
-            if parts[0] == 'ESTOP_STATUS' and len(parts) == 2:
-                return parts[1] == "1"  # "1" means active, "0" means cleared
-
-    except Exception as e:
-        pass
-
-    return False  # Default to not active if query fails
-
-def clear_estop(wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
-    """
-    Clear the software E-stop flag to re-enable robot motion.
-
-    Args:
-        wait_for_ack: Whether to wait for acknowledgment
-        timeout: Timeout for acknowledgment in seconds
-        non_blocking: Return command_id immediately if True
-
-    Resource usage: ZERO overhead if wait_for_ack=False
-    """
-    command = "CLEAR_ESTOP"
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-def set_performance_recording(enabled: bool, wait_for_ack: bool = False, timeout: float = 5.0, non_blocking: bool = False):
-    """
-    Arm or disarm performance and motion recording.
-
-    When armed, recording auto-starts when first command begins executing
-    and auto-stops when command queue is empty. Both performance and motion
-    data are captured with shared session names.
-
-    Args:
-        enabled: True to arm recording, False to disarm (and stop if active)
-        wait_for_ack: Whether to wait for acknowledgment
-        timeout: Timeout for acknowledgment in seconds
-        non_blocking: Return command_id immediately if True
-
-    Resource usage: ZERO overhead if wait_for_ack=False
-    """
-    value = '1' if enabled else '0'
-    command = f"ARM_RECORDING|{value}"
-
-    if wait_for_ack:
-        return send_and_wait(command, timeout, non_blocking)
-    else:
-        return send_robot_command(command)
-
-# ============================================================================
-# MOTION RECORDING FUNCTIONS
-# ============================================================================
-
-def start_motion_recording(name: str = None, wait_for_ack: bool = True, timeout: float = 5.0):
-    """
-    Start motion comparison recording in the commander.
-
-    Args:
-        name: Optional recording name (auto-generated if not provided)
-        wait_for_ack: Whether to wait for acknowledgment
-        timeout: Timeout for acknowledgment in seconds
-
-    Returns:
-        Dict with status and details
-    """
-    command = f"START_MOTION_RECORDING|{name or ''}"
-    if wait_for_ack:
-        return send_and_wait(command, timeout)
-    else:
-        return send_robot_command(command)
-
-
-def stop_motion_recording(wait_for_ack: bool = True, timeout: float = 10.0):
-    """
-    Stop motion comparison recording and get the recorded data.
-
-    Args:
-        wait_for_ack: Whether to wait for acknowledgment (should be True to get data)
-        timeout: Timeout for acknowledgment in seconds (longer to allow data transfer)
-
-    Returns:
-        Dict with status and recording data in details field
-    """
-    command = "STOP_MOTION_RECORDING"
-    if wait_for_ack:
-        return send_and_wait(command, timeout)
-    else:
-        return send_robot_command(command)
-
-
-def get_motion_recording_status(wait_for_ack: bool = True, timeout: float = 2.0):
-    """
-    Get current motion recording status.
-
-    Returns:
-        Dict with is_recording (bool) and sample_count (int)
-    """
-    command = "GET_MOTION_RECORDING_STATUS"
-    if wait_for_ack:
-        result = send_and_wait(command, timeout)
-        if result and result.get('success') and result.get('details'):
-            parts = result['details'].split('|')
-            return {
-                'is_recording': parts[0] == '1' if len(parts) > 0 else False,
-                'sample_count': int(parts[1]) if len(parts) > 1 else 0
-            }
-        return {'is_recording': False, 'sample_count': 0}
-    else:
-        return send_robot_command(command)
-
-
-def get_homed_status():
-    """
-    Get the homing status for all 6 joints.
-
-    Returns:
-        List of 6 boolean values (True=homed, False=not homed) or None if it fails
-
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-
-            request_message = "GET_HOMED"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-
-            parts = response_str.split('|')
-            if parts[0] == 'HOMED' and len(parts) == 2:
-                homed_values = [int(v) == 1 for v in parts[1].split(',')]
-                return homed_values
-
-    except Exception as e:
-        pass
-
-    return None
-
-def get_commander_hz():
-    """
-    Get the current control loop frequency in Hz.
-
-    Returns:
-        Float representing current Hz (e.g., 99.5) or None if it fails
-
-    Resource usage: ZERO overhead - simple request/response
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
-            client_socket.settimeout(2.0)
-
-            request_message = "GET_HZ"
-            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
-
-            data, _ = client_socket.recvfrom(1024)
-            response_str = data.decode('utf-8')
-
-            parts = response_str.split('|')
-            if parts[0] == 'HZ' and len(parts) == 2:
-                return float(parts[1])
-
-    except Exception as e:
-        pass
-
-    return None
-
-def get_robot_status() -> Dict:
-    """
-    Get comprehensive robot status in one call.
-    
-    Returns:
-        Dictionary with pose, angles, speeds, IO, gripper status
-        
-    Resource usage: Multiple requests but still zero overhead
-    """
-    return {
-        'pose': get_robot_pose(),
-        'angles': get_robot_joint_angles(),
-        'speeds': get_robot_joint_speeds(),
-        'io': get_robot_io(),
-        'gripper': get_electric_gripper_status(),
-        'stopped': is_robot_stopped(),
-        'estop': is_estop_pressed()
-    }
-
-# ============================================================================
-# TRACKING FUNCTIONS - ONLY FOR EXPLICIT USE
-# ============================================================================
-
-def check_command_status(command_id: str) -> Optional[Dict]:
-    """
-    Check status - returns None if tracker not initialized.
-    Does NOT initialize tracker (read-only).
-    """
-    if _command_tracker and _command_tracker.is_active():
-        return _command_tracker.get_status(command_id)
-    return None
-
-def is_tracking_active() -> bool:
-    """
-    Check if tracking is active.
-    Returns False if never used (zero overhead check).
-    """
-    return _command_tracker is not None and _command_tracker.is_active()
-
-def get_tracking_stats() -> Dict:
-    """
-    Get resource usage statistics.
-    """
-    if _command_tracker and _command_tracker.is_active():
-        with _command_tracker.lock:
-            return {
-                'active': True,
-                'commands_tracked': len(_command_tracker.command_history),
-                'memory_bytes': len(str(_command_tracker.command_history)),
-                'thread_active': _command_tracker._thread.is_alive() if _command_tracker._thread else False
-            }
-    else:
-        return {
-            'active': False,
-            'commands_tracked': 0,
-            'memory_bytes': 0,
-            'thread_active': False
-        }
-
-# ============================================================================
-# CONVENIENCE FUNCTIONS FOR COMMON OPERATIONS
-# ============================================================================
-
-def wait_for_robot_stopped(timeout: float = 10.0, poll_rate: float = 0.1) -> bool:
-    """
-    Wait for the robot to stop moving.
-    
-    Args:
-        timeout: Maximum time to wait in seconds
-        poll_rate: How often to check in seconds
-        
-    Returns:
-        True if robot stopped, False if timeout
-    """
-    import time
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        if is_robot_stopped():
-            return True
-        time.sleep(poll_rate)
-    
-    return False
-
-def safe_move_with_retry(
-    move_func,
-    *args,
-    max_retries: int = 3,
-    retry_delay: float = 1.0,
-    **kwargs
-):
-    """
-    Execute a move command with automatic retry on failure.
-    
-    Args:
-        move_func: The movement function to call
-        *args: Arguments for the movement function
-        max_retries: Maximum number of retry attempts
-        retry_delay: Delay between retries in seconds
-        **kwargs: Keyword arguments for the movement function
-        
-    Returns:
-        Result from the movement function or error dict
-    """
-    import time
-    
-    # Ensure tracking is enabled for retry logic
-    kwargs['wait_for_ack'] = True
-    
-    for attempt in range(max_retries):
-        result = move_func(*args, **kwargs)
-        
-        if isinstance(result, dict):
-            if result.get('status') in ['COMPLETED', 'QUEUED', 'EXECUTING']:
-                return result
-            elif result.get('status') in ['FAILED', 'TIMEOUT', 'CANCELLED']:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Attempt {attempt + 1} failed: {result.get('details', 'Unknown error')}")
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error(f"All {max_retries} attempts failed")
-                    return result
-        else:
-            # Non-tracked response, assume success
-            return result
-    
+"""
+Zero-Overhead Robot API with Optional Acknowledgments
+======================================================
+This version guarantees ZERO resource overhead when tracking is not used.
+The tracking system is only initialized when explicitly requested.
+"""
+
+import socket
+import os
+from typing import List, Optional, Literal, Dict, Tuple, Union
+import time
+import threading
+import queue
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+import logging
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Global configuration - can be overridden by environment variables
+# COMMANDER_HOST: IP/hostname where commander is listening (default: 127.0.0.1)
+# COMMANDER_PORT: UDP port for commander commands (default: 5001)
+SERVER_IP = os.environ.get("COMMANDER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("COMMANDER_PORT", "5001"))
+
+# Reliable delivery for tracked commands: a tracked datagram is retransmitted
+# (same ID and sequence number) with exponential backoff until the commander
+# acknowledges it. The commander drops duplicates by command ID.
+RETRANSMIT_INITIAL_S = 0.1   # First retransmit after 100ms without an ACK
+RETRANSMIT_BACKOFF = 2.0     # Interval multiplier per attempt
+RETRANSMIT_MAX_INTERVAL_S = 1.0
+RETRANSMIT_MAX_ATTEMPTS = 8  # Total sends, including the first
+
+# Global tracker - starts as None (no resources)
+_command_tracker = None
+_tracker_lock = threading.Lock()
+
+# ============================================================================
+# J2 BACKLASH COMPENSATION
+# ============================================================================
+
+# Load J2 backlash offset from config at startup (requires API restart to change)
+def _load_j2_backlash_offset() -> float:
+    """Load J2 backlash offset from config.yaml, default to 6.0 degrees."""
+    try:
+        from utils.config_loader import get_config
+        config = get_config()
+        return float(config.get('robot', {}).get('j2_backlash_offset', 6.0))
+    except Exception as e:
+        logger.warning(f"Failed to load J2 backlash offset from config: {e}, using default 6.0")
+        return 6.0
+
+J2_BACKLASH_OFFSET = _load_j2_backlash_offset()
+
+def _get_j2_backlash_offset(j2_deg: float) -> float:
+    """
+    Calculate backlash offset for J2 based on angle.
+    Returns offset in degrees (negative value).
+    """
+    if -100 <= j2_deg <= -3:
+        if j2_deg >= -90:
+            # Full offset in the main working range
+            return -J2_BACKLASH_OFFSET
+        else:
+            # Linear taper: full offset at -90°, 0° at -100°
+            t = (j2_deg + 100) / 10.0  # 0 at -100, 1 at -90
+            return -J2_BACKLASH_OFFSET * t
+    return 0.0
+
+
+def apply_j2_backlash(joint_angles: List[float]) -> List[float]:
+    """
+    Apply backlash compensation to J2 (for outgoing commands).
+    -6 deg offset from -3° to -90°, tapering to 0 at -100°.
+
+    Returns a new list with compensated angles (does not modify input).
+    """
+    result = list(joint_angles)  # Copy to avoid modifying input
+    result[1] += _get_j2_backlash_offset(result[1])
+    return result
+
+
+def reverse_j2_backlash(joint_angles: List[float]) -> List[float]:
+    """
+    Reverse backlash compensation from J2 (for incoming feedback).
+    The robot reports the compensated position, we need to show the original.
+
+    If we commanded X and robot went to X-offset, robot reports X-offset.
+    We need to return X, so we add offset back.
+
+    Returns a new list with original angles (does not modify input).
+    """
+    result = list(joint_angles)  # Copy to avoid modifying input
+    j2_deg = result[1]
+    offset = J2_BACKLASH_OFFSET
+
+    # The compensated range is -(100+offset) to -(3+offset) (original -100 to -3 minus up to offset)
+    # We need to figure out the original angle and its offset
+    lower_bound = -100 - offset  # e.g., -106 for offset=6
+    upper_bound = -3 - offset    # e.g., -9 for offset=6
+    taper_threshold = -90 - offset  # e.g., -96 for offset=6
+
+    if lower_bound <= j2_deg <= upper_bound:
+        if j2_deg >= taper_threshold:
+            # Was in full offset zone (-3 to -90 -> -(3+offset) to -(90+offset))
+            result[1] += offset
+        else:
+            # Was in taper zone (-90 to -100 -> -(90+offset) to -(100+offset))
+            # Compensated = original + offset_applied, where offset_applied = -offset * (original + 100) / 10
+            # So: compensated = original - offset * (original + 100) / 10
+            # compensated = original * (1 - offset/10) - 10*offset
+            # original = (compensated + 10*offset) / (1 - offset/10)
+            divisor = 1 - offset / 10.0
+            result[1] = (j2_deg + 10 * offset) / divisor
+
+    return result
+
+# ============================================================================
+# ORIGINAL SEND FUNCTION - ZERO OVERHEAD
+# ============================================================================
+
+def send_robot_command(command_string: str):
+    """
+    Original send function - NO TRACKING, NO OVERHEAD.
+    This is what gets called for all backward-compatible operations.
+    
+    Resource usage:
+    - No threads
+    - No extra sockets
+    - No memory allocation
+    - Exactly the same as your original implementation
+    """
+    if _collect_batched(command_string):
+        return f"Command batched: '{command_string[:50]}...'"
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(command_string.encode('utf-8'), (SERVER_IP, SERVER_PORT))
+        return f"Successfully sent command: '{command_string[:50]}...'"
+    except Exception as e:
+        return f"Error sending command: {e}"
+
+# ============================================================================
+# TRACKING SYSTEM - ONLY LOADED WHEN NEEDED
+# ============================================================================
+
+class LazyCommandTracker:
+    """
+    Command tracker with lazy initialization.
+    Resources are ONLY allocated when tracking is actually used.
+    """
+    
+    def __init__(self, listen_port=5002, history_size=100):
+        self.listen_port = listen_port
+        self.history_size = history_size
+        self.command_history = {}
+        self.lock = threading.Lock()
+        
+        # Lazy initialization flags
+        self._initialized = False
+        self._thread = None
+        self._socket = None
+        self._send_socket = None
+        self._running = False
+
+        # Monotonic sequence number stamped on every tracked datagram
+        self._sequence = 0
+        self.retransmits = 0
+    
+    def _lazy_init(self):
+        """
+        Initialize resources only when first tracking is requested.
+        This is called ONLY when someone uses tracking features.
+        """
+        if self._initialized:
+            return True
+            
+        try:
+            logger.info("[Tracker] First tracking request - initializing resources...")
+            
+            # Create socket
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.bind(('', self.listen_port))
+            self._socket.settimeout(0.05)
+
+            # Single send socket so the commander sees a stable sender address
+            self._send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            
+            # Start thread
+            self._running = True
+            self._thread = threading.Thread(target=self._listen_loop, daemon=True)
+            self._thread.start()
+            
+            self._initialized = True
+            logger.info(f"[Tracker] Initialized on port {self.listen_port}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"[Tracker] Failed to initialize: {e}")
+            self._cleanup()
+            return False
+    
+    def _cleanup(self):
+        """Clean up resources"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=0.5)
+            self._thread = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+        if self._send_socket:
+            self._send_socket.close()
+            self._send_socket = None
+        self._initialized = False
+    
+    def _listen_loop(self):
+        """Listener thread - only runs if tracking is used"""
+        while self._running:
+            try:
+                data, addr = self._socket.recvfrom(65535)
+                message = data.decode('utf-8')
+                
+                # The commander coalesces all ACKs of a control cycle into
+                # one datagram, one ACK per line
+                for line in message.split('\n'):
+                    parts = line.split('|', 3)
+                    if parts[0] != 'ACK' or len(parts) < 3:
+                        continue
+                    cmd_id = parts[1]
+                    status = parts[2]
+                    details = parts[3] if len(parts) > 3 else ""
+                    
+                    with self.lock:
+                        if cmd_id in self.command_history:
+                            entry = self.command_history[cmd_id]
+                            entry.update({
+                                'status': status,
+                                'details': details,
+                                'ack_time': datetime.now(),
+                                'completed': status in ['COMPLETED', 'FAILED', 'INVALID', 'CANCELLED']
+                            })
+                            if 'items' in entry:
+                                self._apply_batch_ack(entry, status, details)
+                
+                # Clean old entries (only if we have many)
+                if len(self.command_history) > self.history_size:
+                    self._cleanup_old_entries()
+                        
+            except socket.timeout:
+                pass
+            except Exception:
+                if self._running:
+                    pass  # Silently continue
+
+            if self._running:
+                self._retransmit_pending()
+
+    def _apply_batch_ack(self, entry: Dict, status: str, details: str):
+        """
+        Propagate the aggregated batch ACK to its items (caller holds lock).
+        A batch is settled by its first ACK; items then follow their own ACKs.
+        """
+        entry['completed'] = True
+        for item_id in entry['items']:
+            item = self.command_history.get(item_id)
+            if not item or item['status'] != 'SENT':
+                continue
+            item['status'] = status
+            item['ack_time'] = entry['ack_time']
+            if status != 'QUEUED':
+                # INVALID/REJECTED: nothing from the batch was queued
+                item['details'] = details
+                item['completed'] = True
+
+    def _retransmit_pending(self):
+        """Resend tracked commands that have not been acknowledged yet"""
+        now = time.time()
+        due = []
+        with self.lock:
+            for cmd_id, info in self.command_history.items():
+                if info['status'] != 'SENT' or 'wire' not in info:
+                    continue
+                if info['attempts'] >= RETRANSMIT_MAX_ATTEMPTS or now < info['next_retry']:
+                    continue
+                info['attempts'] += 1
+                info['retry_interval'] = min(info['retry_interval'] * RETRANSMIT_BACKOFF,
+                                             RETRANSMIT_MAX_INTERVAL_S)
+                info['next_retry'] = now + info['retry_interval']
+                due.append((cmd_id, info['wire'], info['attempts']))
+
+        for cmd_id, wire, attempts in due:
+            logger.debug(f"[Tracker] Retransmitting {cmd_id} (attempt {attempts}/{RETRANSMIT_MAX_ATTEMPTS})")
+            self.retransmits += 1
+            try:
+                self._send_socket.sendto(wire.encode('utf-8'), (SERVER_IP, SERVER_PORT))
+            except Exception:
+                pass  # Next attempt (or the caller's timeout) handles it
+    
+    def _cleanup_old_entries(self):
+        """Remove old entries to prevent memory growth"""
+        with self.lock:
+            now = datetime.now()
+            expired = [cmd_id for cmd_id, info in self.command_history.items()
+                      if now - info['sent_time'] > timedelta(seconds=30)]
+            for cmd_id in expired:
+                del self.command_history[cmd_id]
+    
+    def track_command(self, command: str) -> Tuple[str, str]:
+        """
+        Track a command - initializes tracker if needed.
+        Returns (modified_command, cmd_id)
+        """
+        # Initialize on first use
+        if not self._initialized:
+            if not self._lazy_init():
+                # Initialization failed - fall back to non-tracking
+                return command, None
+        
+        # Generate ID and modify command
+        cmd_id = str(uuid.uuid4())[:8]
+        
+        # Register in history
+        with self.lock:
+            self._sequence += 1
+            tracked_command = f"[{cmd_id}#{self._sequence}]{command}"
+            self.command_history[cmd_id] = {
+                'command': command,
+                'sent_time': datetime.now(),
+                'status': 'SENT',
+                'details': '',
+                'completed': False,
+                'seq': self._sequence,
+                'wire': tracked_command,
+                'attempts': 0,
+                'retry_interval': RETRANSMIT_INITIAL_S / RETRANSMIT_BACKOFF,
+                'next_retry': float('inf')
+            }
+        
+        return tracked_command, cmd_id
+
+    def track_batch(self, commands: List[str]) -> Tuple[Optional[str], List[str]]:
+        """
+        Track a BATCH envelope - initializes tracker if needed.
+        Returns (batch_id, item_ids); only the envelope is retransmitted.
+        """
+        if not self._initialized:
+            if not self._lazy_init():
+                return None, []
+
+        batch_id = str(uuid.uuid4())[:8]
+        item_ids = [str(uuid.uuid4())[:8] for _ in commands]
+        items_str = "\n".join(f"[{item_id}]{command}" for item_id, command in zip(item_ids, commands))
+        now = datetime.now()
+
+        with self.lock:
+            self._sequence += 1
+            for item_id, command in zip(item_ids, commands):
+                self.command_history[item_id] = {
+                    'command': command,
+                    'sent_time': now,
+                    'status': 'SENT',
+                    'details': '',
+                    'completed': False,
+                    'batch_id': batch_id
+                }
+            self.command_history[batch_id] = {
+                'command': f"BATCH|{len(commands)}",
+                'sent_time': now,
+                'status': 'SENT',
+                'details': '',
+                'completed': False,
+                'seq': self._sequence,
+                'wire': f"[{batch_id}#{self._sequence}]BATCH|{len(commands)}\n{items_str}",
+                'items': item_ids,
+                'attempts': 0,
+                'retry_interval': RETRANSMIT_INITIAL_S / RETRANSMIT_BACKOFF,
+                'next_retry': float('inf')
+            }
+
+        return batch_id, item_ids
+
+    def send(self, cmd_id: str):
+        """
+        Transmit a tracked command and arm its retransmit timer.
+        Retransmits stop as soon as any ACK (QUEUED or later) arrives.
+        """
+        with self.lock:
+            info = self.command_history[cmd_id]
+            info['attempts'] = 1
+            info['retry_interval'] = RETRANSMIT_INITIAL_S
+            info['next_retry'] = time.time() + RETRANSMIT_INITIAL_S
+            wire = info['wire']
+        self._send_socket.sendto(wire.encode('utf-8'), (SERVER_IP, SERVER_PORT))
+    
+    # Retransmit bookkeeping, not part of the reported status
+    _INTERNAL_KEYS = ('wire', 'attempts', 'retry_interval', 'next_retry')
+
+    def get_status(self, cmd_id: str) -> Optional[Dict]:
+        """Get status if tracker is initialized"""
+        if not self._initialized:
+            return None
+        with self.lock:
+            entry = self.command_history.get(cmd_id, None)
+            if entry is None:
+                return None
+            return {k: v for k, v in entry.items() if k not in self._INTERNAL_KEYS}
+    
+    def wait_for_completion(self, cmd_id: str, timeout: float = 5.0) -> Dict:
+        """Wait for completion if tracker is initialized"""
+        if not self._initialized:
+            return {'status': 'NO_TRACKING', 'details': 'Tracker not initialized', 'completed': True}
+            
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            status = self.get_status(cmd_id)
+            if status and status['completed']:
+                return status
+            time.sleep(0.01)
+        
+        return self.get_status(cmd_id) or {
+            'status': 'TIMEOUT',
+            'details': 'No acknowledgment received',
+            'completed': True
+        }
+    
+    def is_active(self) -> bool:
+        """Check if tracker is initialized and running"""
+        return self._initialized and self._running
+
+# ============================================================================
+# LAZY TRACKER ACCESS
+# ============================================================================
+
+def _get_tracker_if_needed() -> Optional[LazyCommandTracker]:
+    """
+    Get tracker ONLY if tracking is requested.
+    This ensures zero overhead for non-tracking operations.
+    """
+    global _command_tracker, _tracker_lock
+    
+    # Fast path - tracker already exists
+    if _command_tracker is not None:
+        return _command_tracker
+    
+    # Slow path - create tracker (only happens once)
+    with _tracker_lock:
+        if _command_tracker is None:
+            _command_tracker = LazyCommandTracker()
+        return _command_tracker
+
+# ============================================================================
+# ENHANCED SEND WITH OPTIONAL TRACKING
+# ============================================================================
+
+def send_robot_command_tracked(command_string: str) -> Tuple[str, Optional[str]]:
+    """
+    Send with tracking - initializes tracker on first use.
+    
+    Resource impact:
+    - First call: Starts tracker thread
+    - Subsequent calls: Minimal overhead (UUID generation)
+    """
+    tracker = _get_tracker_if_needed()
+    if tracker:
+        tracked_cmd, cmd_id = tracker.track_command(command_string)
+        if cmd_id:
+            # Send tracked command (retransmitted by the tracker until ACKed)
+            try:
+                tracker.send(cmd_id)
+                return f"Command sent with tracking (ID: {cmd_id})", cmd_id
+            except Exception as e:
+                return f"Error: {e}", None
+    
+    # Fall back to non-tracked
+    return send_robot_command(command_string), None
+
+def send_and_wait(
+    command_string: str, 
+    timeout: float = 2.0, 
+    non_blocking: bool = False
+    ) -> Union[Dict, str, None]:
+    """
+    Send and wait for acknowledgment OR return a command_id immediately.
+    First use initializes tracker.
+    """
+    if _collect_batched(command_string):
+        return {'status': 'BATCHED', 'details': 'Captured by CommandBatch/CommandPipeline',
+                'completed': False, 'command_id': None}
+
+    result, cmd_id = send_robot_command_tracked(command_string)
+    
+    if cmd_id:
+        # If non_blocking is True, return the ID right away
+        if non_blocking:
+            return cmd_id
+            
+        # Otherwise, proceed with the original blocking logic
+        tracker = _get_tracker_if_needed()
+        if tracker:
+            status_dict = tracker.wait_for_completion(cmd_id, timeout)
+            # Add the command_id to the returned dictionary
+            status_dict['command_id'] = cmd_id
+            return status_dict
+    
+    # Handle cases where a command_id could not be generated
+    if non_blocking:
+        return None
+    else:
+        return {'status': 'NO_TRACKING', 'details': result, 'completed': True, 'command_id': None}
+
+# ============================================================================
+# BATCH SUBMISSION - N COMMANDS IN ONE DATAGRAM
+# ============================================================================
+
+# Thread-local collector used by CommandBatch / CommandPipeline to capture
+# commands built by the regular helper functions instead of sending them
+# one by one (anything with an append(command_string) method)
+_batch_local = threading.local()
+
+
+def _collect_batched(command_string: str) -> bool:
+    """Append command to the active CommandBatch (if any). Returns True if captured."""
+    commands = getattr(_batch_local, 'commands', None)
+    if commands is None:
+        return False
+    commands.append(command_string)
+    return True
+
+
+def send_batch(
+    commands: List[str],
+    wait_for_ack: bool = True,
+    timeout: float = 5.0,
+    non_blocking: bool = False
+) -> Union[Dict, str, None]:
+    """
+    Send several commands in one BATCH datagram.
+
+    The commander queues all of them or none (INVALID/REJECTED), answers with
+    one aggregated ACK, then reports EXECUTING/COMPLETED per item.
+
+    Args:
+        commands: Command strings (e.g. "MOVEJOINT|..."), in execution order
+        wait_for_ack: Track the batch and its items
+        timeout: Timeout for the aggregated ACK
+        non_blocking: Return {'command_id', 'item_ids'} immediately
+
+    Returns:
+        Status dict with 'command_id' (batch) and 'item_ids' (per command);
+        poll items with check_command_status(item_id)
+
+    Example:
+        result = send_batch(["MOVEJOINT|0|-90|180|0|0|180|2.0|None", "DELAY|0.5"])
+        if result['status'] == 'QUEUED':
+            for item_id in result['item_ids']:
+                ...
+    """
+    if not commands:
+        error = "Error: Batch is empty."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+
+    envelope = f"BATCH|{len(commands)}\n" + "\n".join(commands)
+
+    if not wait_for_ack:
+        return send_robot_command(envelope)
+
+    tracker = _get_tracker_if_needed()
+    batch_id, item_ids = tracker.track_batch(commands) if tracker else (None, [])
+    if not batch_id:
+        return {'status': 'NO_TRACKING', 'details': send_robot_command(envelope),
+                'completed': True, 'command_id': None, 'item_ids': []}
+
+    try:
+        tracker.send(batch_id)
+    except Exception as e:
+        return {'status': 'FAILED', 'details': f"Error: {e}", 'completed': True,
+                'command_id': batch_id, 'item_ids': item_ids}
+
+    if non_blocking:
+        return {'command_id': batch_id, 'item_ids': item_ids}
+
+    status_dict = dict(tracker.wait_for_completion(batch_id, timeout))
+    status_dict['command_id'] = batch_id
+    status_dict['item_ids'] = item_ids
+    return status_dict
+
+
+class CommandBatch:
+    """
+    Context manager that captures commands from the regular helpers and
+    submits them as one BATCH on exit.
+
+    Helper calls inside the block return immediately with status 'BATCHED'.
+
+    Example:
+        with CommandBatch(timeout=5.0) as batch:
+            move_robot_joints([0, -90, 180, 0, 0, 180], duration=2.0)
+            delay_robot(0.5)
+            smooth_circle([200, 0, 200], 50, duration=5.0)
+        print(batch.result['status'], batch.result['item_ids'])
+    """
+
+    def __init__(self, wait_for_ack: bool = True, timeout: float = 5.0):
+        self.wait_for_ack = wait_for_ack
+        self.timeout = timeout
+        self.commands: List[str] = []
+        self.result = None
+
+    def __enter__(self):
+        if getattr(_batch_local, 'commands', None) is not None:
+            raise RuntimeError("CommandBatch blocks cannot be nested")
+        _batch_local.commands = self.commands
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _batch_local.commands = None
+        if exc_type is None and self.commands:
+            self.result = send_batch(self.commands, self.wait_for_ack, self.timeout)
+        return False
+
+# ============================================================================
+# PIPELINED SUBMISSION - N COMMANDS IN FLIGHT
+# ============================================================================
+
+PIPELINE_POLL_INTERVAL_S = 0.005  # Status polling period of the pipeline worker
+PIPELINE_FAILURE_STATUSES = ('FAILED', 'INVALID', 'CANCELLED', 'REJECTED', 'TIMEOUT')
+
+
+class CommandPipeline:
+    """
+    Keeps up to max_in_flight tracked commands queued ahead of execution so
+    the commander never idles waiting for the next submission.
+
+    Every submitted command gets a concurrent.futures.Future resolving to its
+    final status dict (same shape as send_and_wait). On the first failure the
+    remainder is cancelled: unsent futures are cancelled locally and commands
+    already queued in the commander are withdrawn with CANCEL.
+
+    Can be used directly (submit) or as a context manager that captures the
+    regular helper functions and waits for completion on exit.
+
+    Example:
+        with CommandPipeline(max_in_flight=2) as pipe:
+            for keyframe in keyframes:
+                move_robot_joints(keyframe, duration=0.5, wait_for_ack=True)
+        print(pipe.progress())
+
+        pipe = CommandPipeline(max_in_flight=3)
+        futures = [pipe.submit(cmd) for cmd in commands]
+        results = pipe.wait(timeout=60)
+    """
+
+    def __init__(self,
+                 max_in_flight: int = 2,
+                 ack_timeout: float = 2.0,
+                 command_timeout: float = 60.0,
+                 cancel_on_failure: bool = True,
+                 on_progress=None):
+        """
+        Args:
+            max_in_flight: Commands sent but not yet finished (>= 1)
+            ack_timeout: Max wait for the first ACK of a command (seconds)
+            command_timeout: Max execution time once EXECUTING (seconds)
+            cancel_on_failure: Cancel the remainder on first failure
+            on_progress: Optional callback(progress_dict) after each completion
+        """
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.ack_timeout = ack_timeout
+        self.command_timeout = command_timeout
+        self.cancel_on_failure = cancel_on_failure
+        self.on_progress = on_progress
+
+        self._lock = threading.Lock()
+        self._pending = deque()       # (command_string, future) not yet sent
+        self._in_flight = {}          # cmd_id -> {'future', 'sent', 'started'}
+        self._futures: List[Future] = []
+        self._failed = None           # First failure status dict
+        self._closed = False
+        self._thread = None
+        self._counts = {'completed': 0, 'failed': 0, 'cancelled': 0}
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, command_string: str) -> Future:
+        """Queue a command for pipelined submission; returns its Future"""
+        future = Future()
+        with self._lock:
+            if self._closed or self._failed:
+                future.cancel()
+                self._counts['cancelled'] += 1
+            else:
+                self._pending.append((command_string, future))
+            self._futures.append(future)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return future
+
+    def append(self, command_string: str):
+        """Collector hook used while the pipeline is active as a context manager"""
+        self.submit(command_string)
+
+    def close(self):
+        """Accept no further commands (pending ones still run)"""
+        with self._lock:
+            self._closed = True
+
+    def wait(self, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Wait for every submitted command to finish.
+
+        Returns:
+            Status dict per command, in submission order
+            (cancelled commands report {'status': 'CANCELLED', ...})
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        results = []
+        for future in list(self._futures):
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            if future.cancelled():
+                results.append({'status': 'CANCELLED', 'details': 'Cancelled after earlier failure',
+                                'completed': True, 'command_id': None})
+                continue
+            try:
+                results.append(future.result(timeout=remaining))
+            except Exception as e:
+                results.append({'status': 'TIMEOUT', 'details': str(e) or 'Pipeline wait timed out',
+                                'completed': True, 'command_id': None})
+        return results
+
+    def progress(self) -> Dict:
+        """Aggregate progress across all submitted commands"""
+        with self._lock:
+            total = len(self._futures)
+            done = self._counts['completed'] + self._counts['failed'] + self._counts['cancelled']
+            return {
+                'total': total,
+                'pending': len(self._pending),
+                'in_flight': len(self._in_flight),
+                'completed': self._counts['completed'],
+                'failed': self._counts['failed'],
+                'cancelled': self._counts['cancelled'],
+                'fraction_done': done / total if total else 1.0,
+                'first_failure': self._failed
+            }
+
+    # ------------------------------------------------------------------
+    # Context manager (captures helper functions)
+    # ------------------------------------------------------------------
+
+    def __enter__(self):
+        if getattr(_batch_local, 'commands', None) is not None:
+            raise RuntimeError("CommandPipeline cannot be nested in CommandBatch/CommandPipeline")
+        _batch_local.commands = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _batch_local.commands = None
+        self.close()
+        if exc_type is None:
+            self.wait()
+        else:
+            self._fail({'status': 'CANCELLED', 'details': f"Aborted: {exc}", 'completed': True})
+        return False
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        tracker = _get_tracker_if_needed()
+        while True:
+            with self._lock:
+                if not self._pending and not self._in_flight:
+                    return
+            self._fill(tracker)
+            self._poll(tracker)
+            time.sleep(PIPELINE_POLL_INTERVAL_S)
+
+    def _fill(self, tracker: LazyCommandTracker):
+        """Send pending commands until max_in_flight are outstanding"""
+        while True:
+            with self._lock:
+                if self._failed or not self._pending or len(self._in_flight) >= self.max_in_flight:
+                    return
+                command_string, future = self._pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._counts['cancelled'] += 1
+                continue
+
+            tracked_cmd, cmd_id = tracker.track_command(command_string)
+            if not cmd_id:
+                self._finish(None, future, {'status': 'NO_TRACKING', 'details': 'Tracker unavailable',
+                                            'completed': True, 'command_id': None})
+                continue
+            try:
+                tracker.send(cmd_id)
+            except Exception as e:
+                self._finish(None, future, {'status': 'FAILED', 'details': f"Error: {e}",
+                                            'completed': True, 'command_id': cmd_id})
+                continue
+
+            with self._lock:
+                self._in_flight[cmd_id] = {'future': future, 'sent': time.time(), 'started': None}
+
+    def _poll(self, tracker: LazyCommandTracker):
+        """Resolve finished or timed-out in-flight commands"""
+        now = time.time()
+        with self._lock:
+            in_flight = list(self._in_flight.items())
+
+        for cmd_id, info in in_flight:
+            status = tracker.get_status(cmd_id) or {}
+            state = status.get('status', 'SENT')
+
+            if status.get('completed'):
+                result = dict(status)
+            elif state == 'SENT' and now - info['sent'] > self.ack_timeout:
+                result = {'status': 'TIMEOUT', 'details': 'No acknowledgment received', 'completed': True}
+            elif state == 'EXECUTING':
+                if info['started'] is None:
+                    info['started'] = now
+                if now - info['started'] <= self.command_timeout:
+                    continue
+                result = {'status': 'TIMEOUT', 'details': 'Execution timed out', 'completed': True}
+            else:
+                continue
+
+            result['command_id'] = cmd_id
+            self._finish(cmd_id, info['future'], result)
+
+    def _finish(self, cmd_id: Optional[str], future: Future, result: Dict):
+        failed = result.get('status') != 'COMPLETED'
+        with self._lock:
+            if cmd_id:
+                self._in_flight.pop(cmd_id, None)
+            self._counts['failed' if failed else 'completed'] += 1
+        future.set_result(result)
+
+        if failed and self.cancel_on_failure:
+            self._fail(result)
+
+        if self.on_progress:
+            try:
+                self.on_progress(self.progress())
+            except Exception as e:
+                logger.error(f"[Pipeline] Progress callback error: {e}")
+
+    def _fail(self, result: Dict):
+        """Cancel everything not yet finished after the first failure"""
+        with self._lock:
+            if self._failed:
+                return
+            self._failed = result
+            pending = list(self._pending)
+            self._pending.clear()
+            in_flight_ids = list(self._in_flight)
+
+        for _, future in pending:
+            if future.cancel():
+                with self._lock:
+                    self._counts['cancelled'] += 1
+
+        if in_flight_ids:
+            logger.warning(f"[Pipeline] {result.get('status')} - cancelling {len(in_flight_ids)} queued commands")
+            send_robot_command(f"CANCEL|{','.join(in_flight_ids)}")
+
+# ============================================================================
+# BACKWARD COMPATIBLE MOVEMENT FUNCTIONS - ZERO OVERHEAD BY DEFAULT
+# ============================================================================
+
+def move_robot_joints(
+    joint_angles: List[float],
+    duration: Optional[float] = None,
+    speed_percentage: Optional[int] = None,
+    wait_for_ack: bool = False,  # Default: No tracking, no overhead
+    timeout: float = 2.0,
+    non_blocking: bool = False,
+    accel_percentage: Optional[int] = None,
+    retarget: bool = False
+):
+    """
+    Move robot joints.
+
+    With speed_percentage the move is a jerk-limited S-curve; accel_percentage
+    (default 50) scales its acceleration and jerk. With retarget=True a
+    running speed-based move is steered to the new angles without stopping
+    (queued as a normal move if none is running).
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    # Validation
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either a duration or a speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+
+    # Apply J2 backlash compensation
+    compensated_angles = apply_j2_backlash(joint_angles)
+
+    # Build command
+    angles_str = "|".join(map(str, compensated_angles))
+    duration_str = str(duration) if duration is not None else "None"
+    speed_str = str(speed_percentage) if speed_percentage is not None else "None"
+    command_name = "RETARGETJOINT" if retarget else "MOVEJOINT"
+    command = f"{command_name}|{angles_str}|{duration_str}|{speed_str}"
+    if accel_percentage is not None:
+        command += f"|{accel_percentage}"
+    
+    # Send with or without tracking
+    if wait_for_ack:
+        # User explicitly requested tracking - initialize if needed
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        # Default path - NO TRACKING, NO OVERHEAD
+        return send_robot_command(command)
+
+def move_robot_pose(
+    pose: List[float],
+    duration: Optional[float] = None,
+    speed_percentage: Optional[int] = None,
+    wait_for_ack: bool = False,  # Default: No tracking
+    timeout: float = 2.,
+    non_blocking: bool = False
+):
+    """
+    Move to pose - zero overhead by default.
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either a duration or a speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    pose_str = "|".join(map(str, pose))
+    duration_str = str(duration) if duration is not None else "None"
+    speed_str = str(speed_percentage) if speed_percentage is not None else "None"
+    command = f"MOVEPOSE|{pose_str}|{duration_str}|{speed_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+
+def execute_trajectory(
+    trajectory: List[List[float]],
+    duration: Optional[float] = None,
+    wait_for_ack: bool = False,
+    timeout: float = 30.0,  # Longer default timeout for trajectories
+    non_blocking: bool = False,
+    retime: bool = False
+):
+    """
+    Execute a pre-computed joint trajectory at 100Hz.
+
+    This is designed for Cartesian straight-line motion where:
+    1. Frontend generates Cartesian waypoints
+    2. Backend batch IK solves all waypoints ONCE
+    3. This executes the joint trajectory at 100Hz
+
+    Parameters
+    ----------
+    trajectory : List[List[float]]
+        Pre-computed joint trajectory, each waypoint is [J1-J6] in degrees
+    duration : float, optional
+        Expected duration in seconds (for validation)
+    wait_for_ack : bool
+        Wait for command acknowledgment (default: False for zero overhead)
+    timeout : float
+        Timeout for acknowledgment in seconds (default: 30s for long trajectories)
+    non_blocking : bool
+        If True with wait_for_ack, returns immediately with command_id
+    retime : bool
+        Keep only the path geometry and let the commander replace its timing
+        with the time-optimal one under the joint velocity/acceleration limits
+
+    Returns
+    -------
+    dict or str
+        Command response with status, or command ID if wait_for_ack=True
+
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    import json
+
+    # Validation
+    if not trajectory or len(trajectory) == 0:
+        error = "Error: Trajectory is empty"
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+
+    # Validate each waypoint has 6 joints
+    for i, waypoint in enumerate(trajectory):
+        if len(waypoint) != 6:
+            error = f"Error: Waypoint {i} has {len(waypoint)} joints (expected 6)"
+            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+
+    # Apply J2 backlash compensation to each waypoint
+    compensated_trajectory = [apply_j2_backlash(waypoint) for waypoint in trajectory]
+
+    # Build command - encode trajectory as JSON
+    trajectory_json = json.dumps(compensated_trajectory)
+    duration_str = str(duration) if duration is not None else "None"
+    command = f"EXECUTETRAJECTORY|{trajectory_json}|{duration_str}"
+    if retime:
+        command += "|1"
+
+    # Debug logging
+    parts_count = command.count('|') + 1
+    logger.info(f"[DEBUG] Building EXECUTETRAJECTORY command: duration={duration}, retime={retime}, parts={parts_count}")
+    if parts_count != (4 if retime else 3):
+        logger.error(f"[DEBUG] Command has wrong number of parts! Command preview: {command[:200]}...")
+
+    # Send with or without tracking
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+
+def execute_spline_trajectory(
+    breaks: List[float],
+    coefficients: List[List[List[float]]],
+    wait_for_ack: bool = False,
+    timeout: float = 30.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a piecewise-polynomial joint trajectory at 100Hz.
+
+    Compact alternative to execute_trajectory(): the commander evaluates
+    the spline itself, so the payload is the knots and coefficients instead
+    of one waypoint per 10ms cycle.
+
+    Parameters
+    ----------
+    breaks : List[float]
+        Increasing breakpoint times in seconds, length K+1
+    coefficients : List[List[List[float]]]
+        Shape (k+1, K, 6), k = 3 (cubic) or 5 (quintic): coefficients of
+        every piece and joint in degrees, highest power first, in powers of
+        (t - breaks[i]) (scipy.interpolate.PPoly layout)
+    wait_for_ack : bool
+        Wait for command acknowledgment (default: False for zero overhead)
+    timeout : float
+        Timeout for acknowledgment in seconds
+    non_blocking : bool
+        If True with wait_for_ack, returns immediately with command_id
+
+    Returns
+    -------
+    dict or str
+        Command response with status, or command ID if wait_for_ack=True
+
+    Note
+    ----
+    J2 backlash compensation shifts each piece by the offset at its start
+    angle; this is exact in the constant-offset range and approximate in
+    the 10 degree taper zone.
+    """
+    import json
+
+    if len(breaks) < 2 or not coefficients or len(coefficients[0]) != len(breaks) - 1:
+        error = "Error: Spline needs K+1 breaks and coefficients for K pieces"
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+
+    # Apply J2 backlash compensation: the constant term is the piece's start angle
+    compensated = [[list(joints) for joints in power] for power in coefficients]
+    for piece in compensated[-1]:
+        piece[1] += _get_j2_backlash_offset(piece[1])
+
+    spline_json = json.dumps({'breaks': list(breaks), 'coefficients': compensated})
+    command = f"EXECUTESPLINE|{spline_json}"
+
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+
+def jog_robot_joint(
+    joint_index: int,
+    speed_percentage: int,
+    duration: Optional[float] = None,
+    distance_deg: Optional[float] = None,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+):
+    """
+    Jogs a single robot joint for a specified time or distance.
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    if duration is None and distance_deg is None:
+        error = "Error: You must provide either a duration or a distance_deg."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    if duration is not None:
+        try:
+            duration = float(duration)
+        except (ValueError, TypeError):
+            error = "Error: Duration must be a valid number."
+            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    duration_str = str(duration) if duration is not None else "None"
+    distance_str = str(distance_deg) if distance_deg is not None else "None"
+    command = f"JOG|{joint_index}|{speed_percentage}|{duration_str}|{distance_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def jog_multiple_joints(
+    joints: List[int], 
+    speeds: List[float], 
+    duration: float,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+) -> str:
+    """
+    Jogs multiple robot joints simultaneously for a specified duration.
+
+    Args:
+        joints: List of joint indices (0-5 for positive, 6-11 for negative)
+        speeds: List of corresponding speeds (1-100%)
+        duration: Duration of the jog in seconds
+        wait_for_ack: Enable command tracking (default False)
+        timeout: Timeout for acknowledgment
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    if len(joints) != len(speeds):
+        error = "Error: The number of joints must match the number of speeds."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    joints_str = ",".join(map(str, joints))
+    speeds_str = ",".join(map(str, speeds))
+    command = f"MULTIJOG|{joints_str}|{speeds_str}|{duration}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def jog_cartesian(
+    frame: Literal['TRF', 'WRF'],
+    axis: Literal['X+', 'X-', 'Y+', 'Y-', 'Z+', 'Z-', 'RX+', 'RX-', 'RY+', 'RY-', 'RZ+', 'RZ-'],
+    speed_percentage: int,
+    duration: float,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+):
+    """
+    Jogs the robot's end-effector continuously in Cartesian space.
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    if duration is not None:
+        try:
+            duration = float(duration)
+        except (ValueError, TypeError):
+            error = "Error: Duration must be a valid number."
+            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    command = f"CARTJOG|{frame}|{axis}|{speed_percentage}|{duration}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def move_robot_cartesian(
+    pose: List[float],
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+) -> str:
+    """
+    Moves the robot's end-effector to a specific Cartesian pose in a straight line.
+    
+    Args:
+        pose: Target pose as [x, y, z, r, p, y] (mm and degrees)
+        duration: Total time for the movement in seconds
+        speed_percentage: Movement speed as a percentage (1-100)
+        wait_for_ack: Enable command tracking (default False)
+        timeout: Timeout for acknowledgment
+        
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    # Validate timing arguments
+    if (duration is None and speed_percentage is None):
+        error = "Error: You must provide either 'duration' or 'speed_percentage'."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    if (duration is not None and speed_percentage is not None):
+        error = "Error: Please provide either 'duration' or 'speed_percentage', not both."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    # Prepare command arguments
+    duration_arg = 'NONE'
+    speed_arg = 'NONE'
+    
+    if duration is not None:
+        try:
+            if float(duration) <= 0:
+                error = "Error: Duration must be a positive number."
+                return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+            duration_arg = str(duration)
+        except (ValueError, TypeError):
+            error = "Error: Duration must be a valid number."
+            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    if speed_percentage is not None:
+        try:
+            speed_val = float(speed_percentage)
+            if not (0 < speed_val <= 100):
+                error = "Error: Speed percentage must be between 1 and 100."
+                return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+            speed_arg = str(speed_val)
+        except (ValueError, TypeError):
+            error = "Error: Speed percentage must be a valid number."
+            return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    # Construct command
+    pose_str = "|".join(map(str, pose))
+    command = f"MOVECART|{pose_str}|{duration_arg}|{speed_arg}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def set_io(
+    output: Literal[1, 2],
+    state: bool,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+):
+    """
+    Set a digital output pin state.
+
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    state_int = 1 if state else 0
+    command = f"SET_IO|{output}|{state_int}"
+
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def control_electric_gripper(
+    action: Literal['move', 'calibrate'],
+    position: Optional[int] = 255,
+    speed: Optional[int] = 150,
+    current: Optional[int] = 500,
+    wait_for_ack: bool = False,
+    timeout: float = 2.0,
+    non_blocking: bool = False
+):
+    """
+    Controls the electric gripper.
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead, no tracking
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    action_str = "move" if action == 'move' else 'calibrate'
+    command = f"ELECTRICGRIPPER|{action_str}|{position}|{speed}|{current}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+    
+# ============================================================================
+# SMOOTH MOTION COMMANDS - WITH START POSITION AND DUAL TIMING SUPPORT
+# ============================================================================
+
+def smooth_circle(
+    center: List[float],
+    radius: float,
+    plane: Literal['XY', 'XZ', 'YZ'] = 'XY',
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    clockwise: bool = False,
+    wait_for_ack: bool = False,
+    timeout: float = 10.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a smooth circular motion.
+    
+    Args:
+        center: [x, y, z] center point in mm
+        radius: Circle radius in mm
+        plane: Plane of the circle ('XY', 'XZ', or 'YZ')
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose (mm and degrees).
+                   If None, starts from current position.
+        duration: Time to complete the circle in seconds
+        speed_percentage: Speed as percentage (1-100)
+        clockwise: Direction of motion
+        wait_for_ack: Enable command tracking (default False)
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+    
+    Resource usage:
+    - wait_for_ack=False (default): ZERO overhead
+    - wait_for_ack=True: Initializes tracker on first use
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either duration or speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    center_str = ",".join(map(str, center))
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    clockwise_str = "1" if clockwise else "0"
+    
+    # Format timing
+    if duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    command = f"SMOOTH_CIRCLE|{center_str}|{radius}|{plane}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def smooth_arc_center(
+    end_pose: List[float],
+    center: List[float],
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    clockwise: bool = False,
+    wait_for_ack: bool = False,
+    timeout: float = 10.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a smooth arc motion defined by center point.
+    
+    Args:
+        end_pose: [x, y, z, rx, ry, rz] end pose (mm and degrees)
+        center: [x, y, z] arc center point in mm
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
+                   If None, starts from current position.
+                   If specified, adds smooth transition from current position.
+        duration: Time to complete the arc in seconds
+        speed_percentage: Speed as percentage (1-100)
+        clockwise: Direction of motion
+        wait_for_ack: Enable command tracking
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either duration or speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    end_str = ",".join(map(str, end_pose))
+    center_str = ",".join(map(str, center))
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    clockwise_str = "1" if clockwise else "0"
+    
+    # Format timing
+    if duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    command = f"SMOOTH_ARC_CENTER|{end_str}|{center_str}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def smooth_arc_parametric(
+    end_pose: List[float],
+    radius: float,
+    arc_angle: float,
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    clockwise: bool = False,
+    wait_for_ack: bool = False,
+    timeout: float = 10.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a smooth arc motion defined by radius and angle.
+    
+    Args:
+        end_pose: [x, y, z, rx, ry, rz] end pose (mm and degrees)
+        radius: Arc radius in mm
+        arc_angle: Arc angle in degrees
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
+                   If None, starts from current position.
+        duration: Time to complete the arc in seconds
+        speed_percentage: Speed as percentage (1-100)
+        clockwise: Direction of motion
+        wait_for_ack: Enable command tracking
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either duration or speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    end_str = ",".join(map(str, end_pose))
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    clockwise_str = "1" if clockwise else "0"
+    
+    # Format timing
+    if duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    command = f"SMOOTH_ARC_PARAM|{end_str}|{radius}|{arc_angle}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def smooth_spline(
+    waypoints: List[List[float]],
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    wait_for_ack: bool = False,
+    timeout: float = 10.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a smooth spline motion through waypoints.
+    
+    Args:
+        waypoints: List of [x, y, z, rx, ry, rz] poses (mm and degrees)
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
+                   If None, starts from current position.
+                   If specified and different from first waypoint, adds transition.
+        duration: Total time for the motion in seconds
+        speed_percentage: Speed as percentage (1-100)
+        wait_for_ack: Enable command tracking
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either duration or speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    num_waypoints = len(waypoints)
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    
+    # Format timing
+    if duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    # Format waypoints - flatten each waypoint's 6 values
+    waypoint_strs = []
+    for wp in waypoints:
+        waypoint_strs.extend(map(str, wp))
+    
+    # Build command
+    command_parts = [f"SMOOTH_SPLINE", str(num_waypoints), frame, start_str, timing_str]
+    command_parts.extend(waypoint_strs)
+    command = "|".join(command_parts)
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def smooth_helix(
+    center: List[float],
+    radius: float,
+    pitch: float,
+    height: float,
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    clockwise: bool = False,
+    wait_for_ack: bool = False,
+    timeout: float = 10.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a smooth helical motion.
+    
+    Args:
+        center: [x, y, z] helix center point in mm
+        radius: Helix radius in mm
+        pitch: Vertical distance per revolution in mm
+        height: Total height of helix in mm
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose.
+                   If None, starts from current position on helix perimeter.
+        duration: Time to complete the helix in seconds
+        speed_percentage: Speed as percentage (1-100)
+        clockwise: Direction of motion
+        wait_for_ack: Enable command tracking
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+    """
+    if duration is None and speed_percentage is None:
+        error = "Error: You must provide either duration or speed_percentage."
+        return {'status': 'INVALID', 'details': error} if wait_for_ack else error
+    
+    center_str = ",".join(map(str, center))
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    clockwise_str = "1" if clockwise else "0"
+    
+    # Format timing
+    if duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    command = f"SMOOTH_HELIX|{center_str}|{radius}|{pitch}|{height}|{frame}|{start_str}|{timing_str}|{clockwise_str}"
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def smooth_blend(
+    segments: List[Dict],
+    blend_time: float = 0.5,
+    frame: Literal['WRF', 'TRF'] = 'WRF',
+    start_pose: Optional[List[float]] = None,
+    duration: Optional[float] = None,
+    speed_percentage: Optional[float] = None,
+    wait_for_ack: bool = False,
+    timeout: float = 15.0,
+    non_blocking: bool = False
+):
+    """
+    Execute a blended motion through multiple segments.
+    
+    Args:
+        segments: List of segment dictionaries, each containing:
+            - 'type': 'LINE', 'CIRCLE', 'ARC', or 'SPLINE'
+            - Additional parameters based on type
+        blend_time: Time to blend between segments in seconds
+        frame: Reference frame ('WRF' for World, 'TRF' for Tool)
+        start_pose: Optional [x, y, z, rx, ry, rz] start pose for first segment.
+                   If None, starts from current position.
+        duration: Total time for entire motion (scales all segments proportionally)
+        speed_percentage: Speed as percentage (1-100) for entire motion
+        wait_for_ack: Enable command tracking
+        timeout: Timeout for acknowledgment
+        non_blocking: Return immediately with command ID
+        
+    Example:
+        segments = [
+            {'type': 'LINE', 'end': [x,y,z,rx,ry,rz], 'duration': 2.0},
+            {'type': 'CIRCLE', 'center': [x,y,z], 'radius': 50, 'plane': 'XY', 
+             'duration': 3.0, 'clockwise': False},
+            {'type': 'ARC', 'end': [x,y,z,rx,ry,rz], 'center': [x,y,z], 
+             'duration': 2.0, 'clockwise': True}
+        ]
+    """
+    num_segments = len(segments)
+    start_str = ",".join(map(str, start_pose)) if start_pose else "CURRENT"
+    
+    # Format timing
+    if duration is None and speed_percentage is None:
+        # Use individual segment durations
+        timing_str = "DEFAULT"
+    elif duration is not None:
+        timing_str = f"DURATION|{duration}"
+    else:
+        timing_str = f"SPEED|{speed_percentage}"
+    
+    # Format segments
+    segment_strs = []
+    for seg in segments:
+        seg_type = seg['type']
+        
+        if seg_type == 'LINE':
+            end_str = ",".join(map(str, seg['end']))
+            seg_str = f"LINE|{end_str}|{seg.get('duration', 2.0)}"
+            
+        elif seg_type == 'CIRCLE':
+            center_str = ",".join(map(str, seg['center']))
+            clockwise_str = "1" if seg.get('clockwise', False) else "0"
+            seg_str = f"CIRCLE|{center_str}|{seg['radius']}|{seg['plane']}|{seg.get('duration', 3.0)}|{clockwise_str}"
+            
+        elif seg_type == 'ARC':
+            end_str = ",".join(map(str, seg['end']))
+            center_str = ",".join(map(str, seg['center']))
+            clockwise_str = "1" if seg.get('clockwise', False) else "0"
+            seg_str = f"ARC|{end_str}|{center_str}|{seg.get('duration', 2.0)}|{clockwise_str}"
+            
+        elif seg_type == 'SPLINE':
+            waypoints_str = ";".join([",".join(map(str, wp)) for wp in seg['waypoints']])
+            seg_str = f"SPLINE|{len(seg['waypoints'])}|{waypoints_str}|{seg.get('duration', 3.0)}"
+            
+        else:
+            continue
+            
+        segment_strs.append(seg_str)
+    
+    # Build command with || separators between segments
+    command = f"SMOOTH_BLEND|{num_segments}|{blend_time}|{frame}|{start_str}|{timing_str}|" + "||".join(segment_strs)
+    
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS FOR SMOOTH MOTION CHAINS
+# ============================================================================
+
+def chain_smooth_motions(
+    motions: List[Dict],
+    ensure_continuity: bool = True,
+    frame: Literal['WRF', 'TRF'] = 'WRF',  # ADD THIS
+    wait_for_ack: bool = True,
+    timeout: float = 30.0,
+    batch: bool = False,
+    max_in_flight: int = 0
+):
+    """
+    Chain multiple smooth motions together with automatic continuity.
+    
+    Args:
+        motions: List of motion dictionaries, each with 'type' and parameters
+        ensure_continuity: If True, automatically sets start_pose of each motion
+                          to end of previous motion for perfect continuity
+        frame: Reference frame for all motions ('WRF' or 'TRF')  # ADD THIS
+        wait_for_ack: Enable command tracking
+        timeout: Timeout per motion (batch=True: timeout for the batch ACK)
+        batch: Submit all motions in one atomic BATCH datagram. Returns the
+               send_batch() result (per-motion IDs in 'item_ids') instead of
+               a list of per-motion results.
+        max_in_flight: If > 0, submit through a CommandPipeline keeping this
+                       many motions queued ahead (no idle gap between
+                       motions; remainder cancelled on first failure)
+        
+    Example:
+        chain_smooth_motions([
+            {'type': 'circle', 'center': [200, 0, 200], 'radius': 50, 'duration': 5},
+            {'type': 'arc', 'end_pose': [250, 50, 200, 0, 0, 90], 'center': [225, 25, 200], 'duration': 3},
+            {'type': 'helix', 'center': [250, 50, 150], 'radius': 30, 'pitch': 20, 'height': 100, 'duration': 8}
+        ], frame='TRF')  # Can now specify frame
+    """
+    if batch:
+        with CommandBatch(wait_for_ack=wait_for_ack, timeout=timeout) as command_batch:
+            chain_smooth_motions(motions, ensure_continuity, frame,
+                                 wait_for_ack=wait_for_ack, timeout=timeout)
+        return command_batch.result
+
+    if max_in_flight > 0:
+        with CommandPipeline(max_in_flight=max_in_flight, command_timeout=timeout) as pipeline:
+            chain_smooth_motions(motions, ensure_continuity, frame,
+                                 wait_for_ack=True, timeout=timeout)
+        return pipeline.wait()
+
+    results = []
+    last_end_pose = None
+    
+    for i, motion in enumerate(motions):
+        motion_type = motion.get('type', '').lower()
+        
+        # Add frame to motion parameters
+        motion['frame'] = frame
+        
+        # Add start_pose from previous motion if ensuring continuity
+        if ensure_continuity and last_end_pose and i > 0:
+            motion['start_pose'] = last_end_pose
+        
+        # Execute the appropriate motion (add frame parameter to each call)
+        if motion_type == 'circle':
+            result = smooth_circle(**{k: v for k, v in motion.items() if k != 'type'}, 
+                                  wait_for_ack=wait_for_ack, timeout=timeout)
+            last_end_pose = None  # Circles return to start
+            
+        elif motion_type == 'arc' or motion_type == 'arc_center':
+            result = smooth_arc_center(**{k: v for k, v in motion.items() if k != 'type'},
+                                      wait_for_ack=wait_for_ack, timeout=timeout)
+            last_end_pose = motion.get('end_pose')
+            
+        elif motion_type == 'arc_param' or motion_type == 'arc_parametric':
+            result = smooth_arc_parametric(**{k: v for k, v in motion.items() if k != 'type'},
+                                          wait_for_ack=wait_for_ack, timeout=timeout)
+            last_end_pose = motion.get('end_pose')
+            
+        elif motion_type == 'spline':
+            result = smooth_spline(**{k: v for k, v in motion.items() if k != 'type'},
+                                  wait_for_ack=wait_for_ack, timeout=timeout)
+            waypoints = motion.get('waypoints', [])
+            last_end_pose = waypoints[-1] if waypoints else None
+            
+        elif motion_type == 'helix':
+            result = smooth_helix(**{k: v for k, v in motion.items() if k != 'type'},
+                                 wait_for_ack=wait_for_ack, timeout=timeout)
+            last_end_pose = None
+            
+        else:
+            result = {'status': 'INVALID', 'details': f'Unknown motion type: {motion_type}'}
+        
+        results.append(result)
+        
+        # Check for failures if tracking
+        if wait_for_ack and isinstance(result, dict) and result.get('status') == 'FAILED':
+            logger.error(f"Motion {i+1} failed: {result.get('details')}")
+            break
+    
+    return results
+
+# ============================================================================
+# BASIC FUNCTIONS
+# ============================================================================
+
+def delay_robot(duration: float, wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
+    """Delay - optional tracking"""
+    command = f"DELAY|{duration}"
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def home_robot(wait_for_ack: bool = False, timeout: float = 30.0, non_blocking: bool = False):
+    """Home robot - optional tracking (longer timeout for homing)"""
+    command = "HOME"
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def stop_robot_movement(wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
+    """Stop robot - optional tracking"""
+    command = "STOP"
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def halt_robot_movement(wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
+    """Smooth stop: brake the running S-curve move to rest and clear the queue (STOP otherwise)"""
+    command = "HALT"
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+# ============================================================================
+# COMMANDER LIVENESS - CIRCUIT BREAKER FOR GET QUERIES
+# ============================================================================
+
+QUERY_TIMEOUT_S = 2.0           # Per-query timeout while the commander is reachable
+BREAKER_FAILURE_THRESHOLD = 2   # Consecutive query failures before the breaker opens
+HEARTBEAT_INTERVAL_S = 1.0      # Probe period while the breaker is open
+HEARTBEAT_TIMEOUT_S = 0.5       # Probe reply timeout
+
+
+class CommanderLiveness:
+    """
+    Circuit breaker shared by all GET queries.
+
+    CLOSED: queries go out normally; consecutive timeouts are counted.
+    OPEN:   queries return immediately without touching the network, and a
+            background heartbeat (GET_HZ) probes the commander until it
+            answers, which closes the breaker again.
+
+    The heartbeat thread only exists while the breaker is open, so a healthy
+    commander costs nothing beyond a counter reset per query.
+    """
+
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+
+    def __init__(self,
+                 failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 probe_interval: float = HEARTBEAT_INTERVAL_S,
+                 probe_timeout: float = HEARTBEAT_TIMEOUT_S):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.lock = threading.Lock()
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_success = None
+        self.short_circuited = 0
+        self.trips = 0
+        self._probe_thread = None
+
+    def allow_request(self) -> bool:
+        """True if a query may go out; counts short-circuited calls otherwise"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_failures = 0
+            self.last_success = time.time()
+            if self.state == self.OPEN:
+                logger.info("[Liveness] Commander reachable again - closing circuit breaker")
+                self.state = self.CLOSED
+                self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == self.OPEN or self.consecutive_failures < self.failure_threshold:
+                return
+            self.state = self.OPEN
+            self.opened_at = time.time()
+            self.trips += 1
+            logger.warning(f"[Liveness] Commander unreachable after {self.consecutive_failures} "
+                           f"failed queries - opening circuit breaker")
+            if self._probe_thread is None or not self._probe_thread.is_alive():
+                self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+                self._probe_thread.start()
+
+    def _probe_loop(self):
+        """Heartbeat while OPEN; exits once the commander answers"""
+        while self.state == self.OPEN:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe_socket:
+                    probe_socket.settimeout(self.probe_timeout)
+                    probe_socket.sendto(b"GET_HZ", (SERVER_IP, SERVER_PORT))
+                    data, _ = probe_socket.recvfrom(1024)
+                    if data.startswith(b"HZ|"):
+                        self.record_success()
+                        return
+            except (socket.timeout, OSError):
+                pass
+            time.sleep(self.probe_interval)
+
+    def is_alive(self) -> bool:
+        return self.state == self.CLOSED
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'state': self.state,
+                'alive': self.state == self.CLOSED,
+                'consecutive_failures': self.consecutive_failures,
+                'opened_at': self.opened_at,
+                'last_success': self.last_success,
+                'short_circuited': self.short_circuited,
+                'trips': self.trips
+            }
+
+
+_commander_liveness = CommanderLiveness()
+
+
+def _query_commander(request_message: str, buffer_size: int = 1024) -> Optional[str]:
+    """
+    Send a GET query and return the decoded response.
+
+    Returns None immediately (no network I/O) while the circuit breaker is
+    open. Timeouts are recorded against the breaker and re-raised so callers
+    keep their own error handling.
+    """
+    if not _commander_liveness.allow_request():
+        return None
+
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client_socket:
+            client_socket.settimeout(QUERY_TIMEOUT_S)
+            client_socket.sendto(request_message.encode('utf-8'), (SERVER_IP, SERVER_PORT))
+            data, _ = client_socket.recvfrom(buffer_size)
+    except (socket.timeout, ConnectionError):
+        # ConnectionRefusedError: ICMP port unreachable (commander not bound)
+        _commander_liveness.record_failure()
+        raise
+
+    _commander_liveness.record_success()
+    return data.decode('utf-8')
+
+
+def is_commander_alive() -> bool:
+    """
+    Check the circuit breaker state (no network I/O).
+    False while the commander is known to be unreachable.
+    """
+    return _commander_liveness.is_alive()
+
+
+def get_commander_liveness() -> Dict:
+    """
+    Get circuit breaker statistics for health reporting.
+    """
+    return _commander_liveness.get_stats()
+
+# ============================================================================
+# GET FUNCTIONS - ZERO OVERHEAD, IMMEDIATE RESPONSE
+# ============================================================================
+
+def get_robot_pose():
+    """
+    Get the robot's current end-effector pose.
+    Returns [x, y, z, roll, pitch, yaw] or None if it fails.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_POSE", 2048)
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'POSE' and len(parts) == 2:
+            pose_values = [float(v) for v in parts[1].split(',')]
+            if len(pose_values) == 16:
+                # Convert 4x4 matrix to [x,y,z,r,p,y]
+                import numpy as np
+                from spatialmath import SE3
+                
+                pose_matrix = np.array(pose_values).reshape((4, 4))
+                T = SE3(pose_matrix, check=False)
+                xyz_mm = T.t * 1000  # Convert to mm
+                rpy_deg = T.rpy(unit='deg', order='xyz')
+                
+                # Convert numpy float64 to regular Python floats
+                return [float(x) for x in xyz_mm] + [float(r) for r in rpy_deg]
+        
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for pose response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting robot pose: {e}")
+        return None
+
+def get_robot_joint_angles():
+    """
+    Get the robot's current joint angles in degrees.
+    Returns list of 6 angles or None if it fails.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_ANGLES")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'ANGLES' and len(parts) == 2:
+            angles = [float(v) for v in parts[1].split(',')]
+            # Reverse J2 backlash compensation for display
+            return reverse_j2_backlash(angles)
+
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for angles response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting robot angles: {e}")
+        return None
+
+def get_robot_io(verbose = False):
+    """
+    Get the robot's current digital I/O status.
+    Returns [IN1, IN2, OUT1, OUT2, ESTOP] or None if it fails.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_IO")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'IO' and len(parts) == 2:
+            io_values = [int(v) for v in parts[1].split(',')]
+
+            if verbose:
+                logger.info("--- I/O Status ---")
+                logger.info(f"  IN1:   {io_values[0]} | {'ON' if io_values[0] else 'OFF'}")
+                logger.info(f"  IN2:   {io_values[1]} | {'ON' if io_values[1] else 'OFF'}")
+                logger.info(f"  OUT1:  {io_values[2]} | {'ON' if io_values[2] else 'OFF'}")
+                logger.info(f"  OUT2:  {io_values[3]} | {'ON' if io_values[3] else 'OFF'}")
+                # More intuitive E-stop display
+                if io_values[4] == 0:
+                    logger.info(f"  ESTOP: {io_values[4]} | PRESSED (Emergency Stop Active!)")
+                else:
+                    logger.info(f"  ESTOP: {io_values[4]} | OK (Normal Operation)")
+                logger.info("--------------------------")
+
+            return io_values
+        
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for I/O response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting robot I/O: {e}")
+        return None
+
+def get_electric_gripper_status(verbose = False):
+    """
+    Get the electric gripper's current status.
+    Returns [ID, Position, Speed, Current, StatusByte, ObjectDetected] or None.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_GRIPPER")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'GRIPPER' and len(parts) == 2:
+            gripper_values = [int(v) for v in parts[1].split(',')]
+            
+            # Decode the status byte
+            status_byte = gripper_values[4] if len(gripper_values) > 4 else 0
+            is_active = (status_byte & 0b00000001) != 0
+            is_moving = (status_byte & 0b00000010) != 0
+            is_calibrated = (status_byte & 0b10000000) != 0
+            
+            # Interpret object detection
+            object_detection = gripper_values[5] if len(gripper_values) > 5 else 0
+            if object_detection == 1:
+                detection_text = "Yes (closing)"
+            elif object_detection == 2:
+                detection_text = "Yes (opening)"
+            else:
+                detection_text = "No"
+
+
+            if verbose:
+                # Print formatted status
+                logger.info("--- Electric Gripper Status ---")
+                logger.info(f"  Device ID:         {gripper_values[0]}")
+                logger.info(f"  Current Position:  {gripper_values[1]}")
+                logger.info(f"  Current Speed:     {gripper_values[2]}")
+                logger.info(f"  Current Current:   {gripper_values[3]}")
+                logger.info(f"  Object Detected:   {detection_text}")
+                logger.info(f"  Status Byte:       {bin(status_byte)}")
+                logger.info(f"    - Calibrated:    {is_calibrated}")
+                logger.info(f"    - Active:        {is_active}")
+                logger.info(f"    - Moving:        {is_moving}")
+                logger.info("-------------------------------")
+            
+            return gripper_values
+        
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for gripper response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting gripper status: {e}")
+        return None
+
+def get_robot_joint_speeds():
+    """
+    Get the robot's current joint speeds in steps/sec.
+    Returns list of 6 speed values or None if it fails.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_SPEEDS")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'SPEEDS' and len(parts) == 2:
+            speeds = [float(v) for v in parts[1].split(',')]
+            return speeds
+        
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for speeds response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting robot speeds: {e}")
+        return None
+
+def get_robot_pose_matrix():
+    """
+    Get the robot's current pose as a 4x4 transformation matrix.
+    Returns 4x4 numpy array or None if it fails.
+    
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_POSE", 2048)
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'POSE' and len(parts) == 2:
+            pose_values = [float(v) for v in parts[1].split(',')]
+            if len(pose_values) == 16:
+                import numpy as np
+                return np.array(pose_values).reshape((4, 4))
+        
+        return None
+        
+    except socket.timeout:
+        logger.error("Timeout waiting for pose response")
+        return None
+    except Exception as e:
+        logger.error(f"Error getting robot pose matrix: {e}")
+        return None
+
+def is_robot_stopped(threshold_speed: float = 2.0) -> bool:
+    """
+    Check if the robot has stopped moving.
+    
+    Args:
+        threshold_speed: Speed threshold in steps/sec
+        
+    Returns:
+        True if all joints below threshold, False otherwise
+        
+    Resource usage: ZERO overhead - simple request/response
+    """
+    speeds = get_robot_joint_speeds()
+    if not speeds:
+        return False
+    
+    max_speed = max(abs(s) for s in speeds)
+    return max_speed < threshold_speed
+
+def is_estop_pressed() -> bool:
+    """
+    Check if the physical E-stop button is currently pressed.
+
+    Returns:
+        True if E-stop button is pressed, False otherwise
+
+    Resource usage: ZERO overhead - simple request/response
+    """
+    io_status = get_robot_io()
+    if io_status and len(io_status) >= 5:
+        return io_status[4] == 0  # E-stop is at index 4, 0 means pressed
+    return False
+
+def get_software_estop_status() -> bool:
+    """
+    Get the software E-stop flag status (the flag that blocks motion).
+    This is different from the physical button - the software flag remains
+    active until explicitly cleared, even after the physical button is released.
+
+    Returns:
+        True if software E-stop is active (blocking motion), False otherwise
+
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_ESTOP_STATUS")
+        if response_str is None:
+            return False
+
+        parts = response_str.split('|')
+        if parts[0] == 'ESTOP_STATUS' and len(parts) == 2:
+            return parts[1] == "1"  # "1" means active, "0" means cleared
+
+    except Exception as e:
+        pass
+
+    return False  # Default to not active if query fails
+
+def clear_estop(wait_for_ack: bool = False, timeout: float = 2.0, non_blocking: bool = False):
+    """
+    Clear the software E-stop flag to re-enable robot motion.
+
+    Args:
+        wait_for_ack: Whether to wait for acknowledgment
+        timeout: Timeout for acknowledgment in seconds
+        non_blocking: Return command_id immediately if True
+
+    Resource usage: ZERO overhead if wait_for_ack=False
+    """
+    command = "CLEAR_ESTOP"
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+def set_performance_recording(enabled: bool, wait_for_ack: bool = False, timeout: float = 5.0, non_blocking: bool = False):
+    """
+    Arm or disarm performance and motion recording.
+
+    When armed, recording auto-starts when first command begins executing
+    and auto-stops when command queue is empty. Both performance and motion
+    data are captured with shared session names.
+
+    Args:
+        enabled: True to arm recording, False to disarm (and stop if active)
+        wait_for_ack: Whether to wait for acknowledgment
+        timeout: Timeout for acknowledgment in seconds
+        non_blocking: Return command_id immediately if True
+
+    Resource usage: ZERO overhead if wait_for_ack=False
+    """
+    value = '1' if enabled else '0'
+    command = f"ARM_RECORDING|{value}"
+
+    if wait_for_ack:
+        return send_and_wait(command, timeout, non_blocking)
+    else:
+        return send_robot_command(command)
+
+# ============================================================================
+# MOTION RECORDING FUNCTIONS
+# ============================================================================
+
+def start_motion_recording(name: str = None, wait_for_ack: bool = True, timeout: float = 5.0):
+    """
+    Start motion comparison recording in the commander.
+
+    Args:
+        name: Optional recording name (auto-generated if not provided)
+        wait_for_ack: Whether to wait for acknowledgment
+        timeout: Timeout for acknowledgment in seconds
+
+    Returns:
+        Dict with status and details
+    """
+    command = f"START_MOTION_RECORDING|{name or ''}"
+    if wait_for_ack:
+        return send_and_wait(command, timeout)
+    else:
+        return send_robot_command(command)
+
+
+def stop_motion_recording(wait_for_ack: bool = True, timeout: float = 10.0):
+    """
+    Stop motion comparison recording and get the recorded data.
+
+    Args:
+        wait_for_ack: Whether to wait for acknowledgment (should be True to get data)
+        timeout: Timeout for acknowledgment in seconds (longer to allow data transfer)
+
+    Returns:
+        Dict with status and recording data in details field
+    """
+    command = "STOP_MOTION_RECORDING"
+    if wait_for_ack:
+        return send_and_wait(command, timeout)
+    else:
+        return send_robot_command(command)
+
+
+def get_motion_recording_status(wait_for_ack: bool = True, timeout: float = 2.0):
+    """
+    Get current motion recording status.
+
+    Returns:
+        Dict with is_recording (bool) and sample_count (int)
+    """
+    command = "GET_MOTION_RECORDING_STATUS"
+    if wait_for_ack:
+        result = send_and_wait(command, timeout)
+        if result and result.get('success') and result.get('details'):
+            parts = result['details'].split('|')
+            return {
+                'is_recording': parts[0] == '1' if len(parts) > 0 else False,
+                'sample_count': int(parts[1]) if len(parts) > 1 else 0
+            }
+        return {'is_recording': False, 'sample_count': 0}
+    else:
+        return send_robot_command(command)
+
+
+def get_homed_status():
+    """
+    Get the homing status for all 6 joints.
+
+    Returns:
+        List of 6 boolean values (True=homed, False=not homed) or None if it fails
+
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_HOMED")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'HOMED' and len(parts) == 2:
+            homed_values = [int(v) == 1 for v in parts[1].split(',')]
+            return homed_values
+
+    except Exception as e:
+        pass
+
+    return None
+
+def get_commander_hz():
+    """
+    Get the current control loop frequency in Hz.
+
+    Returns:
+        Float representing current Hz (e.g., 99.5) or None if it fails
+
+    Resource usage: ZERO overhead - simple request/response
+    """
+    try:
+        response_str = _query_commander("GET_HZ")
+        if response_str is None:
+            return None
+
+        parts = response_str.split('|')
+        if parts[0] == 'HZ' and len(parts) == 2:
+            return float(parts[1])
+
+    except Exception as e:
+        pass
+
+    return None
+
+def get_robot_status() -> Dict:
+    """
+    Get comprehensive robot status in one call.
+    
+    Returns:
+        Dictionary with pose, angles, speeds, IO, gripper status
+        
+    Resource usage: Multiple requests but still zero overhead
+    """
+    return {
+        'pose': get_robot_pose(),
+        'angles': get_robot_joint_angles(),
+        'speeds': get_robot_joint_speeds(),
+        'io': get_robot_io(),
+        'gripper': get_electric_gripper_status(),
+        'stopped': is_robot_stopped(),
+        'estop': is_estop_pressed()
+    }
+
+# ============================================================================
+# TRACKING FUNCTIONS - ONLY FOR EXPLICIT USE
+# ============================================================================
+
+def check_command_status(command_id: str) -> Optional[Dict]:
+    """
+    Check status - returns None if tracker not initialized.
+    Does NOT initialize tracker (read-only).
+    """
+    if _command_tracker and _command_tracker.is_active():
+        return _command_tracker.get_status(command_id)
+    return None
+
+def is_tracking_active() -> bool:
+    """
+    Check if tracking is active.
+    Returns False if never used (zero overhead check).
+    """
+    return _command_tracker is not None and _command_tracker.is_active()
+
+def get_tracking_stats() -> Dict:
+    """
+    Get resource usage statistics.
+    """
+    if _command_tracker and _command_tracker.is_active():
+        with _command_tracker.lock:
+            return {
+                'active': True,
+                'commands_tracked': len(_command_tracker.command_history),
+                'memory_bytes': len(str(_command_tracker.command_history)),
+                'thread_active': _command_tracker._thread.is_alive() if _command_tracker._thread else False,
+                'retransmits': _command_tracker.retransmits
+            }
+    else:
+        return {
+            'active': False,
+            'commands_tracked': 0,
+            'memory_bytes': 0,
+            'thread_active': False,
+            'retransmits': 0
+        }
+
+# ============================================================================
+# CONVENIENCE FUNCTIONS FOR COMMON OPERATIONS
+# ============================================================================
+
+def wait_for_robot_stopped(timeout: float = 10.0, poll_rate: float = 0.1) -> bool:
+    """
+    Wait for the robot to stop moving.
+    
+    Args:
+        timeout: Maximum time to wait in seconds
+        poll_rate: How often to check in seconds
+        
+    Returns:
+        True if robot stopped, False if timeout
+    """
+    import time
+    start_time = time.time()
+    
+    while time.time() - start_time < timeout:
+        if is_robot_stopped():
+            return True
+        time.sleep(poll_rate)
+    
+    return False
+
+def safe_move_with_retry(
+    move_func,
+    *args,
+    max_retries: int = 3,
+    retry_delay: float = 1.0,
+    **kwargs
+):
+    """
+    Execute a move command with automatic retry on failure.
+    
+    Args:
+        move_func: The movement function to call
+        *args: Arguments for the movement function
+        max_retries: Maximum number of retry attempts
+        retry_delay: Delay between retries in seconds
+        **kwargs: Keyword arguments for the movement function
+        
+    Returns:
+        Result from the movement function or error dict
+    """
+    import time
+    
+    # Ensure tracking is enabled for retry logic
+    kwargs['wait_for_ack'] = True
+    
+    for attempt in range(max_retries):
+        result = move_func(*args, **kwargs)
+        
+        if isinstance(result, dict):
+            if result.get('status') in ['COMPLETED', 'QUEUED', 'EXECUTING']:
+                return result
+            elif result.get('status') in ['FAILED', 'TIMEOUT', 'CANCELLED']:
+                if attempt < max_retries - 1:
+                    logger.warning(f"Attempt {attempt + 1} failed: {result.get('details', 'Unknown error')}")
+                    logger.info(f"Retrying in {retry_delay} seconds...")
+                    time.sleep(retry_delay)
+                else:
+                    logger.error(f"All {max_retries} attempts failed")
+                    return result
+        else:
+            # Non-tracked response, assume success
+            return result
+    
     return {'status': 'FAILED', 'details': f'Failed after {max_retries} attempts'}
\ No newline at end of file
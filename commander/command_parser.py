@@ -20,6 +20,7 @@ from lib.kinematics import robot_model as PAROL6_ROBOT
 from constants import (
     POSE_ELEMENT_COUNT,
     JOINT_ANGLE_COUNT,
+    BATCH_MAX_ITEMS,
 )
 
 # Note: Command classes will be imported dynamically or passed as parameter
@@ -60,10 +61,23 @@ class CommandParser:
         self._parsers = {
             'HOME': self._parse_home,
             'MOVEJOINT': self._parse_move_joint,
+            'RETARGETJOINT': self._parse_move_joint,
+            'MOVEPOSE': self._parse_move_pose,
+            'MOVECART': self._parse_move_cart,
             'EXECUTETRAJECTORY': self._parse_execute_trajectory,
+            'EXECUTESPLINE': self._parse_execute_spline,
+            'JOG': self._parse_jog,
+            'MULTIJOG': self._parse_multi_jog,
+            'CARTJOG': self._parse_cart_jog,
             'SET_IO': self._parse_set_io,
             'ELECTRICGRIPPER': self._parse_electric_gripper,
             'DELAY': self._parse_delay,
+            'SMOOTH_CIRCLE': self._parse_smooth_motion,
+            'SMOOTH_ARC_CENTER': self._parse_smooth_motion,
+            'SMOOTH_ARC_PARAM': self._parse_smooth_motion,
+            'SMOOTH_SPLINE': self._parse_smooth_motion,
+            'SMOOTH_HELIX': self._parse_smooth_motion,
+            'SMOOTH_BLEND': self._parse_smooth_motion,
         }
 
     def parse(self, message: str, command_classes: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
@@ -111,19 +125,63 @@ class CommandParser:
             self.logger.error(f"[CommandParser] {error_msg}")
             return None, error_msg
 
+    def parse_batch(self,
+                    items: List[Tuple[Optional[str], str]],
+                    command_classes: Dict[str, Any]) -> Tuple[Optional[List[Tuple[Optional[str], Any]]], Optional[str]]:
+        """
+        Parse every command of a BATCH envelope (all or nothing).
+
+        Args:
+            items: List of (item_command_id, command_message) from the envelope
+            command_classes: Dictionary mapping command names to classes
+
+        Returns:
+            Tuple of (parsed_items, error_message)
+            - On success: ([(item_id, command_obj), ...], None)
+            - On failure: (None, "item N (id): error description")
+
+        Example:
+            parsed, error = parser.parse_batch([("a1", "DELAY|1"), ("a2", "HOME")], cmd_classes)
+        """
+        if not items:
+            return None, "Empty batch"
+        if len(items) > BATCH_MAX_ITEMS:
+            return None, f"Batch too large ({len(items)} commands, max {BATCH_MAX_ITEMS})"
+
+        parsed = []
+        for index, (item_id, item_message) in enumerate(items, start=1):
+            if item_message.split('|', 1)[0].upper() == 'BATCH':
+                return None, f"Item {index} ({item_id}): nested BATCH not allowed"
+
+            command_obj, error = self.parse(item_message, command_classes)
+            if command_obj is None:
+                return None, f"Item {index} ({item_id}): {error}"
+            if hasattr(command_obj, 'is_valid') and not command_obj.is_valid:
+                return None, f"Item {index} ({item_id}): Command failed validation"
+
+            parsed.append((item_id, command_obj))
+
+        return parsed, None
+
     # ========================================================================
     # Motion Command Parsers
     # ========================================================================
 
     def _parse_move_joint(self, parts: List[str]) -> Tuple[Optional[Any], Optional[str]]:
-        """Parse MOVEJOINT command: MOVEJOINT|j1,j2,j3,j4,j5,j6|duration|speed"""
+        """
+        Parse MOVEJOINT command: MOVEJOINT|j1|j2|j3|j4|j5|j6|duration|speed[|accel]
+
+        RETARGETJOINT uses the same format (steers the running move instead
+        of queueing when possible, see commander.retarget_active_move).
+        """
         try:
-            if len(parts) != 9:
-                return None, f"MOVEJOINT expects 9 parts, got {len(parts)}"
+            if len(parts) not in (9, 10):
+                return None, f"MOVEJOINT expects 9 or 10 parts, got {len(parts)}"
 
             joint_vals = [float(p) for p in parts[1:7]]
             duration = None if parts[7].upper() == 'NONE' else float(parts[7])
             speed = None if parts[8].upper() == 'NONE' else float(parts[8])
+            accel = None if len(parts) == 9 or parts[9].upper() == 'NONE' else float(parts[9])
 
             MoveJointCommand = self.command_classes.get('MOVEJOINT')
             if not MoveJointCommand:
@@ -132,7 +190,8 @@ class CommandParser:
             cmd_obj = MoveJointCommand(
                 target_angles=joint_vals,
                 duration=duration,
-                velocity_percent=speed
+                velocity_percent=speed,
+                accel_percent=accel
             )
             return cmd_obj, None
 
@@ -194,12 +253,12 @@ class CommandParser:
             return None, f"MOVECART parse error: {e}"
 
     def _parse_execute_trajectory(self, parts: List[str]) -> Tuple[Optional[Any], Optional[str]]:
-        """Parse EXECUTETRAJECTORY command: EXECUTETRAJECTORY|<json_trajectory>|duration"""
+        """Parse EXECUTETRAJECTORY command: EXECUTETRAJECTORY|<json_trajectory>|duration[|retime]"""
         import json
 
         try:
-            if len(parts) != 3:
-                return None, f"EXECUTETRAJECTORY expects 3 parts, got {len(parts)}"
+            if len(parts) not in (3, 4):
+                return None, f"EXECUTETRAJECTORY expects 3 or 4 parts, got {len(parts)}"
 
             # Parse JSON trajectory
             try:
@@ -218,13 +277,17 @@ class CommandParser:
             # Parse duration (optional)
             duration = None if parts[2].upper() == 'NONE' else float(parts[2])
 
+            # Optional time-optimal retiming flag
+            retime = len(parts) == 4 and parts[3].upper() in ('1', 'TRUE', 'RETIME')
+
             ExecuteTrajectoryCommand = self.command_classes.get('EXECUTETRAJECTORY')
             if not ExecuteTrajectoryCommand:
                 return None, "ExecuteTrajectoryCommand class not provided"
 
             cmd_obj = ExecuteTrajectoryCommand(
                 trajectory_deg=trajectory,
-                duration=duration
+                duration=duration,
+                retime=retime
             )
             return cmd_obj, None
 
@@ -233,6 +296,35 @@ class CommandParser:
         except Exception as e:
             return None, f"EXECUTETRAJECTORY parse error: {e}"
 
+    def _parse_execute_spline(self, parts: List[str]) -> Tuple[Optional[Any], Optional[str]]:
+        """Parse EXECUTESPLINE command: EXECUTESPLINE|<json {"breaks": [...], "coefficients": [...]}>"""
+        import json
+
+        try:
+            if len(parts) != 2:
+                return None, f"EXECUTESPLINE expects 2 parts, got {len(parts)}"
+
+            try:
+                spline = json.loads(parts[1])
+            except json.JSONDecodeError as e:
+                return None, f"EXECUTESPLINE invalid JSON: {e}"
+
+            if not isinstance(spline, dict) or 'breaks' not in spline or 'coefficients' not in spline:
+                return None, "EXECUTESPLINE expects an object with 'breaks' and 'coefficients'"
+
+            ExecuteSplineTrajectoryCommand = self.command_classes.get('EXECUTESPLINE')
+            if not ExecuteSplineTrajectoryCommand:
+                return None, "ExecuteSplineTrajectoryCommand class not provided"
+
+            cmd_obj = ExecuteSplineTrajectoryCommand(
+                breaks=spline['breaks'],
+                coefficients=spline['coefficients']
+            )
+            return cmd_obj, None
+
+        except Exception as e:
+            return None, f"EXECUTESPLINE parse error: {e}"
+
     # ========================================================================
     # Jog Command Parsers
     # ========================================================================
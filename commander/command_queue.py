@@ -154,6 +154,62 @@ class CommandQueue:
         self.logger.debug(f"[CommandQueue] Command added (size: {self.size}/{self.max_size})")
         return True
 
+    def can_add_batch(self, commands: List[Any]) -> tuple[bool, str]:
+        """
+        Check if a whole batch of commands fits in the queue.
+
+        Args:
+            commands: Command objects to check
+
+        Returns:
+            Tuple of (can_add: bool, reason: str)
+        """
+        if len(self._queue) + len(commands) > self.max_size:
+            return False, (f"Queue cannot hold batch of {len(commands)} "
+                           f"({self.available_slots} of {self.max_size} slots free)")
+
+        trajectory_commands = sum(1 for cmd in commands if self._is_trajectory_command(cmd))
+        if self._trajectory_count + trajectory_commands > self.max_trajectory_commands:
+            return False, (f"Batch has {trajectory_commands} trajectory commands, "
+                           f"{self.max_trajectory_commands - self._trajectory_count} allowed")
+
+        return True, ""
+
+    def add_batch(self, commands: List[Any]) -> tuple[bool, str]:
+        """
+        Add several commands atomically: either all are queued or none.
+
+        Args:
+            commands: Command objects in execution order
+
+        Returns:
+            Tuple of (added: bool, reason: str)
+
+        Example:
+            added, reason = queue.add_batch([cmd1, cmd2, cmd3])
+            if not added:
+                logger.warning(f"Batch rejected: {reason}")
+        """
+        can_add, reason = self.can_add_batch(commands)
+
+        if not can_add:
+            self.logger.warning(f"[CommandQueue] Cannot add batch: {reason}")
+            self._stats.total_dropped += len(commands)
+            return False, reason
+
+        for command in commands:
+            self._queue.append(command)
+            if self._is_trajectory_command(command):
+                self._trajectory_count += 1
+
+        self._stats.total_queued += len(commands)
+        self._stats.current_size = len(self._queue)
+        if self._stats.current_size > self._stats.peak_size:
+            self._stats.peak_size = self._stats.current_size
+
+        self.logger.debug(f"[CommandQueue] Batch of {len(commands)} added (size: {self.size}/{self.max_size})")
+        return True, ""
+
     def pop(self) -> Optional[Any]:
         """
         Remove and return next command from queue (FIFO).
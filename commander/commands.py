@@ -11,14 +11,31 @@ Extracted from headless_commander.py as part of Tier 2 refactoring.
 """
 
 import logging
+import threading
 import time
 import numpy as np
 from spatialmath import SE3
+from scipy.interpolate import PPoly
 from math import pi
-import roboticstoolbox as rp
 
 # Import robot model and motion generators from lib/
 from lib.kinematics import robot_model as PAROL6_ROBOT
+from lib.kinematics import kinematics_core
+from lib.kinematics import collision
+from lib.kinematics import trajectory_timing
+from lib.kinematics import batch_ik
+from lib.kinematics import scurve
+from lib.kinematics.trajectory_math import (
+    CircularMotion, SplineMotion, MotionBlender, rotation_from_rpy
+)
+from spatialmath.base import trexp
+
+from constants import (
+    IK_SINGULARITY_THRESHOLD,
+    JOG_DEADMAN_TIMEOUT_S,
+    CART_JOG_DLS_DAMPING_MAX,
+    CART_JOG_POSE_GAIN,
+)
 
 # Module logger
 logger = logging.getLogger(__name__)
@@ -103,13 +120,18 @@ class HomeCommand:
 class MoveJointCommand:
     """
     A non-blocking command to move the robot's joints to a specific configuration.
-    It pre-calculates the entire trajectory upon initialization.
+
+    With a duration the trajectory is a pre-calculated quintic (jtraj). With
+    a speed percentage it is a jerk-limited, time-synchronized S-curve that is
+    evaluated every cycle, so a running move can be steered to a new target
+    (retarget) or braked to a smooth stop (halt) without a full stop.
     """
     def __init__(self, target_angles, duration=None, velocity_percent=None, accel_percent=50, trajectory_type='poly'):
         self.is_valid = False  # Will be set to True after basic validation
         self.is_finished = False
         self.command_step = 0
         self.trajectory_steps = []
+        self.generator = None
 
         logger.info(f"Initializing MoveJoint to {target_angles}...")
 
@@ -117,7 +139,7 @@ class MoveJointCommand:
         self.target_angles = target_angles
         self.duration = duration
         self.velocity_percent = velocity_percent
-        self.accel_percent = accel_percent
+        self.accel_percent = accel_percent if accel_percent is not None else 50
         self.trajectory_type = trajectory_type
 
         # --- Perform only state-independent validation ---
@@ -142,78 +164,30 @@ class MoveJointCommand:
             if self.velocity_percent is not None:
                 logger.debug("  -> INFO: Both duration and velocity were provided. Using duration.")
             command_len = int(self.duration / INTERVAL_S)
-            traj_generator = rp.tools.trajectory.jtraj(initial_pos_rad, target_pos_rad, command_len)
+            traj_generator = kinematics_core.jtraj(initial_pos_rad, target_pos_rad, command_len)
             
             for i in range(len(traj_generator.q)):
                 pos_step = [int(PAROL6_ROBOT.RAD2STEPS(p, j)) for j, p in enumerate(traj_generator.q[i])]
                 self.trajectory_steps.append((pos_step, None))
 
         elif self.velocity_percent is not None:
-            logger.info(f"[DEBUG] Entering velocity_percent path")
+            # Jerk-limited S-curve in steps, sampled every cycle so it can be
+            # re-planned mid-motion (retarget / halt)
             try:
-                accel_percent = self.accel_percent if self.accel_percent is not None else 50
-                initial_pos_steps = np.array(current_position_in)
-                target_pos_steps = np.array([int(PAROL6_ROBOT.RAD2STEPS(rad, i)) for i, rad in enumerate(target_pos_rad)])
-                logger.info(f"[DEBUG] initial_pos_steps: {initial_pos_steps}")
-                logger.info(f"[DEBUG] target_pos_steps: {target_pos_steps}")
-                
-                all_joint_times = []
-                for i in range(6):
-                    path_to_travel = abs(target_pos_steps[i] - initial_pos_steps[i])
-                    if path_to_travel == 0:
-                        all_joint_times.append(0)
-                        continue
-
-                    v_max_joint = np.interp(self.velocity_percent, [0, 100], [PAROL6_ROBOT.Joint_min_speed[i], PAROL6_ROBOT.Joint_max_speed[i]])
-                    a_max_rad = np.interp(accel_percent, [0, 100], [PAROL6_ROBOT.Joint_min_acc, PAROL6_ROBOT.Joint_max_acc])
-                    a_max_steps = PAROL6_ROBOT.SPEED_RAD2STEP(a_max_rad, i)
-
-                    if v_max_joint <= 0 or a_max_steps <= 0:
-                        raise ValueError(f"Invalid speed/acceleration for joint {i+1}. Must be positive.")
-
-                    t_accel = v_max_joint / a_max_steps
-                    if path_to_travel < v_max_joint * t_accel:
-                        t_accel = np.sqrt(path_to_travel / a_max_steps)
-                        joint_time = 2 * t_accel
-                    else:
-                        joint_time = path_to_travel / v_max_joint + t_accel
-                    all_joint_times.append(joint_time)
-
-                total_time = max(all_joint_times)
-
-                if total_time <= 0:
-                    self.is_finished = True
-                    return
-
-                if total_time < (2 * INTERVAL_S):
-                    total_time = 2 * INTERVAL_S
-
-                execution_time = np.arange(0, total_time, INTERVAL_S)
-                
-                all_q, all_qd = [], []
-                for i in range(6):
-                    if abs(target_pos_steps[i] - initial_pos_steps[i]) == 0:
-                        all_q.append(np.full(len(execution_time), initial_pos_steps[i]))
-                        all_qd.append(np.zeros(len(execution_time)))
-                    else:
-                        joint_traj = rp.trapezoidal(initial_pos_steps[i], target_pos_steps[i], execution_time)
-                        all_q.append(joint_traj.q)
-                        all_qd.append(joint_traj.qd)
-
-                self.trajectory_steps = list(zip(np.array(all_q).T.astype(int), np.array(all_qd).T.astype(int)))
-                logger.info(f"[DEBUG] Trajectory generated successfully: {len(self.trajectory_steps)} steps")
-                logger.debug(f"  -> Command is valid (duration calculated from speed: {total_time:.2f}s).")
-
-            except Exception as e:
-                logger.error(f"[DEBUG] VALIDATION FAILED: Could not calculate velocity-based trajectory. Error: {e}")
-                logger.debug(f"  -> Please check Joint_min/max_speed and Joint_min/max_acc values in PAROL6_ROBOT.py.")
+                self.generator = scurve.SCurveGenerator(current_position_in, *self._joint_limits(), dt=INTERVAL_S)
+                duration = self.generator.set_target(self._target_steps())
+            except ValueError as e:
+                logger.error(f"  -> VALIDATION FAILED: Could not plan S-curve trajectory: {e}")
+                logger.debug(f"  -> Please check Joint_min/max_speed, Joint_min/max_acc and Joint_max_jerk in PAROL6_ROBOT.py.")
                 self.is_valid = False
                 return
-        
+            logger.debug(f"  -> Command is valid (S-curve duration {duration:.2f}s).")
+            return
+
         else:
             logger.debug("  -> Using conservative values for MoveJoint.")
             command_len = 200
-            traj_generator = rp.tools.trajectory.jtraj(initial_pos_rad, target_pos_rad, command_len)
+            traj_generator = kinematics_core.jtraj(initial_pos_rad, target_pos_rad, command_len)
             for i in range(len(traj_generator.q)):
                 pos_step = [int(PAROL6_ROBOT.RAD2STEPS(p, j)) for j, p in enumerate(traj_generator.q[i])]
                 self.trajectory_steps.append((pos_step, None))
@@ -224,13 +198,78 @@ class MoveJointCommand:
         else:
              logger.debug(f" -> Trajectory prepared with {len(self.trajectory_steps)} steps.")
 
+    def _target_steps(self):
+        return [int(PAROL6_ROBOT.RAD2STEPS(np.deg2rad(angle), i)) for i, angle in enumerate(self.target_angles)]
+
+    def _joint_limits(self):
+        """
+        S-curve limits in steps: speed from velocity_percent, acceleration
+        (read in steps/s² like trajectory_timing) and jerk from accel_percent.
+        """
+        max_speed = [np.interp(self.velocity_percent, [0, 100], [v_min, v_max])
+                     for v_min, v_max in zip(PAROL6_ROBOT.Joint_min_speed, PAROL6_ROBOT.Joint_max_speed)]
+        max_acc = np.interp(self.accel_percent, [0, 100], [PAROL6_ROBOT.Joint_min_acc, PAROL6_ROBOT.Joint_max_acc])
+        # Same acceleration ramp time at every accel_percent
+        max_jerk = max_acc * PAROL6_ROBOT.Joint_max_jerk / PAROL6_ROBOT.Joint_max_acc
+        return max_speed, max_acc, max_jerk
+
+    def retarget(self, other):
+        """
+        Steer this running S-curve move to another MoveJoint's target, speed
+        and acceleration, continuing from the current position, velocity
+        and acceleration.
+
+        Args:
+            other: Newly received MoveJointCommand (speed-based)
+
+        Returns:
+            bool: True if merged into this move
+        """
+        if type(other) is not type(self) or not other.is_valid or self.is_finished:
+            return False
+        if self.generator is None or other.velocity_percent is None or other.duration:
+            return False
+
+        self.target_angles = other.target_angles
+        self.velocity_percent = other.velocity_percent
+        self.accel_percent = other.accel_percent
+        self.generator.set_limits(*self._joint_limits())
+        duration = self.generator.set_target(self._target_steps())
+        logger.info(f"MoveJoint retargeted to {self.target_angles} ({duration:.2f}s)")
+        return True
+
+    def halt(self):
+        """
+        Brake a running S-curve move to rest along a jerk-limited profile.
+
+        Returns:
+            bool: True if the move is braking (False if it cannot be re-planned)
+        """
+        if self.generator is None or self.is_finished:
+            return False
+        self.generator.halt()
+        logger.info("MoveJoint halting")
+        return True
+
     def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
-        # This method remains unchanged.
         Position_out = kwargs.get('Position_out', Position_in)
 
         if self.is_finished or not self.is_valid:
             return True
 
+        if self.generator is not None:
+            if self.generator.is_done:
+                logger.info(f"{type(self).__name__} finished.")
+                self.is_finished = True
+                Position_out[:] = Position_in[:]
+                Speed_out[:] = [0] * 6
+                Command_out.value = 156
+                return True
+            Position_out[:] = np.rint(self.generator.step()).astype(int).tolist()
+            Speed_out[:] = [0] * 6
+            Command_out.value = 156
+            return False
+
         if self.command_step >= len(self.trajectory_steps):
             logger.info(f"{type(self).__name__} finished.")
             self.is_finished = True
@@ -255,10 +294,15 @@ class ExecuteTrajectoryCommand:
     2. Backend batch IK solves all waypoints ONCE (offline)
     3. This command plays back the joint trajectory at 100Hz
 
-    Unlike MoveCartCommand (which solves IK every cycle → 16Hz),
-    this achieves 100Hz by using pre-computed joint positions.
+    Unlike solving IK every cycle (→ 16Hz), this achieves 100Hz by using
+    pre-computed joint positions. MoveCartCommand, MovePoseCommand and the
+    SMOOTH_* commands plan their joint path in the commander and play it
+    back the same way (see PlannedTrajectoryCommand).
     """
-    def __init__(self, trajectory_deg, duration=None):
+    # Replace the trajectory timing with the time-optimal one (TOPP-RA)
+    retime = False
+
+    def __init__(self, trajectory_deg, duration=None, retime=False):
         """
         Initialize ExecuteTrajectoryCommand.
 
@@ -268,17 +312,22 @@ class ExecuteTrajectoryCommand:
             Pre-computed joint trajectory, each waypoint is [J1-J6] in degrees
         duration : float, optional
             Expected duration in seconds (for validation)
+        retime : bool, optional
+            Keep only the path geometry and play it back with the fastest
+            timing the joint velocity/acceleration limits allow
         """
         self.is_valid = False
         self.is_finished = False
         self.command_step = 0
         self.trajectory_steps = []
+        self.error_message = None
 
         logger.info(f"Initializing ExecuteTrajectory with {len(trajectory_deg)} waypoints...")
 
         # Store parameters
         self.trajectory_deg = trajectory_deg
         self.duration = duration
+        self.retime = retime
 
         # Validate trajectory
         if not trajectory_deg or len(trajectory_deg) == 0:
@@ -311,16 +360,65 @@ class ExecuteTrajectoryCommand:
         logger.debug(f"  -> Trajectory validated successfully")
 
     def prepare_for_execution(self, current_position_in):
-        """Convert trajectory from degrees to steps just before execution."""
+        """Check the trajectory for collisions and convert it to steps just before execution."""
         logger.debug(f"  -> Preparing ExecuteTrajectory with {len(self.trajectory_deg)} waypoints...")
 
-        # Convert each waypoint from degrees to steps
-        for waypoint_deg in self.trajectory_deg:
-            pos_step = [int(PAROL6_ROBOT.DEG2STEPS(angle, j)) for j, angle in enumerate(waypoint_deg)]
-            self.trajectory_steps.append((pos_step, None))
+        current_rad = [PAROL6_ROBOT.STEPS2RADS(p, i) for i, p in enumerate(current_position_in)]
+        self.error_message = self._build_steps(current_rad, np.deg2rad(self.trajectory_deg))
+        if self.error_message:
+            logger.error(f"  -> {self.error_message}")
+            self.is_valid = False
+            return
 
         logger.debug(f"  -> Trajectory prepared with {len(self.trajectory_steps)} steps")
 
+    def _build_steps(self, current_rad, trajectory_rad):
+        """
+        Collision check, joint-speed retiming and conversion to steps.
+
+        Segments that would exceed a joint speed limit (typically near a
+        wrist singularity) are slowed down; the rest keeps its timing. With
+        self.retime the timing is first replaced by the time-optimal one.
+
+        Args:
+            current_rad: Current joint angles in radians (start of the move)
+            trajectory_rad: (N, 6) joint trajectory in radians at 100Hz
+
+        Returns:
+            Error message, or None once self.trajectory_steps is filled
+        """
+        # Include the move from the current position to the first waypoint
+        path_rad = np.vstack([current_rad, trajectory_rad])
+        error = self._check_collision(path_rad)
+        if error:
+            return error
+
+        trajectory_rad = path_rad[1:]
+        if self.retime:
+            trajectory_rad, timing = trajectory_timing.time_optimal_retime(trajectory_rad, dt=INTERVAL_S)
+            logger.info(f"  -> Time-optimal retiming: {timing['duration_s']:.2f}s -> "
+                        f"{timing['retimed_duration_s']:.2f}s ({timing['grid_points']} grid points)")
+
+        trajectory_rad, timing = trajectory_timing.retime_path(trajectory_rad, dt=INTERVAL_S)
+        if timing['slowed_segments']:
+            logger.info(f"  -> Retimed {timing['slowed_segments']} segments to respect joint speed limits "
+                        f"(min scale {timing['min_scale']:.2f}, "
+                        f"{timing['duration_s']:.2f}s -> {timing['retimed_duration_s']:.2f}s)")
+
+        steps = np.asarray(trajectory_rad) * _STEPS_PER_RAD
+        self.trajectory_steps = [(pos_step, None) for pos_step in steps.astype(int).tolist()]
+        return None
+
+    @staticmethod
+    def _check_collision(path_rad):
+        """Error message for the first colliding waypoint of a joint path, or None."""
+        result = collision.get_collision_model().check_trajectory(path_rad)
+        if not result['collision']:
+            return None
+        index = max(result['index'] - 1, 0)
+        pairs = ', '.join('/'.join(pair) for pair in result['pairs'])
+        return f"Collision at waypoint {index}: {pairs}"
+
     def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
         """Execute one step of the trajectory (called at 100Hz)."""
         Position_out = kwargs.get('Position_out', Position_in)
@@ -343,6 +441,127 @@ class ExecuteTrajectoryCommand:
             self.command_step += 1
             return False
 
+class ExecuteSplineTrajectoryCommand(ExecuteTrajectoryCommand):
+    """
+    Execute a piecewise-polynomial joint trajectory at 100Hz.
+
+    Compact alternative to ExecuteTrajectoryCommand: instead of one
+    waypoint per cycle, the trajectory is sent as spline breakpoints and
+    per-joint polynomial coefficients (scipy.interpolate.PPoly layout,
+    cubic or quintic), e.g. one knot every 0.5s instead of 50 waypoints.
+
+    Setpoints are evaluated in chunks of CHUNK_SAMPLES cycles during
+    playback, so only the coefficients and one chunk are kept in memory.
+    Collisions and joint speeds are checked on the full evaluation in
+    prepare_for_execution; a trajectory that exceeds a joint speed limit
+    is retimed like ExecuteTrajectoryCommand and played back densely.
+    """
+    CHUNK_SAMPLES = 100
+
+    def __init__(self, breaks, coefficients):
+        """
+        Initialize ExecuteSplineTrajectoryCommand.
+
+        Parameters
+        ----------
+        breaks : list of float
+            Increasing breakpoint times in seconds, length K+1
+        coefficients : list
+            Shape (k+1, K, 6): coefficients of every piece and joint, highest
+            power first, in degrees and powers of (t - breaks[i]); k is 3
+            (cubic) or 5 (quintic)
+        """
+        self.is_valid = False
+        self.is_finished = False
+        self.command_step = 0
+        self.trajectory_steps = []
+        self.error_message = None
+        self._chunk = None
+        self._chunk_start = 0
+
+        try:
+            breaks = np.asarray(breaks, dtype=float)
+            coefficients = np.asarray(coefficients, dtype=float)
+        except ValueError as e:
+            logger.debug(f"  -> VALIDATION FAILED: Malformed spline: {e}")
+            return
+
+        logger.info(f"Initializing ExecuteSplineTrajectory with {len(breaks) - 1} pieces...")
+
+        # Validate spline structure
+        if breaks.ndim != 1 or len(breaks) < 2 or np.any(np.diff(breaks) <= 0):
+            logger.debug("  -> VALIDATION FAILED: Breaks must be at least 2 increasing times")
+            return
+        if coefficients.shape not in ((4, len(breaks) - 1, 6), (6, len(breaks) - 1, 6)):
+            logger.debug(f"  -> VALIDATION FAILED: Coefficients have shape {coefficients.shape}, "
+                         f"expected (4 or 6, {len(breaks) - 1}, 6)")
+            return
+
+        self.spline = PPoly(coefficients, breaks)
+        self.duration = breaks[-1] - breaks[0]
+        self.num_samples = int(np.ceil(self.duration / INTERVAL_S - 1e-9)) + 1
+
+        # Validate joint limits on every cycle
+        violations = kinematics_core.joint_limit_violations(np.deg2rad(self._samples_deg(0, self.num_samples)))
+        if np.any(violations != 0):
+            index, joint = np.argwhere(violations != 0)[0]
+            logger.debug(f"  -> VALIDATION FAILED: Joint {joint + 1} out of range at t={index * INTERVAL_S:.2f}s")
+            return
+
+        self.is_valid = True
+        logger.debug(f"  -> Spline validated: {self.num_samples} samples, {coefficients.size} coefficients")
+
+    def _samples_deg(self, start, count):
+        """Joint angles in degrees of cycles start .. start+count-1 (clipped to the end)."""
+        index = np.arange(start, min(start + count, self.num_samples))
+        t = np.minimum(self.spline.x[0] + index * INTERVAL_S, self.spline.x[-1])
+        return self.spline(t)
+
+    def prepare_for_execution(self, current_position_in):
+        """Check collisions and joint speeds on the full trajectory."""
+        current_rad = [PAROL6_ROBOT.STEPS2RADS(p, i) for i, p in enumerate(current_position_in)]
+        trajectory_rad = np.deg2rad(self._samples_deg(0, self.num_samples))
+
+        if np.max(trajectory_timing.speed_ratio(trajectory_rad, INTERVAL_S)) > 1.0:
+            logger.info("  -> Spline exceeds joint speed limits, playing back retimed waypoints")
+            self.error_message = self._build_steps(current_rad, trajectory_rad)
+        else:
+            self.error_message = self._check_collision(np.vstack([current_rad, trajectory_rad]))
+
+        if self.error_message:
+            logger.error(f"  -> {self.error_message}")
+            self.is_valid = False
+
+    def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
+        """Execute one step of the trajectory (called at 100Hz)."""
+        if self.trajectory_steps:
+            return super().execute_step(Position_in, Homed_in, Speed_out, Command_out, **kwargs)
+
+        Position_out = kwargs.get('Position_out', Position_in)
+
+        if self.is_finished or not self.is_valid:
+            return True
+
+        if self.command_step >= self.num_samples:
+            logger.info(f"{type(self).__name__} finished.")
+            self.is_finished = True
+            Position_out[:] = Position_in[:]
+            Speed_out[:] = [0] * 6
+            Command_out.value = 156  # Position mode
+            return True
+
+        row = self.command_step - self._chunk_start
+        if self._chunk is None or row >= len(self._chunk):
+            self._chunk_start, row = self.command_step, 0
+            self._chunk = (np.deg2rad(self._samples_deg(self.command_step, self.CHUNK_SAMPLES))
+                           * _STEPS_PER_RAD).astype(int)
+
+        Position_out[:] = self._chunk[row].tolist()
+        Speed_out[:] = [0] * 6
+        Command_out.value = 156  # Position mode
+        self.command_step += 1
+        return False
+
 class SetIOCommand:
     """Set a digital output pin state."""
     def __init__(self, output: int, state: bool):
@@ -501,4 +720,843 @@ class DelayCommand:
             self.is_finished = True
         
         return self.is_finished
-    
+
+
+#########################################################################
+# Jog Commands
+#########################################################################
+
+# Conversion factors (steps per radian) and jog speed limits per joint
+_STEPS_PER_RAD = np.array([PAROL6_ROBOT.RAD2STEPS(1.0, i) for i in range(6)])
+_JOG_MAX_SPEED_RAD = np.array(PAROL6_ROBOT.Joint_max_jog_speed) / _STEPS_PER_RAD
+
+# CARTJOG axis -> (twist component, sign); twist is [vx, vy, vz, wx, wy, wz]
+_CART_JOG_AXES = {
+    'X+': (0, 1.0), 'X-': (0, -1.0),
+    'Y+': (1, 1.0), 'Y-': (1, -1.0),
+    'Z+': (2, 1.0), 'Z-': (2, -1.0),
+    'RX+': (3, 1.0), 'RX-': (3, -1.0),
+    'RY+': (4, 1.0), 'RY-': (4, -1.0),
+    'RZ+': (5, 1.0), 'RZ-': (5, -1.0),
+}
+
+
+class MultiJogCommand:
+    """
+    Jog one or more joints in firmware velocity mode (command 123).
+
+    Joint indices 0-5 jog joints 1-6 in the positive direction, 6-11 jog
+    them in the negative direction. Speeds are percentages of the joint jog
+    speed range (Joint_min_jog_speed..Joint_max_jog_speed).
+
+    Deadman: motion stops when the duration window passes without a
+    refresh. While the command runs, a newer jog of the same kind is merged
+    in place (refresh) instead of being queued, so hold-to-jog clients
+    resend the jog with a short duration while the button is held and a
+    dropped client stops the robot within one window.
+
+    A joint stops before it would cross its limit; the command finishes
+    once no joint is moving.
+    """
+    def __init__(self, joints, speed_percentages, duration=None, distance_deg=None):
+        self.is_valid = False
+        self.is_finished = False
+        self.speeds_steps = np.zeros(6)
+        self.distance_deg = distance_deg
+        self.duration = duration
+
+        logger.info(f"Initializing {type(self).__name__}: joints={joints}, speeds={speed_percentages}, "
+                    f"duration={duration}, distance={distance_deg}")
+
+        if len(joints) != len(speed_percentages) or not joints:
+            logger.debug("  -> VALIDATION FAILED: Joints and speeds must be non-empty and of equal length")
+            return
+
+        for joint, speed in zip(joints, speed_percentages):
+            if not 0 <= joint <= 11:
+                logger.debug(f"  -> VALIDATION FAILED: Joint index {joint} out of range (0-11)")
+                return
+            if not 0 <= speed <= 100:
+                logger.debug(f"  -> VALIDATION FAILED: Speed {speed}% out of range (0-100)")
+                return
+            joint_index, direction = (joint, 1) if joint < 6 else (joint - 6, -1)
+            if self.speeds_steps[joint_index] != 0:
+                logger.debug(f"  -> VALIDATION FAILED: Joint {joint_index + 1} given more than once")
+                return
+            self.speeds_steps[joint_index] = direction * np.interp(
+                speed, [0, 100], [PAROL6_ROBOT.Joint_min_jog_speed[joint_index],
+                                  PAROL6_ROBOT.Joint_max_jog_speed[joint_index]])
+
+        if distance_deg is not None:
+            if len(joints) != 1 or distance_deg <= 0:
+                logger.debug("  -> VALIDATION FAILED: Distance jogs need one joint and a positive distance")
+                return
+            joint_index = int(np.flatnonzero(self.speeds_steps)[0])
+            travel_steps = PAROL6_ROBOT.DEG2STEPS(distance_deg, joint_index)
+            self.distance_steps = travel_steps
+            if duration is None:
+                self.duration = travel_steps / abs(self.speeds_steps[joint_index]) + JOG_DEADMAN_TIMEOUT_S
+
+        if self.duration is None or self.duration <= 0:
+            logger.debug("  -> VALIDATION FAILED: Jog needs a positive duration or a distance")
+            return
+
+        self.start_position = None
+        self.deadline = None
+        self.is_valid = True
+
+    def prepare_for_execution(self, current_position_in):
+        """Arm the deadman window and remember the start position."""
+        self.start_position = np.array(current_position_in, dtype=float)
+        self.deadline = time.time() + self.duration
+
+    def refresh(self, other):
+        """
+        Merge a newer jog of the same kind into this running command.
+
+        Args:
+            other: Newly received command
+
+        Returns:
+            bool: True if merged (the deadman window is re-armed)
+        """
+        if type(other) is not type(self) or not other.is_valid or self.is_finished:
+            return False
+        if self.distance_deg is not None or other.distance_deg is not None:
+            return False  # Distance jogs measure from their own start
+
+        self.speeds_steps = other.speeds_steps
+        self.duration = other.duration
+        self.deadline = time.time() + self.duration
+        return True
+
+    def _stop(self, Speed_out, Command_out, reason):
+        logger.info(f"{type(self).__name__} finished: {reason}")
+        self.is_finished = True
+        Speed_out[:] = [0] * 6
+        Command_out.value = 255
+        return True
+
+    def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
+        if self.is_finished or not self.is_valid:
+            return True
+
+        if time.time() >= self.deadline:
+            return self._stop(Speed_out, Command_out, "deadman window expired")
+
+        position = np.array(Position_in, dtype=float)
+        if self.distance_deg is not None:
+            if np.max(np.abs(position - self.start_position)) >= self.distance_steps:
+                return self._stop(Speed_out, Command_out, "distance reached")
+
+        speeds = self.speeds_steps.copy()
+        next_position = position + speeds * INTERVAL_S
+        for j in np.flatnonzero(speeds):
+            min_steps, max_steps = PAROL6_ROBOT.Joint_limits_steps[j]
+            if (speeds[j] > 0 and next_position[j] > max_steps) or (speeds[j] < 0 and next_position[j] < min_steps):
+                logger.warning(f"[{type(self).__name__}] Limit reached on joint {j + 1}")
+                speeds[j] = 0
+                self.speeds_steps[j] = 0
+
+        if not speeds.any():
+            return self._stop(Speed_out, Command_out, "all joints at their limits")
+
+        Speed_out[:] = speeds.astype(int).tolist()
+        Command_out.value = 123
+        return False
+
+
+class JogCommand(MultiJogCommand):
+    """
+    Jog a single joint in velocity mode for a duration or a distance.
+
+    joint: 0-5 positive, 6-11 negative direction (see MultiJogCommand).
+    """
+    def __init__(self, joint, speed_percentage=None, duration=None, distance_deg=None):
+        speed_percentage = 50 if speed_percentage is None else speed_percentage
+        super().__init__([joint], [speed_percentage], duration=duration, distance_deg=distance_deg)
+
+
+class CartesianJogCommand:
+    """
+    Jog the flange along or about a Cartesian axis with resolved-rate control.
+
+    Every cycle the commanded twist is mapped to joint velocities with
+    damped-least-squares velocity IK, dq = J^T (J J^T + lambda^2 I)^-1 v,
+    on the warm commanded joint state - no per-cycle IK solve. Damping
+    ramps in below IK_SINGULARITY_THRESHOLD so the jog slows through
+    singularities instead of diverging, and pose-error feedback keeps the
+    flange on its line/axis. Output is position mode (156) at 100Hz.
+
+    Frames: 'WRF' jogs along base axes, 'TRF' along the current flange axes.
+    Deadman and refresh behave like MultiJogCommand; a refresh with another
+    frame or axis re-anchors the reference pose.
+    """
+    def __init__(self, frame, axis, speed_percentage, duration):
+        self.is_valid = False
+        self.is_finished = False
+        self.frame = frame.upper() if isinstance(frame, str) else frame
+        self.axis = axis.upper() if isinstance(axis, str) else axis
+        self.speed_percentage = speed_percentage
+        self.duration = duration
+
+        logger.info(f"Initializing CartesianJog: frame={self.frame}, axis={self.axis}, "
+                    f"speed={speed_percentage}%, duration={duration}")
+
+        if self.frame not in ('WRF', 'TRF'):
+            logger.debug(f"  -> VALIDATION FAILED: Unknown frame '{frame}' (expected WRF or TRF)")
+            return
+        if self.axis not in _CART_JOG_AXES:
+            logger.debug(f"  -> VALIDATION FAILED: Unknown axis '{axis}'")
+            return
+        if not 0 <= speed_percentage <= 100:
+            logger.debug(f"  -> VALIDATION FAILED: Speed {speed_percentage}% out of range (0-100)")
+            return
+        if duration is None or duration <= 0:
+            logger.debug("  -> VALIDATION FAILED: Duration must be positive")
+            return
+
+        component, sign = _CART_JOG_AXES[self.axis]
+        self.twist = np.zeros(6)
+        if component < 3:
+            self.twist[component] = sign * np.interp(speed_percentage, [0, 100], [
+                PAROL6_ROBOT.Cartesian_linear_velocity_min_JOG, PAROL6_ROBOT.Cartesian_linear_velocity_max_JOG])
+        else:
+            self.twist[component] = sign * np.deg2rad(np.interp(speed_percentage, [0, 100], [
+                PAROL6_ROBOT.Cartesian_angular_velocity_min, PAROL6_ROBOT.Cartesian_angular_velocity_max]))
+
+        self.q = None
+        self.T_goal = None
+        self.deadline = None
+        self.is_valid = True
+
+    def prepare_for_execution(self, current_position_in):
+        """Start from the measured joint state and arm the deadman window."""
+        self.q = np.array(current_position_in, dtype=float) / _STEPS_PER_RAD
+        self.T_goal = kinematics_core.fkine(self.q)
+        self.deadline = time.time() + self.duration
+
+    def refresh(self, other):
+        """
+        Merge a newer CARTJOG into this running command (warm joint state kept).
+
+        Returns:
+            bool: True if merged (the deadman window is re-armed)
+        """
+        if type(other) is not type(self) or not other.is_valid or self.is_finished:
+            return False
+        if (other.frame, other.axis) != (self.frame, self.axis):
+            self.T_goal = kinematics_core.fkine(self.q)
+        self.frame, self.axis, self.twist = other.frame, other.axis, other.twist
+        self.duration = other.duration
+        self.deadline = time.time() + self.duration
+        return True
+
+    def _hold(self, Position_out, Speed_out, Command_out, reason):
+        logger.info(f"CartesianJogCommand finished: {reason}")
+        self.is_finished = True
+        Position_out[:] = (self.q * _STEPS_PER_RAD).astype(int).tolist()
+        Speed_out[:] = [0] * 6
+        Command_out.value = 156
+        return True
+
+    def _joint_velocity(self, T):
+        """DLS joint velocity (rad/s) for the current twist plus pose feedback."""
+        v, w = self.twist[:3], self.twist[3:]
+        if self.frame == 'TRF':
+            v, w = T[:3, :3] @ v, T[:3, :3] @ w
+
+        # Advance the reference pose, then steer towards it
+        self.T_goal[:3, 3] += v * INTERVAL_S
+        self.T_goal[:3, :3] = trexp(w * INTERVAL_S) @ self.T_goal[:3, :3]
+        R_error = self.T_goal[:3, :3] @ T[:3, :3].T
+        pose_error = np.concatenate([
+            self.T_goal[:3, 3] - T[:3, 3],
+            0.5 * np.array([R_error[2, 1] - R_error[1, 2],
+                            R_error[0, 2] - R_error[2, 0],
+                            R_error[1, 0] - R_error[0, 1]])
+        ])
+        twist = np.concatenate([v, w]) + CART_JOG_POSE_GAIN * pose_error
+
+        J = kinematics_core.jacobian(self.q)[0]
+        manip = kinematics_core.manipulability(self.q)[0]
+        damping_sq = 0.0
+        if manip < IK_SINGULARITY_THRESHOLD:
+            damping_sq = (1.0 - (manip / IK_SINGULARITY_THRESHOLD) ** 2) * CART_JOG_DLS_DAMPING_MAX ** 2
+        dq = J.T @ np.linalg.solve(J @ J.T + damping_sq * np.eye(6), twist)
+
+        # Respect joint jog speeds without bending the Cartesian direction
+        ratio = np.max(np.abs(dq) / _JOG_MAX_SPEED_RAD)
+        if ratio > 1.0:
+            dq /= ratio
+        return dq
+
+    def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
+        Position_out = kwargs.get('Position_out', Position_in)
+
+        if self.is_finished or not self.is_valid:
+            return True
+
+        if time.time() >= self.deadline:
+            return self._hold(Position_out, Speed_out, Command_out, "deadman window expired")
+
+        T = kinematics_core.fkine(self.q)
+        q_next = self.q + self._joint_velocity(T) * INTERVAL_S
+
+        # Stop at a limit (moving back out of a slight overshoot is allowed)
+        violation = np.abs(kinematics_core.joint_limit_violations(q_next)[0])
+        if np.any(violation > np.abs(kinematics_core.joint_limit_violations(self.q)[0]) + 1e-12):
+            joints = ', '.join(str(j + 1) for j in np.flatnonzero(violation > 0))
+            logger.warning(f"[CartesianJogCommand] Joint limit reached on joint {joints}")
+            return self._hold(Position_out, Speed_out, Command_out, "joint limit reached")
+
+        self.q = q_next
+        Position_out[:] = (self.q * _STEPS_PER_RAD).astype(int).tolist()
+        Speed_out[:] = [0] * 6
+        Command_out.value = 156
+        return False
+
+
+#########################################################################
+# Smooth Motion Commands
+#########################################################################
+
+# Circle plane -> normal in the command frame (WRF or TRF)
+_PLANE_NORMALS = {'XY': [0.0, 0.0, 1.0], 'XZ': [0.0, 1.0, 0.0], 'YZ': [1.0, 0.0, 0.0]}
+
+# Joint move onto the start of a path that does not begin at the current
+# position: fraction of the joint speed limits used for the quintic approach
+_APPROACH_SPEED_SCALE = 0.5
+
+
+def _num_samples(duration):
+    """Samples of a segment at the control rate (same as TrajectoryGenerator)."""
+    return int(duration / INTERVAL_S)
+
+
+def _line_path(start_pose, end_pose, s):
+    """Straight line with slerped orientation at path parameters s (0 -> 1), (N, 6) poses."""
+    start = np.asarray(start_pose, dtype=float)
+    end = np.asarray(end_pose, dtype=float)
+    positions = start[:3] + np.outer(s, end[:3] - start[:3])
+    orientations = CircularMotion()._slerp_orientation(start[3:], end[3:], s)
+    return np.hstack([positions, orientations])
+
+
+def _circle_path(center, radius, plane, duration, clockwise, start_pose):
+    """Full circle through the start position, start orientation kept."""
+    normal = np.array(_PLANE_NORMALS[plane])
+    if clockwise:
+        normal = -normal
+    path = CircularMotion().generate_circle_3d(center, radius, normal.tolist(), duration=duration,
+                                               start_point=list(start_pose[:3])).copy()
+    path[:, 3:] = start_pose[3:]
+    return path
+
+
+def _arc_path(start_pose, end_pose, center, duration, clockwise):
+    """
+    Arc about center from the start to the end pose.
+
+    The arc plane is given by start, end and center; its normal is oriented
+    towards +Z so clockwise means clockwise seen from above.
+    """
+    r1 = np.asarray(start_pose[:3], dtype=float) - center
+    r2 = np.asarray(end_pose[:3], dtype=float) - center
+    normal = np.cross(r1, r2)
+    if np.linalg.norm(normal) < 1e-6:
+        normal = np.array([0.0, 0.0, 1.0])
+    elif normal[2] < 0:
+        normal = -normal
+    return CircularMotion().generate_arc_3d(list(start_pose), list(end_pose), list(center),
+                                            normal=normal.tolist(), clockwise=clockwise,
+                                            duration=duration).copy()
+
+
+def _spline_path(start_pose, waypoints, duration):
+    """
+    Quintic spline from the start pose through the waypoints.
+
+    Waypoint times are proportional to the segment lengths (mm plus degrees
+    of rotation, so pure reorientations get time too), scaled to duration.
+    """
+    waypoints = np.asarray(waypoints, dtype=float)
+    start = np.asarray(start_pose, dtype=float)
+    if not np.allclose(waypoints[0], start, atol=1e-3):
+        waypoints = np.vstack([start, waypoints])
+
+    rotations = rotation_from_rpy(waypoints[:, 3:])
+    lengths = (np.linalg.norm(np.diff(waypoints[:, :3], axis=0), axis=1)
+               + np.rad2deg((rotations[:-1].inv() * rotations[1:]).magnitude()))
+    # Drop repeated waypoints (zero-length segments)
+    keep = np.concatenate([[True], lengths > 1e-6])
+    waypoints, lengths = waypoints[keep], lengths[keep[1:]]
+    if len(waypoints) < 2:
+        raise ValueError("Spline needs at least two distinct waypoints")
+
+    timestamps = duration * np.concatenate([[0.0], np.cumsum(lengths)]) / lengths.sum()
+    return SplineMotion().generate_quintic_spline(waypoints, timestamps=timestamps)
+
+
+class PlannedTrajectoryCommand(ExecuteTrajectoryCommand):
+    """
+    Base class of the commands planned in the background (SMOOTH_*,
+    MOVECART, MOVEPOSE).
+
+    prepare_for_execution() starts a planner thread that generates the
+    Cartesian path, solves IK for all of it in one batch
+    (batch_ik.solve_path, warm-started from the current joints) and builds
+    the joint setpoints, so the control loop never runs IK. The command
+    holds the robot idle until planning is done and then plays the joint
+    trajectory back at 100Hz like ExecuteTrajectoryCommand (collision
+    check and joint-speed retiming included).
+
+    Paths are defined in the command frame: 'WRF' (base) or 'TRF' (flange
+    at the start of the command). Subclasses implement _generate(), or
+    _joint_path() for paths planned in joint space.
+    """
+    def __init__(self, frame='WRF', start_pose=None, duration=None):
+        """
+        Parameters
+        ----------
+        frame : str
+            'WRF' or 'TRF'
+        start_pose : list of float, optional
+            [x, y, z, rx, ry, rz] (mm, degrees) in the command frame the path
+            starts from; None starts at the current pose
+        duration : float, optional
+            Path duration in seconds
+        """
+        self.is_valid = False
+        self.is_finished = False
+        self.error_state = False
+        self.error_message = None
+        self.command_step = 0
+        self.trajectory_steps = []
+        self.frame = frame
+        self.start_pose = None if start_pose is None else [float(v) for v in start_pose]
+        self.duration = duration
+        self._planner = None
+
+        logger.info(f"Initializing {type(self).__name__} ({frame}, duration={duration})...")
+
+        error = self._validate()
+        if error:
+            logger.debug(f"  -> VALIDATION FAILED: {error}")
+            return
+
+        self.is_valid = True
+        logger.debug(f"  -> {type(self).__name__} validated successfully")
+
+    def _validate(self):
+        """Parameter check; returns an error message or None."""
+        if self.frame not in ('WRF', 'TRF'):
+            return f"Unknown frame '{self.frame}'"
+        if self.start_pose is not None and len(self.start_pose) != 6:
+            return f"Start pose has {len(self.start_pose)} values (expected 6)"
+        if self.duration is not None and not _num_samples(self.duration) >= 2:
+            return f"Duration {self.duration}s is too short"
+        return None
+
+    def _generate(self, start_pose):
+        """(N, 6) poses [x, y, z, rx, ry, rz] (mm, degrees) in the command frame."""
+        raise NotImplementedError
+
+    def prepare_for_execution(self, current_position_in):
+        """Start planning in the background from the current joint position."""
+        current_rad = np.array([PAROL6_ROBOT.STEPS2RADS(p, i) for i, p in enumerate(current_position_in)])
+        self._planner = threading.Thread(target=self._plan, args=(current_rad,),
+                                         name=f"{type(self).__name__}Planner", daemon=True)
+        self._planner.start()
+
+    def _plan(self, current_rad):
+        """Planner thread: joint path -> joint setpoints."""
+        start_time = time.perf_counter()
+        try:
+            Q, self.error_message = self._joint_path(current_rad)
+            if not self.error_message:
+                Q = np.vstack([self._approach(current_rad, Q[0]), Q])
+                self.error_message = self._build_steps(current_rad, Q)
+        except Exception as e:
+            logger.error(f"[{type(self).__name__}] Planning failed: {e}", exc_info=True)
+            self.error_message = f"Planning failed: {e}"
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            if self.error_message:
+                logger.error(f"[{type(self).__name__}] {self.error_message} ({elapsed_ms:.0f} ms)")
+            else:
+                logger.info(f"[{type(self).__name__}] Planned {len(self.trajectory_steps)} steps "
+                            f"in {elapsed_ms:.0f} ms")
+
+    def _joint_path(self, current_rad):
+        """
+        Cartesian path from _generate(), solved with warm-started batch IK.
+
+        Returns
+        -------
+        tuple
+            (Q (N, 6) in radians, None) or (None, error message)
+        """
+        T_flange = kinematics_core.fkine(current_rad)
+        if self.start_pose is not None:
+            start_pose = self.start_pose
+        elif self.frame == 'TRF':
+            start_pose = [0.0] * 6
+        else:
+            start_pose = kinematics_core.matrix_to_pose(T_flange)[0].tolist()
+
+        poses = np.asarray(self._generate(start_pose), dtype=float)
+        if len(poses) == 0:
+            return None, "Empty path"
+
+        T = kinematics_core.pose_to_matrix(poses)
+        if self.frame == 'TRF':
+            T = T_flange @ T
+
+        result = batch_ik.solve_path(T, seed=current_rad, stop_on_failure=True)
+        failed = next((status for status in result['status'] if not status['success']), None)
+        if failed:
+            return None, f"IK failed at waypoint {failed['index']}: {failed['error']}"
+        return result['q'], None
+
+    @staticmethod
+    def _approach(q_from, q_to):
+        """Quintic joint move from q_from up to (excluding) q_to; empty if already there."""
+        delta = np.asarray(q_to) - np.asarray(q_from)
+        # Quintic peak speed is 1.875 * distance / duration
+        duration = 1.875 * np.max(np.abs(delta) / (_APPROACH_SPEED_SCALE * trajectory_timing.JOINT_MAX_SPEED_RAD))
+        n = int(np.ceil(duration / INTERVAL_S))
+        if n < 1 or np.max(np.abs(delta)) < 1e-4:
+            return np.empty((0, 6))
+        s = np.arange(n) / n
+        return q_from + np.outer(quintic_scaling(s), delta)
+
+    @property
+    def is_planning(self):
+        return self._planner is not None and self._planner.is_alive()
+
+    def execute_step(self, Position_in, Homed_in, Speed_out, Command_out, **kwargs):
+        """Idle while planning, then play back the trajectory (called at 100Hz)."""
+        if self.is_finished or not self.is_valid:
+            return True
+
+        if self.is_planning:
+            Speed_out[:] = [0] * 6
+            Command_out.value = 255
+            return False
+
+        if self.error_message:
+            self.error_state = True
+            self.is_finished = True
+            Speed_out[:] = [0] * 6
+            Command_out.value = 255
+            return True
+
+        return super().execute_step(Position_in, Homed_in, Speed_out, Command_out, **kwargs)
+
+
+class SmoothCircleCommand(PlannedTrajectoryCommand):
+    """Full circle in the XY, XZ or YZ plane of the command frame."""
+    def __init__(self, center, radius, plane, duration, clockwise=False, frame='WRF', start_pose=None):
+        self.center = [float(v) for v in center]
+        self.radius = float(radius)
+        self.plane = plane
+        self.clockwise = clockwise
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.center) != 3:
+            return "Center must have 3 values"
+        if self.radius <= 0:
+            return f"Radius {self.radius} must be positive"
+        if self.plane not in _PLANE_NORMALS:
+            return f"Unknown plane '{self.plane}'"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        return _circle_path(self.center, self.radius, self.plane, self.duration, self.clockwise, start_pose)
+
+
+class SmoothArcCenterCommand(PlannedTrajectoryCommand):
+    """Arc about a center point to an end pose (orientation slerped)."""
+    def __init__(self, end_pose, center, duration, clockwise=False, frame='WRF', start_pose=None):
+        self.end_pose = [float(v) for v in end_pose]
+        self.center = [float(v) for v in center]
+        self.clockwise = clockwise
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.end_pose) != 6:
+            return "End pose must have 6 values"
+        if len(self.center) != 3:
+            return "Center must have 3 values"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        return _arc_path(start_pose, self.end_pose, np.array(self.center), self.duration, self.clockwise)
+
+
+class SmoothArcParamCommand(PlannedTrajectoryCommand):
+    """
+    Arc of a given radius to an end pose, in the XY plane of the command
+    frame (Z is interpolated linearly).
+
+    Two arcs of the radius join start and end in each direction; arc_angle
+    above 180 degrees selects the longer one.
+    """
+    def __init__(self, end_pose, radius, arc_angle, duration, clockwise=False, frame='WRF', start_pose=None):
+        self.end_pose = [float(v) for v in end_pose]
+        self.radius = float(radius)
+        self.arc_angle = float(arc_angle)
+        self.clockwise = clockwise
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.end_pose) != 6:
+            return "End pose must have 6 values"
+        if self.radius <= 0:
+            return f"Radius {self.radius} must be positive"
+        if not 0 < self.arc_angle < 360:
+            return f"Arc angle {self.arc_angle} must be between 0 and 360 degrees"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        start = np.asarray(start_pose, dtype=float)
+        end = np.asarray(self.end_pose, dtype=float)
+        chord = end[:2] - start[:2]
+        half = np.linalg.norm(chord) / 2
+        if half < 1e-6 or half > self.radius + 1e-6:
+            raise ValueError(f"No arc of radius {self.radius}mm joins the start and end positions "
+                             f"({2 * half:.1f}mm apart)")
+
+        # Center on the left of the chord for the short counter-clockwise arc
+        left = np.array([-chord[1], chord[0]]) / (2 * half)
+        side = 1.0 if self.clockwise == (self.arc_angle > 180) else -1.0
+        center_xy = (start[:2] + end[:2]) / 2 + side * np.sqrt(max(self.radius**2 - half**2, 0.0)) * left
+
+        flat_end = np.concatenate([end[:2], start[2:3], end[3:]])
+        path = CircularMotion().generate_arc_3d(start.tolist(), flat_end.tolist(), [*center_xy, start[2]],
+                                                normal=[0.0, 0.0, 1.0], clockwise=self.clockwise,
+                                                duration=self.duration).copy()
+        path[:, 2] += np.linspace(0.0, 1.0, len(path)) * (end[2] - start[2])
+        return path
+
+
+class SmoothSplineCommand(PlannedTrajectoryCommand):
+    """Quintic spline through waypoints (zero velocity/acceleration at both ends)."""
+    def __init__(self, waypoints, duration, frame='WRF', start_pose=None):
+        self.waypoints = [[float(v) for v in waypoint] for waypoint in waypoints]
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.waypoints) == 0:
+            return "No waypoints"
+        if any(len(waypoint) != 6 for waypoint in self.waypoints):
+            return "Every waypoint must have 6 values"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        return _spline_path(start_pose, self.waypoints, self.duration)
+
+
+class SmoothHelixCommand(PlannedTrajectoryCommand):
+    """Helix about the Z axis of the command frame, start orientation kept."""
+    def __init__(self, center, radius, pitch, height, duration, clockwise=False, frame='WRF', start_pose=None):
+        self.center = [float(v) for v in center]
+        self.radius = float(radius)
+        self.pitch = float(pitch)
+        self.height = float(height)
+        self.clockwise = clockwise
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.center) != 3:
+            return "Center must have 3 values"
+        if self.radius <= 0 or self.pitch <= 0:
+            return "Radius and pitch must be positive"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        path = CircularMotion().generate_helix_3d(self.center, self.radius, self.pitch, self.height,
+                                                  duration=self.duration, clockwise=self.clockwise,
+                                                  start_point=list(start_pose[:3])).copy()
+        path[:, 3:] = start_pose[3:]
+        return path
+
+
+class SmoothBlendCommand(PlannedTrajectoryCommand):
+    """
+    Sequence of LINE, CIRCLE, ARC and SPLINE segments joined with
+    velocity-continuous blends (MotionBlender); each segment starts where
+    the previous one ends.
+    """
+    _SEGMENT_TYPES = ('LINE', 'CIRCLE', 'ARC', 'SPLINE')
+
+    def __init__(self, segment_definitions, blend_time=0.5, frame='WRF', start_pose=None):
+        self.segment_definitions = segment_definitions
+        self.blend_time = float(blend_time)
+        duration = sum(float(segment.get('duration', 0.0)) for segment in segment_definitions)
+        super().__init__(frame, start_pose, duration)
+
+    def _validate(self):
+        if len(self.segment_definitions) == 0:
+            return "No segments"
+        for i, segment in enumerate(self.segment_definitions):
+            if segment.get('type') not in self._SEGMENT_TYPES:
+                return f"Segment {i} has unknown type '{segment.get('type')}'"
+            if _num_samples(segment.get('duration', 0.0)) < 2:
+                return f"Segment {i} duration is too short"
+            if segment['type'] == 'CIRCLE' and segment.get('plane') not in _PLANE_NORMALS:
+                return f"Segment {i} has unknown plane '{segment.get('plane')}'"
+        if self.blend_time < 0:
+            return f"Blend time {self.blend_time} must not be negative"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        current = np.asarray(start_pose, dtype=float)
+        segments = []
+        for segment in self.segment_definitions:
+            kind, duration = segment['type'], segment['duration']
+            if kind == 'LINE':
+                path = _line_path(current, segment['end'], np.linspace(0.0, 1.0, _num_samples(duration)))
+            elif kind == 'CIRCLE':
+                path = _circle_path(segment['center'], segment['radius'], segment['plane'],
+                                    duration, segment.get('clockwise', False), current)
+            elif kind == 'ARC':
+                path = _arc_path(current, segment['end'], np.asarray(segment['center'], dtype=float),
+                                 duration, segment.get('clockwise', False))
+            else:
+                path = _spline_path(current, segment['waypoints'], duration)
+
+            # The first sample repeats the previous segment's last one
+            segments.append(path if not segments else path[1:])
+            current = path[-1]
+
+        return MotionBlender(self.blend_time, control_rate=1.0 / INTERVAL_S).blend_segments(segments)
+
+
+#########################################################################
+# Cartesian Move Commands
+#########################################################################
+
+# Move duration when neither a duration nor a speed is given (as MoveJoint)
+_DEFAULT_MOVE_DURATION_S = 2.0
+
+
+def _trapezoid_timing(velocity, acceleration):
+    """
+    Duration and blend time of a rest-to-rest trapezoidal profile over a
+    unit path (triangular when the peak velocity is not reached).
+    """
+    if velocity ** 2 / acceleration >= 1.0:
+        blend = np.sqrt(1.0 / acceleration)
+        return 2 * blend, blend
+    blend = velocity / acceleration
+    return 1.0 / velocity + blend, blend
+
+
+def _trapezoid_profile(duration, blend):
+    """Path parameter s (0 -> 1) of a trapezoidal profile, sampled at the control rate."""
+    n = max(int(np.ceil(duration / INTERVAL_S - 1e-9)), 1)
+    t = np.linspace(0.0, duration, n + 1)
+    velocity = 1.0 / (duration - blend)
+    acceleration = velocity / blend
+    return np.where(t < blend, acceleration / 2 * t ** 2,
+                    np.where(t <= duration - blend,
+                             acceleration / 2 * blend ** 2 + velocity * (t - blend),
+                             1.0 - acceleration / 2 * (duration - t) ** 2))
+
+
+class MoveCartCommand(PlannedTrajectoryCommand):
+    """
+    Straight-line move of the flange to a pose in WRF.
+
+    Position moves on a line and orientation is slerped, both following a
+    trapezoidal profile. With a speed percentage, the Cartesian linear and
+    angular speed/acceleration limits of robot_model set the timing
+    (whichever of translation and rotation is slower sets the pace).
+    """
+    def __init__(self, pose, duration=None, velocity_percent=None, accel_percent=50):
+        self.pose = [float(v) for v in pose]
+        self.velocity_percent = velocity_percent
+        self.accel_percent = accel_percent
+        if duration is None and velocity_percent is None:
+            duration = _DEFAULT_MOVE_DURATION_S
+        elif duration is not None and velocity_percent is not None:
+            logger.debug("  -> INFO: Both duration and velocity were provided. Using duration.")
+        super().__init__('WRF', None, duration)
+
+    def _validate(self):
+        if len(self.pose) != 6:
+            return "Pose must have 6 values"
+        if self.velocity_percent is not None and not 0 < self.velocity_percent <= 100:
+            return f"Speed {self.velocity_percent}% must be in (0, 100]"
+        if not 0 < self.accel_percent <= 100:
+            return f"Acceleration {self.accel_percent}% must be in (0, 100]"
+        return super()._validate()
+
+    def _generate(self, start_pose):
+        start = np.asarray(start_pose, dtype=float)
+        end = np.asarray(self.pose, dtype=float)
+        distance = np.linalg.norm(end[:3] - start[:3])
+        angle = np.rad2deg((rotation_from_rpy(start[3:]).inv() * rotation_from_rpy(end[3:])).magnitude())
+        if distance < 1e-3 and angle < 1e-3:
+            return end[np.newaxis]
+
+        if self.duration:
+            duration, blend = self.duration, self.duration / 3
+        else:
+            linear_speed = np.interp(self.velocity_percent, [0, 100], [PAROL6_ROBOT.Cartesian_linear_velocity_min,
+                                                                       PAROL6_ROBOT.Cartesian_linear_velocity_max]) * 1000
+            linear_acc = np.interp(self.accel_percent, [0, 100], [PAROL6_ROBOT.Cartesian_linear_acc_min,
+                                                                  PAROL6_ROBOT.Cartesian_linear_acc_max]) * 1000
+            angular_speed = np.interp(self.velocity_percent, [0, 100], [PAROL6_ROBOT.Cartesian_angular_velocity_min,
+                                                                        PAROL6_ROBOT.Cartesian_angular_velocity_max])
+            # No angular acceleration limit: ramp up in the same time as the translation
+            angular_acc = angular_speed * linear_acc / linear_speed
+
+            # Limits per unit of path parameter; the slower motion sets the pace
+            velocity = min(linear_speed / max(distance, 1e-3), angular_speed / max(angle, 1e-3))
+            acceleration = min(linear_acc / max(distance, 1e-3), angular_acc / max(angle, 1e-3))
+            duration, blend = _trapezoid_timing(velocity, acceleration)
+            logger.debug(f"  -> MoveCart {distance:.1f}mm / {angle:.1f}deg in {duration:.2f}s")
+
+        return _line_path(start, end, _trapezoid_profile(duration, blend))
+
+
+class MovePoseCommand(MoveCartCommand):
+    """
+    Joint-interpolated move of the flange to a pose in WRF.
+
+    The target is solved once (warm-started from the current joints, so the
+    closest IK branch is kept) and all joints move on a synchronized
+    trapezoidal profile. With a speed percentage, the joint speed and
+    acceleration limits of robot_model set the timing, like MoveJoint.
+    """
+    def _joint_path(self, current_rad):
+        result = batch_ik.solve_path(kinematics_core.pose_to_matrix(self.pose), seed=current_rad)
+        status = result['status'][0]
+        if not status['success']:
+            return None, f"IK failed: {status['error']}"
+
+        q_target = result['q'][0]
+        delta = q_target - current_rad
+        moving = np.abs(delta) > 1e-6
+        if not moving.any():
+            return q_target[np.newaxis], None
+
+        if self.duration:
+            duration, blend = self.duration, self.duration / 3
+        else:
+            joint_speed = np.array([
+                PAROL6_ROBOT.SPEED_STEP2RAD(np.interp(self.velocity_percent, [0, 100], [v_min, v_max]), i)
+                for i, (v_min, v_max) in enumerate(zip(PAROL6_ROBOT.Joint_min_speed, PAROL6_ROBOT.Joint_max_speed))
+            ])
+            joint_acc = np.interp(self.accel_percent, [0, 100], [PAROL6_ROBOT.Joint_min_acc, PAROL6_ROBOT.Joint_max_acc])
+
+            # Limits per unit of path parameter; the slowest joint sets the pace
+            distance = np.abs(delta[moving])
+            duration, blend = _trapezoid_timing(np.min(joint_speed[moving] / distance),
+                                                np.min(joint_acc / distance))
+
+        return current_rad + np.outer(_trapezoid_profile(duration, blend), delta), None
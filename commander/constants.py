@@ -61,6 +61,21 @@ IK_SINGULARITY_THRESHOLD = 0.001  # Manipulability threshold for singularity det
 IK_DEFAULT_DAMPING = 0.0000001  # Default damping for IK solver
 IK_RECOVERY_DAMPING = 0.0000001  # Damping for recovery (inward) movements
 
+# ============================================================================
+# Jog Constants
+# ============================================================================
+
+# Jog commands that refresh a running jog of the same kind in place
+JOG_COMMAND_NAMES = ('JOG', 'MULTIJOG', 'CARTJOG')
+
+# Deadman: a jog stops when its duration window passes without a refresh.
+# Distance jogs (no duration) get their estimated travel time plus this margin
+JOG_DEADMAN_TIMEOUT_S = 0.2
+
+# Cartesian jog (damped-least-squares velocity IK)
+CART_JOG_DLS_DAMPING_MAX = 0.05  # Damping at a singularity (ramps in below IK_SINGULARITY_THRESHOLD)
+CART_JOG_POSE_GAIN = 10.0  # Pose error feedback gain (1/s) keeping the jog on its line/axis
+
 # ============================================================================
 # Robot Physical Constants
 # ============================================================================
@@ -116,6 +131,20 @@ TRAJECTORY_COMMAND_MAX_SIZE = 10  # Maximum number of trajectory-heavy commands
 
 # Command ID format
 COMMAND_ID_LENGTH = 8  # Length of command ID string
+COMMAND_SEQUENCE_SEPARATOR = "#"  # [cmd_id#seq]COMMAND - optional client sequence number
+
+# Reliable delivery (duplicate suppression for client retransmits)
+COMMAND_DEDUPE_WINDOW_SIZE = 1024  # Maximum command IDs remembered for duplicate detection
+COMMAND_DEDUPE_TTL_S = 60.0  # Forget command IDs older than this (seconds)
+
+# Batch envelope: BATCH|count\n[id1]CMD1|...\n[id2]CMD2|...
+BATCH_ITEM_SEPARATOR = "\n"  # Separates commands inside a BATCH datagram
+BATCH_MAX_ITEMS = 100  # Maximum commands per batch (bounded by COMMAND_QUEUE_MAX_SIZE)
+
+# ACK delivery: ACKs are buffered during the cycle and flushed once per cycle,
+# one datagram per destination (one ACK per line)
+ACK_DEFAULT_SUBSCRIBERS = ("127.0.0.1",)  # Hosts that receive every ACK (besides the sender)
+ACK_PACKET_MAX_BYTES = 60000  # Split coalesced ACKs above this size (UDP limit ~65507)
 
 # ============================================================================
 # Serial Communication Constants
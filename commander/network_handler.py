@@ -12,7 +12,7 @@ import socket
 import select
 import logging
 import time
-from collections import deque
+from collections import deque, OrderedDict
 from typing import Optional, Tuple, Dict, Any, List
 from dataclasses import dataclass
 
@@ -20,6 +20,12 @@ from constants import (
     UDP_COMMAND_PORT,
     UDP_ACK_PORT,
     COMMAND_COOLDOWN_S,
+    COMMAND_SEQUENCE_SEPARATOR,
+    COMMAND_DEDUPE_WINDOW_SIZE,
+    COMMAND_DEDUPE_TTL_S,
+    BATCH_ITEM_SEPARATOR,
+    ACK_DEFAULT_SUBSCRIBERS,
+    ACK_PACKET_MAX_BYTES,
 )
 
 
@@ -47,10 +53,11 @@ class NetworkHandler:
 
     Responsibilities:
     - Receive commands on UDP port (non-blocking)
-    - Send acknowledgments on separate port
+    - Send acknowledgments on separate port (coalesced once per cycle)
     - Buffer incoming commands with rate limiting
     - Track command IDs and sender addresses
     - Parse command IDs from messages
+    - Suppress duplicate datagrams (client retransmits) by command ID
     """
 
     def __init__(self,
@@ -58,7 +65,10 @@ class NetworkHandler:
                  listen_ip: str = "0.0.0.0",  # 绑定所有网络接口，允许外部网络访问
                  command_port: int = UDP_COMMAND_PORT,
                  ack_port: int = UDP_ACK_PORT,
-                 buffer_max_size: int = 100):
+                 buffer_max_size: int = 100,
+                 dedupe_window_size: int = COMMAND_DEDUPE_WINDOW_SIZE,
+                 dedupe_ttl_s: float = COMMAND_DEDUPE_TTL_S,
+                 ack_subscribers: Optional[List[str]] = None):
         """
         Initialize network handler.
 
@@ -68,6 +78,10 @@ class NetworkHandler:
             command_port: Port for receiving commands (default: 5001)
             ack_port: Port for sending acknowledgments (default: 5002)
             buffer_max_size: Maximum commands in buffer (default: 100)
+            dedupe_window_size: Maximum command IDs remembered for duplicate detection
+            dedupe_ttl_s: Age after which a command ID is forgotten (seconds)
+            ack_subscribers: Hosts that receive every ACK besides the sender
+                             (default: localhost, for the local API server)
         """
         self.logger = logger
         self.listen_ip = listen_ip
@@ -83,11 +97,30 @@ class NetworkHandler:
         self.incoming_buffer = deque(maxlen=buffer_max_size)
         self.last_processed_time = 0
 
+        # Dedupe window: cmd_id -> [first_seen, last_ack_message or None]
+        # A retransmitted datagram whose ID is still in the window is never
+        # re-queued; the last ACK sent for it is replayed instead.
+        self.dedupe_window_size = dedupe_window_size
+        self.dedupe_ttl_s = dedupe_ttl_s
+        self._dedupe_window: "OrderedDict[str, list]" = OrderedDict()
+
+        # ACK delivery: host -> ACK messages buffered until flush_acks()
+        self.ack_subscribers: List[str] = list(
+            ACK_DEFAULT_SUBSCRIBERS if ack_subscribers is None else ack_subscribers)
+        self._pending_acks: Dict[str, List[str]] = {}
+
+        # Highest sequence number seen per sender address
+        self._last_sequence: Dict[Tuple[str, int], int] = {}
+
         # Statistics
         self.commands_received = 0
         self.commands_processed = 0
         self.acks_sent = 0
+        self.ack_datagrams_sent = 0
         self.network_errors = 0
+        self.duplicates_dropped = 0
+        self.acks_replayed = 0
+        self.sequence_gaps = 0
 
     def initialize(self) -> bool:
         """
@@ -133,6 +166,10 @@ class NetworkHandler:
         """
         Receive all pending UDP commands (non-blocking).
 
+        Datagrams carrying a command ID that is still in the dedupe window
+        are dropped here (and their last ACK replayed to the sender), so each
+        command ID is executed at most once regardless of client retransmits.
+
         Returns:
             List of tuples: (raw_message, command_id, parsed_message, sender_address)
 
@@ -157,6 +194,13 @@ class NetworkHandler:
                 if raw_message:
                     # Parse command ID if present
                     cmd_id, parsed_message = self._parse_command_id(raw_message)
+                    cmd_id, sequence = self._split_sequence(cmd_id)
+
+                    if cmd_id and self._is_duplicate(cmd_id, addr):
+                        continue
+
+                    if sequence is not None:
+                        self._track_sequence(addr, sequence)
 
                     commands.append((raw_message, cmd_id, parsed_message, addr))
                     self.commands_received += 1
@@ -167,6 +211,56 @@ class NetworkHandler:
 
         return commands
 
+    def _is_duplicate(self, cmd_id: str, addr: Tuple[str, int]) -> bool:
+        """
+        Check a command ID against the dedupe window, registering it if new.
+
+        Duplicates replay the last ACK sent for the ID (if any) so a client
+        whose ACK was lost stops retransmitting.
+
+        Args:
+            cmd_id: Command ID from the datagram
+            addr: Sender address (ip, port)
+
+        Returns:
+            True if the command was already received and must be dropped
+        """
+        now = time.time()
+        self._expire_dedupe_window(now)
+
+        entry = self._dedupe_window.get(cmd_id)
+        if entry is None:
+            self._dedupe_window[cmd_id] = [now, None]
+            while len(self._dedupe_window) > self.dedupe_window_size:
+                self._dedupe_window.popitem(last=False)
+            return False
+
+        self.duplicates_dropped += 1
+        last_ack = entry[1]
+        if last_ack:
+            self._queue_ack(addr[0], last_ack)
+            self.acks_replayed += 1
+
+        self.logger.debug(f"[NetworkHandler] Dropped duplicate command {cmd_id} from {addr}")
+        return True
+
+    def _expire_dedupe_window(self, now: float):
+        """Drop dedupe entries older than the TTL (oldest entries are first)"""
+        while self._dedupe_window:
+            oldest_id, (first_seen, _) = next(iter(self._dedupe_window.items()))
+            if now - first_seen <= self.dedupe_ttl_s:
+                break
+            del self._dedupe_window[oldest_id]
+
+    def _track_sequence(self, addr: Tuple[str, int], sequence: int):
+        """Record sender sequence number and count gaps (lost or reordered datagrams)"""
+        last = self._last_sequence.get(addr)
+        if last is not None and sequence != last + 1:
+            self.sequence_gaps += 1
+            self.logger.debug(f"[NetworkHandler] Sequence gap from {addr}: {last} -> {sequence}")
+        if last is None or sequence > last:
+            self._last_sequence[addr] = sequence
+
     def buffer_command(self, raw_message: str, addr: Tuple[str, int]):
         """
         Add command to processing buffer with rate limiting.
@@ -232,15 +326,19 @@ class NetworkHandler:
                  details: str = "",
                  addr: Optional[Tuple[str, int]] = None):
         """
-        Send acknowledgment to client.
+        Queue acknowledgment for the sender and all ACK subscribers.
+
+        ACKs are buffered and go out on the next flush_acks() call (once per
+        control cycle), coalesced into one datagram per destination host.
 
         Args:
             command_id: Command ID to acknowledge (None = no ACK sent)
             status: Status string (QUEUED, EXECUTING, COMPLETED, FAILED, CANCELLED, INVALID)
             details: Optional details/error message
-            addr: Sender address (ip, port) or None for broadcast only
+            addr: Sender address (ip, port) or None for subscribers only
 
         ACK Format: ACK|{command_id}|{status}|{details}
+        Datagram Format: one ACK per line (newline separated)
 
         Status Values:
             - QUEUED: Command added to queue
@@ -252,6 +350,7 @@ class NetworkHandler:
 
         Example:
             handler.send_ack("abc123", "COMPLETED", "Motion finished")
+            handler.flush_acks()
             # Sends: "ACK|abc123|COMPLETED|Motion finished"
         """
         if not command_id:
@@ -261,22 +360,81 @@ class NetworkHandler:
             self.logger.warning("[NetworkHandler] ACK socket not initialized")
             return
 
+        # Newlines separate ACKs inside a coalesced datagram
+        details = str(details).replace('\n', ' ')
         ack_message = f"ACK|{command_id}|{status}|{details}"
 
-        # Send to original sender if we have their address
+        # Remember the latest ACK so duplicates of this command can replay it
+        entry = self._dedupe_window.get(command_id)
+        if entry is not None:
+            entry[1] = ack_message
+
+        # Sender first, then subscribers (each host receives the ACK once)
         if addr:
-            try:
-                self.ack_socket.sendto(ack_message.encode('utf-8'), (addr[0], self.ack_port))
-                self.acks_sent += 1
-            except Exception as e:
-                self.logger.error(f"[NetworkHandler] Failed to send ACK to {addr}: {e}")
-                self.network_errors += 1
-
-        # Also broadcast to localhost (for local clients)
+            self._queue_ack(addr[0], ack_message)
+        for host in self.ack_subscribers:
+            if not addr or host != addr[0]:
+                self._queue_ack(host, ack_message)
+        self.acks_sent += 1
+
+    def _queue_ack(self, host: str, ack_message: str):
+        """Buffer an ACK for a destination host until the next flush"""
+        self._pending_acks.setdefault(host, []).append(ack_message)
+
+    def flush_acks(self) -> int:
+        """
+        Send all buffered ACKs, one datagram per destination host.
+
+        Call once per control cycle. Oversized batches are split at
+        ACK_PACKET_MAX_BYTES.
+
+        Returns:
+            Number of datagrams sent
+        """
+        if not self._pending_acks or not self.ack_socket:
+            return 0
+
+        pending = self._pending_acks
+        self._pending_acks = {}
+        datagrams = 0
+
+        for host, messages in pending.items():
+            packet = []
+            packet_size = 0
+            for message in messages:
+                size = len(message) + 1
+                if packet and packet_size + size > ACK_PACKET_MAX_BYTES:
+                    datagrams += self._send_ack_datagram(host, packet)
+                    packet, packet_size = [], 0
+                packet.append(message)
+                packet_size += size
+            if packet:
+                datagrams += self._send_ack_datagram(host, packet)
+
+        self.ack_datagrams_sent += datagrams
+        return datagrams
+
+    def _send_ack_datagram(self, host: str, messages: List[str]) -> int:
+        """Send newline-joined ACKs to host; returns 1 if sent"""
         try:
-            self.ack_socket.sendto(ack_message.encode('utf-8'), ('127.0.0.1', self.ack_port))
-        except:
-            pass  # Silent failure for broadcast
+            self.ack_socket.sendto('\n'.join(messages).encode('utf-8'), (host, self.ack_port))
+            return 1
+        except Exception as e:
+            self.logger.error(f"[NetworkHandler] Failed to send ACKs to {host}: {e}")
+            self.network_errors += 1
+            return 0
+
+    def add_ack_subscriber(self, host: str):
+        """Receive every ACK at host (in addition to the command sender)"""
+        if host not in self.ack_subscribers:
+            self.ack_subscribers.append(host)
+            self.logger.info(f"[NetworkHandler] ACK subscriber added: {host}")
+
+    def remove_ack_subscriber(self, host: str):
+        """Stop sending ACKs for other clients' commands to host"""
+        if host in self.ack_subscribers:
+            self.ack_subscribers.remove(host)
+            self.logger.info(f"[NetworkHandler] ACK subscriber removed: {host}")
 
     def send_response(self, message: str, addr: Tuple[str, int]):
         """
@@ -357,6 +515,61 @@ class NetworkHandler:
 
         return None, message
 
+    @classmethod
+    def unpack_batch(cls, message: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Split a BATCH envelope into its commands.
+
+        Format: BATCH|count\n[id1]COMMAND|params\n[id2]COMMAND|params...
+
+        Args:
+            message: Envelope with the batch ID already stripped
+
+        Returns:
+            List of (item_command_id or None, command_message) in order
+
+        Raises:
+            ValueError: If the declared count does not match the items
+
+        Example:
+            >>> unpack_batch("BATCH|2\n[a1]DELAY|1\n[a2]HOME")
+            [("a1", "DELAY|1"), ("a2", "HOME")]
+        """
+        header, _, body = message.partition(BATCH_ITEM_SEPARATOR)
+        header_parts = header.split('|')
+        items = [line.strip() for line in body.split(BATCH_ITEM_SEPARATOR) if line.strip()]
+
+        if len(header_parts) > 1 and header_parts[1]:
+            declared = int(header_parts[1])
+            if declared != len(items):
+                raise ValueError(f"Batch declares {declared} commands but carries {len(items)}")
+
+        return [cls._parse_command_id(item) for item in items]
+
+    @staticmethod
+    def _split_sequence(cmd_id: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Split an optional sequence number off a command ID.
+
+        Format: cmd_id#seq (sequence numbers are assigned by the client and
+        kept identical across retransmits of the same command)
+
+        Example:
+            >>> _split_sequence("abc12345#17")
+            ("abc12345", 17)
+
+            >>> _split_sequence("abc12345")
+            ("abc12345", None)
+        """
+        if not cmd_id or COMMAND_SEQUENCE_SEPARATOR not in cmd_id:
+            return cmd_id, None
+
+        base_id, _, seq_str = cmd_id.rpartition(COMMAND_SEQUENCE_SEPARATOR)
+        try:
+            return base_id, int(seq_str)
+        except ValueError:
+            return cmd_id, None
+
     # ========================================================================
     # Statistics and Status
     # ========================================================================
@@ -376,9 +589,15 @@ class NetworkHandler:
             'commands_received': self.commands_received,
             'commands_processed': self.commands_processed,
             'acks_sent': self.acks_sent,
+            'ack_datagrams_sent': self.ack_datagrams_sent,
+            'ack_subscribers': list(self.ack_subscribers),
             'network_errors': self.network_errors,
             'buffer_size': self.buffer_size,
             'buffer_max_size': self.buffer_max_size,
+            'duplicates_dropped': self.duplicates_dropped,
+            'acks_replayed': self.acks_replayed,
+            'sequence_gaps': self.sequence_gaps,
+            'dedupe_window_size': len(self._dedupe_window),
         }
 
     def reset_stats(self):
@@ -386,7 +605,11 @@ class NetworkHandler:
         self.commands_received = 0
         self.commands_processed = 0
         self.acks_sent = 0
+        self.ack_datagrams_sent = 0
         self.network_errors = 0
+        self.duplicates_dropped = 0
+        self.acks_replayed = 0
+        self.sequence_gaps = 0
 
 
 # ============================================================================
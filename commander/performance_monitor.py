@@ -68,6 +68,7 @@ class PerformanceMonitor:
     - Statistical analysis (mean, median, percentiles)
     - Budget violations (cycles exceeding 10ms target)
     - Historical data for trending
+    - Event counters (e.g. trajectory cache hits/misses), always on
     """
 
     def __init__(self,
@@ -112,6 +113,9 @@ class PerformanceMonitor:
         self._hz_last_calc_time = time.time()
         self._current_hz = 0.0
 
+        # Event counters (always on, one dict increment per event)
+        self._counters = {}
+
         # Detailed timing data (enabled by debug_mode OR collect_samples)
         if self._debug_mode or self._collect_samples:
             self._cycle_times = deque(maxlen=window_size)
@@ -291,6 +295,29 @@ class PerformanceMonitor:
         """
         return self._current_hz
 
+    # ========================================================================
+    # Event Counters
+    # ========================================================================
+
+    def increment_counter(self, name: str, amount: int = 1):
+        """
+        Count an event (cheap enough for the control loop).
+
+        Args:
+            name: Counter name (e.g., 'trajectory_cache_hits')
+            amount: Increment (default: 1)
+        """
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Get a snapshot of all event counters.
+
+        Returns:
+            Dictionary of counter name -> count
+        """
+        return dict(self._counters)
+
     # ========================================================================
     # Phase Timing
     # ========================================================================
@@ -339,8 +366,9 @@ class PerformanceMonitor:
         phase_time_s = time.perf_counter() - self._phase_start
         phase_time_ms = phase_time_s * 1000
 
-        # Store phase time
-        self._current_timings[phase_name] = phase_time_ms
+        # Store phase time (accumulated: a phase may run more than once per
+        # cycle, e.g. 'network' for command reception and the ACK flush)
+        self._current_timings[phase_name] = self._current_timings.get(phase_name, 0.0) + phase_time_ms
 
         # Reset
         self._phase_start = None
@@ -398,7 +426,8 @@ class PerformanceMonitor:
         if not (self._debug_mode or self._collect_samples):
             return {
                 'hz': self._current_hz,
-                'mode': 'production'
+                'mode': 'production',
+                'counters': self.get_counters()
             }
 
         if not self._cycle_times:
@@ -445,6 +474,8 @@ class PerformanceMonitor:
             'last_violation_time': self._last_violation_time,
         }
 
+        stats['counters'] = self.get_counters()
+
         # General info
         stats['info'] = {
             'target_hz': self.target_hz,
@@ -499,9 +530,15 @@ class PerformanceMonitor:
             f"  Critical: {stats['violations']['critical_count']}",
             f"  Over budget: {stats['violations']['over_budget_count']} "
             f"({stats['violations']['over_budget_percentage']:.1f}%)",
-            "=" * 50,
         ]
 
+        if self._counters:
+            lines.append("")
+            lines.append("Counters:")
+            lines.extend(f"  {name}: {count}" for name, count in sorted(self._counters.items()))
+
+        lines.append("=" * 50)
+
         return "\n".join(lines)
 
     def print_summary(self):
@@ -525,6 +562,7 @@ class PerformanceMonitor:
         self._warning_violations = 0
         self._critical_violations = 0
         self._total_cycles = 0
+        self._counters.clear()
 
         self.logger.info("[PerfMonitor] Statistics reset")
 
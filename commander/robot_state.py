@@ -16,6 +16,7 @@ from spatialmath import SE3
 
 # Import robot model for unit conversions and kinematics
 from lib.kinematics import robot_model as PAROL6_ROBOT
+from lib.kinematics import kinematics_core
 
 
 # ============================================================================
@@ -102,7 +103,7 @@ class RobotState:
         """
         if self.pose_matrix is None:
             q = np.array(self.joints_position_rad)
-            pose_matrix = PAROL6_ROBOT.robot.fkine(q).A
+            pose_matrix = kinematics_core.fkine(q)
             object.__setattr__(self, 'pose_matrix', pose_matrix)
 
         return SE3(self.pose_matrix, check=False)
@@ -5,21 +5,55 @@ Contains IK/FK solvers, robot model, and trajectory generation.
 
 Exports:
 - ik_solver: Inverse kinematics solving functions
+- analytic_ik: Closed-form inverse kinematics (all 8 branches, vectorized)
+- batch_ik: Warm-started IK for whole Cartesian paths (chunkable)
+- ik_seed_cache: Bounded spatial cache of IK solutions for warm starts
+- workspace_map: Precomputed voxel reachability/manipulability map (mmap)
+- collision: Capsule self/environment collision checking (vectorized)
+- trajectory_timing: Singularity pre-scan and joint-speed-limited retiming
+- scurve: Jerk-limited, time-synchronized online joint trajectories
+- input_shaping: ZV/ZVD/EI shaping of joint setpoints and vibration identification
+- kinematics_core: Plain-NumPy DH forward kinematics (batched)
 - robot_model: PAROL6 robot kinematic model
 - trajectory_math: Trajectory generation (circular, spline, etc.)
 """
 
 # Import submodules so they can be accessed as:
 from . import ik_solver
+from . import analytic_ik
+from . import batch_ik
+from . import ik_seed_cache
+from . import workspace_map
+from . import collision
+from . import trajectory_timing
+from . import scurve
+from . import input_shaping
+from . import kinematics_core
 from . import robot_model
 from . import trajectory_math
 
 # Also expose commonly used items directly
 from .ik_solver import solve_ik_with_adaptive_tol_subdivision, IKResult
-from .robot_model import robot, check_joint_limits
+from .robot_model import check_joint_limits
+
+
+def __getattr__(name):
+    # robot_model.robot imports roboticstoolbox - only build it when used
+    if name == 'robot':
+        return robot_model.robot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'ik_solver',
+    'analytic_ik',
+    'batch_ik',
+    'ik_seed_cache',
+    'workspace_map',
+    'collision',
+    'trajectory_timing',
+    'scurve',
+    'input_shaping',
+    'kinematics_core',
     'robot_model',
     'trajectory_math',
     'solve_ik_with_adaptive_tol_subdivision',
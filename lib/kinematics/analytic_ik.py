@@ -0,0 +1,326 @@
+"""
+Closed-Form Inverse Kinematics for PAROL6 Robot
+
+The PAROL6 has a spherical wrist (J4, J5 and J6 axes intersect at the wrist
+center) and no lateral offsets in the arm (d2 = d3 = 0), so IK decouples:
+
+1. Wrist center from the flange pose: p_w = p - a6 * z6
+2. J1 from the wrist center direction (shoulder front/back)
+3. J2, J3 from a planar two-link problem (elbow up/down)
+4. J4, J5, J6 from R36 = R03^T * R, a ZYZ Euler decomposition (wrist flip)
+
+This yields up to 8 solution branches per pose. Every function is
+vectorized over N poses; all branches of all poses are solved in one pass.
+
+The numerical solver in ik_solver.py (robot.ik_LM) remains the fallback for
+poses the closed form rejects and serves as a cross-check
+(see cross_check_numerical).
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import numpy as np
+
+from .kinematics_core import (
+    a1, a2, a3, a4, a5, a6,
+    JOINT_LIMITS_RAD,
+    dh_transforms,
+    fkine_all,
+    fkine_batch,
+)
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+NUM_BRANCHES = 8
+
+# Branch index = 4 * shoulder + 2 * elbow + wrist (bit set = flipped)
+BRANCH_LABELS = [
+    (shoulder, elbow, wrist)
+    for shoulder in ('front', 'back')
+    for elbow in ('up', 'down')
+    for wrist in ('noflip', 'flip')
+]
+
+# Forearm as a single link from J3 to the wrist center
+_FOREARM_LENGTH = np.hypot(a4, a5)
+_FOREARM_ANGLE = np.arctan2(-a5, -a4)
+
+_WRIST_SINGULAR_EPS = 1e-9  # |sin(q5)| below this: J4/J6 axes aligned
+_RESIDUAL_TOL = 1e-6  # Max position (m) / rotation error accepted per branch
+
+_SHOULDER_SIGN = np.array([1, 1, 1, 1, -1, -1, -1, -1])
+_ELBOW_SIGN = np.array([1, 1, -1, -1, 1, 1, -1, -1])
+_WRIST_SIGN = np.array([1, -1, 1, -1, 1, -1, 1, -1])
+
+
+# ============================================================================
+# Batched Solver
+# ============================================================================
+
+def _wrap_into_limits(q, joint_limits):
+    """Shift every angle by a multiple of 2*pi into [lower, lower + 2*pi)."""
+    lower = joint_limits[:, 0]
+    return lower + np.mod(q - lower, 2 * np.pi)
+
+
+def solve_all_batch(T, joint_limits=JOINT_LIMITS_RAD, q_ref=None):
+    """
+    All IK branches for a batch of flange poses.
+
+    Parameters
+    ----------
+    T : array_like, shape (4, 4) or (N, 4, 4)
+        Target flange poses (base frame, metres)
+    joint_limits : array_like, shape (6, 2), optional
+        Joint limits in radians used to wrap and filter solutions
+        (None disables limit filtering)
+    q_ref : array_like, shape (6,) or (N, 6), optional
+        Reference configuration; at a wrist singularity J4 keeps its
+        reference value (J4 + J6 is the only determined quantity)
+
+    Returns
+    -------
+    Q : ndarray, shape (N, 8, 6)
+        Joint solutions per branch (NaN where unreachable)
+    valid : ndarray of bool, shape (N, 8)
+        True where the branch reaches the pose within joint limits
+    """
+    T = np.asarray(T, dtype=float)
+    if T.ndim == 2:
+        T = T[np.newaxis]
+    n_poses = T.shape[0]
+
+    R = T[:, :3, :3]
+    p = T[:, :3, 3]
+    p_w = p - a6 * R[:, :, 2]
+
+    # ── J1: shoulder front/back ───────────────────────────────────────────
+    q1_front = np.arctan2(p_w[:, 1], p_w[:, 0])
+    q1 = q1_front[:, np.newaxis] + np.where(_SHOULDER_SIGN > 0, 0.0, np.pi)  # (N, 8)
+
+    # Wrist center in the J2 plane (u along x1, w along y1 = -z0)
+    u = np.cos(q1) * p_w[:, 0:1] + np.sin(q1) * p_w[:, 1:2] - a2
+    w = -(p_w[:, 2:3] - a1)
+
+    # ── J2, J3: planar two-link (upper arm a3, forearm to wrist center) ──
+    cos_psi = (u ** 2 + w ** 2 - a3 ** 2 - _FOREARM_LENGTH ** 2) / (2 * a3 * _FOREARM_LENGTH)
+    reachable = np.abs(cos_psi) <= 1.0 + 1e-12
+    psi = _ELBOW_SIGN * np.arccos(np.clip(cos_psi, -1.0, 1.0))
+
+    q3 = _FOREARM_ANGLE - psi
+    q2 = np.arctan2(w, u) - np.arctan2(_FOREARM_LENGTH * np.sin(psi),
+                                       a3 + _FOREARM_LENGTH * np.cos(psi))
+
+    # ── J4, J5, J6: ZYZ decomposition of the wrist rotation ──────────────
+    q_arm = np.stack([q1, q2, q3], axis=-1).reshape(-1, 3)
+    links = dh_transforms(q_arm)
+    R03 = (links[:, 0] @ links[:, 1] @ links[:, 2])[:, :3, :3].reshape(n_poses, NUM_BRANCHES, 3, 3)
+
+    R36 = np.swapaxes(R03, -1, -2) @ R[:, np.newaxis]
+    M = R36 * np.array([1.0, -1.0, -1.0])  # R36 * Rx(pi) = Rz(q4) Ry(q5) Rz(q6 + pi/2)
+
+    s5 = _WRIST_SIGN * np.hypot(M[..., 0, 2], M[..., 1, 2])
+    q5 = np.arctan2(s5, M[..., 2, 2])
+    q4 = np.arctan2(_WRIST_SIGN * M[..., 1, 2], _WRIST_SIGN * M[..., 0, 2])
+    q6 = np.arctan2(_WRIST_SIGN * M[..., 2, 1], -_WRIST_SIGN * M[..., 2, 0])
+
+    # Wrist singularity: only q4 + q6 (q5 = 0) or q6 - q4 (q5 = pi) is defined
+    singular = np.abs(s5) < _WRIST_SINGULAR_EPS
+    if np.any(singular):
+        if q_ref is not None:
+            q4_ref = np.broadcast_to(np.asarray(q_ref, dtype=float)[..., 3:4], (n_poses, 1))
+        else:
+            q4_ref = np.zeros((n_poses, 1))
+        q4_fixed = np.broadcast_to(q4_ref, q4.shape)
+        flipped = M[..., 2, 2] < 0
+        q6_sum = np.arctan2(M[..., 1, 0], M[..., 0, 0]) - q4_fixed
+        q6_diff = np.arctan2(M[..., 1, 0], M[..., 1, 1]) + q4_fixed
+        q4 = np.where(singular, q4_fixed, q4)
+        q6 = np.where(singular, np.where(flipped, q6_diff, q6_sum), q6)
+        q5 = np.where(singular, np.where(flipped, np.pi, 0.0), q5)
+        # Both wrist branches coincide - keep one
+        reachable = reachable & ~(singular & (_WRIST_SIGN < 0))
+
+    q6 = q6 - np.pi / 2  # DH offset of J6
+
+    Q = np.stack([q1, q2, q3, q4, q5, q6], axis=-1)
+
+    # ── Joint limits ──────────────────────────────────────────────────────
+    valid = reachable.copy()
+    if joint_limits is not None:
+        limits = np.asarray(joint_limits, dtype=float)
+        Q = _wrap_into_limits(Q, limits)
+        valid &= np.all(Q <= limits[:, 1] + 1e-9, axis=-1)
+
+    # ── Residual check (guards numerical edge cases) ─────────────────────
+    Q_flat = np.where(reachable[..., np.newaxis], Q, 0.0).reshape(-1, 6)
+    T_check = fkine_batch(Q_flat).reshape(n_poses, NUM_BRANCHES, 4, 4)
+    pos_err = np.linalg.norm(T_check[..., :3, 3] - p[:, np.newaxis], axis=-1)
+    rot_err = np.linalg.norm(T_check[..., :3, :3] - R[:, np.newaxis], axis=(-2, -1))
+    valid &= (pos_err < _RESIDUAL_TOL) & (rot_err < _RESIDUAL_TOL)
+
+    Q = np.where(reachable[..., np.newaxis], Q, np.nan)
+    return Q, valid
+
+
+def solve_nearest_batch(T, q_ref, joint_limits=JOINT_LIMITS_RAD, same_branch=False):
+    """
+    Closest valid IK branch to a reference configuration, per pose.
+
+    Parameters
+    ----------
+    T : array_like, shape (N, 4, 4)
+        Target flange poses
+    q_ref : array_like, shape (6,) or (N, 6)
+        Reference configurations in radians
+    joint_limits : array_like, shape (6, 2), optional
+        Joint limits in radians
+    same_branch : bool, optional
+        Only accept the branch q_ref is in (no shoulder/elbow/wrist flips)
+
+    Returns
+    -------
+    Q : ndarray, shape (N, 6)
+        Selected solutions (NaN where none is valid)
+    ok : ndarray of bool, shape (N,)
+        True where a solution was found
+    """
+    Q_all, valid = solve_all_batch(T, joint_limits, q_ref)
+    n_poses = Q_all.shape[0]
+    q_ref = np.broadcast_to(np.asarray(q_ref, dtype=float), (n_poses, 6))
+
+    if same_branch:
+        branch = configuration_branch(q_ref)
+        valid = valid & (np.arange(NUM_BRANCHES) == branch[:, np.newaxis])
+
+    distance = np.where(valid, np.nansum((Q_all - q_ref[:, np.newaxis]) ** 2, axis=-1), np.inf)
+    best = np.argmin(distance, axis=1)
+    ok = np.isfinite(distance[np.arange(n_poses), best])
+    Q = Q_all[np.arange(n_poses), best]
+    Q[~ok] = np.nan
+    return Q, ok
+
+
+# ============================================================================
+# Single-Pose Convenience API
+# ============================================================================
+
+def solve_all(T, joint_limits=JOINT_LIMITS_RAD, q_ref=None):
+    """
+    All valid IK solutions for one flange pose.
+
+    Parameters
+    ----------
+    T : array_like, shape (4, 4)
+        Target flange pose (SE3 objects: pass T.A)
+    joint_limits : array_like, shape (6, 2), optional
+        Joint limits in radians
+    q_ref : array_like, shape (6,), optional
+        If given, solutions are sorted by distance to q_ref
+
+    Returns
+    -------
+    list of (ndarray, tuple)
+        (q, branch_label) pairs, e.g. (q, ('front', 'up', 'noflip'))
+    """
+    Q, valid = solve_all_batch(T, joint_limits, q_ref)
+    solutions = [(Q[0, b], BRANCH_LABELS[b]) for b in range(NUM_BRANCHES) if valid[0, b]]
+    if q_ref is not None:
+        q_ref = np.asarray(q_ref, dtype=float)
+        solutions.sort(key=lambda s: float(np.sum((s[0] - q_ref) ** 2)))
+    return solutions
+
+
+def solve_nearest(T, q_ref, joint_limits=JOINT_LIMITS_RAD, same_branch=False):
+    """
+    Closest valid IK solution to q_ref for one flange pose.
+
+    Returns
+    -------
+    ndarray, shape (6,) or None
+        Joint angles in radians, None if the pose is unreachable
+    """
+    Q, ok = solve_nearest_batch(np.asarray(T, dtype=float)[np.newaxis], q_ref,
+                                joint_limits, same_branch)
+    return Q[0] if ok[0] else None
+
+
+# ============================================================================
+# Configuration Branches
+# ============================================================================
+
+def configuration_branch(q):
+    """
+    Branch index (0-7, see BRANCH_LABELS) of joint configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray of int, shape (N,)
+    """
+    q_batch = np.atleast_2d(np.asarray(q, dtype=float))
+    p_w = fkine_all(q_batch)[:, 3, :3, 3]  # Frame 4 origin = wrist center
+
+    radial = np.cos(q_batch[:, 0]) * p_w[:, 0] + np.sin(q_batch[:, 0]) * p_w[:, 1]
+    shoulder = (radial < 0).astype(int)
+
+    psi = np.angle(np.exp(1j * (_FOREARM_ANGLE - q_batch[:, 2])))
+    elbow = (psi < 0).astype(int)
+
+    wrist = (np.sin(q_batch[:, 4]) < -_WRIST_SINGULAR_EPS).astype(int)
+
+    return 4 * shoulder + 2 * elbow + wrist
+
+
+# ============================================================================
+# Cross-Check Against Numerical IK
+# ============================================================================
+
+def cross_check_numerical(robot, T, q_seed, tol=1e-6):
+    """
+    Compare the closed-form solution with robot.ik_LM from the same seed.
+
+    Parameters
+    ----------
+    robot : DHRobot
+        Robot model (robot_model.robot)
+    T : array_like, shape (4, 4)
+        Target flange pose
+    q_seed : array_like, shape (6,)
+        Seed for ik_LM and reference for branch selection
+    tol : float, optional
+        Max joint-space disagreement in radians
+
+    Returns
+    -------
+    dict
+        analytic/numerical solutions, the branch the numerical solution
+        landed in, whether it matches an analytic branch, and the max
+        joint difference to that branch
+    """
+    solution = robot.ik_LM(np.asarray(T, dtype=float), q0=q_seed, method='sugihara')
+    q_num, success = solution[0], solution[1]
+    Q, valid = solve_all_batch(T, q_ref=q_seed)
+
+    result = {
+        'numerical_success': bool(success),
+        'numerical_q': q_num if success else None,
+        'analytic_q': Q[0][valid[0]],
+        'matches': False,
+        'max_difference': None,
+    }
+
+    if success and np.any(valid[0]):
+        diff = np.angle(np.exp(1j * (Q[0][valid[0]] - q_num)))
+        max_diff = np.max(np.abs(diff), axis=1)
+        result['max_difference'] = float(np.min(max_diff))
+        result['matches'] = bool(result['max_difference'] < tol)
+
+    return result
@@ -0,0 +1,288 @@
+"""
+Batch Inverse Kinematics for PAROL6 Robot
+
+Solves IK for whole Cartesian paths (thousands of waypoints) in one call:
+
+- All closed-form branches of every waypoint are computed in one vectorized
+  pass (analytic_ik.solve_all_batch)
+- Branch selection is warm-started: each waypoint takes the valid branch
+  closest to the previous waypoint's solution
+- Waypoints the closed form rejects fall back to the numerical solver
+  (ik_solver.solve_ik_with_adaptive_tol_subdivision), seeded the same way
+- The solved joint path is checked against the capsule collision model and
+  scanned for near-singular zones (trajectory_timing.singularity_zones)
+
+Long paths are split into chunks that can be solved in parallel (e.g. by a
+ProcessPoolExecutor, see api/fastapi_server.py). plan_chunk_seeds provides
+each chunk with a seed on the same branch the sequential solve would reach.
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import logging
+
+import numpy as np
+
+from . import analytic_ik
+from . import collision
+from . import trajectory_timing
+from . import workspace_map
+from .kinematics_core import JOINT_LIMITS_RAD
+
+logger = logging.getLogger(__name__)
+
+# Neutral seed (middle of every joint range) when the caller provides none
+DEFAULT_SEED_RAD = JOINT_LIMITS_RAD.mean(axis=1)
+
+# Consecutive solutions further apart than this are reported as a warning
+JOINT_JUMP_WARNING_RAD = np.deg2rad(30.0)
+
+
+def _select_warm_started(Q_all, valid, seed, warm_start):
+    """
+    Pick one branch per waypoint, closest to the previous solution.
+
+    Returns
+    -------
+    Q : ndarray, shape (N, 6)
+        Selected solutions (NaN where no branch is valid)
+    ok : ndarray of bool, shape (N,)
+    """
+    n_points = Q_all.shape[0]
+    Q = np.full((n_points, 6), np.nan)
+    ok = np.zeros(n_points, dtype=bool)
+    q_ref = np.asarray(seed, dtype=float)
+
+    for i in range(n_points):
+        if not valid[i].any():
+            continue
+        distance = np.where(valid[i], np.nansum((Q_all[i] - q_ref) ** 2, axis=-1), np.inf)
+        Q[i] = Q_all[i, np.argmin(distance)]
+        ok[i] = True
+        if warm_start:
+            q_ref = Q[i]
+
+    return Q, ok
+
+
+def _solve_numerical(T, q_seed):
+    """Numerical fallback for one waypoint. Returns (q or None, error message)."""
+    from spatialmath import SE3
+    from . import ik_solver
+    from . import robot_model
+
+    try:
+        result = ik_solver.solve_ik_with_adaptive_tol_subdivision(
+            robot_model.robot,
+            SE3(T, check=False),
+            q_seed,
+            joint_limits_checker=robot_model.check_joint_limits,
+            use_analytic=False
+        )
+    except Exception as e:
+        return None, f"Numerical IK error: {e}"
+
+    if result.success:
+        return np.asarray(result.q, dtype=float), None
+    if result.violations:
+        return None, f"Joint limit violation: {', '.join(result.violations)}"
+    return None, "Target unreachable"
+
+
+def solve_path(T, seed=None, warm_start=True, numerical_fallback=True, stop_on_failure=False):
+    """
+    Solve IK for a sequence of flange poses.
+
+    Parameters
+    ----------
+    T : array_like, shape (N, 4, 4)
+        Target flange poses (metres)
+    seed : array_like, shape (6,), optional
+        Joint configuration in radians for the first waypoint
+        (default: DEFAULT_SEED_RAD)
+    warm_start : bool, optional
+        Seed every waypoint with the previous solution (default: True);
+        if False every waypoint is seeded with `seed`
+    numerical_fallback : bool, optional
+        Retry waypoints the closed form rejects with ik_LM (default: True)
+    stop_on_failure : bool, optional
+        Skip all waypoints after the first failure (default: False)
+
+    Returns
+    -------
+    dict
+        'q': ndarray (N, 6) in radians (NaN where failed),
+        'status': list of per-waypoint dicts {index, success, method, error},
+        'warnings': list of dicts (joint jumps, configuration changes)
+    """
+    T = np.asarray(T, dtype=float)
+    if T.ndim == 2:
+        T = T[np.newaxis]
+    seed = DEFAULT_SEED_RAD if seed is None else np.asarray(seed, dtype=float)
+
+    Q_all, valid = analytic_ik.solve_all_batch(T)
+    Q, ok = _select_warm_started(Q_all, valid, seed, warm_start)
+
+    reach_map = workspace_map.get_workspace_map()
+    reachable = reach_map.is_reachable_batch(T[:, :3, 3]) if reach_map is not None else np.ones(len(T), dtype=bool)
+
+    status = []
+    q_prev = seed
+    failed = False
+    for i in range(len(T)):
+        entry = {'index': i, 'success': bool(ok[i]), 'method': 'analytic', 'error': None}
+
+        if failed and stop_on_failure:
+            entry.update(success=False, method=None, error="Skipped after earlier failure")
+        elif not ok[i]:
+            if not reachable[i]:
+                q_num, error = None, "Target outside reachable workspace"
+            elif numerical_fallback:
+                q_num, error = _solve_numerical(T[i], q_prev)
+            else:
+                q_num, error = None, "No closed-form solution within joint limits"
+            if q_num is not None:
+                Q[i] = q_num
+                entry.update(success=True, method='numerical')
+            else:
+                entry.update(success=False, method=None, error=error)
+                failed = True
+
+        # A numerical solution may land on another branch - keep later
+        # closed-form picks continuous with it
+        if entry['method'] == 'numerical' and warm_start and i + 1 < len(T):
+            Q[i + 1:], ok[i + 1:] = _select_warm_started(Q_all[i + 1:], valid[i + 1:], Q[i], warm_start)
+
+        if entry['success'] and warm_start:
+            q_prev = Q[i]
+        status.append(entry)
+
+    return {'q': Q, 'status': status, 'warnings': path_warnings(Q, seed)}
+
+
+def path_warnings(Q, seed=None):
+    """
+    Continuity, singularity and collision warnings for a solved joint path.
+
+    Parameters
+    ----------
+    Q : ndarray, shape (N, 6)
+        Joint path in radians (NaN rows are skipped)
+    seed : array_like, shape (6,), optional
+        Configuration preceding the first waypoint
+
+    Returns
+    -------
+    list of dict
+    """
+    rows = np.flatnonzero(~np.isnan(Q).any(axis=1))
+    if len(rows) == 0:
+        return []
+
+    path = Q[rows]
+    indices = rows
+    if seed is not None:
+        path = np.vstack([seed, path])
+        indices = np.concatenate([[-1], rows])
+
+    warnings = []
+    jumps = np.abs(np.diff(path, axis=0))
+    for k, joint in zip(*np.nonzero(jumps > JOINT_JUMP_WARNING_RAD)):
+        warnings.append({
+            'type': 'joint_jump',
+            'index': int(indices[k + 1]),
+            'joint': int(joint) + 1,
+            'delta_deg': float(np.rad2deg(jumps[k, joint]))
+        })
+
+    branches = analytic_ik.configuration_branch(path)
+    for k in np.flatnonzero(np.diff(branches) != 0):
+        warnings.append({
+            'type': 'configuration_change',
+            'index': int(indices[k + 1]),
+            'from': '/'.join(analytic_ik.BRANCH_LABELS[branches[k]]),
+            'to': '/'.join(analytic_ik.BRANCH_LABELS[branches[k + 1]])
+        })
+
+    manip, zones = trajectory_timing.singularity_zones(path)
+    for start, stop in zones:
+        warnings.append({
+            'type': 'near_singularity',
+            'index': int(indices[start]),
+            'end_index': int(indices[stop - 1]),
+            'min_manipulability': float(manip[start:stop].min())
+        })
+
+    contact = collision.get_collision_model().check_trajectory(path)
+    if contact['collision']:
+        warnings.append({
+            'type': 'collision',
+            'index': int(indices[contact['index']]),
+            'pairs': ['/'.join(pair) for pair in contact['pairs']]
+        })
+
+    return warnings
+
+
+# ============================================================================
+# Chunked Solving (parallel execution)
+# ============================================================================
+
+def plan_chunk_seeds(T, chunk_size, seed=None, warm_start=True):
+    """
+    Seeds for solving a path in independent chunks.
+
+    The first waypoint of every chunk is solved closed-form, warm-started
+    from the previous chunk's first waypoint, and used as the chunk's seed
+    so every chunk starts on the branch a sequential solve would reach.
+
+    Parameters
+    ----------
+    T : array_like, shape (N, 4, 4)
+        Target flange poses
+    chunk_size : int
+        Waypoints per chunk
+    seed : array_like, shape (6,), optional
+        Configuration in radians before the first waypoint
+    warm_start : bool, optional
+        If False every chunk uses `seed`
+
+    Returns
+    -------
+    list of (start, stop, seed)
+        Slice bounds and seed (radians) per chunk
+    """
+    T = np.asarray(T, dtype=float)
+    seed = DEFAULT_SEED_RAD if seed is None else np.asarray(seed, dtype=float)
+    starts = list(range(0, len(T), chunk_size))
+
+    chunk_seeds = [seed] * len(starts)
+    if warm_start and len(starts) > 1:
+        Q_all, valid = analytic_ik.solve_all_batch(T[starts])
+        anchors, ok = _select_warm_started(Q_all, valid, seed, warm_start=True)
+        q_ref = seed
+        for k in range(1, len(starts)):
+            # Unreachable anchor: keep the last reachable one
+            if ok[k]:
+                q_ref = anchors[k]
+            chunk_seeds[k] = q_ref
+
+    return [(start, min(start + chunk_size, len(T)), chunk_seed)
+            for start, chunk_seed in zip(starts, chunk_seeds)]
+
+
+def solve_chunk(T, seed, warm_start=True, numerical_fallback=True):
+    """
+    Process-pool worker: solve_path on one chunk (plain arrays in and out).
+
+    Continuity warnings are left to the caller (path_warnings on the merged
+    path) so chunk boundaries are covered.
+
+    Returns
+    -------
+    tuple
+        (q (n, 6) radians, status list with chunk-local indices)
+    """
+    result = solve_path(T, seed, warm_start=warm_start, numerical_fallback=numerical_fallback)
+    return result['q'], result['status']
@@ -0,0 +1,635 @@
+"""
+Capsule Collision Model for PAROL6 Robot
+
+Every link is covered by one or more capsules (line segment + radius) fixed
+in its DH frame, so a configuration is checked with one batched FK pass
+(kinematics_core.fkine_all) and closed-form segment-segment distances.
+
+- Self collision between non-adjacent links
+- Environment: half-spaces (table, walls) and world-fixed capsules/spheres
+  (fixtures)
+- Whole trajectories in one vectorized pass: consecutive configurations
+  are grouped into segments, each capsule's sweep over a segment is bounded
+  by a sphere (broad phase), and exact distances are only evaluated for
+  segment/pair combinations whose spheres overlap (narrow phase)
+
+The link capsules were fitted to the URDF meshes (frontend/public/urdf)
+expressed in the DH frames; regenerate them with:
+
+    python -m lib.kinematics.collision --fit
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import itertools
+import logging
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from . import kinematics_core
+
+logger = logging.getLogger(__name__)
+
+Capsule = namedtuple('Capsule', ['name', 'frame', 'p0', 'p1', 'radius'])
+Capsule.__doc__ = """
+Capsule fixed in a frame.
+
+frame: -1 = world (obstacles), 0 = robot base, 1..6 = DH link frames.
+p0, p1: segment end points (m) in that frame; p0 == p1 gives a sphere.
+radius: capsule radius (m).
+"""
+
+WORLD_FRAME = -1
+
+# Fitted to the URDF meshes by fit_link_capsules() - frame = DH link index
+LINK_CAPSULES = (
+    Capsule('base_0', 0, (-0.153, 0.0037, 0.0309), (0.0366, 0.0386, 0.0321), 0.0608),
+    Capsule('base_1', 0, (-0.1419, -0.0404, 0.0435), (0.0408, -0.0334, 0.0262), 0.0491),
+    Capsule('L1_0', 1, (-0.0327, 0.0069, 0.092), (0.0073, 0.0206, -0.0491), 0.0782),
+    Capsule('L2_0', 2, (-0.1838, -0.0098, -0.0768), (-0.1104, 0.0103, -0.0493), 0.0571),
+    Capsule('L2_1', 2, (-0.1137, 0.0149, 0.0281), (-0.1049, 0.0214, 0.0593), 0.0354),
+    Capsule('L2_2', 2, (-0.0464, 0.0099, -0.0618), (-0.0055, -0.0016, -0.0577), 0.0413),
+    Capsule('L3_0', 3, (0.0154, 0.0035, 0.0095), (0.0427, -0.0086, 0.014), 0.0521),
+    Capsule('L3_1', 3, (0.0009, -0.0005, -0.0515), (0.0609, -0.004, -0.0492), 0.0382),
+    Capsule('L4_0', 4, (0.0006, -0.0755, -0.0494), (-0.0, -0.0023, -0.0433), 0.0345),
+    Capsule('L4_1', 4, (0.0002, -0.1052, -0.0049), (0.022, -0.1102, -0.009), 0.0672),
+    Capsule('L5_0', 5, (-0.0012, -0.0121, -0.0289), (0.0004, -0.0043, 0.0264), 0.0396),
+    Capsule('L6_0', 6, (-0.0053, 0.0064, 0.0867), (-0.0208, -0.0053, 0.0854), 0.0416),
+)
+
+# Capsule pairs that overlap by construction (joint housings) although
+# their links are not adjacent - see find_ignore_pairs()
+SELF_COLLISION_IGNORE = frozenset({
+    ('L1_0', 'L4_1'), ('L1_0', 'L5_0'), ('L2_0', 'L4_0'), ('L2_0', 'L4_1'),
+    ('L2_1', 'L4_1'), ('L2_2', 'L4_1'), ('base_0', 'L2_0'), ('base_1', 'L2_0'),
+})
+
+# Minimum joint-space step when checking between trajectory samples (rad)
+DEFAULT_MAX_STEP_RAD = np.deg2rad(2.0)
+
+# Configurations per broad-phase segment
+DEFAULT_SEGMENT_LENGTH = 16
+
+URDF_PATH = Path(__file__).resolve().parents[2] / "frontend" / "public" / "urdf" / "PAROL6.urdf"
+
+
+# ============================================================================
+# Geometry
+# ============================================================================
+
+def segment_distance(p0, p1, q0, q1):
+    """
+    Closest distance between segments [p0, p1] and [q0, q1], vectorized.
+
+    Parameters
+    ----------
+    p0, p1, q0, q1 : ndarray, shape (..., 3)
+        Segment end points (broadcast against each other)
+
+    Returns
+    -------
+    ndarray, shape (...)
+    """
+    d1 = p1 - p0
+    d2 = q1 - q0
+    r = p0 - q0
+    a = np.einsum('...i,...i->...', d1, d1)
+    e = np.einsum('...i,...i->...', d2, d2)
+    b = np.einsum('...i,...i->...', d1, d2)
+    c = np.einsum('...i,...i->...', d1, r)
+    f = np.einsum('...i,...i->...', d2, r)
+
+    eps = 1e-12
+    safe_a = np.where(a > eps, a, 1.0)
+    safe_e = np.where(e > eps, e, 1.0)
+    denom = a * e - b * b
+
+    # Closest point on the infinite lines, clamped to segment 1
+    s = np.where(denom > eps, np.clip((b * f - c * e) / np.where(denom > eps, denom, 1.0), 0.0, 1.0), 0.0)
+    t = (b * s + f) / safe_e
+
+    # Clamp t to segment 2 and recompute s where needed
+    s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0),
+                 np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+
+    # Degenerate segments (spheres)
+    p_point = a <= eps
+    q_point = e <= eps
+    s = np.where(p_point, 0.0, np.where(q_point, np.clip(-c / safe_a, 0.0, 1.0), s))
+    t = np.where(q_point, 0.0, np.where(p_point, np.clip(f / safe_e, 0.0, 1.0), t))
+
+    closest = (p0 + d1 * s[..., np.newaxis]) - (q0 + d2 * t[..., np.newaxis])
+    return np.linalg.norm(closest, axis=-1)
+
+
+# ============================================================================
+# Collision Model
+# ============================================================================
+
+class CollisionModel:
+    """
+    Capsule model of the robot and its environment.
+
+    Parameters
+    ----------
+    capsules : sequence of Capsule, optional
+        Robot capsules (default: LINK_CAPSULES)
+    obstacles : sequence of Capsule, optional
+        World-fixed capsules/spheres (frame is ignored, world assumed)
+    planes : sequence of (normal, offset), optional
+        Half-spaces the robot must stay in: dot(normal, x) >= offset.
+        Capsules on the base and link 1 are exempt (they cannot move
+        towards a table the robot stands on)
+    margin : float, optional
+        Extra clearance required everywhere (m)
+    ignore_pairs : set of (name, name), optional
+        Self-collision capsule pairs to skip (default: SELF_COLLISION_IGNORE)
+    """
+
+    def __init__(self, capsules=LINK_CAPSULES, obstacles=(), planes=(), margin=0.0,
+                 ignore_pairs=SELF_COLLISION_IGNORE):
+        self.capsules = tuple(capsules)
+        self.obstacles = tuple(obstacles)
+        self.margin = float(margin)
+
+        self._names = [c.name for c in self.capsules]
+        self._frames = np.array([c.frame for c in self.capsules])
+        self._local = np.array([[c.p0, c.p1] for c in self.capsules], dtype=float)  # (C, 2, 3)
+        self._radii = np.array([c.radius for c in self.capsules], dtype=float)
+
+        # Self pairs: different, non-adjacent links
+        pairs = []
+        for i, j in itertools.combinations(range(len(self.capsules)), 2):
+            if abs(self._frames[i] - self._frames[j]) <= 1:
+                continue
+            if (self._names[i], self._names[j]) in ignore_pairs or (self._names[j], self._names[i]) in ignore_pairs:
+                continue
+            pairs.append((i, j))
+        self._self_pairs = np.array(pairs, dtype=int).reshape(-1, 2)
+
+        # Obstacles are appended after the robot capsules (world frame)
+        self._obstacle_points = np.array([[o.p0, o.p1] for o in self.obstacles], dtype=float).reshape(-1, 2, 3)
+        self._obstacle_radii = np.array([o.radius for o in self.obstacles], dtype=float)
+        moving = np.flatnonzero(self._frames >= 2)
+        self._obstacle_pairs = np.array(list(itertools.product(moving, range(len(self.obstacles)))),
+                                        dtype=int).reshape(-1, 2)
+
+        self._plane_normals = np.array([n for n, _ in planes], dtype=float).reshape(-1, 3)
+        if len(self._plane_normals):
+            self._plane_normals /= np.linalg.norm(self._plane_normals, axis=1, keepdims=True)
+        self._plane_offsets = np.array([d for _, d in planes], dtype=float)
+        self._plane_capsules = moving
+
+    # ------------------------------------------------------------------
+    # Geometry helpers
+    # ------------------------------------------------------------------
+
+    def capsule_points(self, q):
+        """
+        World end points of the robot capsules.
+
+        Parameters
+        ----------
+        q : array_like, shape (6,) or (N, 6)
+            Joint angles in radians
+
+        Returns
+        -------
+        ndarray, shape (N, C, 2, 3)
+        """
+        frames = kinematics_core.fkine_all(q)
+        n_configs = frames.shape[0]
+        # Frame 0 (base) is the identity
+        all_frames = np.empty((n_configs, frames.shape[1] + 1, 4, 4))
+        all_frames[:, 0] = np.eye(4)
+        all_frames[:, 1:] = frames
+
+        T = all_frames[:, self._frames]  # (N, C, 4, 4)
+        return np.einsum('ncij,ckj->ncki', T[..., :3, :3], self._local) + T[:, :, np.newaxis, :3, 3]
+
+    def _pair_clearance(self, points, configs, kind, pairs):
+        """Clearance (m, negative = penetration) for (config, pair) combinations."""
+        if kind == 'self':
+            i, j = self._self_pairs[pairs].T
+            distance = segment_distance(points[configs, i, 0], points[configs, i, 1],
+                                        points[configs, j, 0], points[configs, j, 1])
+            return distance - self._radii[i] - self._radii[j] - self.margin
+
+        i, k = self._obstacle_pairs[pairs].T
+        distance = segment_distance(points[configs, i, 0], points[configs, i, 1],
+                                    self._obstacle_points[k, 0], self._obstacle_points[k, 1])
+        return distance - self._radii[i] - self._obstacle_radii[k] - self.margin
+
+    def _pair_names(self, kind, pair):
+        if kind == 'self':
+            i, j = self._self_pairs[pair]
+            return self._names[i], self._names[j]
+        i, k = self._obstacle_pairs[pair]
+        return self._names[i], self.obstacles[k].name
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    def check(self, q):
+        """
+        Collision state of individual configurations (no broad phase).
+
+        Parameters
+        ----------
+        q : array_like, shape (6,) or (N, 6)
+            Joint angles in radians
+
+        Returns
+        -------
+        ndarray of bool, shape (N,)
+            True where the configuration collides
+        """
+        points = self.capsule_points(q)
+        n_configs = points.shape[0]
+        colliding = np.zeros(n_configs, dtype=bool)
+        configs = np.arange(n_configs)
+
+        for kind, pairs in (('self', self._self_pairs), ('obstacle', self._obstacle_pairs)):
+            if len(pairs) == 0:
+                continue
+            c, p = np.meshgrid(configs, np.arange(len(pairs)), indexing='ij')
+            clearance = self._pair_clearance(points, c.ravel(), kind, p.ravel()).reshape(n_configs, -1)
+            colliding |= np.any(clearance < 0.0, axis=1)
+
+        colliding |= np.any(self._plane_clearance(points) < 0.0, axis=1)
+        return colliding
+
+    def _plane_clearance(self, points):
+        """Clearance (N, n_capsules * n_planes) of the moving capsules to the half-spaces."""
+        if len(self._plane_normals) == 0:
+            return np.zeros((points.shape[0], 0))
+        ends = points[:, self._plane_capsules]  # (N, M, 2, 3)
+        height = np.einsum('nmki,pi->nmpk', ends, self._plane_normals).min(axis=-1) - self._plane_offsets
+        clearance = height - self._radii[self._plane_capsules][:, np.newaxis] - self.margin
+        return clearance.reshape(points.shape[0], -1)
+
+    def check_trajectory(self, Q, max_step=DEFAULT_MAX_STEP_RAD, segment_length=DEFAULT_SEGMENT_LENGTH):
+        """
+        Check a whole joint trajectory in one vectorized pass.
+
+        Consecutive waypoints further apart than max_step are densified
+        first. Waypoints are grouped into segments of segment_length; the
+        sweep of every capsule over a segment is bounded by a sphere and
+        only overlapping segment/pair combinations get exact distances.
+
+        Parameters
+        ----------
+        Q : array_like, shape (N, 6)
+            Joint trajectory in radians
+        max_step : float, optional
+            Largest joint change between checked configurations (rad)
+        segment_length : int, optional
+            Configurations per broad-phase segment
+
+        Returns
+        -------
+        dict
+            'collision': bool,
+            'index': first colliding waypoint (segment start) or None,
+            'pairs': list of (name, name) colliding there
+                     ('plane' for half-spaces),
+            'clearance': smallest exact clearance evaluated (m) or None,
+            'checked': number of configurations checked,
+            'narrow_phase': number of exact pair distances evaluated
+        """
+        Q = np.atleast_2d(np.asarray(Q, dtype=float))
+        Q_dense, waypoint_index = _densify(Q, max_step)
+        points = self.capsule_points(Q_dense)
+        n_configs = points.shape[0]
+
+        result = {'collision': False, 'index': None, 'pairs': [], 'clearance': None,
+                  'checked': n_configs, 'narrow_phase': 0}
+        first_hit = n_configs
+        hits = {}
+
+        def record(configs, clearance, names):
+            nonlocal first_hit
+            if len(clearance):
+                lowest = float(clearance.min())
+                if result['clearance'] is None or lowest < result['clearance']:
+                    result['clearance'] = lowest
+            for config, pair_names in zip(configs[clearance < 0.0], np.asarray(names, dtype=object)[clearance < 0.0]):
+                if config < first_hit:
+                    first_hit = config
+                    hits.clear()
+                if config == first_hit:
+                    hits[tuple(pair_names)] = True
+
+        # Broad phase: bounding sphere of every capsule's sweep per segment
+        n_segments = -(-n_configs // segment_length)
+        padded = np.concatenate([points, np.repeat(points[-1:], n_segments * segment_length - n_configs, axis=0)])
+        sweep = padded.reshape(n_segments, segment_length, points.shape[1], 2, 3)
+        centres = sweep.mean(axis=(1, 3))  # (S, C, 3)
+        bounds = np.linalg.norm(sweep - centres[:, np.newaxis, :, np.newaxis], axis=-1).max(axis=(1, 3))
+        bounds = bounds + self._radii  # (S, C)
+
+        for kind, pairs in (('self', self._self_pairs), ('obstacle', self._obstacle_pairs)):
+            if len(pairs) == 0:
+                continue
+            if kind == 'self':
+                gap = (np.linalg.norm(centres[:, pairs[:, 0]] - centres[:, pairs[:, 1]], axis=-1)
+                       - bounds[:, pairs[:, 0]] - bounds[:, pairs[:, 1]])
+            else:
+                obstacle_centres = self._obstacle_points.mean(axis=1)
+                obstacle_bounds = (np.linalg.norm(self._obstacle_points[:, 0] - self._obstacle_points[:, 1], axis=-1) / 2
+                                   + self._obstacle_radii)
+                gap = (np.linalg.norm(centres[:, pairs[:, 0]] - obstacle_centres[pairs[:, 1]], axis=-1)
+                       - bounds[:, pairs[:, 0]] - obstacle_bounds[pairs[:, 1]])
+
+            segments, candidates = np.nonzero(gap < self.margin)
+            if len(segments) == 0:
+                continue
+
+            # Narrow phase: every configuration of the candidate segments
+            offsets = np.arange(segment_length)
+            configs = (segments[:, np.newaxis] * segment_length + offsets).ravel()
+            pair_index = np.repeat(candidates, segment_length)
+            keep = configs < n_configs
+            configs, pair_index = configs[keep], pair_index[keep]
+
+            clearance = self._pair_clearance(points, configs, kind, pair_index)
+            result['narrow_phase'] += len(clearance)
+            names = [self._pair_names(kind, p) for p in pair_index] if np.any(clearance < 0.0) else [()] * len(clearance)
+            record(configs, clearance, names)
+
+        if len(self._plane_normals):
+            plane_clearance = self._plane_clearance(points)
+            below = np.flatnonzero(np.any(plane_clearance < 0.0, axis=1))
+            lowest = float(plane_clearance.min())
+            if result['clearance'] is None or lowest < result['clearance']:
+                result['clearance'] = lowest
+            if len(below) and below[0] <= first_hit:
+                if below[0] < first_hit:
+                    hits.clear()
+                first_hit = below[0]
+                moving = np.repeat(self._plane_capsules, len(self._plane_normals))
+                for column in np.flatnonzero(plane_clearance[first_hit] < 0.0):
+                    hits[(self._names[moving[column]], 'plane')] = True
+
+        if first_hit < n_configs:
+            result.update(collision=True, index=int(waypoint_index[first_hit]), pairs=list(hits))
+        return result
+
+
+def _densify(Q, max_step):
+    """
+    Insert configurations so no joint moves more than max_step between them.
+
+    Returns
+    -------
+    Q_dense : ndarray, shape (M, 6)
+    waypoint_index : ndarray of int, shape (M,)
+        Original waypoint each dense configuration starts from
+    """
+    if len(Q) < 2 or max_step is None:
+        return Q, np.arange(len(Q))
+
+    steps = np.ceil(np.abs(np.diff(Q, axis=0)).max(axis=1) / max_step).astype(int)
+    steps = np.maximum(steps, 1)
+    if np.all(steps == 1):
+        return Q, np.arange(len(Q))
+
+    segment = np.repeat(np.arange(len(steps)), steps)
+    fraction = (np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)) / np.repeat(steps, steps)
+    Q_dense = Q[segment] + fraction[:, np.newaxis] * (Q[segment + 1] - Q[segment])
+    return np.vstack([Q_dense, Q[-1:]]), np.append(segment, len(Q) - 1)
+
+
+# ============================================================================
+# Shared Instance
+# ============================================================================
+
+_collision_model = None
+
+
+def configure(table_height=None, obstacles=(), margin=0.0):
+    """
+    Build the shared model used by the commander and the batch planners.
+
+    Parameters
+    ----------
+    table_height : float, optional
+        Table surface z in the base frame (m); None disables the table
+    obstacles : sequence of Capsule, optional
+        Fixtures in the base frame
+    margin : float, optional
+        Extra clearance (m)
+
+    Returns
+    -------
+    CollisionModel
+    """
+    global _collision_model
+    planes = [((0.0, 0.0, 1.0), table_height)] if table_height is not None else []
+    _collision_model = CollisionModel(obstacles=obstacles, planes=planes, margin=margin)
+    logger.info(f"[Collision] Model configured: {len(_collision_model.capsules)} link capsules, "
+                f"{len(_collision_model.obstacles)} obstacles, table={table_height}, margin={margin}")
+    return _collision_model
+
+
+def get_collision_model():
+    """Shared model (self collision + table at z=0 unless configure() was called)."""
+    global _collision_model
+    if _collision_model is None:
+        _collision_model = CollisionModel(planes=[((0.0, 0.0, 1.0), 0.0)])
+    return _collision_model
+
+
+# ============================================================================
+# Capsule Fitting (offline, from the URDF meshes)
+# ============================================================================
+
+# URDF joint angle = DH joint angle + offset (URDF J4 zero is rotated by
+# -90 deg w.r.t. the DH J4 zero; J6 matches the DH +90 deg offset)
+URDF_JOINT_OFFSETS_DEG = (0.0, 0.0, 0.0, -90.0, 0.0, -90.0)
+
+# Capsules per link mesh (k-means clusters, one capsule each)
+URDF_CAPSULES_PER_LINK = {'base_link': 2, 'L1': 1, 'L2': 3, 'L3': 2, 'L4': 2, 'L5': 1, 'L6': 1}
+
+
+def _rpy_matrix(rpy):
+    roll, pitch, yaw = rpy
+    cr, sr, cp, sp, cy, sy = np.cos(roll), np.sin(roll), np.cos(pitch), np.sin(pitch), np.cos(yaw), np.sin(yaw)
+    return np.array([[cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+                     [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+                     [-sp, cp * sr, cp * cr]])
+
+
+def _load_stl(path):
+    """Vertices (M, 3) of a binary or ASCII STL file."""
+    data = Path(path).read_bytes()
+    if data[:5] == b'solid' and b'facet' in data[:512]:
+        import re
+        return np.array(re.findall(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)', data), dtype=float)
+    count = int(np.frombuffer(data[80:84], dtype='<u4')[0])
+    record = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+    return np.frombuffer(data[84:84 + record.itemsize * count], dtype=record)['vertices'].reshape(-1, 3).astype(float)
+
+
+def _link_vertices_dh(urdf_path):
+    """URDF visual mesh vertices per link, expressed in the matching DH frame."""
+    import xml.etree.ElementTree as ET
+
+    root = ET.parse(urdf_path).getroot()
+    q_urdf = np.deg2rad(URDF_JOINT_OFFSETS_DEG)  # DH q = 0
+    link_frames = {}
+    joint_index = 0
+    for joint in root.findall('joint'):
+        origin = joint.find('origin')
+        T = np.eye(4)
+        T[:3, :3] = _rpy_matrix(np.array(origin.get('rpy', '0 0 0').split(), dtype=float))
+        T[:3, 3] = np.array(origin.get('xyz', '0 0 0').split(), dtype=float)
+        parent = link_frames.get(joint.find('parent').get('link'), np.eye(4))
+        T = parent @ T
+        if joint.get('type') == 'revolute':
+            axis = np.array(joint.find('axis').get('xyz').split(), dtype=float)
+            axis /= np.linalg.norm(axis)
+            K = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+            angle = q_urdf[joint_index]
+            R = np.eye(4)
+            R[:3, :3] = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * K @ K
+            T = T @ R
+            joint_index += 1
+        link_frames[joint.find('child').get('link')] = T
+
+    dh_frames = kinematics_core.fkine_all(np.zeros(6))[0]
+    vertices = {}
+    for link in root.findall('link'):
+        name = link.get('name')
+        mesh = link.find('visual/geometry/mesh')
+        if name not in URDF_CAPSULES_PER_LINK or mesh is None:
+            continue
+        visual_origin = np.eye(4)
+        origin = link.find('visual/origin')
+        if origin is not None:
+            visual_origin[:3, :3] = _rpy_matrix(np.array(origin.get('rpy', '0 0 0').split(), dtype=float))
+            visual_origin[:3, 3] = np.array(origin.get('xyz', '0 0 0').split(), dtype=float)
+
+        points = np.unique(np.round(_load_stl(Path(urdf_path).parent / mesh.get('filename')), 5), axis=0)
+        frame = 0 if name == 'base_link' else int(name[1:])
+        dh_frame = np.eye(4) if frame == 0 else dh_frames[frame - 1]
+        T = np.linalg.inv(dh_frame) @ link_frames.get(name, np.eye(4)) @ visual_origin
+        vertices[name] = (frame, points @ T[:3, :3].T + T[:3, 3])
+    return vertices
+
+
+def _fit_capsule(points):
+    """Capsule along the principal axis enclosing all points."""
+    centre = points.mean(axis=0)
+    _, _, Vt = np.linalg.svd(points - centre, full_matrices=False)
+    axis = Vt[0]
+    t = (points - centre) @ axis
+    perpendicular = (points - centre) - np.outer(t, axis)
+
+    # Centre the axis on the perpendicular bounding box
+    u, w = perpendicular @ Vt[1], perpendicular @ Vt[2]
+    shift = (u.max() + u.min()) / 2 * Vt[1] + (w.max() + w.min()) / 2 * Vt[2]
+    centre = centre + shift
+    distance = np.linalg.norm(perpendicular - shift, axis=1)
+    radius = distance.max()
+
+    # Shortest segment whose end caps still contain every point
+    reach = np.sqrt(np.maximum(radius ** 2 - distance ** 2, 0.0))
+    start, end = np.min(t + reach), np.max(t - reach)
+    if start > end:
+        start = end = (start + end) / 2
+    return centre + start * axis, centre + end * axis, radius
+
+
+def _capsule_volume(p0, p1, radius):
+    return np.pi * radius ** 2 * np.linalg.norm(p1 - p0) + 4.0 / 3.0 * np.pi * radius ** 3
+
+
+def fit_link_capsules(urdf_path=URDF_PATH, seed=0):
+    """
+    Fit capsules to the URDF link meshes (k-means clusters per link).
+
+    Returns
+    -------
+    list of Capsule
+        In DH frames, ready to paste into LINK_CAPSULES
+    """
+    capsules = []
+    for name, (frame, points) in _link_vertices_dh(urdf_path).items():
+        count = URDF_CAPSULES_PER_LINK[name]
+        best = None
+        for attempt in range(5):
+            rng = np.random.default_rng(seed + attempt)
+            centres = points[rng.choice(len(points), count, replace=False)]
+            for _ in range(50):
+                labels = np.argmin(((points[:, np.newaxis] - centres) ** 2).sum(axis=-1), axis=1)
+                centres = np.array([points[labels == k].mean(axis=0) if np.any(labels == k) else centres[k]
+                                    for k in range(count)])
+            fits = [_fit_capsule(points[labels == k]) for k in range(count) if np.count_nonzero(labels == k) > 10]
+            volume = sum(_capsule_volume(*fit) for fit in fits)
+            if best is None or volume < best[0]:
+                best = (volume, fits)
+
+        label = 'base' if name == 'base_link' else name
+        fits = sorted(best[1], key=lambda fit: tuple(np.round((fit[0] + fit[1]) / 2, 3)))
+        for k, (p0, p1, radius) in enumerate(fits):
+            capsules.append(Capsule(f'{label}_{k}', frame, tuple(np.round(p0, 4)), tuple(np.round(p1, 4)),
+                                    round(float(radius), 4)))
+    return capsules
+
+
+# Poses the real robot reaches without contact (Home, Ready, Shutdown pose
+# from config.yaml): capsule pairs overlapping there are fitting artefacts
+KNOWN_FREE_POSES_DEG = (
+    (90, -90, 180, 0, 0, 180),
+    (0, -90, 180, 0, 0, 90),
+    (90, -145.0088, 107.866, 0, 0, 180),
+)
+
+
+def find_ignore_pairs(capsules, samples=20000, always_fraction=0.99, seed=0):
+    """
+    Non-adjacent capsule pairs to exclude from self-collision checks.
+
+    A pair is excluded if it overlaps in a known collision-free pose
+    (KNOWN_FREE_POSES_DEG) or in (almost) every random configuration -
+    joint housings touching by construction, not collisions.
+    """
+    rng = np.random.default_rng(seed)
+    limits = kinematics_core.JOINT_LIMITS_RAD
+    q = rng.uniform(limits[:, 0], limits[:, 1], size=(samples, kinematics_core.NUM_JOINTS))
+    q = np.vstack([np.deg2rad(KNOWN_FREE_POSES_DEG), q])
+    n_known = len(KNOWN_FREE_POSES_DEG)
+
+    model = CollisionModel(capsules, ignore_pairs=frozenset())
+    points = model.capsule_points(q)
+    ignore = set()
+    for pair in range(len(model._self_pairs)):
+        clearance = model._pair_clearance(points, np.arange(len(q)), 'self', np.full(len(q), pair))
+        colliding = clearance < 0.0
+        if colliding[:n_known].any() or colliding[n_known:].mean() >= always_fraction:
+            ignore.add(model._pair_names('self', pair))
+    return ignore
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PAROL6 capsule collision model")
+    parser.add_argument('--fit', action='store_true', help="Fit link capsules to the URDF meshes")
+    parser.add_argument('--urdf', type=Path, default=URDF_PATH, help="URDF path")
+    args = parser.parse_args()
+
+    if args.fit:
+        fitted = fit_link_capsules(args.urdf)
+        print("LINK_CAPSULES = (")
+        for capsule in fitted:
+            print(f"    Capsule('{capsule.name}', {capsule.frame}, {tuple(float(v) for v in capsule.p0)}, "
+                  f"{tuple(float(v) for v in capsule.p1)}, {capsule.radius}),")
+        print(")")
+        print(f"SELF_COLLISION_IGNORE = frozenset({sorted(find_ignore_pairs(fitted))})")
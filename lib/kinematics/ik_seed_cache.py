@@ -0,0 +1,200 @@
+"""
+IK Seed Cache for PAROL6 Robot
+
+Remembers previously solved (TCP pose -> joint configuration) pairs so
+repeated targets (program replays, timeline playback) start from a known
+solution instead of from scratch.
+
+- Spatial index: hash grid over TCP position (cell_size_m voxels); a lookup
+  scans the target's voxel and its 26 neighbours
+- Entries are only matched within the same configuration branch
+  (analytic_ik.configuration_branch: shoulder/elbow/wrist)
+- Bounded: least-recently-used entries are evicted beyond max_entries
+- Hit/miss statistics for tuning (stats())
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import itertools
+import logging
+from collections import OrderedDict
+
+import numpy as np
+
+from . import analytic_ik
+
+logger = logging.getLogger(__name__)
+
+_NEIGHBOUR_OFFSETS = np.array(list(itertools.product((-1, 0, 1), repeat=3)))
+
+
+class IKSeedCache:
+    """
+    Bounded spatial cache of IK solutions.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of cached solutions (LRU eviction, default: 10000)
+    cell_size_m : float, optional
+        Voxel edge length of the spatial hash grid in metres (default: 0.01)
+    max_distance : float, optional
+        Max pose distance for a seed hit (default: 0.02). Pose distance is
+        position error (m) + rotation_weight * ||R_a - R_b||_F
+    rotation_weight : float, optional
+        Metres per unit of rotation-matrix Frobenius distance (default: 0.05)
+    exact_tolerance : float, optional
+        Pose distance below which a cached solution is reused directly
+        (default: 1e-9)
+    """
+
+    def __init__(self, max_entries=10000, cell_size_m=0.01, max_distance=0.02,
+                 rotation_weight=0.05, exact_tolerance=1e-9):
+        self.max_entries = max_entries
+        self.cell_size_m = cell_size_m
+        self.max_distance = max_distance
+        self.rotation_weight = rotation_weight
+        self.exact_tolerance = exact_tolerance
+
+        self._entries = OrderedDict()  # entry_id -> (cell, T, q, branch), LRU order
+        self._cells = {}               # cell -> set of entry_ids
+        self._next_id = 0
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # Spatial index
+    # ------------------------------------------------------------------
+
+    def _cell(self, position):
+        return tuple(np.floor(np.asarray(position) / self.cell_size_m).astype(int))
+
+    def _pose_distance(self, T_a, T_b):
+        return (np.linalg.norm(T_a[:3, 3] - T_b[:3, 3])
+                + self.rotation_weight * np.linalg.norm(T_a[:3, :3] - T_b[:3, :3]))
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            entry_id, (cell, _, _, _) = self._entries.popitem(last=False)
+            bucket = self._cells[cell]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._cells[cell]
+            self._evictions += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def insert(self, T, q):
+        """
+        Record a solved pose.
+
+        Parameters
+        ----------
+        T : array_like, shape (4, 4)
+            TCP pose (SE3 objects: pass T.A)
+        q : array_like, shape (6,)
+            Joint solution in radians
+        """
+        T = np.asarray(T, dtype=float)
+        q = np.asarray(q, dtype=float)
+        branch = int(analytic_ik.configuration_branch(q)[0])
+        cell = self._cell(T[:3, 3])
+
+        # Replace an existing entry for the same pose and branch
+        for entry_id in self._cells.get(cell, ()):
+            _, T_cached, _, branch_cached = self._entries[entry_id]
+            if branch_cached == branch and self._pose_distance(T, T_cached) <= self.exact_tolerance:
+                self._entries[entry_id] = (cell, T, q, branch)
+                self._entries.move_to_end(entry_id)
+                return
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (cell, T, q, branch)
+        self._cells.setdefault(cell, set()).add(entry_id)
+        self._evict()
+
+    def lookup(self, T, branch):
+        """
+        Nearest cached solution for a pose within one configuration branch.
+
+        Parameters
+        ----------
+        T : array_like, shape (4, 4)
+            Target TCP pose
+        branch : int
+            Configuration branch (analytic_ik.configuration_branch)
+
+        Returns
+        -------
+        tuple
+            (q, exact) - q is None on a miss; exact is True when the cached
+            pose matches the target within exact_tolerance
+        """
+        T = np.asarray(T, dtype=float)
+        self._lookups += 1
+
+        best_id, best_distance = None, np.inf
+        base_cell = np.array(self._cell(T[:3, 3]))
+        for offset in _NEIGHBOUR_OFFSETS:
+            for entry_id in self._cells.get(tuple(base_cell + offset), ()):
+                _, T_cached, _, branch_cached = self._entries[entry_id]
+                if branch_cached != branch:
+                    continue
+                distance = self._pose_distance(T, T_cached)
+                if distance < best_distance:
+                    best_id, best_distance = entry_id, distance
+
+        if best_id is None or best_distance > self.max_distance:
+            self._misses += 1
+            return None, False
+
+        self._entries.move_to_end(best_id)
+        exact = best_distance <= self.exact_tolerance
+        if exact:
+            self._exact_hits += 1
+        else:
+            self._seed_hits += 1
+        return self._entries[best_id][2].copy(), exact
+
+    def clear(self):
+        """Drop all cached solutions (statistics are kept)."""
+        self._entries.clear()
+        self._cells.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups that returned a solution (exact or seed)."""
+        if self._lookups == 0:
+            return 0.0
+        return (self._exact_hits + self._seed_hits) / self._lookups
+
+    def stats(self):
+        """Cache statistics."""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'lookups': self._lookups,
+            'exact_hits': self._exact_hits,
+            'seed_hits': self._seed_hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'hit_rate': self.hit_rate
+        }
+
+    def reset_stats(self):
+        """Reset hit/miss statistics."""
+        self._lookups = 0
+        self._exact_hits = 0
+        self._seed_hits = 0
+        self._misses = 0
+        self._evictions = 0
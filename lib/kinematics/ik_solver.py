@@ -2,6 +2,9 @@
 Inverse Kinematics Solver for PAROL6 Robot
 
 This module provides centralized IK solving functionality with:
+- Closed-form analytic IK (analytic_ik.py) as the first attempt
+- Optional seed cache of previous solutions (ik_seed_cache.py)
+- O(1) rejection of unreachable targets (workspace_map.py)
 - Adaptive tolerance based on manipulability (proximity to singularities)
 - Recursive subdivision for difficult targets
 - Angle unwrapping for continuous motion
@@ -16,9 +19,12 @@ import numpy as np
 from collections import namedtuple
 from spatialmath import SE3
 from spatialmath.base import trinterp
-from roboticstoolbox import DHRobot
 import logging
 
+from . import analytic_ik
+from . import kinematics_core
+from . import workspace_map
+
 # Get logger
 logger = logging.getLogger(__name__)
 
@@ -104,7 +110,8 @@ def calculate_adaptive_tolerance(robot, q, strict_tol=1e-10, loose_tol=1e-7):
     Parameters
     ----------
     robot : DHRobot
-        Robot model
+        Robot model (unused - manipulability is evaluated in closed form by
+        kinematics_core; kept for call compatibility)
     q : array_like
         Joint configuration in radians
     strict_tol : float, optional
@@ -124,11 +131,11 @@ def calculate_adaptive_tolerance(robot, q, strict_tol=1e-10, loose_tol=1e-7):
     # Calculate manipulability measure (closer to 0 = closer to singularity)
     if _performance_monitor:
         _performance_monitor.start_phase('ik_manipulability')
-    manip = robot.manipulability(q_array)
+    manip = float(kinematics_core.manipulability(q_array)[0])
     if _performance_monitor:
         _performance_monitor.end_phase('ik_manipulability')
 
-    singularity_threshold = 0.001
+    singularity_threshold = kinematics_core.SINGULARITY_THRESHOLD
 
     # Normalize singularity proximity to [0, 1] range
     sing_normalized = np.clip(manip / singularity_threshold, 0.0, 1.0)
@@ -189,14 +196,16 @@ def calculate_configuration_dependent_max_reach(q_seed):
 
 
 def solve_ik_with_adaptive_tol_subdivision(
-        robot: DHRobot,
+        robot: 'DHRobot',
         target_pose: SE3,
         current_q,
         current_pose: SE3 = None,
         max_depth: int = 4,
         ilimit: int = 100,
         jogging: bool = False,
-        joint_limits_checker=None
+        joint_limits_checker=None,
+        use_analytic: bool = True,
+        seed_q=None
 ):
     """
     Solve inverse kinematics with adaptive tolerance and recursive subdivision.
@@ -208,6 +217,11 @@ def solve_ik_with_adaptive_tol_subdivision(
     If necessary, recursively subdivides the motion until ikine_LMS converges
     on every segment. Finally checks that solution respects joint limits.
 
+    Targets outside the precomputed workspace map are rejected before any
+    solver runs. With use_analytic, the closed-form solver runs first and returns the
+    valid branch (shoulder/elbow/wrist) closest to current_q. The numerical
+    path only runs when no branch reaches the target within joint limits.
+
     From experimentation, jogging with lower tolerances often produces q_paths
     that do not differ from current_q, essentially freezing the robot.
 
@@ -229,6 +243,12 @@ def solve_ik_with_adaptive_tol_subdivision(
         If True, use strict tolerance for jogging (default: False)
     joint_limits_checker : callable, optional
         Function to check joint limits: checker(current_q, target_q) -> (valid, violations)
+    use_analytic : bool, optional
+        Try the closed-form solver before ik_LM (default: True)
+    seed_q : array_like, optional
+        Start ik_LM from this configuration instead of current_q (e.g. a
+        cached solution near the target); joint limits are still checked
+        against current_q
 
     Returns
     -------
@@ -241,8 +261,36 @@ def solve_ik_with_adaptive_tol_subdivision(
         - tolerance_used: Tolerance value used
         - violations: Joint limit violations (if any)
     """
-    if current_pose is None:
-        current_pose = robot.fkine(current_q)
+    # ── Reachability pre-check (O(1) voxel lookup) ───────────────────────
+    reach_map = workspace_map.get_workspace_map()
+    if reach_map is not None and not reach_map.is_reachable(target_pose.t):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[IKSolver] Target outside reachable workspace: {np.round(target_pose.t, 4)}")
+        return IKResult(False, None, 0, 0.0, 0.0, [])
+
+    # ── Closed-form first attempt ────────────────────────────────────────
+    if use_analytic:
+        if _performance_monitor:
+            _performance_monitor.start_phase('ik_solve')
+        q_analytic = analytic_ik.solve_nearest(target_pose.A, current_q)
+        if _performance_monitor:
+            _performance_monitor.end_phase('ik_solve')
+
+        if q_analytic is not None:
+            if joint_limits_checker is not None:
+                solution_valid, violations = joint_limits_checker(current_q, q_analytic)
+            else:
+                solution_valid, violations = True, []
+            if solution_valid:
+                return IKResult(True, q_analytic, 0, 0.0, 0.0, violations)
+
+    if seed_q is not None:
+        q_start = np.asarray(seed_q, dtype=float)
+        current_pose = robot.fkine(q_start)
+    else:
+        q_start = current_q
+        if current_pose is None:
+            current_pose = robot.fkine(current_q)
 
     # ── Inner recursive solver ───────────────────────────────────────────
     def _solve(Ta: SE3, Tb: SE3, q_seed, depth, tol):
@@ -317,10 +365,10 @@ def solve_ik_with_adaptive_tol_subdivision(
     if jogging:
         adaptive_tol = 1e-10  # Strict tolerance for jogging
     else:
-        adaptive_tol = calculate_adaptive_tolerance(robot, current_q)
+        adaptive_tol = calculate_adaptive_tolerance(robot, q_start)
 
     # Solve IK with subdivision
-    path, ok, its, resid = _solve(current_pose, target_pose, current_q, 0, adaptive_tol)
+    path, ok, its, resid = _solve(current_pose, target_pose, q_start, 0, adaptive_tol)
 
     # Check if solution respects joint limits
     target_q = path[-1] if len(path) != 0 else None
@@ -343,9 +391,12 @@ class IKSolver:
     Inverse kinematics solver class for PAROL6 robot.
 
     Provides a convenient object-oriented interface to the IK solving functions.
+    With a seed cache, solutions are remembered per pose: an exact repeat is
+    answered from the cache, a nearby pose in the same configuration branch
+    seeds ik_LM with the cached solution.
     """
 
-    def __init__(self, robot_model, joint_limits_checker=None):
+    def __init__(self, robot_model, joint_limits_checker=None, seed_cache=None):
         """
         Initialize IK solver.
 
@@ -355,14 +406,17 @@ class IKSolver:
             Robot kinematic model
         joint_limits_checker : callable, optional
             Function to check joint limits
+        seed_cache : IKSeedCache, optional
+            Cache of previous solutions consulted before solving
         """
         self.robot = robot_model
         self.joint_limits_checker = joint_limits_checker
+        self.seed_cache = seed_cache
         self._solve_count = 0
         self._success_count = 0
 
     def solve(self, target_pose, current_q, current_pose=None,
-             max_depth=4, ilimit=100, jogging=False):
+             max_depth=4, ilimit=100, jogging=False, use_analytic=True):
         """
         Solve inverse kinematics for target pose.
 
@@ -380,6 +434,8 @@ class IKSolver:
             Maximum IK iterations (default: 100)
         jogging : bool, optional
             Use strict tolerance for jogging (default: False)
+        use_analytic : bool, optional
+            Try the closed-form solver before ik_LM (default: True)
 
         Returns
         -------
@@ -388,6 +444,19 @@ class IKSolver:
         """
         self._solve_count += 1
 
+        seed_q = None
+        if self.seed_cache is not None:
+            branch = int(analytic_ik.configuration_branch(current_q)[0])
+            seed_q, exact = self.seed_cache.lookup(target_pose.A, branch)
+            if exact:
+                if self.joint_limits_checker is not None:
+                    solution_valid, violations = self.joint_limits_checker(current_q, seed_q)
+                else:
+                    solution_valid, violations = True, []
+                if solution_valid:
+                    self._success_count += 1
+                    return IKResult(True, seed_q, 0, 0.0, 0.0, violations)
+
         result = solve_ik_with_adaptive_tol_subdivision(
             self.robot,
             target_pose,
@@ -396,11 +465,15 @@ class IKSolver:
             max_depth=max_depth,
             ilimit=ilimit,
             jogging=jogging,
-            joint_limits_checker=self.joint_limits_checker
+            joint_limits_checker=self.joint_limits_checker,
+            use_analytic=use_analytic,
+            seed_q=seed_q
         )
 
         if result.success:
             self._success_count += 1
+            if self.seed_cache is not None:
+                self.seed_cache.insert(target_pose.A, result.q)
 
         return result
 
@@ -411,7 +484,16 @@ class IKSolver:
             return 0.0
         return self._success_count / self._solve_count
 
+    @property
+    def cache_hit_rate(self):
+        """Get seed cache hit rate (0.0 without a cache)."""
+        if self.seed_cache is None:
+            return 0.0
+        return self.seed_cache.hit_rate
+
     def reset_stats(self):
         """Reset solver statistics."""
         self._solve_count = 0
         self._success_count = 0
+        if self.seed_cache is not None:
+            self.seed_cache.reset_stats()
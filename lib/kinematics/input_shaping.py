@@ -0,0 +1,351 @@
+"""
+Input Shaping for PAROL6 Robot
+
+Suppresses the residual vibration of compliant joints (belts, J2 backlash)
+by convolving the joint setpoint stream with a short train of impulses
+whose responses cancel at the joint's natural frequency:
+
+- ZV: two impulses over half a damped period (shortest, most sensitive to
+  frequency error)
+- ZVD: three impulses over one period (robust to ~±20% frequency error)
+- EI: three impulses over one period, tolerating 5% residual vibration at
+  the design frequency for a wider insensitive band
+
+Every joint has its own shaper (frequency, damping, type); unshaped joints
+pass straight through. Impulse times are not rounded to the control
+period: each impulse is split between the two neighbouring samples.
+
+The shaped motion ends later than the reference by the shaper duration
+(half to one vibration period), so the commander lets the setpoints settle
+on the final target before the next command starts.
+
+Shaper parameters are identified from MotionRecorder recordings
+(commanded vs. measured joint positions) by fitting a damped oscillation
+to the following error after every move:
+
+    python -m lib.kinematics.input_shaping motion_recordings/<name>.json
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+
+import numpy as np
+
+from .trajectory_timing import DEFAULT_DT
+
+logger = logging.getLogger(__name__)
+
+SHAPER_TYPES = ('ZV', 'ZVD', 'EI')
+
+# Residual vibration tolerated by the EI shaper at the design frequency
+EI_VIBRATION_TOLERANCE = 0.05
+
+# Identification: settle windows after moves
+DEFAULT_SETTLE_WINDOW_S = 1.0
+MIN_WINDOW_SAMPLES = 8
+MIN_RINGING_DEG = 0.02
+
+
+# ============================================================================
+# Shaper Design
+# ============================================================================
+
+def design_shaper(shaper_type, frequency_hz, damping=0.0):
+    """
+    Impulse train of a ZV / ZVD / EI shaper.
+
+    Parameters
+    ----------
+    shaper_type : str
+        'ZV', 'ZVD' or 'EI'
+    frequency_hz : float
+        Natural frequency of the vibration (> 0)
+    damping : float, optional
+        Damping ratio (0 <= damping < 1)
+
+    Returns
+    -------
+    times : ndarray
+        Impulse times in seconds (first is 0)
+    amplitudes : ndarray
+        Impulse amplitudes (sum to 1)
+    """
+    shaper_type = shaper_type.upper()
+    if shaper_type not in SHAPER_TYPES:
+        raise ValueError(f"Unknown shaper type '{shaper_type}' (expected one of {', '.join(SHAPER_TYPES)})")
+    if frequency_hz <= 0 or not 0 <= damping < 1:
+        raise ValueError(f"Invalid shaper frequency {frequency_hz} Hz / damping {damping}")
+
+    damped = math.sqrt(1.0 - damping ** 2)
+    K = math.exp(-damping * math.pi / damped)
+    period = 1.0 / (frequency_hz * damped)
+
+    if shaper_type == 'ZV':
+        amplitudes, times = [1.0, K], [0.0, period / 2]
+    elif shaper_type == 'ZVD':
+        amplitudes, times = [1.0, 2 * K, K * K], [0.0, period / 2, period]
+    else:
+        v_tol = EI_VIBRATION_TOLERANCE
+        amplitudes = [(1 + v_tol) / 4, (1 - v_tol) / 2 * K, (1 + v_tol) / 4 * K * K]
+        times = [0.0, period / 2, period]
+
+    amplitudes = np.array(amplitudes)
+    return np.array(times), amplitudes / amplitudes.sum()
+
+
+def residual_vibration(times, amplitudes, frequency_hz, damping=0.0):
+    """
+    Vibration left by a shaper on a mode (fraction of the unshaped one).
+
+    Useful to check the sensitivity of a shaper to frequency errors.
+    """
+    omega = 2 * math.pi * frequency_hz
+    damped = omega * math.sqrt(1.0 - damping ** 2)
+    weight = amplitudes * np.exp(damping * omega * (times - times[-1]))
+    return float(np.hypot(np.sum(weight * np.cos(damped * times)), np.sum(weight * np.sin(damped * times))))
+
+
+def _fir_taps(times, amplitudes, dt):
+    """FIR weights of an impulse train at the sample period (fractional delays split linearly)."""
+    delay = np.asarray(times) / dt
+    taps = np.zeros(int(np.floor(delay[-1])) + 2)
+    for d, amplitude in zip(delay, amplitudes):
+        n = int(np.floor(d))
+        frac = d - n
+        taps[n] += amplitude * (1 - frac)
+        taps[n + 1] += amplitude * frac
+    return np.trim_zeros(taps, 'b')
+
+
+# ============================================================================
+# Streaming Shaper
+# ============================================================================
+
+class InputShaper:
+    """
+    Per-joint FIR input shaper for a stream of setpoints (one per cycle).
+
+    Parameters
+    ----------
+    shapers : list of (str, float, float) or None
+        Per joint (type, frequency_hz, damping), or None to pass through
+    dt : float, optional
+        Control period (s)
+    """
+
+    def __init__(self, shapers, dt=DEFAULT_DT):
+        self.shapers = list(shapers)
+        self.dt = float(dt)
+
+        taps = [_fir_taps(*design_shaper(*shaper), self.dt) if shaper else np.ones(1) for shaper in self.shapers]
+        length = max(len(t) for t in taps)
+        # Column j: weights of joint j, newest sample first
+        self._taps = np.zeros((length, len(taps)))
+        for j, t in enumerate(taps):
+            self._taps[:len(t), j] = t
+        self._history = None
+        self._still_cycles = length
+
+    @classmethod
+    def from_config(cls, config, dt=DEFAULT_DT, num_joints=6):
+        """
+        Build from the `robot.input_shaping` config section.
+
+        Keys: enabled (bool), shaper ('ZV'/'ZVD'/'EI' or one per joint),
+        frequency_hz (one per joint, 0 = not shaped), damping (float or
+        one per joint).
+
+        Returns
+        -------
+        InputShaper or None
+            None if shaping is disabled or no joint is shaped
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        def per_joint(value, default):
+            value = default if value is None else value
+            return list(value) if isinstance(value, (list, tuple)) else [value] * num_joints
+
+        types = per_joint(config.get('shaper'), 'ZVD')
+        frequencies = per_joint(config.get('frequency_hz'), 0.0)
+        dampings = per_joint(config.get('damping'), 0.0)
+        if not len(types) == len(frequencies) == len(dampings) == num_joints:
+            raise ValueError(f"input_shaping needs {num_joints} values per joint setting")
+
+        shapers = [(t, float(f), float(z)) if f and float(f) > 0 else None
+                   for t, f, z in zip(types, frequencies, dampings)]
+        if not any(shapers):
+            return None
+        return cls(shapers, dt)
+
+    @property
+    def duration(self):
+        """Delay between the reference and the shaped setpoints settling (s)."""
+        return (len(self._taps) - 1) * self.dt
+
+    @property
+    def is_settled(self):
+        """True once the shaped setpoints have reached the last reference."""
+        return self._still_cycles >= len(self._taps) - 1
+
+    def reset(self, position):
+        """Restart from rest at `position` (no motion in the history)."""
+        self._history = np.tile(np.asarray(position, dtype=float), (len(self._taps), 1))
+        self._still_cycles = len(self._taps)
+
+    def shape(self, reference):
+        """
+        Push the next reference setpoint and return the shaped one.
+
+        Returns
+        -------
+        list of int
+            Shaped setpoint, rounded like the reference (steps)
+        """
+        reference = np.asarray(reference, dtype=float)
+        if self._history is None:
+            self.reset(reference)
+        changed = not np.array_equal(reference, self._history[0])
+        self._history = np.roll(self._history, 1, axis=0)
+        self._history[0] = reference
+        self._still_cycles = 0 if changed else self._still_cycles + 1
+        return np.rint(np.sum(self._taps * self._history, axis=0)).astype(int).tolist()
+
+    def settle(self):
+        """Hold the last reference: shaped setpoint of the next cycle."""
+        return self.shape(self._history[0])
+
+
+# ============================================================================
+# Identification from MotionRecorder data
+# ============================================================================
+
+def _settle_windows(commanded, max_samples):
+    """Slices where the commanded position holds still right after moving."""
+    moving = np.abs(np.diff(commanded)) > 1e-9
+    windows = []
+    start = None
+    for k in range(len(moving)):
+        if moving[k]:
+            start = None
+        elif start is None and k > 0 and moving[k - 1]:
+            start = k + 1
+        if start is not None and (k + 2 - start >= max_samples or k == len(moving) - 1):
+            windows.append(slice(start, k + 2))
+            start = None
+    return windows
+
+
+def identify_vibration(recording, window_s=DEFAULT_SETTLE_WINDOW_S, min_ringing_deg=MIN_RINGING_DEG):
+    """
+    Natural frequency and damping of every joint from a MotionRecorder
+    recording.
+
+    The following error (measured - commanded) is taken in the windows
+    where the commanded position holds still after a move and fitted with
+    a second-order autoregressive model, whose poles give the damped
+    oscillation.
+
+    Parameters
+    ----------
+    recording : dict
+        MotionRecorder data ('commander_state' samples with timestamp_ms,
+        position_out, position_in in degrees)
+    window_s : float, optional
+        Settle time analysed after every move
+    min_ringing_deg : float, optional
+        Windows with smaller peak error are ignored
+
+    Returns
+    -------
+    list of dict or None
+        Per joint: 'frequency_hz', 'damping', 'windows', 'peak_error_deg';
+        None if no ringing was found
+    """
+    samples = recording['commander_state']
+    if len(samples) < MIN_WINDOW_SAMPLES:
+        raise ValueError(f"Recording has only {len(samples)} samples")
+
+    t = np.array([s['timestamp_ms'] for s in samples]) / 1000.0
+    dt = float(np.median(np.diff(t)))
+    grid = np.arange(t[0], t[-1], dt)
+    commanded = np.array([s['position_out'] for s in samples])
+    measured = np.array([s['position_in'] for s in samples])
+
+    results = []
+    for joint in range(commanded.shape[1]):
+        # Resample on a uniform grid (the recorder self-throttles)
+        out = np.interp(grid, t, commanded[:, joint])
+        error = np.interp(grid, t, measured[:, joint]) - out
+
+        rows, targets, peaks = [], [], []
+        for window in _settle_windows(out, max(int(window_s / dt), MIN_WINDOW_SAMPLES)):
+            e = error[window]
+            if len(e) < MIN_WINDOW_SAMPLES:
+                continue
+            e = e - np.mean(e[-max(len(e) // 4, 2):])
+            if np.max(np.abs(e)) < min_ringing_deg:
+                continue
+            rows.append(np.column_stack([e[1:-1], e[:-2]]))
+            targets.append(e[2:])
+            peaks.append(np.max(np.abs(e)))
+
+        result = None
+        if rows:
+            (a1, a2), *_ = np.linalg.lstsq(np.vstack(rows), np.concatenate(targets), rcond=None)
+            poles = np.roots([1.0, -a1, -a2])
+            pole = poles[np.argmax(poles.imag)]
+            if pole.imag > 0 and 0 < abs(pole) < 1:
+                s = np.log(pole) / dt
+                omega = abs(s)
+                result = {
+                    'frequency_hz': float(omega / (2 * math.pi)),
+                    'damping': float(-s.real / omega),
+                    'windows': len(rows),
+                    'peak_error_deg': float(max(peaks)),
+                }
+                if result['frequency_hz'] > 0.4 / dt:
+                    logger.warning(f"[InputShaping] J{joint + 1}: {result['frequency_hz']:.1f} Hz is close to the "
+                                   f"recording's Nyquist frequency ({0.5 / dt:.1f} Hz) - record at a higher rate")
+        results.append(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Identify input shaper parameters from a motion recording")
+    parser.add_argument('recording', type=Path, help="MotionRecorder JSON file")
+    parser.add_argument('--shaper', default='ZVD', choices=SHAPER_TYPES, help="Shaper type to suggest")
+    parser.add_argument('--window', type=float, default=DEFAULT_SETTLE_WINDOW_S, help="Settle window per move (s)")
+    parser.add_argument('--min-ringing', type=float, default=MIN_RINGING_DEG, help="Ignore smaller errors (deg)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with open(args.recording, 'r') as f:
+        modes = identify_vibration(json.load(f), args.window, args.min_ringing)
+
+    for joint, mode in enumerate(modes):
+        if mode is None:
+            print(f"J{joint + 1}: no ringing found")
+        else:
+            shaper_s = design_shaper(args.shaper, mode['frequency_hz'], mode['damping'])[0][-1]
+            print(f"J{joint + 1}: {mode['frequency_hz']:.2f} Hz, damping {mode['damping']:.3f} "
+                  f"({mode['windows']} moves, peak error {mode['peak_error_deg']:.3f} deg, "
+                  f"{args.shaper} adds {shaper_s * 1000:.0f} ms)")
+
+    frequencies = [round(m['frequency_hz'], 2) if m else 0 for m in modes]
+    dampings = [round(m['damping'], 3) if m else 0 for m in modes]
+    print("\nconfig.yaml (robot section):")
+    print("  input_shaping:")
+    print("    enabled: true")
+    print(f"    shaper: {args.shaper}")
+    print(f"    frequency_hz: {frequencies}")
+    print(f"    damping: {dampings}")
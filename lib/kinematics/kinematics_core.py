@@ -0,0 +1,648 @@
+"""
+Lightweight Kinematics Core for PAROL6 Robot
+
+Plain-NumPy implementation of the PAROL6 DH chain. Every function accepts a
+single joint vector (6,) or a batch (N, 6) and evaluates the whole batch in
+one vectorized pass, without roboticstoolbox.
+
+Provides forward kinematics, the geometric Jacobian, closed-form Yoshikawa
+manipulability and singularity measures, joint-limit checks and the joint-space interpolation
+primitives used by the commander (ports of roboticstoolbox jtraj and
+trapezoidal). Importing this module only requires NumPy; roboticstoolbox is
+only loaded by robot_model.robot for the numerical IK solvers.
+
+The DH table mirrors robot_model.robot exactly (standard DH convention:
+T_i = Rz(theta_i + offset_i) * Tz(d_i) * Tx(a_i) * Rx(alpha_i)).
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import numpy as np
+from collections import namedtuple
+from math import pi
+
+# ============================================================================
+# DH Parameters
+# ============================================================================
+
+# Robot length values (metres) - see robot_model.py for their meaning
+a1 = 110.50 / 1000
+a2 = 23.42 / 1000
+a3 = 180 / 1000
+a4 = 43.5 / 1000
+a5 = 176.35 / 1000
+a6 = 34.0 / 1000  # Fixed offset from J5/J6 intersection to J6 flange
+a7 = 0  # No offset - TCP at J5/J6 axis intersection
+
+alpha_DH = [-pi / 2, pi, pi / 2, -pi / 2, pi / 2, pi]
+
+DH_D = np.array([a1, 0.0, 0.0, -a5, 0.0, -a6])
+DH_A = np.array([a2, a3, -a4, 0.0, 0.0, -a7])
+DH_ALPHA = np.array(alpha_DH)
+DH_OFFSET = np.array([0.0, 0.0, 0.0, 0.0, 0.0, pi / 2])  # +90° on J6 to align TCP with URDF
+
+NUM_JOINTS = 6
+
+# Joint limits (degrees) - same values as robot_model.Joint_limits_degree
+JOINT_LIMITS_DEGREE = np.array([
+    [-123.046875, 123.046875],
+    [-145.0088, -3.375],
+    [107.866, 287.8675],
+    [-105.46975, 105.46975],
+    [-90, 90],
+    [0, 360],
+])
+JOINT_LIMITS_RAD = np.deg2rad(JOINT_LIMITS_DEGREE)
+
+# Manipulability below which a configuration counts as near-singular
+SINGULARITY_THRESHOLD = 0.001
+
+
+# ============================================================================
+# Forward Kinematics
+# ============================================================================
+
+def _as_batch(q):
+    """Return (q as (N, n) float array, True if input was a single vector)."""
+    q_array = np.asarray(q, dtype=float)
+    if q_array.ndim == 1:
+        return q_array[np.newaxis, :], True
+    return q_array, False
+
+
+def dh_transforms(q):
+    """
+    Per-link DH transforms for a batch of configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians (fewer columns evaluate only the first links)
+
+    Returns
+    -------
+    ndarray, shape (N, n, 4, 4)
+        Link transform i-1 -> i for every configuration and link
+    """
+    q_batch, _ = _as_batch(q)
+    n_links = q_batch.shape[1]
+
+    theta = q_batch + DH_OFFSET[:n_links]
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(DH_ALPHA[:n_links]), np.sin(DH_ALPHA[:n_links])
+    d, a = DH_D[:n_links], DH_A[:n_links]
+
+    T = np.zeros(q_batch.shape + (4, 4))
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st * ca
+    T[..., 0, 2] = st * sa
+    T[..., 0, 3] = a * ct
+    T[..., 1, 0] = st
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -ct * sa
+    T[..., 1, 3] = a * st
+    T[..., 2, 1] = sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = d
+    T[..., 3, 3] = 1.0
+    return T
+
+
+def fkine_all(q):
+    """
+    Frames of every link (base frame excluded) for a batch of configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (N, n, 4, 4)
+        Base -> link i transform for i = 1..n
+    """
+    links = dh_transforms(q)
+    frames = np.empty_like(links)
+    frames[:, 0] = links[:, 0]
+    for i in range(1, links.shape[1]):
+        frames[:, i] = frames[:, i - 1] @ links[:, i]
+    return frames
+
+
+def fkine_batch(q):
+    """
+    Flange pose for a batch of configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (N, 4, 4)
+        Base -> flange homogeneous transforms
+    """
+    links = dh_transforms(q)
+    T = links[:, 0]
+    for i in range(1, links.shape[1]):
+        T = T @ links[:, i]
+    return T
+
+
+def fkine(q):
+    """
+    Flange pose of a single configuration.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (4, 4)
+        Base -> flange homogeneous transform (same as robot.fkine(q).A)
+    """
+    return fkine_batch(np.asarray(q, dtype=float)[np.newaxis, :])[0]
+
+
+# ============================================================================
+# Jacobian and Manipulability
+# ============================================================================
+
+def jacobian(q):
+    """
+    Geometric Jacobian in the base frame for a batch of configurations.
+
+    Column i is [z_{i-1} x (p_e - p_{i-1}); z_{i-1}] with z/p the joint
+    axes and origins from fkine_all (same as robot.jacob0(q)).
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (N, 6, 6)
+        Rows: [vx, vy, vz, wx, wy, wz]; columns: joints
+    """
+    frames = fkine_all(q)
+    n_configs = frames.shape[0]
+
+    z = np.empty((n_configs, NUM_JOINTS, 3))
+    p = np.empty((n_configs, NUM_JOINTS, 3))
+    z[:, 0] = [0.0, 0.0, 1.0]
+    p[:, 0] = 0.0
+    z[:, 1:] = frames[:, :-1, :3, 2]
+    p[:, 1:] = frames[:, :-1, :3, 3]
+    p_end = frames[:, -1, :3, 3]
+
+    J = np.empty((n_configs, 6, NUM_JOINTS))
+    J[:, :3, :] = np.swapaxes(np.cross(z, p_end[:, np.newaxis, :] - p), 1, 2)
+    J[:, 3:, :] = np.swapaxes(z, 1, 2)
+    return J
+
+
+def singularity_factors(q):
+    """
+    Closed-form factors of |det J| for a batch of configurations.
+
+    With a spherical wrist the Jacobian is block-triangular about the wrist
+    centre, so |det J| = shoulder * elbow * wrist:
+
+    - shoulder: distance of the wrist centre from the J1 axis (m)
+    - elbow: a3 * |a4 sin(q3) - a5 cos(q3)| (arm stretched / folded, m^2)
+    - wrist: |sin(q5)| (J4 and J6 aligned)
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (N, 3)
+        Columns: shoulder, elbow, wrist (0 at the respective singularity)
+    """
+    q_batch, _ = _as_batch(q)
+    q2, q3, q5 = q_batch[:, 1], q_batch[:, 2], q_batch[:, 4]
+    forearm = q2 - q3
+
+    factors = np.empty((q_batch.shape[0], 3))
+    factors[:, 0] = np.abs(a2 + a3 * np.cos(q2) - a4 * np.cos(forearm) + a5 * np.sin(forearm))
+    factors[:, 1] = a3 * np.abs(a4 * np.sin(q3) - a5 * np.cos(q3))
+    factors[:, 2] = np.abs(np.sin(q5))
+    return factors
+
+
+def manipulability(q=None, J=None):
+    """
+    Yoshikawa manipulability sqrt(det(J J^T)) for a batch of configurations.
+
+    For the square PAROL6 Jacobian this equals |det J|, evaluated in closed
+    form from singularity_factors (no Jacobian is built).
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6), optional
+        Joint angles in radians
+    J : ndarray, shape (N, 6, 6), optional
+        Precomputed Jacobians (used instead of q)
+
+    Returns
+    -------
+    ndarray, shape (N,)
+        Same as robot.manipulability(q) (0 at singularities)
+    """
+    if J is not None:
+        return np.abs(np.linalg.det(J))
+    return np.prod(singularity_factors(q), axis=1)
+
+
+def near_singularity(q, threshold=SINGULARITY_THRESHOLD):
+    """
+    Whether configurations are within the manipulability threshold.
+
+    Returns
+    -------
+    ndarray of bool, shape (N,)
+    """
+    return manipulability(q) < threshold
+
+
+def singularity_speed_scale(q, threshold=SINGULARITY_THRESHOLD, min_scale=0.1):
+    """
+    Speed scale factor that slows motion down approaching a singularity.
+
+    Ramps linearly from 1.0 (manipulability >= threshold) down to
+    min_scale (manipulability 0).
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+    threshold : float, optional
+        Manipulability at which slowing starts
+    min_scale : float, optional
+        Scale at the singularity itself
+
+    Returns
+    -------
+    ndarray, shape (N,)
+    """
+    ratio = np.clip(manipulability(q) / threshold, 0.0, 1.0)
+    return min_scale + (1.0 - min_scale) * ratio
+
+
+# ============================================================================
+# Joint Limits
+# ============================================================================
+
+def within_joint_limits(q, limits=JOINT_LIMITS_RAD, tol=0.0):
+    """
+    Joint-limit check for a batch of configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+    limits : array_like, shape (6, 2), optional
+        Joint limits in radians
+    tol : float, optional
+        Allowed overshoot in radians
+
+    Returns
+    -------
+    ndarray of bool, shape (N,)
+    """
+    q_batch, _ = _as_batch(q)
+    limits = np.asarray(limits, dtype=float)
+    return np.all((q_batch >= limits[:, 0] - tol) & (q_batch <= limits[:, 1] + tol), axis=-1)
+
+
+def joint_limit_violations(q, limits=JOINT_LIMITS_RAD):
+    """
+    Per-joint signed distance outside the limits (0 inside).
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+
+    Returns
+    -------
+    ndarray, shape (N, 6)
+        Negative below the lower limit, positive above the upper limit
+    """
+    q_batch, _ = _as_batch(q)
+    limits = np.asarray(limits, dtype=float)
+    return np.minimum(q_batch - limits[:, 0], 0.0) + np.maximum(q_batch - limits[:, 1], 0.0)
+
+
+# ============================================================================
+# Joint-Space Interpolation
+# ============================================================================
+
+# Same fields as the roboticstoolbox Trajectory attributes used by the commander
+JointTrajectory = namedtuple('JointTrajectory', 'q qd qdd')
+
+
+def jtraj(q0, qf, n):
+    """
+    Quintic joint trajectory with zero boundary velocity/acceleration
+    (NumPy port of roboticstoolbox jtraj(q0, qf, n)).
+
+    Parameters
+    ----------
+    q0, qf : array_like, shape (n_joints,)
+        Start and end configurations
+    n : int
+        Number of samples
+
+    Returns
+    -------
+    JointTrajectory
+        q, qd, qdd of shape (n, n_joints); derivatives per unit of
+        normalized time (0 -> 1)
+    """
+    q0 = np.asarray(q0, dtype=float)
+    delta = np.asarray(qf, dtype=float) - q0
+    s = np.linspace(0.0, 1.0, n)[:, np.newaxis]
+
+    q = q0 + delta * (10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5)
+    qd = delta * (30 * s ** 2 - 60 * s ** 3 + 30 * s ** 4)
+    qdd = delta * (60 * s - 180 * s ** 2 + 120 * s ** 3)
+    return JointTrajectory(q, qd, qdd)
+
+
+def trapezoidal(q0, qf, t):
+    """
+    Scalar trapezoidal (linear segment with parabolic blends) trajectory
+    (NumPy port of roboticstoolbox trapezoidal(q0, qf, t) with default V).
+
+    Parameters
+    ----------
+    q0, qf : float
+        Start and end values
+    t : array_like
+        Monotonic time samples; the motion ends at max(t)
+
+    Returns
+    -------
+    JointTrajectory
+        q, qd, qdd arrays of len(t)
+    """
+    t = np.asarray(t, dtype=float)
+    T = np.max(t)
+    V = (qf - q0) / T * 1.5
+
+    if V == 0:
+        q = np.full(t.shape, float(q0))
+        return JointTrajectory(q, np.zeros(t.shape), np.zeros(t.shape))
+
+    tb = (q0 - qf + V * T) / V
+    a = V / tb
+
+    blend_in = t <= tb
+    linear = (t > tb) & (t <= T - tb)
+    blend_out = (t > T - tb) & (t <= T)
+
+    q = np.where(t < 0, q0, qf).astype(float)
+    qd = np.zeros(t.shape)
+    qdd = np.zeros(t.shape)
+
+    rows = blend_in & (t >= 0)
+    q[rows] = q0 + a / 2 * t[rows] ** 2
+    qd[rows] = a * t[rows]
+    qdd[rows] = a
+
+    q[linear] = (qf + q0 - V * T) / 2 + V * t[linear]
+    qd[linear] = V
+
+    q[blend_out] = qf - a / 2 * T ** 2 + a * T * t[blend_out] - a / 2 * t[blend_out] ** 2
+    qd[blend_out] = a * T - a * t[blend_out]
+    qdd[blend_out] = -a
+
+    return JointTrajectory(q, qd, qdd)
+
+
+# ============================================================================
+# Pose Conversions
+# ============================================================================
+# Poses are [x, y, z, rx, ry, rz] in mm and degrees, with the same RPY
+# convention as SE3.RPY(..., unit='deg', order='xyz') used by the commander:
+# R = Rx(rz) * Ry(ry) * Rz(rx)
+
+def rpy_to_matrix(rpy_deg):
+    """
+    Rotation matrices from RPY angles (order='xyz').
+
+    Parameters
+    ----------
+    rpy_deg : array_like, shape (3,) or (N, 3)
+        [rx, ry, rz] in degrees
+
+    Returns
+    -------
+    ndarray, shape (N, 3, 3)
+    """
+    angles = np.deg2rad(np.atleast_2d(np.asarray(rpy_deg, dtype=float)))
+    ca, sa = np.cos(angles[:, 0]), np.sin(angles[:, 0])
+    cb, sb = np.cos(angles[:, 1]), np.sin(angles[:, 1])
+    cc, sc = np.cos(angles[:, 2]), np.sin(angles[:, 2])
+
+    R = np.empty((angles.shape[0], 3, 3))
+    R[:, 0, 0] = cb * ca
+    R[:, 0, 1] = -cb * sa
+    R[:, 0, 2] = sb
+    R[:, 1, 0] = cc * sa + sc * sb * ca
+    R[:, 1, 1] = cc * ca - sc * sb * sa
+    R[:, 1, 2] = -sc * cb
+    R[:, 2, 0] = sc * sa - cc * sb * ca
+    R[:, 2, 1] = sc * ca + cc * sb * sa
+    R[:, 2, 2] = cc * cb
+    return R
+
+
+def matrix_to_rpy(R, order='xyz'):
+    """
+    RPY angles from rotation matrices.
+
+    Parameters
+    ----------
+    R : array_like, shape (3, 3) or (N, 3, 3)
+    order : str, optional
+        'xyz' (commander convention, default) or 'zyx'
+        (R = Rz(rz) * Ry(ry) * Rx(rx), as SE3.rpy(order='zyx'))
+
+    Returns
+    -------
+    ndarray, shape (N, 3)
+        [rx, ry, rz] in degrees (first angle = 0 at the ry = ±90° singularity)
+    """
+    R = np.asarray(R, dtype=float)
+    if R.ndim == 2:
+        R = R[np.newaxis]
+
+    if order == 'xyz':
+        cb = np.hypot(R[:, 0, 0], R[:, 0, 1])
+        ry = np.arctan2(R[:, 0, 2], cb)
+        singular = cb < 1e-12
+        rx = np.where(singular, 0.0, np.arctan2(-R[:, 0, 1], R[:, 0, 0]))
+        rz = np.where(singular, np.arctan2(R[:, 2, 1], R[:, 1, 1]), np.arctan2(-R[:, 1, 2], R[:, 2, 2]))
+    elif order == 'zyx':
+        cb = np.hypot(R[:, 0, 0], R[:, 1, 0])
+        ry = np.arctan2(-R[:, 2, 0], cb)
+        singular = cb < 1e-12
+        rx = np.where(singular, 0.0, np.arctan2(R[:, 2, 1], R[:, 2, 2]))
+        rz = np.where(singular, np.arctan2(-R[:, 0, 1], R[:, 1, 1]), np.arctan2(R[:, 1, 0], R[:, 0, 0]))
+    else:
+        raise ValueError(f"Unsupported RPY order: {order}")
+
+    return np.rad2deg(np.stack([rx, ry, rz], axis=-1))
+
+
+def matrix_to_quaternion(R):
+    """
+    Unit quaternions [w, x, y, z] from rotation matrices (w >= 0).
+
+    Parameters
+    ----------
+    R : array_like, shape (3, 3) or (N, 3, 3)
+
+    Returns
+    -------
+    ndarray, shape (N, 4)
+    """
+    R = np.asarray(R, dtype=float)
+    if R.ndim == 2:
+        R = R[np.newaxis]
+
+    # Shepperd's method: pivot on the largest of w, x, y, z
+    diag = np.stack([R[:, 0, 0] + R[:, 1, 1] + R[:, 2, 2],
+                     R[:, 0, 0], R[:, 1, 1], R[:, 2, 2]], axis=-1)
+    pivot = np.argmax(diag, axis=-1)
+    q = np.empty((R.shape[0], 4))
+
+    for k in range(4):
+        rows = pivot == k
+        if not np.any(rows):
+            continue
+        r = R[rows]
+        if k == 0:
+            s = 2.0 * np.sqrt(1.0 + diag[rows, 0])
+            q[rows] = np.stack([0.25 * s, (r[:, 2, 1] - r[:, 1, 2]) / s,
+                                (r[:, 0, 2] - r[:, 2, 0]) / s, (r[:, 1, 0] - r[:, 0, 1]) / s], axis=-1)
+        elif k == 1:
+            s = 2.0 * np.sqrt(1.0 + r[:, 0, 0] - r[:, 1, 1] - r[:, 2, 2])
+            q[rows] = np.stack([(r[:, 2, 1] - r[:, 1, 2]) / s, 0.25 * s,
+                                (r[:, 0, 1] + r[:, 1, 0]) / s, (r[:, 0, 2] + r[:, 2, 0]) / s], axis=-1)
+        elif k == 2:
+            s = 2.0 * np.sqrt(1.0 + r[:, 1, 1] - r[:, 0, 0] - r[:, 2, 2])
+            q[rows] = np.stack([(r[:, 0, 2] - r[:, 2, 0]) / s, (r[:, 0, 1] + r[:, 1, 0]) / s,
+                                0.25 * s, (r[:, 1, 2] + r[:, 2, 1]) / s], axis=-1)
+        else:
+            s = 2.0 * np.sqrt(1.0 + r[:, 2, 2] - r[:, 0, 0] - r[:, 1, 1])
+            q[rows] = np.stack([(r[:, 1, 0] - r[:, 0, 1]) / s, (r[:, 0, 2] + r[:, 2, 0]) / s,
+                                (r[:, 1, 2] + r[:, 2, 1]) / s, 0.25 * s], axis=-1)
+
+    q *= np.where(q[:, 0:1] < 0, -1.0, 1.0)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def pose_to_matrix(pose):
+    """
+    Homogeneous transforms from [x, y, z, rx, ry, rz] poses (mm, degrees).
+
+    Parameters
+    ----------
+    pose : array_like, shape (6,) or (N, 6)
+
+    Returns
+    -------
+    ndarray, shape (N, 4, 4)
+        Transforms in metres
+    """
+    pose = np.atleast_2d(np.asarray(pose, dtype=float))
+    T = np.zeros((pose.shape[0], 4, 4))
+    T[:, :3, :3] = rpy_to_matrix(pose[:, 3:6])
+    T[:, :3, 3] = pose[:, :3] / 1000.0
+    T[:, 3, 3] = 1.0
+    return T
+
+
+def matrix_to_pose(T):
+    """
+    [x, y, z, rx, ry, rz] poses (mm, degrees) from homogeneous transforms.
+
+    Parameters
+    ----------
+    T : array_like, shape (4, 4) or (N, 4, 4)
+        Transforms in metres
+
+    Returns
+    -------
+    ndarray, shape (N, 6)
+    """
+    T = np.asarray(T, dtype=float)
+    if T.ndim == 2:
+        T = T[np.newaxis]
+    return np.concatenate([T[:, :3, 3] * 1000.0, matrix_to_rpy(T[:, :3, :3])], axis=-1)
+
+
+# ============================================================================
+# Tool (TCP) Offsets
+# ============================================================================
+
+def tool_transform(offset):
+    """
+    Flange -> TCP transform from a tool offset.
+
+    Parameters
+    ----------
+    offset : array_like, shape (6,)
+        [x, y, z, rx, ry, rz] in mm and degrees, expressed in the flange
+        frame; rotation applied as Rx(rx) * Ry(ry) * Rz(rz) (same as the
+        tool tcp_offset in config.yaml)
+
+    Returns
+    -------
+    ndarray, shape (4, 4)
+    """
+    offset = np.asarray(offset, dtype=float)
+    rx, ry, rz = np.deg2rad(offset[3:6])
+    cx, sx, cy, sy, cz, sz = np.cos(rx), np.sin(rx), np.cos(ry), np.sin(ry), np.cos(rz), np.sin(rz)
+
+    Rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    Ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    Rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+
+    T = np.eye(4)
+    T[:3, :3] = Rx @ Ry @ Rz
+    T[:3, 3] = offset[:3] / 1000.0
+    return T
+
+
+def fkine_tcp(q, tool_offset=None):
+    """
+    TCP pose for a batch of configurations.
+
+    Parameters
+    ----------
+    q : array_like, shape (6,) or (N, 6)
+        Joint angles in radians
+    tool_offset : array_like, shape (6,), optional
+        Tool offset (see tool_transform); None returns the flange pose
+
+    Returns
+    -------
+    ndarray, shape (N, 4, 4)
+    """
+    T = fkine_batch(q)
+    if tool_offset is not None:
+        T = T @ tool_transform(tool_offset)
+    return T
@@ -0,0 +1,310 @@
+"""
+Jerk-Limited Online Trajectory Generation for PAROL6 Robot
+
+Seven-segment S-curve profiles (jerk limited, acceleration and velocity
+bounded) for all joints, time-synchronized so every joint starts and
+arrives together:
+
+- Profiles start from an arbitrary state (position, velocity,
+  acceleration) and end at rest on the target, so a motion can be
+  re-planned from wherever it currently is: the target can change
+  mid-motion and a running motion can be braked to a smooth stop
+  without the acceleration ever stepping
+- Every joint first takes its minimum-time profile; the others are then
+  slowed (lower peak velocity, longer cruise) to the slowest joint's
+  duration
+
+Profile of one joint: change velocity to a peak vp (jerk up, hold
+acceleration, jerk down), cruise at vp, change velocity back to zero
+(jerk down, hold, jerk up). The peak velocity is found by a refining
+grid search - distance and duration are monotonic in vp - so no case
+analysis of the seven segments is needed, and all joints and candidates
+are evaluated together in NumPy.
+
+Profiles are built only when the target or the limits change; in
+between, SCurveGenerator.step() samples the stored piecewise-cubic
+profile, which is exact.
+
+Units are whatever the caller uses (steps or radians) as long as
+position, limits and time agree.
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import logging
+
+import numpy as np
+
+from .trajectory_timing import DEFAULT_DT
+
+logger = logging.getLogger(__name__)
+
+# Peak velocity search: candidates per refinement round and rounds
+# (relative precision 1/31^4 ~ 1e-6)
+_SEARCH_CANDIDATES = 32
+_SEARCH_ROUNDS = 4
+
+
+# ============================================================================
+# Profiles
+# ============================================================================
+# A profile is a (jerk, duration) pair of arrays, shape (..., segments),
+# applied from a start state (p, v, a); jerk is constant within a segment.
+# Segments may have zero duration. Leading dimensions are joints (and
+# peak velocity candidates during the search).
+
+def _integrate(p, v, a, jerk, duration):
+    """State (p, v, a) after applying the segments."""
+    for k in range(jerk.shape[-1]):
+        j, t = jerk[..., k], duration[..., k]
+        tt = t * t
+        p = p + v * t + a * tt / 2 + j * tt * t / 6
+        v = v + a * t + j * tt / 2
+        a = a + j * t
+    return p, v, a
+
+
+def _velocity_change(v0, a0, v1, max_acc, max_jerk):
+    """
+    Shortest jerk-limited segments from (v0, a0) to velocity v1 at zero
+    acceleration: ramp the acceleration to a peak, hold it, ramp to zero.
+
+    Returns
+    -------
+    jerk, duration : ndarray, shape (..., 3)
+    """
+    # Velocity reached by ramping the current acceleration straight to zero
+    v_ramp = v0 + a0 * np.abs(a0) / (2 * max_jerk)
+    sign = np.where(v1 >= v_ramp, 1.0, -1.0)
+    a0, dv = sign * a0, sign * (v1 - v0)
+
+    # Peak acceleration without a hold phase, capped at max_acc (the hold
+    # then makes up the missing velocity)
+    a_peak = np.minimum(np.sqrt(np.maximum(max_jerk * dv + a0 * a0 / 2, 0.0)), max_acc)
+    ramp_gain = (a0 + a_peak) / 2 * np.abs(a_peak - a0) / max_jerk + a_peak * a_peak / (2 * max_jerk)
+    t_hold = np.maximum(dv - ramp_gain, 0.0) / np.where(a_peak > 0, a_peak, 1.0)
+
+    jerk = np.stack([sign * np.copysign(max_jerk, a_peak - a0), np.zeros_like(sign), -sign * max_jerk], axis=-1)
+    duration = np.stack([np.abs(a_peak - a0) / max_jerk, t_hold, a_peak / max_jerk], axis=-1)
+    return jerk, duration
+
+
+def _cruise_profile(v0, a0, vp, distance, max_acc, max_jerk):
+    """
+    Seven segments through peak velocity vp >= 0; cruising at vp covers
+    what the velocity changes leave of `distance`.
+
+    Returns
+    -------
+    jerk, duration : ndarray, shape (..., 7)
+    covered : ndarray, shape (...)
+        Distance of the velocity changes alone
+    """
+    head_jerk, head_t = _velocity_change(v0, a0, vp, max_acc, max_jerk)
+    tail_jerk, tail_t = _velocity_change(vp, 0.0, 0.0, max_acc, max_jerk)
+    covered = _integrate(0.0, v0, a0, np.concatenate([head_jerk, tail_jerk], axis=-1),
+                         np.concatenate([head_t, tail_t], axis=-1))[0]
+    t_cruise = np.where(vp > 0, np.maximum(distance - covered, 0.0) / np.where(vp > 0, vp, 1.0), 0.0)
+
+    jerk = np.concatenate([head_jerk, np.zeros_like(head_t[..., :1]), tail_jerk], axis=-1)
+    duration = np.concatenate([head_t, t_cruise[..., np.newaxis], tail_t], axis=-1)
+    return jerk, duration, covered
+
+
+def _search(accept, lo, hi):
+    """
+    Bracket the threshold (per joint) of a monotonic accept(x): True
+    below it, False above, accept(lo) taken as True.
+
+    Every round evaluates a grid of candidates at once, shape (n, K),
+    and narrows to the cell containing the threshold.
+
+    Returns
+    -------
+    lo, hi : ndarray, shape (n,)
+        Last accepted and first rejected value (hi == lo if all accepted)
+    """
+    grid = np.linspace(0.0, 1.0, _SEARCH_CANDIDATES)
+    for _ in range(_SEARCH_ROUNDS):
+        candidates = lo[:, np.newaxis] + (hi - lo)[:, np.newaxis] * grid
+        ok = accept(candidates)
+        ok[:, 0] = True
+        last = _SEARCH_CANDIDATES - 1 - np.argmax(ok[:, ::-1], axis=1)
+        rows = np.arange(len(lo))
+        lo, hi = candidates[rows, last], candidates[rows, np.minimum(last + 1, _SEARCH_CANDIDATES - 1)]
+    return lo, hi
+
+
+def plan_profiles(position, velocity, acceleration, target, max_speed, max_acc, max_jerk, synchronize=True):
+    """
+    Jerk-limited profiles of all joints from their current state to rest
+    at target.
+
+    Parameters
+    ----------
+    position, velocity, acceleration : ndarray, shape (n,)
+        Current state
+    target : ndarray, shape (n,)
+        Target positions
+    max_speed, max_acc, max_jerk : ndarray, shape (n,)
+        Limits (> 0)
+    synchronize : bool, optional
+        Slow every joint down (lower peak velocity, longer cruise) to the
+        slowest joint's duration (default: True). Joints that cannot be
+        stretched - already stopping exactly on target - arrive early and
+        wait at rest.
+
+    Returns
+    -------
+    jerk, duration : ndarray, shape (n, 7)
+    """
+    # Move towards the target from where ramping down to rest would end
+    zero = np.zeros_like(position)
+    stop_distance = _cruise_profile(velocity, acceleration, zero, zero, max_acc, max_jerk)[2]
+    sign = np.where(target - position >= stop_distance, 1.0, -1.0)
+    v, a, distance = sign * velocity, sign * acceleration, sign * (target - position)
+
+    # Candidate grids are (n, K): per-joint values as columns
+    column = [x[:, np.newaxis] for x in (v, a, distance, max_acc, max_jerk)]
+
+    def profile(vp):
+        return _cruise_profile(column[0], column[1], vp, column[2], column[3], column[4])
+
+    # Fastest: highest peak velocity that does not overshoot
+    vp, _ = _search(lambda vp: profile(vp)[2] <= column[2], zero, max_speed)
+    jerk, duration, _ = _cruise_profile(v, a, vp, distance, max_acc, max_jerk)
+
+    if synchronize:
+        # Lower peak velocity until every joint takes the slowest joint's time
+        total = duration.sum(axis=1)
+        goal = total.max(initial=0.0)
+        stretch = (total < goal) & (vp > 0)
+        if np.any(stretch):
+            # Duration falls as the peak velocity rises: first vp within the goal
+            _, vp_sync = _search(lambda vp: profile(vp)[1].sum(axis=-1) > goal, zero, vp)
+            slower_jerk, slower_duration, _ = _cruise_profile(v, a, vp_sync, distance, max_acc, max_jerk)
+            jerk = np.where(stretch[:, np.newaxis], slower_jerk, jerk)
+            duration = np.where(stretch[:, np.newaxis], slower_duration, duration)
+
+    return sign[:, np.newaxis] * jerk, duration
+
+
+# ============================================================================
+# Multi-Joint Online Generator
+# ============================================================================
+
+class SCurveGenerator:
+    """
+    Time-synchronized jerk-limited motion of several joints, re-plannable
+    from the current state at any cycle.
+
+    Parameters
+    ----------
+    position : array_like, shape (n,)
+        Start position (at rest)
+    max_speed, max_acc, max_jerk : array_like, shape (n,) or float
+        Per-joint limits (> 0)
+    dt : float, optional
+        Time advanced by every step()
+
+    Examples
+    --------
+    >>> gen = SCurveGenerator(q_start, v_max, a_max, j_max)
+    >>> gen.set_target(q_goal)
+    >>> while not gen.is_done:
+    ...     q = gen.step()                 # once per control cycle
+    ...     if new_goal is not None:
+    ...         gen.set_target(new_goal)   # continues from the current state
+    """
+
+    def __init__(self, position, max_speed, max_acc, max_jerk, dt=DEFAULT_DT):
+        self.position = np.array(position, dtype=float)
+        self.velocity = np.zeros_like(self.position)
+        self.acceleration = np.zeros_like(self.position)
+        self.target = self.position.copy()
+        self.dt = float(dt)
+        self.set_limits(max_speed, max_acc, max_jerk)
+        self._start(np.zeros((len(self.position), 0)), np.zeros((len(self.position), 0)))
+
+    def set_limits(self, max_speed, max_acc, max_jerk):
+        """Change the limits; they apply from the next set_target()/halt()."""
+        shape = self.position.shape
+        self.max_speed = np.broadcast_to(np.asarray(max_speed, dtype=float), shape).copy()
+        self.max_acc = np.broadcast_to(np.asarray(max_acc, dtype=float), shape).copy()
+        self.max_jerk = np.broadcast_to(np.asarray(max_jerk, dtype=float), shape).copy()
+        if np.any(self.max_speed <= 0) or np.any(self.max_acc <= 0) or np.any(self.max_jerk <= 0):
+            raise ValueError("Speed, acceleration and jerk limits must be positive")
+
+    def _start(self, jerk, duration):
+        """Run the profiles from the current state."""
+        # State at the start of every segment, shape (n, segments)
+        n_segments = jerk.shape[1]
+        starts = np.empty((3, len(self.position), n_segments))
+        state = (self.position, self.velocity, self.acceleration)
+        for k in range(n_segments):
+            starts[:, :, k] = state
+            state = _integrate(*state, jerk[:, k:k + 1], duration[:, k:k + 1])
+
+        self._jerk = jerk
+        self._durations = duration
+        self._segment_times = np.cumsum(duration, axis=1) - duration
+        self._segment_states = starts
+        self._end = state
+        self._time = 0.0
+        self.duration = float(duration.sum(axis=1).max(initial=0.0))
+
+    def set_target(self, target):
+        """
+        Plan from the current state to rest at `target`.
+
+        Returns
+        -------
+        float
+            Duration of the new motion (s)
+        """
+        self.target = np.array(target, dtype=float)
+        self._start(*plan_profiles(self.position, self.velocity, self.acceleration, self.target,
+                                   self.max_speed, self.max_acc, self.max_jerk))
+        return self.duration
+
+    def halt(self):
+        """
+        Brake every joint to rest as fast as the limits allow (smooth abort).
+
+        Returns
+        -------
+        ndarray
+            Positions where the joints come to rest
+        """
+        self._start(*_velocity_change(self.velocity, self.acceleration, 0.0, self.max_acc, self.max_jerk))
+        self.target = self._end[0].copy()
+        return self.target
+
+    @property
+    def is_done(self):
+        return self._time >= self.duration
+
+    def step(self):
+        """
+        Advance one cycle.
+
+        Returns
+        -------
+        ndarray
+            Position at the new time (exactly the target once finished)
+        """
+        self._time = min(self._time + self.dt, self.duration)
+        if self.is_done:
+            self.position = self.target.copy()
+            self.velocity = np.zeros_like(self.target)
+            self.acceleration = np.zeros_like(self.target)
+        else:
+            # Current segment of every joint (the last one once a joint has arrived)
+            rows = np.arange(len(self.target))
+            k = np.maximum(np.sum(self._segment_times <= self._time, axis=1) - 1, 0)
+            elapsed = np.minimum(self._time - self._segment_times[rows, k], self._durations[rows, k])
+            p, v, a = self._segment_states[:, rows, k]
+            self.position, self.velocity, self.acceleration = _integrate(
+                p, v, a, self._jerk[rows, k][:, np.newaxis], elapsed[:, np.newaxis])
+        return self.position
@@ -1,714 +1,1011 @@
-"""
-Smooth Motion Module for PAROL6 Robotic Arm
-============================================
-This module provides advanced trajectory generation capabilities including:
-- Circular and arc movements
-- Cubic spline trajectories
-- Motion blending
-- Pre-computed and real-time trajectory generation
-
-Compatible with:
-- numpy==1.23.4
-- scipy==1.11.4
-- roboticstoolbox-python==1.0.3
-"""
-
-import sys
-import warnings
-import logging
-from collections import namedtuple
-from roboticstoolbox import DHRobot
-from spatialmath.base import trinterp
-
-# Get module logger
-logger = logging.getLogger(__name__)
-
-# Version compatibility check
-try:
-    import numpy as np
-    # Check numpy version
-    np_version = tuple(map(int, np.__version__.split('.')[:2]))
-    if np_version < (1, 23):
-        warnings.warn(f"NumPy version {np.__version__} detected. Recommended: 1.23.4")
-    
-    from scipy.interpolate import CubicSpline
-    from scipy.spatial.transform import Rotation, Slerp
-    import scipy
-    # Check scipy version
-    scipy_version = tuple(map(int, scipy.__version__.split('.')[:2]))
-    if scipy_version < (1, 11):
-        warnings.warn(f"SciPy version {scipy.__version__} detected. Recommended: 1.11.4")
-        
-except ImportError as e:
-    logger.error(f"Error importing required packages: {e}")
-    logger.error("Please install: pip3 install numpy==1.23.4 scipy==1.11.4")
-    sys.exit(1)
-
-from spatialmath import SE3
-import time
-from typing import List, Tuple, Optional, Dict, Union
-from collections import deque
-
-# Import PAROL6 specific modules (now using relative imports within lib/kinematics/)
-try:
-    from . import robot_model as PAROL6_ROBOT
-except ImportError:
-    logger.warning("Warning: PAROL6 robot model not found. Some functions may not work.")
-    PAROL6_ROBOT = None
-
-# ============================================================================
-# IK Solver - Imported from centralized ik_solver module
-# ============================================================================
-# REFACTORED: Previously duplicated ~210 lines of IK code
-# Now using centralized ik_solver.py module (Tier 1 improvement)
-# ============================================================================
-
-from .ik_solver import (
-    IKResult,
-    normalize_angle,
-    unwrap_angles,
-    calculate_adaptive_tolerance,
-    calculate_configuration_dependent_max_reach,
-    solve_ik_with_adaptive_tol_subdivision
-)
-
-# Wrapper function to maintain compatibility with existing code
-# This version adds extra logging for smooth_motion module
-def solve_ik_with_adaptive_tol_subdivision_verbose(
-        robot: DHRobot,
-        target_pose: SE3,
-        current_q,
-        current_pose: SE3 = None,
-        max_depth: int = 4,
-        ilimit: int = 100,
-        jogging: bool = False
-):
-    """
-    Wrapper around ik_solver with verbose logging for smooth motion.
-
-    This maintains backward compatibility while using the centralized IK solver.
-    """
-    logger.info(f"[SmoothMotion IK] Starting: target={target_pose.t}, seed={np.degrees(current_q)}")
-
-    # Use centralized IK solver with joint limits checker
-    joint_limits_checker = None
-    if PAROL6_ROBOT is not None:
-        joint_limits_checker = PAROL6_ROBOT.check_joint_limits
-
-    result = _original_ik_solver(
-        robot,
-        target_pose,
-        current_q,
-        current_pose=current_pose,
-        max_depth=max_depth,
-        ilimit=ilimit,
-        jogging=jogging,
-        joint_limits_checker=joint_limits_checker
-    )
-
-    if result.success:
-        logger.info(f"[SmoothMotion IK] ✓ SUCCESS - solution={np.degrees(result.q)}")
-    else:
-        reason = f"Joint limit violations: {result.violations}" if result.violations else "IK solver failed"
-        logger.warning(f"[SmoothMotion IK] ✗ FAILED - {reason}")
-
-    return result
-
-# For backward compatibility, create alias
-# Code in this file can still call solve_ik_with_adaptive_tol_subdivision()
-# and it will use the verbose wrapper
-_original_ik_solver = solve_ik_with_adaptive_tol_subdivision
-solve_ik_with_adaptive_tol_subdivision = solve_ik_with_adaptive_tol_subdivision_verbose
-
-# ============================================================================
-# END OF IK SOLVER FUNCTIONS
-# ============================================================================
-
-class TrajectoryGenerator:
-    """Base class for trajectory generation with caching support"""
-    
-    def __init__(self, control_rate: float = 100.0):
-        """
-        Initialize trajectory generator
-        
-        Args:
-            control_rate: Control loop frequency in Hz (default 100Hz for PAROL6)
-        """
-        self.control_rate = control_rate
-        self.dt = 1.0 / control_rate
-        self.trajectory_cache = {}
-        
-    def generate_timestamps(self, duration: float) -> np.ndarray:
-        """Generate evenly spaced timestamps for trajectory"""
-        num_points = int(duration * self.control_rate)
-        return np.linspace(0, duration, num_points)
-
-class CircularMotion(TrajectoryGenerator):
-    """Generate circular and arc trajectories in 3D space"""
-    
-    def generate_arc_3d(self, 
-                       start_pose: List[float], 
-                       end_pose: List[float], 
-                       center: List[float], 
-                       normal: Optional[List[float]] = None,
-                       clockwise: bool = True,
-                       duration: float = 2.0) -> np.ndarray:
-        """
-        Generate a 3D circular arc trajectory
-        
-        Args:
-            start_pose: Starting pose [x, y, z, rx, ry, rz] (mm and degrees)
-            end_pose: Ending pose [x, y, z, rx, ry, rz] (mm and degrees)
-            center: Center point of arc [x, y, z] (mm)
-            normal: Normal vector to arc plane (default: z-axis)
-            clockwise: Direction of rotation
-            duration: Time to complete arc (seconds)
-            
-        Returns:
-            Array of poses along the arc trajectory
-        """
-        # Convert to numpy arrays
-        start_pos = np.array(start_pose[:3])
-        end_pos = np.array(end_pose[:3])
-        center_pt = np.array(center)
-        
-        # Calculate radius vectors
-        r1 = start_pos - center_pt
-        r2 = end_pos - center_pt
-        radius = np.linalg.norm(r1)
-        
-        # Determine arc plane normal if not provided
-        if normal is None:
-            normal = np.cross(r1, r2)
-            if np.linalg.norm(normal) < 1e-6:  # Points are collinear
-                normal = np.array([0, 0, 1])  # Default to XY plane
-        normal = normal / np.linalg.norm(normal)
-        
-        # Calculate arc angle
-        r1_norm = r1 / np.linalg.norm(r1)
-        r2_norm = r2 / np.linalg.norm(r2)
-        cos_angle = np.clip(np.dot(r1_norm, r2_norm), -1, 1)
-        arc_angle = np.arccos(cos_angle)
-        
-        # Check direction using cross product
-        cross = np.cross(r1_norm, r2_norm)
-        if np.dot(cross, normal) < 0:
-            arc_angle = 2 * np.pi - arc_angle
-            
-        if clockwise:
-            arc_angle = -arc_angle
-            
-        # Generate trajectory points
-        timestamps = self.generate_timestamps(duration)
-        trajectory = []
-        
-        for i, t in enumerate(timestamps):
-            # Interpolation factor
-            s = t / duration
-            
-            # For first point, use exact start position
-            if i == 0:
-                current_pos = start_pos
-            else:
-                # Rotate radius vector
-                angle = s * arc_angle
-                rot_matrix = self._rotation_matrix_from_axis_angle(normal, angle)
-                current_pos = center_pt + rot_matrix @ r1
-            
-            # Interpolate orientation (SLERP)
-            current_orient = self._slerp_orientation(start_pose[3:], end_pose[3:], s)
-            
-            # Combine position and orientation
-            pose = np.concatenate([current_pos, current_orient])
-            trajectory.append(pose)
-            
-        return np.array(trajectory)
-    
-    def generate_circle_3d(self,
-                      center: List[float],
-                      radius: float,
-                      normal: List[float] = [0, 0, 1],
-                      start_angle: float = None,
-                      duration: float = 4.0,
-                      start_point: List[float] = None) -> np.ndarray:
-        """
-        Generate a complete circle trajectory that starts at start_point
-        """
-        timestamps = self.generate_timestamps(duration)
-        trajectory = []
-        
-        # Create orthonormal basis for circle plane
-        normal = np.array(normal) / np.linalg.norm(normal)
-        u = self._get_perpendicular_vector(normal)
-        v = np.cross(normal, u)
-        
-        center_np = np.array(center)
-        
-        # CRITICAL FIX: Validate and handle geometry
-        if start_point is not None:
-            start_pos = np.array(start_point[:3])
-            
-            # Project start point onto the circle plane
-            to_start = start_pos - center_np
-            to_start_plane = to_start - np.dot(to_start, normal) * normal
-            
-            # Get distance from center in the plane
-            dist_in_plane = np.linalg.norm(to_start_plane)
-            
-            if dist_in_plane < 0.001:
-                # Start point is at center - can't determine angle
-                logger.warning(f"    WARNING: Start point is at circle center, using default position")
-                start_angle = 0
-                actual_start = center_np + radius * u
-            else:
-                # Calculate the angle of the start point
-                to_start_normalized = to_start_plane / dist_in_plane
-                u_comp = np.dot(to_start_normalized, u)
-                v_comp = np.dot(to_start_normalized, v)
-                start_angle = np.arctan2(v_comp, u_comp)
-                
-                # CHECK FOR INVALID GEOMETRY
-                radius_error = abs(dist_in_plane - radius)
-                if radius_error > radius * 0.3:  # More than 30% off
-                    logger.warning(f"    WARNING: Start point is {dist_in_plane:.1f}mm from center,")
-                    logger.warning(f"             but circle radius is {radius:.1f}mm!")
-                    
-                    # AUTO-CORRECT: Adjust center to make geometry valid
-                    logger.warning(f"    AUTO-CORRECTING: Moving center to maintain {radius}mm radius from start")
-                    direction = to_start_plane / dist_in_plane
-                    center_np = start_pos - direction * radius
-                    logger.warning(f"    New center: {center_np.round(1)}")
-                    
-                    # Recalculate with new center
-                    to_start = start_pos - center_np
-                    to_start_plane = to_start - np.dot(to_start, normal) * normal
-                    dist_in_plane = np.linalg.norm(to_start_plane)
-                
-                actual_start = start_pos
-        else:
-            start_angle = 0 if start_angle is None else start_angle
-            actual_start = None
-        
-        # Generate the circle 
-        for i, t in enumerate(timestamps):
-            if i == 0 and actual_start is not None:
-                # First point MUST be exactly the start point
-                pos = actual_start
-            else:
-                # Generate circle points
-                angle = start_angle + (2 * np.pi * t / duration)
-                pos = center_np + radius * (np.cos(angle) * u + np.sin(angle) * v)
-            
-            # Placeholder orientation (will be overridden)
-            orient = [0, 0, 0]
-            trajectory.append(np.concatenate([pos, orient]))
-        
-        return np.array(trajectory)
-    
-    def _rotation_matrix_from_axis_angle(self, axis: np.ndarray, angle: float) -> np.ndarray:
-        """Generate rotation matrix using Rodrigues' formula"""
-        axis = axis / np.linalg.norm(axis)
-        cos_a = np.cos(angle)
-        sin_a = np.sin(angle)
-        
-        # Cross-product matrix
-        K = np.array([[0, -axis[2], axis[1]],
-                     [axis[2], 0, -axis[0]],
-                     [-axis[1], axis[0], 0]])
-        
-        # Rodrigues' formula
-        R = np.eye(3) + sin_a * K + (1 - cos_a) * K @ K
-        return R
-    
-    def _get_perpendicular_vector(self, v: np.ndarray) -> np.ndarray:
-        """Find a vector perpendicular to the given vector"""
-        v = np.array(v)  # Ensure it's a numpy array
-        if abs(v[0]) < 0.9:
-            return np.cross(v, [1, 0, 0]) / np.linalg.norm(np.cross(v, [1, 0, 0]))
-        else:
-            return np.cross(v, [0, 1, 0]) / np.linalg.norm(np.cross(v, [0, 1, 0]))
-    
-    def _slerp_orientation(self, start_orient: List[float], 
-                          end_orient: List[float], 
-                          t: float) -> np.ndarray:
-        """Spherical linear interpolation for orientation"""
-        # Convert to quaternions
-        r1 = Rotation.from_euler('xyz', start_orient, degrees=True)
-        r2 = Rotation.from_euler('xyz', end_orient, degrees=True)
-        
-        # Create slerp object - compatible with scipy 1.11.4
-        # Stack rotations into a single Rotation object
-        key_rots = Rotation.from_quat([r1.as_quat(), r2.as_quat()])
-        slerp = Slerp([0, 1], key_rots)
-        
-        # Interpolate
-        interp_rot = slerp(t)
-        return interp_rot.as_euler('xyz', degrees=True)
-
-class SplineMotion(TrajectoryGenerator):
-    """Generate smooth spline trajectories through waypoints"""
-    
-    def generate_cubic_spline(self,
-                             waypoints: List[List[float]],
-                             timestamps: Optional[List[float]] = None,
-                             velocity_start: Optional[List[float]] = None,
-                             velocity_end: Optional[List[float]] = None) -> np.ndarray:
-        """
-        Generate cubic spline trajectory through waypoints
-        
-        Args:
-            waypoints: List of poses [x, y, z, rx, ry, rz]
-            timestamps: Time for each waypoint (auto-generated if None)
-            velocity_start: Initial velocity (zero if None)
-            velocity_end: Final velocity (zero if None)
-            
-        Returns:
-            Array of interpolated poses
-        """
-        waypoints = np.array(waypoints)
-        num_waypoints = len(waypoints)
-        
-        # Auto-generate timestamps if not provided
-        if timestamps is None:
-            # Estimate based on distance
-            total_dist = 0
-            for i in range(1, num_waypoints):
-                dist = np.linalg.norm(waypoints[i, :3] - waypoints[i-1, :3])
-                total_dist += dist
-            
-            # Assume average speed of 50 mm/s
-            total_time = total_dist / 50.0
-            timestamps = np.linspace(0, total_time, num_waypoints)
-        
-        # Create splines for position
-        pos_splines = []
-        for i in range(3):
-            bc_type = 'not-a-knot'  # Default boundary condition
-            
-            # Apply velocity boundary conditions if specified
-            if velocity_start is not None and velocity_end is not None:
-                bc_type = ((1, velocity_start[i]), (1, velocity_end[i]))
-            
-            spline = CubicSpline(timestamps, waypoints[:, i], bc_type=bc_type)
-            pos_splines.append(spline)
-        
-        # Create splines for orientation (convert to quaternions for smooth interpolation)
-        rotations = [Rotation.from_euler('xyz', wp[3:], degrees=True) for wp in waypoints]
-        # Stack quaternions for scipy 1.11.4 compatibility
-        quats = np.array([r.as_quat() for r in rotations])
-        key_rots = Rotation.from_quat(quats)
-        slerp = Slerp(timestamps, key_rots)
-        
-        # Generate dense trajectory
-        t_eval = self.generate_timestamps(timestamps[-1])
-        trajectory = []
-        
-        for t in t_eval:
-            # Evaluate position splines
-            pos = [spline(t) for spline in pos_splines]
-            
-            # Evaluate orientation
-            rot = slerp(t)
-            orient = rot.as_euler('xyz', degrees=True)
-            
-            trajectory.append(np.concatenate([pos, orient]))
-        
-        return np.array(trajectory)
-    
-    def generate_quintic_spline(self,
-                               waypoints: List[List[float]],
-                               timestamps: Optional[List[float]] = None) -> np.ndarray:
-        """
-        Generate quintic (5th order) spline with zero velocity and acceleration at endpoints
-        
-        Args:
-            waypoints: List of poses [x, y, z, rx, ry, rz]
-            timestamps: Time for each waypoint
-            
-        Returns:
-            Array of interpolated poses
-        """
-        # For quintic spline, we need to ensure zero velocity and acceleration
-        # at the endpoints for smooth motion
-        return self.generate_cubic_spline(
-            waypoints, 
-            timestamps,
-            velocity_start=[0, 0, 0],
-            velocity_end=[0, 0, 0]
-        )
-
-class MotionBlender:
-    """Blend between different motion segments for smooth transitions"""
-    
-    def __init__(self, blend_time: float = 0.5):
-        self.blend_time = blend_time
-        
-    def blend_trajectories(self, traj1, traj2, blend_samples=50):
-        """Blend two trajectory segments with improved velocity continuity"""
-        
-        if blend_samples < 4:
-            return np.vstack([traj1, traj2])
-        
-        # Use more samples for smoother blending
-        blend_samples = max(blend_samples, 20)  # Minimum 20 samples for smooth blend
-        
-        # Calculate overlap region more carefully
-        overlap_start = max(0, len(traj1) - blend_samples // 3)
-        overlap_end = min(len(traj2), blend_samples // 3)
-        
-        # Extract blend region
-        blend_start_pose = traj1[overlap_start] if overlap_start < len(traj1) else traj1[-1]
-        blend_end_pose = traj2[overlap_end] if overlap_end < len(traj2) else traj2[0]
-        
-        # Generate smooth transition using S-curve
-        blended = []
-        for i in range(blend_samples):
-            t = i / (blend_samples - 1)
-            # Use smoothstep function for smoother acceleration
-            s = t * t * (3 - 2 * t)  # Smoothstep
-            
-            # Blend position
-            pos_blend = blend_start_pose * (1 - s) + blend_end_pose * s
-            
-            # For orientation, use SLERP
-            r1 = Rotation.from_euler('xyz', blend_start_pose[3:], degrees=True)
-            r2 = Rotation.from_euler('xyz', blend_end_pose[3:], degrees=True)
-            key_rots = Rotation.from_quat([r1.as_quat(), r2.as_quat()])
-            slerp = Slerp([0, 1], key_rots)
-            orient_blend = slerp(s).as_euler('xyz', degrees=True)
-            
-            pos_blend[3:] = orient_blend
-            blended.append(pos_blend)
-        
-        # Combine with better overlap handling
-        result = np.vstack([
-            traj1[:overlap_start],
-            np.array(blended),
-            traj2[overlap_end:]
-        ])
-        
-        return result
-
-class SmoothMotionCommand:
-    """Command class for executing smooth motions on PAROL6"""
-    
-    def __init__(self, trajectory: np.ndarray, speed_factor: float = 1.0):
-        """
-        Initialize smooth motion command
-        
-        Args:
-            trajectory: Pre-computed trajectory array
-            speed_factor: Speed scaling factor (1.0 = normal speed)
-        """
-        self.trajectory = trajectory
-        self.speed_factor = speed_factor
-        self.current_index = 0
-        self.is_finished = False
-        self.is_valid = True
-        
-    def prepare_for_execution(self, current_position_in):
-        """Validate trajectory is reachable from current position"""
-        # Check if IK solver is available
-        if solve_ik_with_adaptive_tol_subdivision is None:
-            logger.warning("Warning: IK solver not available, skipping validation")
-            self.is_valid = True
-            return True
-            
-        try:
-            # Convert current position to radians
-            current_q = np.array([PAROL6_ROBOT.STEPS2RADS(p, i) 
-                                 for i, p in enumerate(current_position_in)])
-            
-            # Check first waypoint is reachable
-            first_pose = self.trajectory[0]
-            target_se3 = SE3(first_pose[0]/1000, first_pose[1]/1000, first_pose[2]/1000) * \
-                        SE3.RPY(first_pose[3:], unit='deg', order='xyz')
-            
-            ik_result = solve_ik_with_adaptive_tol_subdivision(
-                PAROL6_ROBOT.robot, target_se3, current_q, ilimit=20
-            )
-            
-            if not ik_result.success:
-                logger.error(f"Smooth motion validation failed: Cannot reach first waypoint")
-                self.is_valid = False
-                return False
-                
-            logger.info(f"Smooth motion prepared with {len(self.trajectory)} waypoints")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Smooth motion preparation error: {e}")
-            self.is_valid = False
-            return False
-    
-    def execute_step(self, Position_in, Speed_out, Command_out, **kwargs):
-        """Execute one step of the smooth motion"""
-        if self.is_finished or not self.is_valid:
-            return True
-        
-        # Check if required modules are available
-        if PAROL6_ROBOT is None or solve_ik_with_adaptive_tol_subdivision is None:
-            logger.error("Error: Required PAROL6 modules not available")
-            self.is_finished = True
-            Speed_out[:] = [0] * 6
-            Command_out.value = 255
-            return True
-        
-        # Apply speed scaling
-        step_increment = max(1, int(self.speed_factor))
-        self.current_index += step_increment
-        
-        if self.current_index >= len(self.trajectory):
-            logger.info("Smooth motion completed")
-            self.is_finished = True
-            Speed_out[:] = [0] * 6
-            Command_out.value = 255
-            return True
-        
-        # Get current target pose
-        target_pose = self.trajectory[self.current_index]
-        
-        # Convert to SE3
-        target_se3 = SE3(target_pose[0]/1000, target_pose[1]/1000, target_pose[2]/1000) * \
-                    SE3.RPY(target_pose[3:], unit='deg', order='xyz')
-        
-        # Get current joint configuration
-        current_q = np.array([PAROL6_ROBOT.STEPS2RADS(p, i) 
-                             for i, p in enumerate(Position_in)])
-        
-        # Solve IK
-        ik_result = solve_ik_with_adaptive_tol_subdivision(
-            PAROL6_ROBOT.robot, target_se3, current_q, ilimit=20
-        )
-        
-        if not ik_result.success:
-            logger.error(f"IK failed at trajectory point {self.current_index}")
-            self.is_finished = True
-            Speed_out[:] = [0] * 6
-            Command_out.value = 255
-            return True
-        
-        # Convert to steps and send
-        target_steps = [int(PAROL6_ROBOT.RAD2STEPS(q, i)) 
-                       for i, q in enumerate(ik_result.q)]
-        
-        # Calculate velocities for smooth following
-        for i in range(6):
-            Speed_out[i] = int((target_steps[i] - Position_in[i]) * 10)  # P-control factor
-        
-        Command_out.value = 156  # Smooth motion command
-        return False
-
-# Helper functions for integration with robot_api.py
-
-def execute_circle(center: List[float], 
-                  radius: float, 
-                  duration: float = 4.0,
-                  normal: List[float] = [0, 0, 1]) -> str:
-    """
-    Execute a circular motion on PAROL6
-    
-    Args:
-        center: Center point [x, y, z] in mm
-        radius: Circle radius in mm
-        duration: Time to complete circle
-        normal: Normal vector to circle plane
-        
-    Returns:
-        Command string for robot_api
-    """
-    motion_gen = CircularMotion()
-    trajectory = motion_gen.generate_circle_3d(center, radius, normal, 0, duration)
-    
-    # Convert to command string format
-    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
-    command = f"SMOOTH_MOTION|CIRCLE|{traj_str}"
-    
-    return command
-
-def execute_arc(start_pose: List[float],
-               end_pose: List[float],
-               center: List[float],
-               clockwise: bool = True,
-               duration: float = 2.0) -> str:
-    """
-    Execute an arc motion on PAROL6
-    
-    Args:
-        start_pose: Starting pose [x, y, z, rx, ry, rz]
-        end_pose: Ending pose [x, y, z, rx, ry, rz]
-        center: Arc center point [x, y, z]
-        clockwise: Direction of rotation
-        duration: Time to complete arc
-        
-    Returns:
-        Command string for robot_api
-    """
-    motion_gen = CircularMotion()
-    trajectory = motion_gen.generate_arc_3d(start_pose, end_pose, center, 
-                                           clockwise=clockwise, duration=duration)
-    
-    # Convert to command string format
-    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
-    command = f"SMOOTH_MOTION|ARC|{traj_str}"
-    
-    return command
-
-def execute_spline(waypoints: List[List[float]], 
-                  total_time: Optional[float] = None) -> str:
-    """
-    Execute a spline motion through waypoints
-    
-    Args:
-        waypoints: List of poses [x, y, z, rx, ry, rz]
-        total_time: Total time for motion (auto-calculated if None)
-        
-    Returns:
-        Command string for robot_api
-    """
-    motion_gen = SplineMotion()
-    
-    # Generate timestamps if total_time is provided
-    timestamps = None
-    if total_time:
-        timestamps = np.linspace(0, total_time, len(waypoints))
-    
-    trajectory = motion_gen.generate_cubic_spline(waypoints, timestamps)
-    
-    # Convert to command string format
-    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
-    command = f"SMOOTH_MOTION|SPLINE|{traj_str}"
-    
-    return command
-
-# Example usage
-if __name__ == "__main__":
-    # Example: Generate a circle trajectory
-    circle_gen = CircularMotion()
-    circle_traj = circle_gen.generate_circle_3d(
-        center=[200, 0, 200],  # mm
-        radius=50,  # mm
-        duration=4.0  # seconds
-    )
-    logger.debug(f"Generated circle with {len(circle_traj)} points")
-    
-    # Example: Generate arc trajectory
-    arc_traj = circle_gen.generate_arc_3d(
-        start_pose=[250, 0, 200, 0, 0, 0],
-        end_pose=[200, 50, 200, 0, 0, 90],
-        center=[200, 0, 200],
-        duration=2.0
-    )
-    logger.debug(f"Generated arc with {len(arc_traj)} points")
-    
-    # Example: Generate spline through waypoints
-    spline_gen = SplineMotion()
-    waypoints = [
-        [200, 0, 100, 0, 0, 0],
-        [250, 50, 150, 0, 15, 45],
-        [200, 100, 200, 0, 30, 90],
-        [150, 50, 150, 0, 15, 45],
-        [200, 0, 100, 0, 0, 0]
-    ]
-    spline_traj = spline_gen.generate_cubic_spline(waypoints)
+"""
+Smooth Motion Module for PAROL6 Robotic Arm
+============================================
+This module provides advanced trajectory generation capabilities including:
+- Circular, arc and helix movements (vectorized over the whole trajectory)
+- Cubic spline trajectories
+- Motion blending
+- Pre-computed and real-time trajectory generation
+- Bounded LRU cache of generated trajectories (repeated motions are not
+  regenerated); cached arrays are read-only
+
+Generator timings: python -m lib.kinematics.trajectory_math --benchmark
+
+Compatible with:
+- numpy==1.23.4
+- scipy==1.11.4
+- roboticstoolbox-python==1.0.3
+"""
+
+import sys
+import warnings
+import logging
+import hashlib
+import inspect
+import functools
+from collections import OrderedDict
+from collections import namedtuple
+from spatialmath.base import trinterp
+
+# Get module logger
+logger = logging.getLogger(__name__)
+
+# Version compatibility check
+try:
+    import numpy as np
+    # Check numpy version
+    np_version = tuple(map(int, np.__version__.split('.')[:2]))
+    if np_version < (1, 23):
+        warnings.warn(f"NumPy version {np.__version__} detected. Recommended: 1.23.4")
+    
+    from scipy.interpolate import CubicSpline, make_interp_spline
+    from scipy.spatial.transform import Rotation, Slerp
+    import scipy
+    # Check scipy version
+    scipy_version = tuple(map(int, scipy.__version__.split('.')[:2]))
+    if scipy_version < (1, 11):
+        warnings.warn(f"SciPy version {scipy.__version__} detected. Recommended: 1.11.4")
+        
+except ImportError as e:
+    logger.error(f"Error importing required packages: {e}")
+    logger.error("Please install: pip3 install numpy==1.23.4 scipy==1.11.4")
+    sys.exit(1)
+
+from spatialmath import SE3
+import time
+from typing import List, Tuple, Optional, Dict, Union
+from collections import deque
+
+# Import PAROL6 specific modules (now using relative imports within lib/kinematics/)
+try:
+    from . import robot_model as PAROL6_ROBOT
+except ImportError:
+    logger.warning("Warning: PAROL6 robot model not found. Some functions may not work.")
+    PAROL6_ROBOT = None
+
+# ============================================================================
+# IK Solver - Imported from centralized ik_solver module
+# ============================================================================
+# REFACTORED: Previously duplicated ~210 lines of IK code
+# Now using centralized ik_solver.py module (Tier 1 improvement)
+# ============================================================================
+
+from .ik_solver import (
+    IKResult,
+    normalize_angle,
+    unwrap_angles,
+    calculate_adaptive_tolerance,
+    calculate_configuration_dependent_max_reach,
+    solve_ik_with_adaptive_tol_subdivision
+)
+
+# Wrapper function to maintain compatibility with existing code
+# This version adds extra logging for smooth_motion module
+def solve_ik_with_adaptive_tol_subdivision_verbose(
+        robot: 'DHRobot',
+        target_pose: SE3,
+        current_q,
+        current_pose: SE3 = None,
+        max_depth: int = 4,
+        ilimit: int = 100,
+        jogging: bool = False
+):
+    """
+    Wrapper around ik_solver with verbose logging for smooth motion.
+
+    This maintains backward compatibility while using the centralized IK solver.
+    """
+    logger.info(f"[SmoothMotion IK] Starting: target={target_pose.t}, seed={np.degrees(current_q)}")
+
+    # Use centralized IK solver with joint limits checker
+    joint_limits_checker = None
+    if PAROL6_ROBOT is not None:
+        joint_limits_checker = PAROL6_ROBOT.check_joint_limits
+
+    result = _original_ik_solver(
+        robot,
+        target_pose,
+        current_q,
+        current_pose=current_pose,
+        max_depth=max_depth,
+        ilimit=ilimit,
+        jogging=jogging,
+        joint_limits_checker=joint_limits_checker
+    )
+
+    if result.success:
+        logger.info(f"[SmoothMotion IK] ✓ SUCCESS - solution={np.degrees(result.q)}")
+    else:
+        reason = f"Joint limit violations: {result.violations}" if result.violations else "IK solver failed"
+        logger.warning(f"[SmoothMotion IK] ✗ FAILED - {reason}")
+
+    return result
+
+# For backward compatibility, create alias
+# Code in this file can still call solve_ik_with_adaptive_tol_subdivision()
+# and it will use the verbose wrapper
+_original_ik_solver = solve_ik_with_adaptive_tol_subdivision
+solve_ik_with_adaptive_tol_subdivision = solve_ik_with_adaptive_tol_subdivision_verbose
+
+# ============================================================================
+# END OF IK SOLVER FUNCTIONS
+# ============================================================================
+
+# ============================================================================
+# Trajectory Cache
+# ============================================================================
+
+# Memory budget of the shared trajectory cache (a 10s trajectory at 100Hz
+# is 48 KiB)
+TRAJECTORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_performance_monitor = None
+
+def set_performance_monitor(monitor):
+    """Set the global performance monitor for trajectory cache counters"""
+    global _performance_monitor
+    _performance_monitor = monitor
+
+
+def _canonical(value):
+    """Hashable canonical form of a generator argument (1 == 1.0, lists == arrays)"""
+    if isinstance(value, (bool, np.bool_)) or value is None or isinstance(value, str):
+        return bool(value) if isinstance(value, np.bool_) else value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_canonical(v) for v in value)
+    return repr(value)
+
+
+class TrajectoryCache:
+    """
+    Bounded LRU cache of generated trajectories
+    
+    Entries are keyed by a hash of the generator, its parameters and the
+    control rate. Eviction is by total array size (bytes). Stored arrays are
+    made read-only so they can be returned without defensive copies - copy
+    before modifying a returned trajectory.
+    """
+    
+    def __init__(self, max_bytes: int = TRAJECTORY_CACHE_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Total size of cached arrays before LRU eviction
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> read-only ndarray, LRU order
+        self._nbytes = 0
+        self.reset_stats()
+    
+    @staticmethod
+    def make_key(name: str, control_rate: float, arguments: Dict) -> str:
+        """Canonical hash of a generator call"""
+        canonical = (name, float(control_rate), tuple(sorted((k, _canonical(v)) for k, v in arguments.items())))
+        return hashlib.blake2b(repr(canonical).encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached trajectory or None (counts a hit or a miss)"""
+        trajectory = self._entries.get(key)
+        if trajectory is None:
+            self._count('misses')
+            return None
+        self._entries.move_to_end(key)
+        self._count('hits')
+        return trajectory
+    
+    def put(self, key: str, trajectory: np.ndarray) -> np.ndarray:
+        """Store a trajectory; returns it as a read-only array"""
+        trajectory = np.asarray(trajectory)
+        trajectory.flags.writeable = False
+        if trajectory.nbytes > self.max_bytes:
+            return trajectory
+        
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._nbytes -= previous.nbytes
+        self._entries[key] = trajectory
+        self._nbytes += trajectory.nbytes
+        
+        while self._nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+            self._count('evictions')
+        return trajectory
+    
+    def clear(self):
+        """Drop all cached trajectories (statistics are kept)"""
+        self._entries.clear()
+        self._nbytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @property
+    def nbytes(self) -> int:
+        """Total size of cached arrays in bytes"""
+        return self._nbytes
+    
+    def _count(self, event: str):
+        self._stats[event] += 1
+        if _performance_monitor:
+            _performance_monitor.increment_counter(f'trajectory_cache_{event}')
+    
+    def stats(self) -> Dict[str, float]:
+        """Cache statistics"""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            'entries': len(self._entries),
+            'bytes': self._nbytes,
+            'max_bytes': self.max_bytes,
+            **self._stats,
+            'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+        }
+    
+    def reset_stats(self):
+        """Reset hit/miss statistics"""
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+_trajectory_cache = TrajectoryCache()
+
+def get_trajectory_cache() -> TrajectoryCache:
+    """Shared cache used by all trajectory generators"""
+    return _trajectory_cache
+
+
+def cached_trajectory(method):
+    """
+    Cache a TrajectoryGenerator method's result in self.trajectory_cache
+    
+    The key covers the class, method, control rate and all arguments
+    (defaults included), so equal calls hit regardless of how the
+    arguments were passed.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments['self']
+        key = self.trajectory_cache.make_key(
+            f"{type(self).__name__}.{method.__name__}", self.control_rate, arguments)
+        trajectory = self.trajectory_cache.get(key)
+        if trajectory is None:
+            trajectory = self.trajectory_cache.put(key, method(self, *args, **kwargs))
+        return trajectory
+    
+    return wrapper
+
+
+# ============================================================================
+# Orientation Convention
+# ============================================================================
+# Poses are [x, y, z, rx, ry, rz] with the commander's RPY convention
+# (SE3.RPY(..., order='xyz'), kinematics_core.rpy_to_matrix):
+# R = Rx(rz) * Ry(ry) * Rz(rx), i.e. intrinsic 'XYZ' with reversed angles
+
+def rotation_from_rpy(rpy_deg) -> Rotation:
+    """Rotation(s) from [rx, ry, rz] in degrees (commander convention)"""
+    return Rotation.from_euler('XYZ', np.asarray(rpy_deg, dtype=float)[..., ::-1], degrees=True)
+
+
+def rotation_to_rpy(rotation: Rotation) -> np.ndarray:
+    """[rx, ry, rz] in degrees (commander convention) from Rotation(s)"""
+    return rotation.as_euler('XYZ', degrees=True)[..., ::-1]
+
+
+class TrajectoryGenerator:
+    """Base class for trajectory generation with caching support"""
+    
+    def __init__(self, control_rate: float = 100.0):
+        """
+        Initialize trajectory generator
+        
+        Args:
+            control_rate: Control loop frequency in Hz (default 100Hz for PAROL6)
+        """
+        self.control_rate = control_rate
+        self.dt = 1.0 / control_rate
+        self.trajectory_cache = get_trajectory_cache()
+        
+    def generate_timestamps(self, duration: float) -> np.ndarray:
+        """Generate evenly spaced timestamps for trajectory"""
+        num_points = int(duration * self.control_rate)
+        return np.linspace(0, duration, num_points)
+
+class CircularMotion(TrajectoryGenerator):
+    """
+    Generate circular, arc and helix trajectories in 3D space
+
+    Every generator evaluates the whole trajectory in one vectorized pass
+    over the timestamp vector (no per-sample rotation matrices or Slerp
+    objects).
+    """
+    
+    @cached_trajectory
+    def generate_arc_3d(self, 
+                       start_pose: List[float], 
+                       end_pose: List[float], 
+                       center: List[float], 
+                       normal: Optional[List[float]] = None,
+                       clockwise: bool = True,
+                       duration: float = 2.0) -> np.ndarray:
+        """
+        Generate a 3D circular arc trajectory
+        
+        Args:
+            start_pose: Starting pose [x, y, z, rx, ry, rz] (mm and degrees)
+            end_pose: Ending pose [x, y, z, rx, ry, rz] (mm and degrees)
+            center: Center point of arc [x, y, z] (mm)
+            normal: Normal vector to arc plane (default: start x end radius,
+                    i.e. the shorter arc counter-clockwise)
+            clockwise: Direction of rotation about the normal
+            duration: Time to complete arc (seconds)
+            
+        Returns:
+            Array of poses along the arc trajectory
+        """
+        # Convert to numpy arrays
+        start_pos = np.array(start_pose[:3], dtype=float)
+        end_pos = np.array(end_pose[:3], dtype=float)
+        center_pt = np.array(center, dtype=float)
+        
+        # Calculate radius vectors
+        r1 = start_pos - center_pt
+        r2 = end_pos - center_pt
+        
+        # Determine arc plane normal if not provided
+        if normal is None:
+            normal = np.cross(r1, r2)
+            if np.linalg.norm(normal) < 1e-6:  # Points are collinear
+                normal = np.array([0, 0, 1])  # Default to XY plane
+        normal = np.asarray(normal, dtype=float)
+        normal = normal / np.linalg.norm(normal)
+        
+        # Calculate arc angle
+        r1_norm = r1 / np.linalg.norm(r1)
+        r2_norm = r2 / np.linalg.norm(r2)
+        cos_angle = np.clip(np.dot(r1_norm, r2_norm), -1, 1)
+        arc_angle = np.arccos(cos_angle)
+        
+        # Counter-clockwise angle about the normal, using the cross product
+        cross = np.cross(r1_norm, r2_norm)
+        if np.dot(cross, normal) < 0:
+            arc_angle = 2 * np.pi - arc_angle
+            
+        # Clockwise: the other way around to the same end point
+        if clockwise:
+            arc_angle = arc_angle - 2 * np.pi
+            
+        # Rotate the radius vector about the normal for all samples at once
+        s = self.generate_timestamps(duration) / duration
+        positions = center_pt + Rotation.from_rotvec(np.outer(s * arc_angle, normal)).apply(r1)
+        positions[0] = start_pos  # First point is exactly the start position
+        
+        orientations = self._slerp_orientation(start_pose[3:], end_pose[3:], s)
+        return np.hstack([positions, orientations])
+    
+    @cached_trajectory
+    def generate_circle_3d(self,
+                      center: List[float],
+                      radius: float,
+                      normal: List[float] = [0, 0, 1],
+                      start_angle: float = None,
+                      duration: float = 4.0,
+                      start_point: List[float] = None) -> np.ndarray:
+        """
+        Generate a complete circle trajectory that starts at start_point
+        """
+        timestamps = self.generate_timestamps(duration)
+        normal, u, v = self._plane_basis(normal)
+        center_np, start_angle, actual_start = self._resolve_start(
+            center, radius, normal, u, v, start_angle, start_point)
+        
+        angles = start_angle + 2 * np.pi * timestamps / duration
+        positions = center_np + radius * (np.outer(np.cos(angles), u) + np.outer(np.sin(angles), v))
+        if actual_start is not None and len(positions):
+            positions[0] = actual_start  # First point MUST be exactly the start point
+        
+        # Placeholder orientation (will be overridden)
+        return np.hstack([positions, np.zeros_like(positions)])
+    
+    @cached_trajectory
+    def generate_helix_3d(self,
+                         center: List[float],
+                         radius: float,
+                         pitch: float,
+                         height: float,
+                         axis: List[float] = [0, 0, 1],
+                         duration: float = 4.0,
+                         clockwise: bool = False,
+                         start_point: List[float] = None) -> np.ndarray:
+        """
+        Generate a helix trajectory around an axis through center
+        
+        Args:
+            center: Center of the bottom circle [x, y, z] (mm)
+            radius: Helix radius (mm)
+            pitch: Rise per revolution along the axis (mm)
+            height: Total rise along the axis (mm)
+            axis: Helix axis direction (default: z-axis)
+            duration: Time to complete the helix (seconds)
+            clockwise: Direction of rotation seen from the axis tip
+            start_point: Start position; sets the start angle (and moves the
+                         center if it is far off the radius), like circles
+            
+        Returns:
+            Array of poses along the helix (placeholder orientation)
+        """
+        timestamps = self.generate_timestamps(duration)
+        axis, u, v = self._plane_basis(axis)
+        center_np, start_angle, actual_start = self._resolve_start(
+            center, radius, axis, u, v, None, start_point)
+        
+        s = timestamps / duration
+        revolutions = height / pitch if pitch > 0 else 1
+        direction = -1.0 if clockwise else 1.0
+        angles = start_angle + direction * 2 * np.pi * revolutions * s
+        positions = (center_np
+                     + radius * (np.outer(np.cos(angles), u) + np.outer(np.sin(angles), v))
+                     + np.outer(s * height, axis))
+        if actual_start is not None and len(positions):
+            positions[0] = actual_start
+        
+        # Placeholder orientation (will be overridden)
+        return np.hstack([positions, np.zeros_like(positions)])
+    
+    def _plane_basis(self, normal: List[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Unit normal and orthonormal in-plane basis (u, v)"""
+        normal = np.asarray(normal, dtype=float)
+        normal = normal / np.linalg.norm(normal)
+        u = self._get_perpendicular_vector(normal)
+        v = np.cross(normal, u)
+        return normal, u, v
+    
+    def _resolve_start(self, center, radius, normal, u, v, start_angle, start_point):
+        """
+        Start angle of a circle/helix from its start point
+        
+        Returns:
+            (center, start_angle, actual_start) - center is moved when the
+            start point is more than 30% off the radius; actual_start is None
+            without a start point
+        """
+        center_np = np.array(center, dtype=float)
+        if start_point is None:
+            return center_np, 0 if start_angle is None else start_angle, None
+        
+        start_pos = np.array(start_point[:3], dtype=float)
+        
+        # Project start point onto the circle plane
+        to_start = start_pos - center_np
+        to_start_plane = to_start - np.dot(to_start, normal) * normal
+        
+        # Get distance from center in the plane
+        dist_in_plane = np.linalg.norm(to_start_plane)
+        
+        if dist_in_plane < 0.001:
+            # Start point is at center - can't determine angle
+            logger.warning(f"    WARNING: Start point is at circle center, using default position")
+            return center_np, 0, center_np + radius * u
+        
+        # Calculate the angle of the start point
+        to_start_normalized = to_start_plane / dist_in_plane
+        start_angle = np.arctan2(np.dot(to_start_normalized, v), np.dot(to_start_normalized, u))
+        
+        # CHECK FOR INVALID GEOMETRY
+        radius_error = abs(dist_in_plane - radius)
+        if radius_error > radius * 0.3:  # More than 30% off
+            logger.warning(f"    WARNING: Start point is {dist_in_plane:.1f}mm from center,")
+            logger.warning(f"             but circle radius is {radius:.1f}mm!")
+            
+            # AUTO-CORRECT: Adjust center to make geometry valid
+            logger.warning(f"    AUTO-CORRECTING: Moving center to maintain {radius}mm radius from start")
+            center_np = start_pos - to_start_normalized * radius
+            logger.warning(f"    New center: {center_np.round(1)}")
+        
+        return center_np, start_angle, start_pos
+    
+    def _get_perpendicular_vector(self, v: np.ndarray) -> np.ndarray:
+        """Find a vector perpendicular to the given vector"""
+        v = np.array(v)  # Ensure it's a numpy array
+        if abs(v[0]) < 0.9:
+            return np.cross(v, [1, 0, 0]) / np.linalg.norm(np.cross(v, [1, 0, 0]))
+        else:
+            return np.cross(v, [0, 1, 0]) / np.linalg.norm(np.cross(v, [0, 1, 0]))
+    
+    def _slerp_orientation(self, start_orient: List[float], 
+                          end_orient: List[float], 
+                          t: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Spherical linear interpolation for orientation
+        
+        One Slerp evaluated at every t (scalar -> (3,), array -> (N, 3))
+        """
+        key_rots = rotation_from_rpy([start_orient, end_orient])
+        slerp = Slerp([0, 1], key_rots)
+        return rotation_to_rpy(slerp(t))
+
+class SplineMotion(TrajectoryGenerator):
+    """Generate smooth spline trajectories through waypoints"""
+    
+    @cached_trajectory
+    def generate_cubic_spline(self,
+                             waypoints: List[List[float]],
+                             timestamps: Optional[List[float]] = None,
+                             velocity_start: Optional[List[float]] = None,
+                             velocity_end: Optional[List[float]] = None) -> np.ndarray:
+        """
+        Generate cubic spline trajectory through waypoints
+        
+        Args:
+            waypoints: List of poses [x, y, z, rx, ry, rz]
+            timestamps: Time for each waypoint (auto-generated if None)
+            velocity_start: Initial velocity (zero if None)
+            velocity_end: Final velocity (zero if None)
+            
+        Returns:
+            Array of interpolated poses
+        """
+        waypoints = np.asarray(waypoints, dtype=float)
+        timestamps = self._waypoint_timestamps(waypoints, timestamps)
+        
+        # One spline for all three position axes
+        bc_type = 'not-a-knot'  # Default boundary condition
+        
+        # Apply velocity boundary conditions if specified
+        if velocity_start is not None and velocity_end is not None:
+            bc_type = ((1, np.asarray(velocity_start, dtype=float)),
+                       (1, np.asarray(velocity_end, dtype=float)))
+        
+        position_spline = CubicSpline(timestamps, waypoints[:, :3], bc_type=bc_type)
+        return self._evaluate(position_spline, waypoints, timestamps)
+    
+    @cached_trajectory
+    def generate_quintic_spline(self,
+                               waypoints: List[List[float]],
+                               timestamps: Optional[List[float]] = None) -> np.ndarray:
+        """
+        Generate quintic (5th order) spline with zero velocity and acceleration at endpoints
+        
+        Args:
+            waypoints: List of poses [x, y, z, rx, ry, rz]
+            timestamps: Time for each waypoint
+            
+        Returns:
+            Array of interpolated poses
+        """
+        waypoints = np.asarray(waypoints, dtype=float)
+        timestamps = self._waypoint_timestamps(waypoints, timestamps)
+        
+        # Degree-5 B-spline: two conditions per end (velocity and acceleration)
+        rest = [(1, np.zeros(3)), (2, np.zeros(3))]
+        position_spline = make_interp_spline(timestamps, waypoints[:, :3], k=5, bc_type=(rest, rest))
+        return self._evaluate(position_spline, waypoints, timestamps)
+    
+    def _waypoint_timestamps(self, waypoints: np.ndarray,
+                             timestamps: Optional[List[float]]) -> np.ndarray:
+        """Given timestamps, or timestamps estimated from the path length"""
+        if timestamps is not None:
+            return np.asarray(timestamps, dtype=float)
+        
+        # Assume average speed of 50 mm/s
+        total_dist = np.linalg.norm(np.diff(waypoints[:, :3], axis=0), axis=1).sum()
+        total_time = total_dist / 50.0
+        return np.linspace(0, total_time, len(waypoints))
+    
+    def _evaluate(self, position_spline, waypoints: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+        """Sample position spline and orientation Slerp over the whole time vector"""
+        # Quaternion Slerp for smooth orientation interpolation
+        key_rots = rotation_from_rpy(waypoints[:, 3:])
+        slerp = Slerp(timestamps, key_rots)
+        
+        t_eval = self.generate_timestamps(timestamps[-1])
+        positions = position_spline(t_eval)
+        orientations = rotation_to_rpy(slerp(t_eval))
+        return np.hstack([positions, orientations])
+
+class MotionBlender:
+    """
+    Blend consecutive motion segments for smooth transitions
+
+    Each blend zone replaces the end of one segment and the start of the
+    next with a quintic Hermite curve matched to the position, velocity and
+    acceleration of both segments at the zone boundaries, so velocity (and
+    acceleration) stay continuous. All blend zones of a call are computed in
+    one batched pass; orientations are blended as a quintic in rotation-
+    vector space relative to the zone's start orientation (one batched
+    Rotation evaluation).
+    """
+    
+    def __init__(self, blend_time: float = 0.5, control_rate: float = 100.0):
+        """
+        Args:
+            blend_time: Duration of each blend zone (seconds)
+            control_rate: Sample rate of the segments in Hz
+        """
+        self.blend_time = blend_time
+        self.dt = 1.0 / control_rate
+        
+    def blend_trajectories(self, traj1, traj2, blend_samples=50):
+        """Blend two trajectory segments (see blend_segments)"""
+        return self.blend_segments([traj1, traj2], blend_samples)
+    
+    def blend_segments(self, segments: List[np.ndarray],
+                       blend_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Join any number of pose segments with velocity-continuous blends
+        
+        Args:
+            segments: Pose arrays (N_i, 6) [x, y, z, rx, ry, rz] (mm and
+                      degrees) sampled at the control rate
+            blend_samples: Samples per blend zone (default: blend_time at the
+                           control rate). Half of the zone is taken from each
+                           neighbouring segment; zones shrink to fit short
+                           segments.
+            
+        Returns:
+            Blended trajectory with the same duration as the concatenated
+            segments
+        """
+        segments = [np.asarray(seg, dtype=float) for seg in segments if len(seg)]
+        if len(segments) < 2:
+            return segments[0].copy() if segments else np.empty((0, 6))
+        if blend_samples is None:
+            blend_samples = int(round(self.blend_time / self.dt))
+        
+        # Half-zone length m: the boundary derivatives need one sample on
+        # either side of the zone start and of the zone end
+        lengths = [len(seg) for seg in segments]
+        m = min([blend_samples // 2, lengths[0] - 1, lengths[-1] - 2]
+                + [(n - 3) // 2 for n in lengths[1:-1]])
+        if m < 2:
+            return np.vstack(segments)
+        
+        # Zone boundary samples (index -1/0/+1 around start and end), (J, 3, 6)
+        before = np.stack([seg[len(seg) - m - 1:len(seg) - m + 2] for seg in segments[:-1]])
+        after = np.stack([seg[m - 1:m + 2] for seg in segments[1:]])
+        blends = self._quintic_blends(before, after, 2 * m)
+        
+        pieces = [segments[0][:len(segments[0]) - m]]
+        for j, seg in enumerate(segments[1:]):
+            pieces.append(before[j, 1:2])
+            pieces.append(blends[j])
+            end = len(seg) - m if j + 1 < len(segments) - 1 else len(seg)
+            pieces.append(seg[m:end])
+        return np.vstack(pieces)
+    
+    def _quintic_blends(self, before: np.ndarray, after: np.ndarray, intervals: int) -> np.ndarray:
+        """
+        Interior samples of all blend zones
+        
+        Args:
+            before: (J, 3, 6) poses around each zone start
+            after: (J, 3, 6) poses around each zone end
+            intervals: Zone duration in samples
+            
+        Returns:
+            (J, intervals - 1, 6) blended poses
+        """
+        dt = self.dt
+        T = intervals * dt
+        tau = np.arange(1, intervals) / intervals
+        tau2, tau3, tau4, tau5 = tau**2, tau**3, tau**4, tau**5
+        
+        # Quintic Hermite basis (position/velocity/acceleration at both ends)
+        basis = np.stack([
+            1 - 10 * tau3 + 15 * tau4 - 6 * tau5,
+            T * (tau - 6 * tau3 + 8 * tau4 - 3 * tau5),
+            T**2 * (tau2 - 3 * tau3 + 3 * tau4 - tau5) / 2,
+            10 * tau3 - 15 * tau4 + 6 * tau5,
+            T * (-4 * tau3 + 7 * tau4 - 3 * tau5),
+            T**2 * (tau3 - 2 * tau4 + tau5) / 2,
+        ], axis=1)  # (K, 6)
+        
+        def boundary_state(x):
+            """Position, central-difference velocity and acceleration, (J, 3, D)"""
+            return np.stack([x[:, 1],
+                             (x[:, 2] - x[:, 0]) / (2 * dt),
+                             (x[:, 2] - 2 * x[:, 1] + x[:, 0]) / dt**2], axis=1)
+        
+        # Positions
+        pos = np.concatenate([boundary_state(before[..., :3]), boundary_state(after[..., :3])], axis=1)
+        positions = np.einsum('kc,jcd->jkd', basis, pos)
+        
+        # Orientations: rotation vectors relative to each zone's start orientation
+        n_zones = len(before)
+        rotations = rotation_from_rpy(np.concatenate([before[..., 3:], after[..., 3:]], axis=1).reshape(-1, 3))
+        start_rot = rotation_from_rpy(before[:, 1, 3:])
+        relative = (start_rot[np.repeat(np.arange(n_zones), 6)].inv() * rotations).as_rotvec().reshape(n_zones, 6, 3)
+        rot = np.concatenate([boundary_state(relative[:, :3]), boundary_state(relative[:, 3:])], axis=1)
+        rotvecs = np.einsum('kc,jcd->jkd', basis, rot)
+        
+        K = intervals - 1
+        blended_rot = start_rot[np.repeat(np.arange(n_zones), K)] * Rotation.from_rotvec(rotvecs.reshape(-1, 3))
+        orientations = rotation_to_rpy(blended_rot).reshape(n_zones, K, 3)
+        return np.concatenate([positions, orientations], axis=2)
+
+class SmoothMotionCommand:
+    """Command class for executing smooth motions on PAROL6"""
+    
+    def __init__(self, trajectory: np.ndarray, speed_factor: float = 1.0):
+        """
+        Initialize smooth motion command
+        
+        Args:
+            trajectory: Pre-computed trajectory array
+            speed_factor: Speed scaling factor (1.0 = normal speed)
+        """
+        self.trajectory = trajectory
+        self.speed_factor = speed_factor
+        self.current_index = 0
+        self.is_finished = False
+        self.is_valid = True
+        
+    def prepare_for_execution(self, current_position_in):
+        """Validate trajectory is reachable from current position"""
+        # Check if IK solver is available
+        if solve_ik_with_adaptive_tol_subdivision is None:
+            logger.warning("Warning: IK solver not available, skipping validation")
+            self.is_valid = True
+            return True
+            
+        try:
+            # Convert current position to radians
+            current_q = np.array([PAROL6_ROBOT.STEPS2RADS(p, i) 
+                                 for i, p in enumerate(current_position_in)])
+            
+            # Check first waypoint is reachable
+            first_pose = self.trajectory[0]
+            target_se3 = SE3(first_pose[0]/1000, first_pose[1]/1000, first_pose[2]/1000) * \
+                        SE3.RPY(first_pose[3:], unit='deg', order='xyz')
+            
+            ik_result = solve_ik_with_adaptive_tol_subdivision(
+                PAROL6_ROBOT.robot, target_se3, current_q, ilimit=20
+            )
+            
+            if not ik_result.success:
+                logger.error(f"Smooth motion validation failed: Cannot reach first waypoint")
+                self.is_valid = False
+                return False
+                
+            logger.info(f"Smooth motion prepared with {len(self.trajectory)} waypoints")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Smooth motion preparation error: {e}")
+            self.is_valid = False
+            return False
+    
+    def execute_step(self, Position_in, Speed_out, Command_out, **kwargs):
+        """Execute one step of the smooth motion"""
+        if self.is_finished or not self.is_valid:
+            return True
+        
+        # Check if required modules are available
+        if PAROL6_ROBOT is None or solve_ik_with_adaptive_tol_subdivision is None:
+            logger.error("Error: Required PAROL6 modules not available")
+            self.is_finished = True
+            Speed_out[:] = [0] * 6
+            Command_out.value = 255
+            return True
+        
+        # Apply speed scaling
+        step_increment = max(1, int(self.speed_factor))
+        self.current_index += step_increment
+        
+        if self.current_index >= len(self.trajectory):
+            logger.info("Smooth motion completed")
+            self.is_finished = True
+            Speed_out[:] = [0] * 6
+            Command_out.value = 255
+            return True
+        
+        # Get current target pose
+        target_pose = self.trajectory[self.current_index]
+        
+        # Convert to SE3
+        target_se3 = SE3(target_pose[0]/1000, target_pose[1]/1000, target_pose[2]/1000) * \
+                    SE3.RPY(target_pose[3:], unit='deg', order='xyz')
+        
+        # Get current joint configuration
+        current_q = np.array([PAROL6_ROBOT.STEPS2RADS(p, i) 
+                             for i, p in enumerate(Position_in)])
+        
+        # Solve IK
+        ik_result = solve_ik_with_adaptive_tol_subdivision(
+            PAROL6_ROBOT.robot, target_se3, current_q, ilimit=20
+        )
+        
+        if not ik_result.success:
+            logger.error(f"IK failed at trajectory point {self.current_index}")
+            self.is_finished = True
+            Speed_out[:] = [0] * 6
+            Command_out.value = 255
+            return True
+        
+        # Convert to steps and send
+        target_steps = [int(PAROL6_ROBOT.RAD2STEPS(q, i)) 
+                       for i, q in enumerate(ik_result.q)]
+        
+        # Calculate velocities for smooth following
+        for i in range(6):
+            Speed_out[i] = int((target_steps[i] - Position_in[i]) * 10)  # P-control factor
+        
+        Command_out.value = 156  # Smooth motion command
+        return False
+
+# Helper functions for integration with robot_api.py
+
+def execute_circle(center: List[float], 
+                  radius: float, 
+                  duration: float = 4.0,
+                  normal: List[float] = [0, 0, 1]) -> str:
+    """
+    Execute a circular motion on PAROL6
+    
+    Args:
+        center: Center point [x, y, z] in mm
+        radius: Circle radius in mm
+        duration: Time to complete circle
+        normal: Normal vector to circle plane
+        
+    Returns:
+        Command string for robot_api
+    """
+    motion_gen = CircularMotion()
+    trajectory = motion_gen.generate_circle_3d(center, radius, normal, 0, duration)
+    
+    # Convert to command string format
+    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
+    command = f"SMOOTH_MOTION|CIRCLE|{traj_str}"
+    
+    return command
+
+def execute_arc(start_pose: List[float],
+               end_pose: List[float],
+               center: List[float],
+               clockwise: bool = True,
+               duration: float = 2.0) -> str:
+    """
+    Execute an arc motion on PAROL6
+    
+    Args:
+        start_pose: Starting pose [x, y, z, rx, ry, rz]
+        end_pose: Ending pose [x, y, z, rx, ry, rz]
+        center: Arc center point [x, y, z]
+        clockwise: Direction of rotation
+        duration: Time to complete arc
+        
+    Returns:
+        Command string for robot_api
+    """
+    motion_gen = CircularMotion()
+    trajectory = motion_gen.generate_arc_3d(start_pose, end_pose, center, 
+                                           clockwise=clockwise, duration=duration)
+    
+    # Convert to command string format
+    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
+    command = f"SMOOTH_MOTION|ARC|{traj_str}"
+    
+    return command
+
+def execute_spline(waypoints: List[List[float]], 
+                  total_time: Optional[float] = None) -> str:
+    """
+    Execute a spline motion through waypoints
+    
+    Args:
+        waypoints: List of poses [x, y, z, rx, ry, rz]
+        total_time: Total time for motion (auto-calculated if None)
+        
+    Returns:
+        Command string for robot_api
+    """
+    motion_gen = SplineMotion()
+    
+    # Generate timestamps if total_time is provided
+    timestamps = None
+    if total_time:
+        timestamps = np.linspace(0, total_time, len(waypoints))
+    
+    trajectory = motion_gen.generate_cubic_spline(waypoints, timestamps)
+    
+    # Convert to command string format
+    traj_str = "|".join([",".join(map(str, pose)) for pose in trajectory])
+    command = f"SMOOTH_MOTION|SPLINE|{traj_str}"
+    
+    return command
+
+def benchmark_generators(duration: float = 10.0, repeats: int = 5) -> Dict[str, float]:
+    """
+    Time the vectorized arc/circle/helix generators against a per-sample
+    reference (one rotation and one Slerp object per sample, as before
+    vectorization), and a trajectory cache hit
+
+    Returns:
+        Best time in milliseconds per generator
+    """
+    gen = CircularMotion()
+    start_pose = [250, 0, 200, 0, 0, 0]
+    end_pose = [200, 50, 200, 0, 0, 90]
+    center = [200, 0, 200]
+
+    def per_sample_arc():
+        r1 = np.array(start_pose[:3], dtype=float) - center
+        s = gen.generate_timestamps(duration) / duration
+        return np.array([
+            np.concatenate([center + Rotation.from_rotvec([0, 0, si * np.pi / 2]).apply(r1),
+                            gen._slerp_orientation(start_pose[3:], end_pose[3:], si)])
+            for si in s
+        ])
+
+    cases = {
+        'arc (per-sample reference)': per_sample_arc,
+        'arc': lambda: gen.generate_arc_3d(start_pose, end_pose, center, clockwise=False, duration=duration),
+        'circle': lambda: gen.generate_circle_3d(center, 50, duration=duration, start_point=start_pose),
+        'helix': lambda: gen.generate_helix_3d(center, 50, 20, 60, duration=duration, start_point=start_pose),
+    }
+    results = {}
+    for name, generate in cases.items():
+        timings = []
+        for _ in range(repeats):
+            gen.trajectory_cache.clear()
+            t0 = time.perf_counter()
+            generate()
+            timings.append(time.perf_counter() - t0)
+        results[name] = min(timings) * 1000
+    
+    cases['arc']()
+    t0 = time.perf_counter()
+    cases['arc']()
+    results['arc (cache hit)'] = (time.perf_counter() - t0) * 1000
+    return results
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PAROL6 smooth motion trajectories")
+    parser.add_argument('--benchmark', action='store_true', help="Time the arc/circle/helix generators")
+    parser.add_argument('--duration', type=float, default=10.0, help="Benchmark trajectory duration (s)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        samples = int(args.duration * 100)
+        for name, ms in benchmark_generators(args.duration).items():
+            print(f"{name:28s} {samples} samples: {ms:8.2f} ms")
+        sys.exit(0)
+
+    # Example: Generate a circle trajectory
+    circle_gen = CircularMotion()
+    circle_traj = circle_gen.generate_circle_3d(
+        center=[200, 0, 200],  # mm
+        radius=50,  # mm
+        duration=4.0  # seconds
+    )
+    logger.debug(f"Generated circle with {len(circle_traj)} points")
+    
+    # Example: Generate arc trajectory
+    arc_traj = circle_gen.generate_arc_3d(
+        start_pose=[250, 0, 200, 0, 0, 0],
+        end_pose=[200, 50, 200, 0, 0, 90],
+        center=[200, 0, 200],
+        duration=2.0
+    )
+    logger.debug(f"Generated arc with {len(arc_traj)} points")
+    
+    # Example: Generate spline through waypoints
+    spline_gen = SplineMotion()
+    waypoints = [
+        [200, 0, 100, 0, 0, 0],
+        [250, 50, 150, 0, 15, 45],
+        [200, 100, 200, 0, 30, 90],
+        [150, 50, 150, 0, 15, 45],
+        [200, 0, 100, 0, 0, 0]
+    ]
+    spline_traj = spline_gen.generate_cubic_spline(waypoints)
     logger.debug(f"Generated spline with {len(spline_traj)} points")
\ No newline at end of file
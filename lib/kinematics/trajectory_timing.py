@@ -0,0 +1,346 @@
+"""
+Trajectory Timing for PAROL6 Robot
+
+Analysis and retiming of joint paths sampled at the control rate (100Hz):
+
+- Singularity pre-scan: manipulability of every waypoint in one vectorized
+  pass (kinematics_core.manipulability) and the low-manipulability zones
+  along the path
+- Local retiming: segments that would exceed the joint speed limits
+  (robot_model.Joint_max_speed) - typically near a wrist singularity,
+  where small Cartesian steps need large joint steps - are stretched in
+  time, everything else keeps its original timing. The speed scale ramps
+  in and out of a slowed zone instead of stepping.
+- Time-optimal parameterization: the fastest timing of a geometric path
+  under per-joint velocity and acceleration limits (TOPP-RA reachability
+  analysis), for paths whose original timing does not matter.
+
+Slowing only where needed keeps paths faster than lowering the speed
+percentage of the whole motion.
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import logging
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from . import kinematics_core
+from . import robot_model
+
+logger = logging.getLogger(__name__)
+
+# Control loop period (s)
+DEFAULT_DT = 0.01
+
+# Joint speed limits in rad/s (robot_model.Joint_max_speed is in steps/s)
+JOINT_MAX_SPEED_RAD = np.array([
+    robot_model.SPEED_STEP2RAD(speed, i) for i, speed in enumerate(robot_model.Joint_max_speed)
+])
+
+# Joint acceleration limits in rad/s². robot_model.Joint_max_acc is read in
+# steps/s² like Joint_max_speed (1.6 - 7.9 rad/s²); taken as rad/s² it would
+# not limit anything
+JOINT_MAX_ACC_RAD = np.array([
+    robot_model.SPEED_STEP2RAD(robot_model.Joint_max_acc, i) for i in range(len(robot_model.Joint_max_speed))
+])
+
+# Path grid points of the time-optimal parameterization
+DEFAULT_GRID_POINTS = 1000
+
+# Max change of the speed scale between consecutive segments: from full
+# speed to standstill takes at least 1/ramp segments
+DEFAULT_SPEED_RAMP = 0.05
+
+
+def singularity_zones(Q, threshold=kinematics_core.SINGULARITY_THRESHOLD):
+    """
+    Manipulability along a joint path and its low-manipulability zones.
+
+    Parameters
+    ----------
+    Q : array_like, shape (N, 6)
+        Joint path in radians
+    threshold : float, optional
+        Manipulability below which a waypoint is near a singularity
+
+    Returns
+    -------
+    manipulability : ndarray, shape (N,)
+    zones : list of (start, stop)
+        Waypoint index ranges (stop exclusive) below the threshold
+    """
+    manip = kinematics_core.manipulability(np.asarray(Q, dtype=float))
+    near = np.concatenate([[False], manip < threshold, [False]])
+    edges = np.flatnonzero(np.diff(near.astype(np.int8)))
+    zones = [(int(start), int(stop)) for start, stop in zip(edges[::2], edges[1::2])]
+    return manip, zones
+
+
+def speed_ratio(Q, dt=DEFAULT_DT, max_speed=JOINT_MAX_SPEED_RAD):
+    """
+    Peak joint speed of every segment relative to its limit.
+
+    Parameters
+    ----------
+    Q : array_like, shape (N, 6)
+        Joint path in radians, one waypoint every `dt` seconds
+    dt : float, optional
+        Waypoint spacing (s)
+    max_speed : array_like, shape (6,), optional
+        Joint speed limits (rad/s)
+
+    Returns
+    -------
+    ndarray, shape (N-1,)
+        Values above 1.0 exceed a joint speed limit
+    """
+    dq = np.abs(np.diff(np.asarray(Q, dtype=float), axis=0))
+    return np.max(dq / (np.asarray(max_speed) * dt), axis=1, initial=0.0)
+
+
+def retime_path(Q, dt=DEFAULT_DT, max_speed=JOINT_MAX_SPEED_RAD, ramp=DEFAULT_SPEED_RAMP,
+                threshold=kinematics_core.SINGULARITY_THRESHOLD):
+    """
+    Stretch the segments of a path that exceed the joint speed limits.
+
+    Every segment gets a speed scale min(1, 1/speed_ratio); the scale is
+    then limited to change by at most `ramp` per segment (forward and
+    backward pass) and the path is resampled at `dt` with the new timing.
+    Segments within the limits away from a slowed zone keep their timing.
+
+    Parameters
+    ----------
+    Q : array_like, shape (N, 6)
+        Joint path in radians, one waypoint every `dt` seconds
+    dt : float, optional
+        Waypoint spacing (s)
+    max_speed : array_like, shape (6,), optional
+        Joint speed limits (rad/s)
+    ramp : float, optional
+        Max change of the speed scale between consecutive segments
+    threshold : float, optional
+        Manipulability threshold for the reported singularity zones
+
+    Returns
+    -------
+    Q_out : ndarray, shape (M, 6)
+        Retimed path, one waypoint every `dt` seconds (Q itself if no
+        segment had to be slowed)
+    info : dict
+        'zones': low-manipulability zones of the input path,
+        'slowed_segments': number of segments whose scale is below 1,
+        'min_scale': smallest speed scale,
+        'duration_s' / 'retimed_duration_s': path duration before/after
+    """
+    Q = np.asarray(Q, dtype=float)
+    _, zones = singularity_zones(Q, threshold)
+    duration = (len(Q) - 1) * dt
+    info = {'zones': zones, 'slowed_segments': 0, 'min_scale': 1.0,
+            'duration_s': duration, 'retimed_duration_s': duration}
+
+    ratio = speed_ratio(Q, dt, max_speed)
+    if len(ratio) == 0 or ratio.max() <= 1.0:
+        return Q, info
+
+    scale = np.minimum(1.0, 1.0 / np.maximum(ratio, 1e-12))
+    for k in range(1, len(scale)):
+        scale[k] = min(scale[k], scale[k - 1] + ramp)
+    for k in range(len(scale) - 2, -1, -1):
+        scale[k] = min(scale[k], scale[k + 1] + ramp)
+
+    # Knot times of the original waypoints, resampled on a uniform grid
+    t = np.concatenate([[0.0], np.cumsum(dt / scale)])
+    n_out = int(np.ceil(t[-1] / dt - 1e-9)) + 1
+    t_out = np.minimum(np.arange(n_out) * dt, t[-1])
+    segment = np.clip(np.searchsorted(t, t_out, side='right') - 1, 0, len(Q) - 2)
+    frac = ((t_out - t[segment]) / (t[segment + 1] - t[segment]))[:, np.newaxis]
+    Q_out = Q[segment] + frac * (Q[segment + 1] - Q[segment])
+    Q_out[-1] = Q[-1]
+
+    info.update(slowed_segments=int(np.count_nonzero(scale < 1.0)), min_scale=float(scale.min()),
+                retimed_duration_s=float(t[-1]))
+    return Q_out, info
+
+
+# ============================================================================
+# Time-Optimal Parameterization (TOPP-RA)
+# ============================================================================
+# Path q(s) with s the chord length along the joint path. With x = sdot² and
+# u = sddot, joint velocity and acceleration are linear in (x, u):
+#   qdot = q'(s) sdot          ->  x <= min_j (v_j / |q'_j|)²
+#   qddot = q'(s) u + q''(s) x ->  |q'_j u + q''_j x| <= a_j
+# and x_{i+1} = x_i + 2 delta_i u_i between grid points. The acceleration
+# limits are enforced at both ends of every grid interval (interpolation
+# scheme): at s_{i+1}, q'_{i+1} u + q''_{i+1} (x + 2 delta u) has the same
+# form with q' -> q'_{i+1} + 2 delta q''_{i+1}.
+#
+# A backward pass computes the largest x from which the end can still be
+# reached at rest (the controllable sets), a forward pass then takes the
+# largest feasible u at every grid point. Every constraint row
+# |p u + r x| <= a bounds u by two lines in x with the same slope -r/p, so
+# the controllable-set LPs reduce to the smallest roots of lines, all
+# vectorized over the grid except the one term that depends on the next
+# grid point's set.
+
+def _smallest_root(offset, slope):
+    """Smallest x > 0 where a line offset + slope * x (offset >= 0) reaches 0 from above; inf if none."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.where(slope < 0, offset / -slope, np.inf)
+    return np.min(root, axis=-1)
+
+
+def _acceleration_bounds(p, r, max_acc):
+    """
+    Bounds on u from the rows |p u + r x| <= a, as lines in x:
+    u in [-width + slope*x, width + slope*x].
+
+    Rows with p ~ 0 (joint not moving along the path) contribute the bound
+    x <= a / |r| instead.
+
+    Returns
+    -------
+    width, slope : ndarray, shape (M, R)
+        +inf width / zero slope for rows with p ~ 0
+    x_bound : ndarray, shape (M,)
+    """
+    moving = np.abs(p) > 1e-9
+    safe_p = np.where(moving, p, 1.0)
+    width = np.where(moving, max_acc / np.abs(safe_p), np.inf)
+    slope = np.where(moving, -r / safe_p, 0.0)
+    with np.errstate(divide='ignore'):
+        x_bound = np.min(np.where(moving, np.inf, max_acc / np.abs(r)), axis=1)
+    return width, slope, x_bound
+
+
+def _controllable_sets(width, slope, delta, x_static):
+    """
+    Backward pass: largest x at every grid point that can still stop at the end.
+
+    width, slope, delta and x_static are per grid interval (M-1 rows).
+    """
+    w, d = width, slope
+
+    # Lower u bound of joint j below upper bound of joint k:
+    # (w_j + w_k) + (d_k - d_j) x >= 0
+    pair_offset = (w[:, :, np.newaxis] + w[:, np.newaxis, :]).reshape(len(w), -1)
+    pair_slope = (d[:, np.newaxis, :] - d[:, :, np.newaxis]).reshape(len(w), -1)
+    x_pairs = _smallest_root(np.where(np.isinf(pair_offset), np.inf, pair_offset),
+                             np.where(np.isinf(pair_offset), 0.0, pair_slope))
+
+    # Max deceleration keeps x_{i+1} >= 0: x + 2 delta (w_k + d_k x) >= 0
+    growth = 1.0 + 2 * delta[:, np.newaxis] * d
+    x_nonnegative = _smallest_root(2 * delta[:, np.newaxis] * w, growth)
+    x_limit = np.minimum(x_static, np.minimum(x_pairs, x_nonnegative))
+
+    # Max deceleration reaches x_{i+1} <= h: x (1 + 2 delta d_j) <= h + 2 delta w_j
+    # (sequential: plain floats are much faster than NumPy for 12 rows)
+    brake = 2 * delta[:, np.newaxis] * w
+    valid = (growth > 0) & np.isfinite(brake)
+    brake = np.where(valid, brake, np.inf).tolist()
+    inv_growth = np.where(valid, 1.0 / np.where(valid, growth, 1.0), 1.0).tolist()
+    x_limit = x_limit.tolist()
+
+    x_reach = [0.0] * (len(width) + 1)
+    for i in range(len(width) - 1, -1, -1):
+        h = x_reach[i + 1]
+        reachable = min([(h + b) * g for b, g in zip(brake[i], inv_growth[i])])
+        x_reach[i] = max(min(x_limit[i], reachable), 0.0)
+    return np.array(x_reach)
+
+
+def _greedy_accelerations(width, slope, delta, x_reach):
+    """Forward pass: largest feasible u at every grid point, from rest."""
+    # Plain floats: the pass is sequential (inf widths have zero slope)
+    width, slope = width.tolist(), slope.tolist()
+    x_reach, delta = x_reach.tolist(), delta.tolist()
+
+    x = [0.0] * (len(width) + 1)
+    u = [0.0] * len(width)
+    for i in range(len(width)):
+        x_i, two_delta = x[i], 2 * delta[i]
+        u_max = min((x_reach[i + 1] - x_i) / two_delta, min([w + d * x_i for w, d in zip(width[i], slope[i])]))
+        u[i] = max(u_max, -x_i / two_delta)
+        x[i + 1] = x_i + two_delta * u[i]
+    return np.array(x), np.array(u)
+
+
+def time_optimal_retime(Q, dt=DEFAULT_DT, max_speed=JOINT_MAX_SPEED_RAD, max_acc=JOINT_MAX_ACC_RAD,
+                        grid_points=DEFAULT_GRID_POINTS):
+    """
+    Minimum-time timing of a joint path under joint velocity and
+    acceleration limits (TOPP-RA), starting and ending at rest.
+
+    Only the geometry of Q is kept: waypoints are interpolated by a cubic
+    spline over their chord length, the timing is solved on the waypoints
+    plus `grid_points` evenly spaced path points and the result is
+    resampled every `dt`. Limits hold at the grid points (in between up to
+    discretization).
+
+    Parameters
+    ----------
+    Q : array_like, shape (N, 6)
+        Joint path in radians (its timing is ignored)
+    dt : float, optional
+        Output sample spacing (s); also the spacing assumed for Q when
+        reporting its original duration
+    max_speed : array_like, shape (6,), optional
+        Joint speed limits (rad/s)
+    max_acc : array_like, shape (6,), optional
+        Joint acceleration limits (rad/s²)
+    grid_points : int, optional
+        Evenly spaced path points added to the waypoints
+
+    Returns
+    -------
+    Q_out : ndarray, shape (M, 6)
+        Retimed path, one waypoint every `dt` seconds
+    info : dict
+        'duration_s' / 'retimed_duration_s': path duration before/after,
+        'grid_points': path discretization used
+    """
+    Q = np.asarray(Q, dtype=float)
+    max_speed = np.asarray(max_speed, dtype=float)
+    max_acc = np.asarray(max_acc, dtype=float)
+    duration = (len(Q) - 1) * dt
+    info = {'duration_s': duration, 'retimed_duration_s': 0.0, 'grid_points': 0}
+
+    # Repeated waypoints carry no geometry
+    lengths = np.linalg.norm(np.diff(Q, axis=0), axis=1)
+    moving = lengths > 1e-9
+    if not np.any(moving):
+        return Q[:1].copy(), info
+    Q_path = np.vstack([Q[:1], Q[1:][moving]])
+    s_knots = np.concatenate([[0.0], np.cumsum(lengths[moving])])
+    path = CubicSpline(s_knots, Q_path, bc_type='natural')
+
+    s = np.union1d(s_knots, np.linspace(0.0, s_knots[-1], max(int(grid_points), 3)))
+    s = s[np.concatenate([[True], np.diff(s) > 1e-12 * s_knots[-1]])]
+    s[-1] = s_knots[-1]
+    delta = np.diff(s)
+    dq, ddq = path(s, 1), path(s, 2)
+
+    # Acceleration rows at both ends of every grid interval
+    p = np.hstack([dq[:-1], dq[1:] + 2 * delta[:, np.newaxis] * ddq[1:]])
+    r = np.hstack([ddq[:-1], ddq[1:]])
+    width, slope, x_bound = _acceleration_bounds(p, r, np.tile(max_acc, 2))
+    with np.errstate(divide='ignore'):
+        x_static = np.minimum(np.min((max_speed / np.abs(dq[:-1])) ** 2, axis=1), x_bound)
+
+    x_reach = _controllable_sets(width, slope, delta, x_static)
+    x, u = _greedy_accelerations(width, slope, delta, x_reach)
+
+    # Constant u per grid interval: s(t) is quadratic in between
+    sdot = np.sqrt(np.maximum(x, 0.0))
+    t_grid = np.concatenate([[0.0], np.cumsum(2 * delta / np.maximum(sdot[:-1] + sdot[1:], 1e-12))])
+    n_out = int(np.ceil(t_grid[-1] / dt - 1e-9)) + 1
+    t_out = np.minimum(np.arange(n_out) * dt, t_grid[-1])
+    k = np.clip(np.searchsorted(t_grid, t_out, side='right') - 1, 0, len(s) - 2)
+    tau = t_out - t_grid[k]
+    s_out = np.clip(s[k] + sdot[k] * tau + u[k] * tau ** 2 / 2, s[k], s[k + 1])
+    s_out[-1] = s[-1]
+
+    info.update(retimed_duration_s=float(t_grid[-1]), grid_points=len(s))
+    return path(s_out), info
@@ -0,0 +1,254 @@
+"""
+Workspace Reachability Map for PAROL6 Robot
+
+Precomputed voxel map of the flange positions the PAROL6 can reach (any
+orientation, within joint limits), with the best Yoshikawa manipulability
+seen in each voxel.
+
+Storage: one uint8 .npy array (nx, ny, nz) loaded with mmap - 0 means
+unreachable, 1..255 is the quantized manipulability - plus a small JSON
+sidecar with the grid origin, voxel size and quantization scale.
+
+Lookups are O(1) (index arithmetic on the mmap), so IK callers can reject
+unreachable targets before running any solver.
+
+The map is generated offline by sampling joint space:
+
+    python -m lib.kinematics.workspace_map --samples 10000000 --voxel 0.01
+
+Reachable voxels are dilated by one voxel so sampling gaps never reject a
+reachable target (the map errs on the side of "reachable").
+
+Author: PAROL6 Team
+Date: 2025-01-13
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+
+from . import kinematics_core
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAP_PATH = Path(__file__).parent / "data" / "workspace_map.npy"
+
+DEFAULT_VOXEL_SIZE_M = 0.01
+DEFAULT_SAMPLES = 10_000_000
+
+# Bounding box of the flange: max reach from the J2 axis is
+# a3 + |(a4, a5)| + a6 (+ a2 horizontally), plus a two-voxel margin
+_REACH = kinematics_core.a3 + np.hypot(kinematics_core.a4, kinematics_core.a5) + kinematics_core.a6
+_BOUNDS_MIN = np.array([-(_REACH + kinematics_core.a2), -(_REACH + kinematics_core.a2), kinematics_core.a1 - _REACH])
+_BOUNDS_MAX = np.array([_REACH + kinematics_core.a2, _REACH + kinematics_core.a2, kinematics_core.a1 + _REACH])
+
+
+class WorkspaceMap:
+    """
+    Voxel reachability / manipulability lookup.
+
+    Parameters
+    ----------
+    grid : ndarray of uint8, shape (nx, ny, nz)
+        0 = unreachable, 1..255 = reachable with quantized manipulability
+    origin : array_like, shape (3,)
+        Position (m) of the corner of voxel (0, 0, 0)
+    voxel_size : float
+        Voxel edge length (m)
+    manipulability_max : float
+        Manipulability represented by the value 255
+    """
+
+    def __init__(self, grid, origin, voxel_size, manipulability_max):
+        self.grid = grid
+        self.origin = np.asarray(origin, dtype=float)
+        self.voxel_size = float(voxel_size)
+        self.manipulability_max = float(manipulability_max)
+        self._shape = np.array(grid.shape)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MAP_PATH):
+        """
+        Load a map file with mmap (no copy into memory).
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the .npy grid; metadata is read from the .json sidecar
+        """
+        path = Path(path)
+        with open(path.with_suffix('.json'), 'r') as f:
+            meta = json.load(f)
+        grid = np.load(path, mmap_mode='r')
+        return cls(grid, meta['origin'], meta['voxel_size'], meta['manipulability_max'])
+
+    def save(self, path=DEFAULT_MAP_PATH, **extra_meta):
+        """Write the grid (.npy) and its metadata (.json sidecar)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.ascontiguousarray(self.grid, dtype=np.uint8))
+        meta = {
+            'origin': self.origin.tolist(),
+            'voxel_size': self.voxel_size,
+            'manipulability_max': self.manipulability_max,
+            'shape': [int(n) for n in self.grid.shape],
+            **extra_meta
+        }
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _values(self, positions):
+        """Grid values for positions (N, 3); 0 outside the grid."""
+        index = np.floor((positions - self.origin) / self.voxel_size).astype(int)
+        inside = np.all((index >= 0) & (index < self._shape), axis=-1)
+        values = np.zeros(len(positions), dtype=np.uint8)
+        if np.any(inside):
+            i = index[inside]
+            values[inside] = self.grid[i[:, 0], i[:, 1], i[:, 2]]
+        return values
+
+    def is_reachable(self, position):
+        """
+        Whether a flange position (m) can be reached in some orientation.
+
+        Returns
+        -------
+        bool
+        """
+        return bool(self._values(np.asarray(position, dtype=float).reshape(1, 3))[0])
+
+    def is_reachable_batch(self, positions):
+        """
+        Reachability of many flange positions (m).
+
+        Parameters
+        ----------
+        positions : array_like, shape (N, 3)
+
+        Returns
+        -------
+        ndarray of bool, shape (N,)
+        """
+        return self._values(np.asarray(positions, dtype=float).reshape(-1, 3)) > 0
+
+    def manipulability_at(self, position):
+        """
+        Best manipulability reachable at a flange position (m).
+
+        Returns
+        -------
+        float
+            0.0 if unreachable
+        """
+        value = self._values(np.asarray(position, dtype=float).reshape(1, 3))[0]
+        if value == 0:
+            return 0.0
+        return (value - 1) / 254.0 * self.manipulability_max
+
+    def reachable_fraction(self):
+        """Fraction of grid voxels that are reachable."""
+        return float(np.count_nonzero(self.grid)) / self.grid.size
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+def generate(samples=DEFAULT_SAMPLES, voxel_size=DEFAULT_VOXEL_SIZE_M, seed=0, chunk_size=200_000):
+    """
+    Build a WorkspaceMap by sampling joint space uniformly within limits.
+
+    Parameters
+    ----------
+    samples : int, optional
+        Number of random joint configurations
+    voxel_size : float, optional
+        Voxel edge length (m)
+    seed : int, optional
+        Random seed (maps are reproducible)
+    chunk_size : int, optional
+        Configurations evaluated per vectorized pass
+
+    Returns
+    -------
+    WorkspaceMap
+    """
+    rng = np.random.default_rng(seed)
+    origin = _BOUNDS_MIN - 2 * voxel_size
+    shape = np.ceil((_BOUNDS_MAX + 2 * voxel_size - origin) / voxel_size).astype(int)
+    best = np.zeros(shape, dtype=float)
+    reached = np.zeros(shape, dtype=bool)
+    limits = kinematics_core.JOINT_LIMITS_RAD
+
+    for start in range(0, samples, chunk_size):
+        n = min(chunk_size, samples - start)
+        q = rng.uniform(limits[:, 0], limits[:, 1], size=(n, kinematics_core.NUM_JOINTS))
+        positions = kinematics_core.fkine_batch(q)[:, :3, 3]
+        manip = kinematics_core.manipulability(q)
+
+        index = np.floor((positions - origin) / voxel_size).astype(int)
+        flat = np.ravel_multi_index(index.T, shape)
+        reached.flat[flat] = True
+        np.maximum.at(best.ravel(), flat, manip)
+
+    # One-voxel dilation: sampling gaps must not reject reachable targets
+    dilated = reached.copy()
+    best_dilated = best.copy()
+    for axis in range(3):
+        for shift in (-1, 1):
+            dilated |= np.roll(reached, shift, axis=axis)
+            best_dilated = np.maximum(best_dilated, np.roll(best, shift, axis=axis))
+
+    manipulability_max = float(best.max()) if best.max() > 0 else 1.0
+    grid = np.zeros(shape, dtype=np.uint8)
+    grid[dilated] = 1 + np.round(254 * best_dilated[dilated] / manipulability_max).astype(np.uint8)
+    return WorkspaceMap(grid, origin, voxel_size, manipulability_max)
+
+
+# ============================================================================
+# Shared Instance
+# ============================================================================
+
+_workspace_map = None
+_load_attempted = False
+
+
+def get_workspace_map():
+    """
+    Shared map loaded from DEFAULT_MAP_PATH (None if no map was generated).
+    """
+    global _workspace_map, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        try:
+            _workspace_map = WorkspaceMap.load()
+        except FileNotFoundError:
+            logger.warning(f"[WorkspaceMap] No map at {DEFAULT_MAP_PATH} - reachability pre-check disabled")
+        except Exception as e:
+            logger.error(f"[WorkspaceMap] Failed to load {DEFAULT_MAP_PATH}: {e}")
+    return _workspace_map
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the PAROL6 workspace reachability map")
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help="Joint-space samples")
+    parser.add_argument('--voxel', type=float, default=DEFAULT_VOXEL_SIZE_M, help="Voxel size in metres")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--output', type=Path, default=DEFAULT_MAP_PATH, help="Output .npy path")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    workspace_map = generate(args.samples, args.voxel, args.seed)
+    workspace_map.save(args.output, samples=args.samples, seed=args.seed)
+    print(f"Workspace map {workspace_map.grid.shape} ({workspace_map.grid.nbytes / 1024:.0f} KiB), "
+          f"{workspace_map.reachable_fraction() * 100:.1f}% reachable, "
+          f"generated in {time.time() - start_time:.1f}s -> {args.output}")